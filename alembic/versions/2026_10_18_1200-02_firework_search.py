@@ -0,0 +1,56 @@
+"""firework_search
+
+Revision ID: 02
+Revises: 01
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '02'
+down_revision: Union[str, None] = '01'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+FIREWORK_SEARCH_VECTOR = (
+    "setweight(to_tsvector('russian', coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('simple', "
+    "coalesce(article, '') || ' ' || coalesce(code, '')), 'B') || "
+    "setweight(to_tsvector('russian', coalesce(description, '')), 'C')"
+)
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.add_column('firework', sa.Column(
+        'search_vector',
+        postgresql.TSVECTOR(),
+        sa.Computed(FIREWORK_SEARCH_VECTOR, persisted=True),
+        nullable=True,
+    ))
+    op.create_index(
+        'ix_firework_search_vector',
+        'firework',
+        ['search_vector'],
+        unique=False,
+        postgresql_using='gin',
+    )
+    op.create_index(
+        'ix_firework_name_trgm',
+        'firework',
+        ['name'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'name': 'gin_trgm_ops'},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_firework_name_trgm', table_name='firework')
+    op.drop_index('ix_firework_search_vector', table_name='firework')
+    op.drop_column('firework', 'search_vector')
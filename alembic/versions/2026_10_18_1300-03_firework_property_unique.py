@@ -0,0 +1,41 @@
+"""firework_property_unique
+
+Revision ID: 03
+Revises: 02
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '03'
+down_revision: Union[str, None] = '02'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Прежний загрузчик CSV дублировал характеристики при каждом импорте:
+    # оставляем самую свежую запись для пары товар-поле.
+    op.execute(
+        """
+        DELETE FROM firework_property AS duplicate
+        USING firework_property AS newer
+        WHERE duplicate.firework_id = newer.firework_id
+            AND duplicate.field_id = newer.field_id
+            AND duplicate.id < newer.id
+        """
+    )
+    op.create_unique_constraint(
+        'uq_firework_property_field',
+        'firework_property',
+        ['firework_id', 'field_id'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint(
+        'uq_firework_property_field', 'firework_property', type_='unique'
+    )
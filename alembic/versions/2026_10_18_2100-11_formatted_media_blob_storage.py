@@ -0,0 +1,44 @@
+"""formatted_media_blob_storage
+
+Revision ID: 11
+Revises: 10
+Create Date: 2026-10-18 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '11'
+down_revision: Union[str, None] = '10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Прежние записи - копии исходных файлов без обработки, созданные
+    # по запросу бота. Они не переносятся в хранилище файлов: варианты
+    # создаются заново из исходных медиа (python -m
+    # src.utils.media_variants), поэтому миграция не обращается
+    # к хранилищу и не зависит от кода приложения.
+    op.execute('DELETE FROM formattedmedia')
+    op.add_column('formattedmedia', sa.Column('path', sa.String(length=255), nullable=False))
+    op.add_column('formattedmedia', sa.Column('size', sa.BigInteger(), nullable=False))
+    op.add_column('formattedmedia', sa.Column('sha256', sa.String(length=64), nullable=False))
+    op.add_column('formattedmedia', sa.Column('width', sa.Integer(), nullable=True))
+    op.add_column('formattedmedia', sa.Column('height', sa.Integer(), nullable=True))
+    op.drop_column('formattedmedia', 'file')
+
+
+def downgrade() -> None:
+    # Файлы записей остаются в хранилище; прежняя версия приложения
+    # создает копии заново по запросу бота.
+    op.execute('DELETE FROM formattedmedia')
+    op.add_column('formattedmedia', sa.Column('file', sa.LargeBinary(), nullable=False))
+    op.drop_column('formattedmedia', 'height')
+    op.drop_column('formattedmedia', 'width')
+    op.drop_column('formattedmedia', 'sha256')
+    op.drop_column('formattedmedia', 'size')
+    op.drop_column('formattedmedia', 'path')
@@ -0,0 +1,38 @@
+"""formatted_media_variants
+
+Revision ID: 12
+Revises: 11
+Create Date: 2026-10-18 22:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '12'
+down_revision: Union[str, None] = '11'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Варианты создаются заново из исходных медиа
+    # (src/service/media_variants.py). Ревизия 11 удаляет прежние
+    # записи, а строки, оставшиеся после ее ранней версии (копии
+    # исходных файлов в хранилище), удаляются здесь без файлов: файлы
+    # удаляются после фиксации миграции командой
+    # python -m src.utils.media_variants (delete_orphaned_files).
+    op.execute('DELETE FROM formattedmedia')
+    op.add_column('formattedmedia', sa.Column('variant', sa.String(length=32), nullable=False))
+    op.add_column('formattedmedia', sa.Column('format', sa.String(length=8), nullable=False))
+    op.add_column('formattedmedia', sa.Column('telegram_file_id', sa.String(), nullable=True))
+    op.create_unique_constraint('unique_formatted_media_variant', 'formattedmedia', ['media_id', 'variant', 'format'])
+
+
+def downgrade() -> None:
+    op.drop_constraint('unique_formatted_media_variant', 'formattedmedia', type_='unique')
+    op.drop_column('formattedmedia', 'telegram_file_id')
+    op.drop_column('formattedmedia', 'format')
+    op.drop_column('formattedmedia', 'variant')
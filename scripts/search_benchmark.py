@@ -0,0 +1,123 @@
+"""Сравнение поиска по ILIKE и полнотекстового поиска.
+
+Скрипт в одной транзакции добавляет в таблицу firework синтетический
+каталог (по умолчанию 100 000 товаров), прогоняет одни и те же запросы
+через фильтр name (ILIKE, FireworkFilterSchema) и через
+firework_crud.search_fireworks, печатает медианное время и количество
+найденного, после чего откатывает транзакцию - данные в БД не остаются.
+
+Запуск (нужна БД с примененной миграцией 02):
+    python -m scripts.search_benchmark --count 100000 --repeats 5
+"""
+
+import argparse
+import asyncio
+from statistics import median
+from time import perf_counter
+from typing import Awaitable, Callable
+
+from sqlalchemy import text
+
+from src.crud.product import firework_crud
+from src.database.db_dependencies import AsyncSessionLocal
+from src.schemas.filter_shema import FireworkFilterSchema
+from src.schemas.pagination_schema import PaginationSchema
+
+SYNTHETIC_CATALOG_SQL = text(
+    """
+    INSERT INTO firework (
+        code, name, measurement_unit, description, price,
+        product_size, article
+    )
+    SELECT
+        'bench-' || g,
+        (ARRAY['Салют', 'Фонтан', 'Ракета', 'Батарея салютов',
+               'Римская свеча', 'Петарда'])[1 + g % 6]
+        || ' ' ||
+        (ARRAY['Звездопад', 'Огненный дождь', 'Праздничный',
+               'Зимняя сказка', 'Северное сияние', 'Раскаты грома'])
+               [1 + (g / 6) % 6]
+        || ' ' || g,
+        'шт',
+        'Яркие залпы с эффектом '
+        || (ARRAY['золотой ивы', 'мерцающих звезд', 'разноцветных шаров',
+                  'свистящих комет'])[1 + g % 4]
+        || ', высота подъема ' || (20 + g % 60) || ' метров.',
+        100 + g % 9000,
+        '10x10x10',
+        'BENCH-' || g
+    FROM generate_series(1, :count) AS g
+    """
+)
+
+# Запросы с опечатками и словоформами, которые ILIKE не находит.
+QUERIES = (
+    'звездопад',
+    'северное сияние',
+    'огненного дождя',
+    'ракеты',
+    'звездапад',
+    'золотой ивой',
+)
+
+
+async def measure(
+    coroutine_factory: Callable[[], Awaitable[int]], repeats: int
+) -> tuple[float, int]:
+    timings = []
+    found = 0
+    for _ in range(repeats):
+        started = perf_counter()
+        found = await coroutine_factory()
+        timings.append(perf_counter() - started)
+    return median(timings) * 1000, found
+
+
+async def run(count: int, repeats: int, limit: int) -> None:
+    async with AsyncSessionLocal() as session:
+        try:
+            await session.execute(SYNTHETIC_CATALOG_SQL, {'count': count})
+            await session.execute(text('ANALYZE firework'))
+            pagination_schema = PaginationSchema(offset=0, limit=limit)
+            print(f'Синтетический каталог: {count} товаров')
+            print(
+                f'{"запрос":<20}{"ILIKE, мс":>12}{"найдено":>10}'
+                f'{"FTS, мс":>12}{"найдено":>10}'
+            )
+            for query in QUERIES:
+
+                async def ilike_search() -> int:
+                    fireworks, _ = await firework_crud.get_multi(
+                        session,
+                        filter_schema=FireworkFilterSchema(name=query),
+                        pagination_schema=pagination_schema,
+                    )
+                    return len(fireworks)
+
+                async def full_text_search() -> int:
+                    results = await firework_crud.search_fireworks(
+                        session, query, limit=limit
+                    )
+                    return len(results)
+
+                ilike_time, ilike_found = await measure(ilike_search, repeats)
+                fts_time, fts_found = await measure(full_text_search, repeats)
+                print(
+                    f'{query:<20}{ilike_time:>12.1f}{ilike_found:>10}'
+                    f'{fts_time:>12.1f}{fts_found:>10}'
+                )
+        finally:
+            await session.rollback()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--count', type=int, default=100_000)
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--limit', type=int, default=10)
+    args = parser.parse_args()
+    asyncio.run(run(args.count, args.repeats, args.limit))
+
+
+if __name__ == '__main__':
+    main()
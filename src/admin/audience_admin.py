@@ -0,0 +1,78 @@
+from types import SimpleNamespace
+
+from fastapi import Request
+from sqladmin import BaseView, expose
+from sqlalchemy import select
+from starlette.datastructures import QueryParams
+from starlette.templating import Jinja2Templates
+
+from src.crud.newsletter import newsletter_crud
+from src.crud.user_segment import user_segment_crud
+from src.database.db_dependencies import AsyncSessionLocal
+from src.models.newsletter import AccountAge
+from src.models.product import Tag
+
+templates = Jinja2Templates(directory='src/admin/templates')
+
+ACCOUNT_AGES = {account_age.value for account_age in AccountAge}
+
+
+def get_preview_criteria(params: QueryParams, tags: list[Tag]) -> object:
+    """Критерии рассылки из формы предпросмотра.
+
+    Объект повторяет поля Newsletter, которые читает
+    newsletter_crud.get_recipients_query, но не является моделью, чтобы
+    не попасть в сессию. Неизвестные значения полей формы
+    не учитываются.
+    """
+    tag_ids = params.getlist('tags')
+    selected_tags = [tag for tag in tags if str(tag.id) in tag_ids]
+    account_age = params.get('account_age', '')
+    number_of_orders = params.get('number_of_orders', '')
+    return SimpleNamespace(
+        age_verified='age_verified' in params,
+        account_age=(
+            AccountAge(account_age) if account_age in ACCOUNT_AGES else None
+        ),
+        number_of_orders=(
+            int(number_of_orders) if number_of_orders.isdigit() else 0
+        ),
+        users_related_to_tag=bool(selected_tags),
+        tags=selected_tags,
+    )
+
+
+class AudiencePreviewView(BaseView):
+    name = 'Аудитория рассылок'
+    icon = 'fa-users'
+
+    @expose('/audience', methods=['GET'], identity='audience')
+    async def audience(self, request: Request):
+        """Размеры сегментов и аудитория рассылки с выбранными критериями.
+
+        Данные читаются из таблицы user_segment, поэтому страница
+        открывается мгновенно при любом количестве пользователей.
+        """
+        params = request.query_params
+        async with AsyncSessionLocal() as session:
+            sizes = await user_segment_crud.get_sizes(session)
+            tags = (
+                await session.scalars(select(Tag).order_by(Tag.name))
+            ).all()
+            criteria = preview = None
+            if 'preview' in params:
+                criteria = get_preview_criteria(params, tags)
+                preview = await newsletter_crud.count_recipients(
+                    criteria, session
+                )
+        return templates.TemplateResponse(
+            'sqladmin/audience.html',
+            {
+                'request': request,
+                'sizes': sizes,
+                'tags': tags,
+                'account_ages': list(AccountAge),
+                'criteria': criteria,
+                'preview': preview,
+            },
+        )
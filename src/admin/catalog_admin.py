@@ -0,0 +1,22 @@
+from typing import Any
+
+from sqladmin import ModelView
+from starlette.requests import Request
+
+from src.service.catalog_cache import catalog_cache
+
+
+class CatalogModelView(ModelView):
+    """Базовое представление моделей каталога.
+
+    После создания, изменения или удаления объекта сбрасывает кеш
+    каталога, чтобы API сразу отдавал актуальные данные.
+    """
+
+    async def after_model_change(
+        self, data: dict, model: Any, is_created: bool, request: Request
+    ) -> None:
+        await catalog_cache.bump_version()
+
+    async def after_model_delete(self, model: Any, request: Request) -> None:
+        await catalog_cache.bump_version()
@@ -1,14 +1,14 @@
 from markupsafe import Markup
-from sqladmin import ModelView
 from sqlalchemy import select
 from sqlalchemy.sql import Select
 from starlette.requests import Request
 
+from src.admin.catalog_admin import CatalogModelView
 from src.admin.constants import PAGE_SIZE
 from src.models.product import Category
 
 
-class CategoryView(ModelView, model=Category):
+class CategoryView(CatalogModelView, model=Category):
     name = 'категория товара'
     name_plural = 'Категории товаров'
 
@@ -2,10 +2,16 @@ from fastapi import FastAPI
 from sqladmin import Admin
 
 from src.admin.admin_dependencies import SQLAdminAuth
+from src.admin.audience_admin import AudiencePreviewView
 from src.admin.bot_info import BotInfoView
 from src.admin.category_admin import CategoryView
 from src.admin.media_admin import MediaView
-from src.admin.newsletter_admin import NewsletterMediaView, NewsletterView
+from src.admin.newsletter_admin import (
+    NewsletterDeliveryView,
+    NewsletterMediaView,
+    NewsletterView,
+    NewsletterWaveView,
+)
 from src.admin.orderstatus import OrderStatusView
 from src.admin.product_admin import FireworkView
 from src.admin.product_extra_properties import (
@@ -51,6 +57,9 @@ async def setup_admin(app: FastAPI) -> Admin:
     admin.add_view(MediaView)
     admin.add_view(NewsletterView)
     admin.add_view(NewsletterMediaView)
+    admin.add_view(NewsletterWaveView)
+    admin.add_view(NewsletterDeliveryView)
+    admin.add_view(AudiencePreviewView)
     admin.add_view(OrderStatusView)
     admin.add_view(BotInfoView)
     admin.add_view(AdminUploadCSVView)
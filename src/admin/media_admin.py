@@ -1,11 +1,19 @@
-from sqladmin import ModelView
+from starlette.requests import Request
 
+from src.admin.catalog_admin import CatalogModelView
 from src.admin.constants import PAGE_SIZE
-from src.admin.utils import generate_clickable_formatters
+from src.admin.utils import (
+    generate_clickable_formatters,
+    reset_telegram_file_id,
+)
+from src.crud.media import formatted_media_crud
+from src.database.db_dependencies import AsyncSessionLocal
 from src.models.media import Media
+from src.service.blob_storage import blob_storage
+from src.service.media_variants import refresh_variants
 
 
-class MediaView(ModelView, model=Media):
+class MediaView(CatalogModelView, model=Media):
     name = 'медиа'
     name_plural = 'Медиафайлы товаров'
 
@@ -18,11 +26,13 @@ class MediaView(ModelView, model=Media):
         'created_at',
         'updated_at',
         'formatted_media',
+        'telegram_file_id',
     ]
     column_labels = {
         'media_url': 'url медиафайла',
         'media_type': 'тип медиафайла',
         'fireworks': 'товары',
+        'telegram_file_id': 'file_id в Telegram',
     }
     column_details_exclude_list = [
         'id',
@@ -35,3 +45,33 @@ class MediaView(ModelView, model=Media):
     column_formatters = generate_clickable_formatters(
         Media, '/admin/media/details', column_list
     )
+
+    async def on_model_change(
+        self, data: dict, model: Media, is_created: bool, request: Request
+    ) -> None:
+        request.state.media_url_changed = is_created or (
+            data.get('media_url', model.media_url) != model.media_url
+        )
+        reset_telegram_file_id(data, model)
+
+    async def after_model_change(
+        self, data: dict, model: Media, is_created: bool, request: Request
+    ) -> None:
+        # Варианты фото делаются из файла по ссылке: у новой ссылки
+        # свои варианты.
+        if request.state.media_url_changed:
+            await refresh_variants(model.id)
+        await super().after_model_change(data, model, is_created, request)
+
+    async def on_model_delete(self, model: Media, request: Request) -> None:
+        async with AsyncSessionLocal() as session:
+            variants = await formatted_media_crud.get_by_media_id(
+                model.id, session
+            )
+        request.state.variant_paths = [variant.path for variant in variants]
+
+    async def after_model_delete(self, model: Media, request: Request) -> None:
+        # Записи вариантов удаляются каскадом, а их файлы - здесь.
+        for path in request.state.variant_paths:
+            await blob_storage.delete(path)
+        await super().after_model_delete(model, request)
@@ -1,8 +1,22 @@
 from sqladmin import ModelView
+from sqlalchemy import select
+from sqlalchemy.orm import undefer_group
+from sqlalchemy.sql import Select
+from starlette.requests import Request
+from wtforms import validators
 
 from src.admin.constants import PAGE_SIZE
-from src.admin.utils import generate_clickable_formatters
-from src.models.newsletter import Newsletter, NewsletterMedia
+from src.admin.utils import (
+    generate_clickable_formatters,
+    reset_telegram_file_id,
+)
+from src.models.newsletter import (
+    Newsletter,
+    NewsletterDelivery,
+    NewsletterMedia,
+    NewsletterWave,
+)
+from src.utils.scheduler.scheduler import notify_newsletter_changed
 
 
 class NewsletterView(ModelView, model=Newsletter):
@@ -20,14 +34,27 @@ class NewsletterView(ModelView, model=Newsletter):
         Newsletter.canceled,
         Newsletter.account_age,
         Newsletter.users_related_to_tag,
+        Newsletter.sent_count,
+        Newsletter.failed_count,
+        Newsletter.pending_count,
+        Newsletter.waves,
     ]
     form_excluded_columns = [
         'created_at',
         'updated_at',
+        'queued_at',
+        'sent_count',
+        'failed_count',
+        'pending_count',
+        'waves',
     ]
+    # Статистика доставки загружается только в списке (list_query).
     column_details_exclude_list = [
         'id',
         'updated_at',
+        'sent_count',
+        'failed_count',
+        'pending_count',
     ]
     column_labels = {
         'mediafiles': 'медиафайлы',
@@ -41,6 +68,11 @@ class NewsletterView(ModelView, model=Newsletter):
         'created_at': 'дата создания',
         'account_age': 'возраст аккаунта',
         'users_related_to_tag': 'тег для пользователя',
+        'queued_at': 'поставлена в очередь',
+        'sent_count': 'доставлено',
+        'failed_count': 'ошибок доставки',
+        'pending_count': 'ожидает доставки',
+        'waves': 'волны отправки',
     }
     column_sortable_list = [
         'switch_send',
@@ -54,6 +86,121 @@ class NewsletterView(ModelView, model=Newsletter):
         'content',
     ]
 
+    def list_query(self, request: Request) -> Select:
+        return select(Newsletter).options(undefer_group('delivery_stats'))
+
+    async def after_model_change(
+        self, data: dict, model: Newsletter, is_created: bool, request: Request
+    ) -> None:
+        # Планировщик заведет задачу, которая отправит рассылку точно
+        # в datetime_send, или удалит задачу отмененной рассылки.
+        await notify_newsletter_changed(model.id)
+
+    async def after_model_delete(
+        self, model: Newsletter, request: Request
+    ) -> None:
+        await notify_newsletter_changed(model.id)
+
+
+class NewsletterDeliveryView(ModelView, model=NewsletterDelivery):
+    """Очередь доставки рассылок (только просмотр)."""
+
+    name = 'доставка рассылки'
+    name_plural = 'Доставки рассылок'
+    can_create = False
+    can_edit = False
+
+    column_list = [
+        NewsletterDelivery.newsletter_id,
+        NewsletterDelivery.telegram_id,
+        NewsletterDelivery.wave,
+        NewsletterDelivery.status,
+        NewsletterDelivery.attempts,
+        NewsletterDelivery.error,
+        NewsletterDelivery.sent_at,
+    ]
+    column_labels = {
+        'newsletter_id': 'id рассылки',
+        'telegram_id': 'telegram id',
+        'wave': 'волна',
+        'status': 'статус',
+        'attempts': 'попыток',
+        'error': 'ошибка',
+        'claimed_at': 'взята в работу',
+        'sent_at': 'доставлена',
+        'created_at': 'дата создания',
+    }
+    column_sortable_list = ['newsletter_id', 'status', 'sent_at']
+    column_searchable_list = ['telegram_id']
+
+    page_size = PAGE_SIZE
+
+
+class NewsletterWaveView(ModelView, model=NewsletterWave):
+    """Волны постепенной отправки рассылок и их статистика."""
+
+    name = 'волна рассылки'
+    name_plural = 'Волны рассылок'
+
+    column_list = [
+        NewsletterWave.newsletter,
+        NewsletterWave.number,
+        NewsletterWave.audience_percent,
+        NewsletterWave.rate_limit,
+        NewsletterWave.pause_minutes,
+        NewsletterWave.released_at,
+        NewsletterWave.finished_at,
+        NewsletterWave.sent_count,
+        NewsletterWave.failed_count,
+        NewsletterWave.clicks,
+    ]
+    form_columns = [
+        'newsletter',
+        'number',
+        'audience_percent',
+        'rate_limit',
+        'pause_minutes',
+    ]
+    column_details_exclude_list = [
+        'id',
+        'newsletter_id',
+        'updated_at',
+        'sent_count',
+        'failed_count',
+    ]
+    column_labels = {
+        'newsletter': 'рассылка',
+        'number': 'номер волны',
+        'audience_percent': 'доля получателей, %',
+        'rate_limit': 'лимит сообщений в секунду',
+        'pause_minutes': 'пауза после предыдущей волны, мин',
+        'released_at': 'начало отправки',
+        'finished_at': 'окончание отправки',
+        'sent_count': 'доставлено',
+        'failed_count': 'ошибок доставки',
+        'clicks': 'нажатий на теги',
+        'created_at': 'дата создания',
+    }
+    column_sortable_list = ['number', 'released_at', 'clicks']
+    form_args = {
+        'number': {'validators': [validators.NumberRange(min=1)]},
+        'audience_percent': {
+            'validators': [validators.NumberRange(min=1, max=100)]
+        },
+        'rate_limit': {
+            'validators': [
+                validators.Optional(),
+                validators.NumberRange(min=0.1),
+            ]
+        },
+        'pause_minutes': {'validators': [validators.NumberRange(min=0)]},
+    }
+
+    page_size = PAGE_SIZE
+
+    def list_query(self, request: Request) -> Select:
+        return select(NewsletterWave).options(undefer_group('delivery_stats'))
+
 
 class NewsletterMediaView(ModelView, model=NewsletterMedia):
     name = 'медиафайл рассылки'
@@ -66,6 +213,7 @@ class NewsletterMediaView(ModelView, model=NewsletterMedia):
     form_excluded_columns = [
         'created_at',
         'updated_at',
+        'telegram_file_id',
     ]
     column_details_exclude_list = [
         'id',
@@ -75,6 +223,16 @@ class NewsletterMediaView(ModelView, model=NewsletterMedia):
     column_labels = {
         'newsletters': 'рассылки',
         'media_url': 'ссылка на медиа',
+        'telegram_file_id': 'file_id в Telegram',
     }
 
     page_size = PAGE_SIZE
+
+    async def on_model_change(
+        self,
+        data: dict,
+        model: NewsletterMedia,
+        is_created: bool,
+        request: Request,
+    ) -> None:
+        reset_telegram_file_id(data, model)
@@ -1,11 +1,11 @@
 from markupsafe import Markup
-from sqladmin import ModelView
 from sqlalchemy import select
 from sqlalchemy.sql import Select
 from starlette.requests import Request
 
 # from starlette.responses import RedirectResponse
 # from sqladmin.filters import FilterEqual, FilterLike, FilterIn
+from src.admin.catalog_admin import CatalogModelView
 from src.admin.constants import PAGE_SIZE
 from src.admin.utils import generate_clickable_formatters
 from src.models.product import Category, Firework, Tag
@@ -22,7 +22,7 @@ from src.models.product import Category, Firework, Tag
 #     )
 
 
-class FireworkView(ModelView, model=Firework):
+class FireworkView(CatalogModelView, model=Firework):
     """Представление пиротехники в админке."""
 
     name = 'товар'
@@ -47,6 +47,8 @@ class FireworkView(ModelView, model=Firework):
         'category_id',
         'updated_at',
         'order_fireworks',
+        'search_vector',
+        'content_hash',
     ]
     form_columns = [
         'code',
@@ -65,6 +67,7 @@ class FireworkView(ModelView, model=Firework):
         'product_size',
         'packing_material',
         'caliber',
+        'is_active',
     ]
     column_labels = {
         'id': 'ID',
@@ -93,6 +96,7 @@ class FireworkView(ModelView, model=Firework):
         'created_at': 'дата создания',
         'properties': 'доп. характеристики',
         'caliber': 'калибр',
+        'is_active': 'в каталоге',
     }
     column_sortable_list = [
         'name',
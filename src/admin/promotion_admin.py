@@ -1,11 +1,10 @@
-from sqladmin import ModelView
-
+from src.admin.catalog_admin import CatalogModelView
 from src.admin.constants import PAGE_SIZE
 from src.admin.utils import generate_clickable_formatters
 from src.models.discounts import Discount
 
 
-class DiscountView(ModelView, model=Discount):
+class DiscountView(CatalogModelView, model=Discount):
     """Представление акций в админке."""
 
     name = 'акция'
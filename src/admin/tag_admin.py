@@ -1,11 +1,11 @@
 from markupsafe import Markup
-from sqladmin import ModelView
 
+from src.admin.catalog_admin import CatalogModelView
 from src.admin.constants import PAGE_SIZE
 from src.models.product import Tag
 
 
-class TagView(ModelView, model=Tag):
+class TagView(CatalogModelView, model=Tag):
     name = 'тег товара'
     name_plural = 'Теги товаров'
 
@@ -1,17 +1,40 @@
-import contextlib
+import uuid
 
-import anyio  # встроенная зависимость FastAPI
 from fastapi import Request, UploadFile
 from sqladmin import BaseView, expose
-from starlette.responses import RedirectResponse
+from starlette.responses import JSONResponse, RedirectResponse
 from starlette.templating import Jinja2Templates
 
-from src.database.db_dependencies import get_async_session
-from src.service.csv_loader import load_data
+from src.database.db_dependencies import AsyncSessionLocal
+from src.service.csv_import_jobs import (
+    enqueue_import,
+    get_job,
+    get_recent_jobs,
+)
 
-CSV_DESTINATION = 'price.csv'
 templates = Jinja2Templates(directory='src/admin/templates')
 
+JOB_NOT_FOUND = {'detail': 'Задача загрузки не найдена'}
+
+
+def serialize_job(job: object) -> dict:
+    """Данные задачи загрузки для страницы статуса."""
+    return {
+        'id': str(job.id),
+        'file_name': job.file_name,
+        'status': job.status.value,
+        'status_display': str(job.status),
+        'total_rows': job.total_rows,
+        'processed_rows': job.processed_rows,
+        'progress': job.progress,
+        'error': job.error,
+        'report': job.report,
+        'created_at': job.created_at.isoformat(),
+        'finished_at': (
+            job.finished_at.isoformat() if job.finished_at else None
+        ),
+    }
+
 
 class AdminUploadCSVView(BaseView):
     name = 'Загрузка CSV'
@@ -20,28 +43,48 @@ class AdminUploadCSVView(BaseView):
 
     @expose('/upload', methods=['GET', 'POST'])
     async def upload(self, request: Request):
-        if request.method == 'POST':
-            form = await request.form()
-            file: UploadFile = form['file']
-            content = await file.read()
-
-            # Записываем синхронно, но в отдельном потоке
-            def write_file() -> None:
-                with open(CSV_DESTINATION, 'wb') as buffer:
-                    buffer.write(content)
-
-            await anyio.to_thread.run_sync(write_file)
+        async with AsyncSessionLocal() as session:
+            if request.method == 'POST':
+                form = await request.form()
+                file: UploadFile = form['file']
+                job = await enqueue_import(
+                    session, file, remove_missing='remove_missing' in form
+                )
+                return RedirectResponse(
+                    url=request.url_for(
+                        'admin:upload_job', job_id=str(job.id)
+                    ),
+                    status_code=303,
+                )
+            jobs = await get_recent_jobs(session)
 
-            session_gen = get_async_session()
-            session = await anext(session_gen)
-            try:
-                await load_data(session)
-            finally:
-                with contextlib.suppress(StopAsyncIteration):
-                    await anext(session_gen)
-
-            return RedirectResponse(url=request.url.path, status_code=303)
+        return templates.TemplateResponse(
+            'sqladmin/upload_csv.html', {'request': request, 'jobs': jobs}
+        )
 
+    @expose('/upload/jobs/{job_id}', identity='upload_job')
+    async def upload_job(self, request: Request):
+        """Страница статуса задачи, опрашивающая upload_job_status."""
         return templates.TemplateResponse(
-            'sqladmin/upload_csv.html', {'request': request}
+            'sqladmin/import_job.html',
+            {
+                'request': request,
+                'job_id': request.path_params['job_id'],
+                'status_url': request.url_for(
+                    'admin:upload_job_status',
+                    job_id=request.path_params['job_id'],
+                ),
+            },
         )
+
+    @expose('/upload/jobs/{job_id}/status', identity='upload_job_status')
+    async def upload_job_status(self, request: Request):
+        try:
+            job_id = uuid.UUID(request.path_params['job_id'])
+        except ValueError:
+            return JSONResponse(JOB_NOT_FOUND, status_code=404)
+        async with AsyncSessionLocal() as session:
+            job = await get_job(session, job_id)
+        if job is None:
+            return JSONResponse(JOB_NOT_FOUND, status_code=404)
+        return JSONResponse(serialize_job(job))
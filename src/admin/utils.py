@@ -43,3 +43,13 @@ def generate_clickable_formatters(
         )
 
     return formatters
+
+
+def reset_telegram_file_id(data: dict, model: BaseJFModel) -> None:
+    """Сбрасывает file_id медиа в Telegram, если изменилась ссылка.
+
+    Вызывается из on_model_change представлений медиа: по старому
+    file_id бот отправлял бы прежний файл.
+    """
+    if data.get('media_url', model.media_url) != model.media_url:
+        model.telegram_file_id = None
@@ -9,6 +9,7 @@ from src.schemas.discounts import (
     ReadDiscountsSchema,
 )
 from src.schemas.product import FireworkDB
+from src.service.catalog_cache import catalog_cache
 
 router = APIRouter()
 
@@ -21,8 +22,16 @@ router = APIRouter()
 async def get_disctounts(
     session: AsyncSession = Depends(get_async_session),
 ):
-    """Получение всех акций."""
-    return await discounts_crud.get_all_discounts(session)
+    """Получение всех акций.
+
+    Список кешируется на время жизни кеша каталога.
+    """
+    return await catalog_cache.get_or_load(
+        'discounts',
+        {},
+        lambda: discounts_crud.get_all_discounts(session),
+        List[ReadDiscountsSchema],
+    )
 
 
 @router.get(
@@ -35,6 +44,11 @@ async def get_user_address(
     session: AsyncSession = Depends(get_async_session),
 ):
     """Получить все фейерверки связанные с конкретной акцией по её id."""
-    return await discounts_crud.get_fireworks_by_discount_id(
-        session, int(discount_id)
+    return await catalog_cache.get_or_load(
+        'discount_fireworks',
+        {'id': discount_id},
+        lambda: discounts_crud.get_fireworks_by_discount_id(
+            session, int(discount_id)
+        ),
+        List[FireworkDB],
     )
@@ -1,39 +1,138 @@
 import aiohttp
-from fastapi import APIRouter, Depends, HTTPException
+from PIL import Image, UnidentifiedImageError
+from fastapi import APIRouter, Depends, HTTPException, Header, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.api.v1.validators import (
-    check_formatted_media_exists_by_media_id,
-    check_media_exists_by_id,
-)
-from src.crud.media import formatted_media_crud, media_crud
+from src.api.v1.validators import check_media_exists_by_id
+from src.crud.media import PHOTO_MEDIA_TYPE, formatted_media_crud, media_crud
 from src.database.db_dependencies import get_async_session
-from src.schemas.media import FormattedMediaCreate, FormattedMediaDB
+from src.models.media import FormattedMedia
+from src.schemas.media import FormattedMediaDB, MediaDB, MediaFileIdUpdate
+from src.service.blob_storage import BlobNotFoundError
+from src.service.catalog_cache import catalog_cache
+from src.service.images import CONTENT_TYPES
+from src.service.media_gateway import media_gateway
+from src.service.media_variants import generate_variants
 
 router = APIRouter()
 
+# Файл варианта меняется только при пересоздании вариантов, а ETag
+# позволяет проверить его без повторной загрузки.
+FORMATTED_MEDIA_CACHE_CONTROL = 'public, max-age=86400'
+
+
+async def get_formatted_media_or_404(
+    formatted_media_id: int, session: AsyncSession
+) -> FormattedMedia:
+    formatted_media = await formatted_media_crud.get(
+        formatted_media_id, session
+    )
+    if formatted_media is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f'Варианта фото с id={formatted_media_id} не существует!',
+        )
+    return formatted_media
+
 
 @router.post(
     '/converted_media/{media_id}',
-    response_model=FormattedMediaDB,
+    response_model=list[FormattedMediaDB],
     status_code=201,
 )
 async def create_formatted_media(
     media_id: int, session: AsyncSession = Depends(get_async_session)
-) -> FormattedMediaDB:
-    media = await media_crud.get(media_id, session)
+) -> list[FormattedMediaDB]:
+    """Создать (или пересоздать) варианты фото для показа.
+
+    Фото перекодируется в варианты для списка каталога, карточки товара
+    и рассылок (см. src/service/images.py); прежние варианты медиа
+    заменяются.
+    """
     await check_media_exists_by_id(media_id, session)
-    await check_formatted_media_exists_by_media_id(media_id, session)
-    async with aiohttp.ClientSession() as get_media_session:
-        async with get_media_session.get(media.media_url) as response:
-            if response.status != 200:
-                raise HTTPException(
-                    status_code=400, detail='Ошибка при переходе по media_url!'
-                )
-            media_data = await response.read()
-    formatted_media_create_data = FormattedMediaCreate(
-        media_id=media.id, file=media_data
+    media = await media_crud.get(media_id, session, options=())
+    if media.media_type != PHOTO_MEDIA_TYPE:
+        raise HTTPException(
+            status_code=400, detail='Варианты создаются только для фото!'
+        )
+    try:
+        variants = await generate_variants(
+            session, media, media_gateway.get_session()
+        )
+    except (aiohttp.ClientError, KeyError):
+        raise HTTPException(
+            status_code=400, detail='Ошибка при переходе по media_url!'
+        )
+    except (UnidentifiedImageError, Image.DecompressionBombError):
+        raise HTTPException(
+            status_code=400,
+            detail='Файл по media_url не является изображением!',
+        )
+    # Варианты входят в ответы каталога (MediaDB.variants).
+    await catalog_cache.bump_version()
+    return variants
+
+
+@router.get('/formatted_media/{formatted_media_id}')
+async def get_formatted_media_file(
+    formatted_media_id: int,
+    if_none_match: str | None = Header(None),
+    session: AsyncSession = Depends(get_async_session),
+) -> Response:
+    """Файл варианта фото (бот скачивает его для отправки в Telegram)."""
+    formatted_media = await get_formatted_media_or_404(
+        formatted_media_id, session
+    )
+    headers = {
+        'ETag': f'"{formatted_media.sha256}"',
+        'Cache-Control': FORMATTED_MEDIA_CACHE_CONTROL,
+    }
+    if if_none_match == headers['ETag']:
+        return Response(status_code=304, headers=headers)
+    try:
+        content = await formatted_media_crud.read_file(formatted_media)
+    except BlobNotFoundError:
+        raise HTTPException(
+            status_code=404, detail='Файл варианта фото не найден!'
+        )
+    return Response(
+        content,
+        media_type=CONTENT_TYPES[formatted_media.format],
+        headers=headers,
     )
-    return await formatted_media_crud.create(
-        session, formatted_media_create_data
+
+
+@router.patch(
+    '/formatted_media/{formatted_media_id}/telegram_file_id',
+    response_model=FormattedMediaDB,
+)
+async def set_formatted_media_telegram_file_id(
+    formatted_media_id: int,
+    file_id_schema: MediaFileIdUpdate,
+    session: AsyncSession = Depends(get_async_session),
+) -> FormattedMediaDB:
+    """Сохранить file_id варианта фото, загруженного ботом в Telegram."""
+    formatted_media = await get_formatted_media_or_404(
+        formatted_media_id, session
+    )
+    return await formatted_media_crud.set_telegram_file_id(
+        formatted_media, file_id_schema.telegram_file_id, session
+    )
+
+
+@router.patch('/media/{media_id}/telegram_file_id', response_model=MediaDB)
+async def set_media_telegram_file_id(
+    media_id: int,
+    file_id_schema: MediaFileIdUpdate,
+    session: AsyncSession = Depends(get_async_session),
+) -> MediaDB:
+    """Сохранить file_id медиа, загруженного ботом в Telegram.
+
+    Следующие отправки этого медиа бот делает по file_id, без повторной
+    загрузки файла.
+    """
+    await check_media_exists_by_id(media_id, session)
+    media = await media_crud.get(media_id, session)
+    return await media_crud.set_telegram_file_id(
+        media, file_id_schema.telegram_file_id, session
     )
@@ -0,0 +1,43 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.crud.newsletter import newsletter_crud
+from src.database.db_dependencies import get_async_session
+from src.schemas.newsletter import TagLanding
+from src.service.tag_landing import get_tag_landing
+
+router = APIRouter()
+
+
+@router.post(
+    '/newsletters/{newsletter_id}/waves/{wave}/clicks',
+    status_code=status.HTTP_204_NO_CONTENT,
+)
+async def add_newsletter_click(
+    newsletter_id: int,
+    wave: int,
+    session: AsyncSession = Depends(get_async_session),
+) -> None:
+    """Учесть нажатие на кнопку тега в сообщении волны рассылки."""
+    if not await newsletter_crud.add_click(newsletter_id, wave, session):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail='Волна рассылки не найдена',
+        )
+
+
+@router.get(
+    '/newsletters/tag_landing',
+    status_code=status.HTTP_200_OK,
+    response_model=TagLanding,
+)
+async def get_newsletter_tag_landing(
+    tag: str = Query(..., min_length=1),
+    session: AsyncSession = Depends(get_async_session),
+) -> TagLanding:
+    """Страница результатов по тегу из кнопки рассылки.
+
+    Для тегов рассылок страница готовится до отправки, поэтому ответ
+    берется из кеша без запросов к БД.
+    """
+    return await get_tag_landing(session, tag)
@@ -1,17 +1,19 @@
-from typing import Union
+from math import ceil
+from typing import Optional, Union
 
 import aiohttp
 from fastapi import APIRouter, Depends, Query, Request, status
-from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.api.v1.utils import build_next_and_prev_urls
+from src.api.v1.utils import build_cursor_urls, build_next_and_prev_urls
 from src.api.v1.validators import (
     check_category_exists,
     check_firework_exists,
 )
-from src.crud.product import category_crud, firework_crud
+from src.crud.base import CRUDBaseRead
+from src.crud.product import SEARCH_LIMIT, category_crud, firework_crud
 from src.database.db_dependencies import get_async_session
+from src.models.product import Category, Firework
 from src.schemas.filter_shema import FireworkFilterSchema
 from src.schemas.pagination_schema import (
     MAX_PAGINATION_LIMIT,
@@ -26,33 +28,117 @@ from src.schemas.product import (
     CategoryDB,
     FireworkCreate,
     FireworkDB,
+    FireworkSearchResult,
 )
+from src.service.catalog_cache import catalog_cache
+from src.service.media_gateway import is_range_media, media_gateway
+from src.service.media_store import media_store
+from src.service.yandex_disk import is_yandex_disk_url
 
 router = APIRouter()
 
+DEFAULT_CURSOR_ORDER = ['name']
+CURSOR_TITLE = 'Курсор страницы (включает пагинацию по курсору).'
+USE_CURSOR_TITLE = 'Пагинация по курсору вместо offset.'
+WITH_COUNT_TITLE = 'Считать ли количество объектов (в режиме курсора).'
+SEARCH_QUERY_TITLE = 'Поисковый запрос: название, артикул, код, описание.'
+SEARCH_QUERY_MIN_LENGTH = 2
+SEARCH_QUERY_MAX_LENGTH = 100
 
-@router.get('/proxy')
-async def proxy(url: str):
-    api_url = 'https://cloud-api.yandex.net/v1/disk/public/resources/download'
-    async with aiohttp.ClientSession() as session:
-        async with session.get(api_url, params={'public_key': url}) as r:
-            if r.status != 200:
-                return {'error': 'Failed to get direct link'}
-            href = (await r.json()).get('href')
 
-        if not href:
-            return {'error': 'No href returned'}
+async def get_cursor_page(
+    crud: CRUDBaseRead,
+    objects_key: str,
+    object_schema: type,
+    request: Request,
+    session: AsyncSession,
+    cursor: Optional[str],
+    limit: int,
+    with_count: bool,
+    filter_schema: Optional[FireworkFilterSchema] = None,
+) -> dict:
+    """Собирает ответ со страницей объектов, выбранной по курсору.
+
+    Страница и количество объектов берутся из кеша каталога.
+    Количество не считается, если клиент передал with_count=false.
+    """
+    objects, next_cursor, previous_cursor = await catalog_cache.get_or_load(
+        f'{objects_key}:cursor',
+        {'filter': filter_schema, 'cursor': cursor, 'limit': limit},
+        lambda: crud.get_multi_by_cursor(
+            session,
+            filter_schema=filter_schema,
+            limit=limit,
+            cursor=cursor,
+            order_by=DEFAULT_CURSOR_ORDER,
+        ),
+        tuple[list[object_schema], Optional[str], Optional[str]],
+    )
+    previous_page_url, next_page_url = build_cursor_urls(
+        previous_cursor, next_cursor, str(request.url)
+    )
+    objects_count = (
+        await catalog_cache.get_or_load(
+            f'{objects_key}:count',
+            {'filter': filter_schema},
+            lambda: crud.get_filtered_count(session, filter_schema),
+            int,
+        )
+        if with_count
+        else None
+    )
+    return {
+        objects_key: objects,
+        'next_cursor': next_cursor,
+        'previous_cursor': previous_cursor,
+        'next_page_url': next_page_url,
+        'previous_page_url': previous_page_url,
+        'pages_count': (
+            ceil(objects_count / limit) if objects_count is not None else None
+        ),
+        f'{objects_key}_count': objects_count,
+    }
+
 
-        async with session.get(href) as media_resp:
-            if media_resp.status != 200:
-                return {'error': 'Failed to fetch media'}
+async def get_fireworks_page(
+    session: AsyncSession,
+    filter_schema: Optional[FireworkFilterSchema],
+    offset: int,
+    limit: int,
+) -> tuple[list[FireworkDB], int]:
+    """Страница фейерверков по offset из кеша каталога."""
+    return await catalog_cache.get_or_load(
+        'fireworks',
+        {'filter': filter_schema, 'offset': offset, 'limit': limit},
+        lambda: firework_crud.get_multi(
+            session,
+            pagination_schema=PaginationSchema(offset=offset, limit=limit),
+            filter_schema=filter_schema,
+        ),
+        tuple[list[FireworkDB], int],
+    )
+
+
+@router.get('/proxy')
+async def proxy(url: str, request: Request):
+    """Медиа товара с Яндекс Диска (см. src/service/media_gateway.py).
 
-            return StreamingResponse(
-                media_resp.content,
-                media_type=media_resp.headers.get(
-                    'Content-Type', 'application/octet-stream'
-                ),
-            )
+    Файл из хранилища медиа отдается с ETag и Cache-Control (за nginx -
+    по X-Accel-Redirect); видео, которого еще нет в хранилище,
+    передается от источника по частям с учетом Range.
+    """
+    if not is_yandex_disk_url(url):
+        return {'error': 'Failed to get direct link'}
+    try:
+        stored = await media_store.get(url)
+        if stored is None and is_range_media(url):
+            return await media_gateway.stream(request, url)
+        if stored is None:
+            # Файл скачивается один раз и дальше берется из хранилища.
+            stored = await media_gateway.fetch(url)
+    except (aiohttp.ClientError, KeyError):
+        return {'error': 'Failed to fetch media'}
+    return media_gateway.build_response(request, stored)
 
 
 @router.get(
@@ -67,14 +153,34 @@ async def get_сategories(
     limit: int = Query(
         PAGINATION_LIMIT, ge=MIN_PAGINATION_LIMIT, le=MAX_PAGINATION_LIMIT
     ),
+    cursor: Optional[str] = Query(None, title=CURSOR_TITLE),
+    use_cursor: bool = Query(False, title=USE_CURSOR_TITLE),
+    with_count: bool = Query(True, title=WITH_COUNT_TITLE),
 ) -> dict[str, Union[list[CategoryDB], str, int, None]]:
     """Получить все категории фейерверков.
 
     Доступен всем пользователям.
+    С параметром use_cursor (или cursor) страницы отдаются по курсору.
     """
-    pagination_schema = PaginationSchema(offset=offset, limit=limit)
-    categories, categories_count = await category_crud.get_multi(
-        session, pagination_schema=pagination_schema
+    if use_cursor or cursor:
+        return await get_cursor_page(
+            category_crud,
+            'categories',
+            CategoryDB,
+            request,
+            session,
+            cursor,
+            limit,
+            with_count,
+        )
+    categories, categories_count = await catalog_cache.get_or_load(
+        'categories',
+        {'offset': offset, 'limit': limit},
+        lambda: category_crud.get_multi(
+            session,
+            pagination_schema=PaginationSchema(offset=offset, limit=limit),
+        ),
+        tuple[list[CategoryDB], int],
     )
     # categories_count = await category_crud.get_count(session)
     previous_page_url, next_page_url, pages_count = build_next_and_prev_urls(
@@ -118,16 +224,29 @@ async def get_fireworks(
     limit: int = Query(
         PAGINATION_LIMIT, ge=MIN_PAGINATION_LIMIT, le=MAX_PAGINATION_LIMIT
     ),
+    cursor: Optional[str] = Query(None, title=CURSOR_TITLE),
+    use_cursor: bool = Query(False, title=USE_CURSOR_TITLE),
+    with_count: bool = Query(True, title=WITH_COUNT_TITLE),
 ) -> dict[str, Union[list[FireworkDB], str, int, None]]:
     """Получить фейерверки.
 
     Доступен всем пользователям.
+    С параметром use_cursor (или cursor) страницы отдаются по курсору.
     """
-    pagination_schema = PaginationSchema(offset=offset, limit=limit)
-    fireworks, fireworks_count = await firework_crud.get_multi(
-        session,
-        pagination_schema=pagination_schema,
-        filter_schema=filter_schema,
+    if use_cursor or cursor:
+        return await get_cursor_page(
+            firework_crud,
+            'fireworks',
+            FireworkDB,
+            request,
+            session,
+            cursor,
+            limit,
+            with_count,
+            filter_schema=filter_schema,
+        )
+    fireworks, fireworks_count = await get_fireworks_page(
+        session, filter_schema, offset, limit
     )
     # fireworks_count = await firework_crud.get_count(session)
     previous_page_url, next_page_url, pages_count = build_next_and_prev_urls(
@@ -142,6 +261,40 @@ async def get_fireworks(
     )
 
 
+@router.post(
+    '/fireworks/search',
+    status_code=status.HTTP_200_OK,
+    response_model=list[FireworkSearchResult],
+)
+async def search_fireworks(
+    session: AsyncSession = Depends(get_async_session),
+    filter_schema: FireworkFilterSchema = None,
+    query: str = Query(
+        ...,
+        min_length=SEARCH_QUERY_MIN_LENGTH,
+        max_length=SEARCH_QUERY_MAX_LENGTH,
+        title=SEARCH_QUERY_TITLE,
+    ),
+    limit: int = Query(
+        SEARCH_LIMIT, ge=MIN_PAGINATION_LIMIT, le=MAX_PAGINATION_LIMIT
+    ),
+) -> list[FireworkSearchResult]:
+    """Поиск фейерверков с учетом словоформ и опечаток.
+
+    Доступен всем пользователям. Результаты отсортированы по
+    релевантности, совпадения в названии и описании выделены <b></b>.
+    """
+    query = ' '.join(query.split())
+    return await catalog_cache.get_or_load(
+        'fireworks:search',
+        {'query': query, 'filter': filter_schema, 'limit': limit},
+        lambda: firework_crud.search_fireworks(
+            session, query, filter_schema=filter_schema, limit=limit
+        ),
+        list[FireworkSearchResult],
+    )
+
+
 @router.get(
     '/fireworks/by_category/{category_id}',
     status_code=status.HTTP_200_OK,
@@ -155,15 +308,32 @@ async def get_fireworks_by_category_name(
     limit: int = Query(
         PAGINATION_LIMIT, ge=MIN_PAGINATION_LIMIT, le=MAX_PAGINATION_LIMIT
     ),
+    cursor: Optional[str] = Query(None, title=CURSOR_TITLE),
+    use_cursor: bool = Query(False, title=USE_CURSOR_TITLE),
+    with_count: bool = Query(True, title=WITH_COUNT_TITLE),
 ):
-    await check_category_exists(category_id, session)
-    category = await category_crud.get(category_id, session)
-    pagination_schema = PaginationSchema(offset=offset, limit=limit)
+    async def load_category() -> Category:
+        await check_category_exists(category_id, session)
+        return await category_crud.get(category_id, session)
+
+    category = await catalog_cache.get_or_load(
+        'category', {'id': category_id}, load_category, CategoryDB
+    )
     filter_schema = FireworkFilterSchema(categories=[category.name])
-    fireworks, fireworks_count = await firework_crud.get_multi(
-        session,
-        pagination_schema=pagination_schema,
-        filter_schema=filter_schema,
+    if use_cursor or cursor:
+        return await get_cursor_page(
+            firework_crud,
+            'fireworks',
+            FireworkDB,
+            request,
+            session,
+            cursor,
+            limit,
+            with_count,
+            filter_schema=filter_schema,
+        )
+    fireworks, fireworks_count = await get_fireworks_page(
+        session, filter_schema, offset, limit
     )
     # fireworks_count = len(fireworks)
     previous_page_url, next_page_url, pages_count = build_next_and_prev_urls(
@@ -191,7 +361,8 @@ async def create_firework(
 
     Создает новый фейерверк.
     """
-    return await firework_crud.create(firework_schema, session)
+    firework = await firework_crud.create(firework_schema, session)
+    return await firework_crud.get(firework.id, session)
 
 
 @router.get(
@@ -207,5 +378,11 @@ async def get_firework_by_id(
 
     Доступен всем пользователям.
     """
-    await check_firework_exists(firework_id, session)
-    return await firework_crud.get(firework_id, session)
+
+    async def load_firework() -> Firework:
+        await check_firework_exists(firework_id, session)
+        return await firework_crud.get(firework_id, session)
+
+    return await catalog_cache.get_or_load(
+        'firework', {'id': firework_id}, load_firework, FireworkDB
+    )
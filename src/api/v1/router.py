@@ -8,6 +8,7 @@ from src.api.v1.endpoints import (
     discount_router,
     favorite_router,
     media_router,
+    newsletter_router,
     order_router,
     product_router,
     user_router,
@@ -25,3 +26,4 @@ main_router.include_router(favorite_router, tags=['Избранные'])
 main_router.include_router(bot_info_router, tags=['Информация о боте'])
 main_router.include_router(custom_admin_router, tags=['Кастомная админка'])
 main_router.include_router(media_router, tags=['Медиа'])
+main_router.include_router(newsletter_router, tags=['Рассылки'])
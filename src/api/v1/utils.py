@@ -40,3 +40,34 @@ def build_next_and_prev_urls(
         else None
     )
     return previous_page_url, next_page_url, ceil(objects_count / limit)
+
+
+def build_cursor_urls(
+    previous_cursor: str | None, next_cursor: str | None, current_url: str
+) -> tuple[str | None, str | None]:
+    """Строит ссылки на соседние страницы выборки по курсору.
+
+    Аргументы:
+        previous_cursor (str | None): курсор предыдущей страницы.
+        next_cursor (str | None): курсор следующей страницы.
+        current_url (str): текущий url-адрес.
+
+    Возвращаемое значение:
+        tuple[str | None, str | None]: ссылки на предыдущую
+            и следующую страницы.
+    """
+    parsed_url = urlparse(current_url)
+    query_params = parse_qs(parsed_url.query)
+    query_params.pop('offset', None)
+    urls = []
+    for cursor in (previous_cursor, next_cursor):
+        if cursor is None:
+            urls.append(None)
+            continue
+        query_params['cursor'] = [cursor]
+        urls.append(
+            urlunparse(
+                parsed_url._replace(query=urlencode(query_params, doseq=True))
+            )
+        )
+    return tuple(urls)
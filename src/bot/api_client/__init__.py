@@ -0,0 +1,12 @@
+from src.bot.api_client.client import APIClient, APIClientError, api_client
+from src.bot.api_client.decoder import decode
+from src.bot.api_client.metrics import APICallMetrics, api_metrics
+
+__all__ = [
+    'APICallMetrics',
+    'APIClient',
+    'APIClientError',
+    'api_client',
+    'api_metrics',
+    'decode',
+]
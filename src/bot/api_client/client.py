@@ -0,0 +1,330 @@
+"""Типизированный клиент API для обработчиков бота.
+
+Все запросы идут через общий пул src.bot.http_client, ответы
+декодируются в схемы src/schemas, длительность каждого вызова
+попадает в api_metrics.
+"""
+
+from time import perf_counter
+from typing import Any, TypeVar
+
+from src.bot.api_client.decoder import decode
+from src.bot.api_client.metrics import APICallMetrics, api_metrics
+from src.bot.http_client import APIHttpClient, api_http_client
+from src.schemas.bot_info import ReadBotInfoSchema
+from src.schemas.cart import (
+    CreateCartSchema,
+    MessageResponse,
+    ReadCartSchema,
+    UserIdentificationSchema,
+)
+from src.schemas.discounts import ReadDiscountsSchema
+from src.schemas.favourite import FavoriteDBCreate, FavoriteDBGet
+from src.schemas.filter_shema import FireworkFilterSchema
+from src.schemas.media import (
+    FormattedMediaDB,
+    MediaDB,
+    MediaFileIdUpdate,
+)
+from src.schemas.newsletter import TagLanding
+from src.schemas.order import ReadOrderSchema
+from src.schemas.pagination_schema import PAGINATION_LIMIT, PAGINATION_OFFSET
+from src.schemas.product import (
+    CategoryListSchema,
+    FireworkDB,
+    FireworkListSchema,
+    FireworkSearchResult,
+)
+
+SchemaType = TypeVar('SchemaType')
+
+API_ERROR_MESSAGE = 'API вернул {status}: {detail}'
+
+
+class APIClientError(Exception):
+    """Ответ API с неожиданным статусом."""
+
+    def __init__(self, status: int, detail: str) -> None:
+        """Сохраняет статус и тело ответа API."""
+        self.status = status
+        self.detail = detail
+        super().__init__(
+            API_ERROR_MESSAGE.format(status=status, detail=detail)
+        )
+
+
+class APIClient:
+    """Методы API, которыми пользуется бот."""
+
+    def __init__(
+        self,
+        http_client: APIHttpClient = api_http_client,
+        metrics: APICallMetrics = api_metrics,
+    ) -> None:
+        """Привязывает клиент к пулу соединений и сборщику метрик."""
+        self.http_client = http_client
+        self.metrics = metrics
+
+    async def _call(
+        self,
+        name: str,
+        method: str,
+        url: str,
+        schema: type[SchemaType] | None,
+        expected_status: int = 200,
+        **kwargs: Any,
+    ) -> SchemaType | None:
+        """Выполняет запрос, проверяет статус и декодирует ответ.
+
+        Аргументы:
+            1. name (str): имя вызова для метрик.
+            2. method (str): HTTP-метод.
+            3. url (str): путь относительно API_BASE_URL.
+            4. schema: схема ответа; None, если тело не нужно.
+            5. expected_status (int): статус успешного ответа.
+        """
+        started = perf_counter()
+        error = True
+        try:
+            async with self.http_client.request(
+                method, url, **kwargs
+            ) as response:
+                body = await response.read()
+                if response.status != expected_status:
+                    raise APIClientError(
+                        response.status, body.decode(errors='replace')
+                    )
+                result = decode(schema, body) if schema else None
+            error = False
+            return result
+        finally:
+            self.metrics.observe(name, perf_counter() - started, error)
+
+    @staticmethod
+    def _page_params(offset: int, limit: int, cursor: str | None) -> dict:
+        if cursor:
+            return dict(cursor=cursor, limit=limit, with_count='false')
+        return dict(offset=offset, limit=limit)
+
+    @staticmethod
+    def _telegram_body(telegram_id: int) -> dict:
+        return UserIdentificationSchema(telegram_id=telegram_id).model_dump()
+
+    async def get_fireworks(
+        self,
+        filter_schema: FireworkFilterSchema | None = None,
+        offset: int = PAGINATION_OFFSET,
+        limit: int = PAGINATION_LIMIT,
+        cursor: str | None = None,
+    ) -> FireworkListSchema:
+        """Страница фейерверков с фильтрами.
+
+        С курсором страница выбирается по курсору, offset не учитывается.
+        """
+        return await self._call(
+            'get_fireworks',
+            'POST',
+            '/fireworks',
+            FireworkListSchema,
+            params=self._page_params(offset, limit, cursor),
+            json=filter_schema.model_dump() if filter_schema else None,
+        )
+
+    async def search_fireworks(
+        self,
+        query: str,
+        filter_schema: FireworkFilterSchema | None = None,
+        limit: int = PAGINATION_LIMIT,
+    ) -> list[FireworkSearchResult]:
+        """Полнотекстовый поиск фейерверков, самые релевантные первыми."""
+        return await self._call(
+            'search_fireworks',
+            'POST',
+            '/fireworks/search',
+            list[FireworkSearchResult],
+            params=dict(query=query, limit=limit),
+            json=filter_schema.model_dump() if filter_schema else None,
+        )
+
+    async def get_fireworks_by_category(
+        self,
+        category_id: int,
+        offset: int = PAGINATION_OFFSET,
+        limit: int = PAGINATION_LIMIT,
+    ) -> FireworkListSchema:
+        """Страница фейерверков одной категории."""
+        return await self._call(
+            'get_fireworks_by_category',
+            'GET',
+            f'/fireworks/by_category/{category_id}',
+            FireworkListSchema,
+            params=dict(offset=offset, limit=limit),
+        )
+
+    async def get_firework(self, firework_id: int) -> FireworkDB:
+        """Карточка одного фейерверка."""
+        return await self._call(
+            'get_firework', 'GET', f'/fireworks/{firework_id}', FireworkDB
+        )
+
+    async def get_categories(
+        self,
+        offset: int = PAGINATION_OFFSET,
+        limit: int = PAGINATION_LIMIT,
+        cursor: str | None = None,
+    ) -> CategoryListSchema:
+        """Страница категорий."""
+        return await self._call(
+            'get_categories',
+            'GET',
+            '/categories',
+            CategoryListSchema,
+            params=self._page_params(offset, limit, cursor),
+        )
+
+    async def get_cart(self, telegram_id: int) -> list[ReadCartSchema]:
+        """Содержимое корзины пользователя."""
+        return await self._call(
+            'get_cart',
+            'POST',
+            '/user/cart/me',
+            list[ReadCartSchema],
+            json=self._telegram_body(telegram_id),
+        )
+
+    async def add_to_cart(
+        self, telegram_id: int, firework_id: int, amount: int = 1
+    ) -> MessageResponse:
+        """Добавляет товар в корзину пользователя."""
+        return await self._call(
+            'add_to_cart',
+            'POST',
+            '/user/cart',
+            MessageResponse,
+            expected_status=201,
+            json=dict(
+                create_data=CreateCartSchema(
+                    amount=amount, firework_id=firework_id
+                ).model_dump(),
+                user_ident=self._telegram_body(telegram_id),
+            ),
+        )
+
+    async def get_favorites(self, telegram_id: int) -> list[FavoriteDBGet]:
+        """Избранные фейерверки пользователя."""
+        return await self._call(
+            'get_favorites',
+            'POST',
+            '/favorites/me',
+            list[FavoriteDBGet],
+            json=self._telegram_body(telegram_id),
+        )
+
+    async def add_to_favorite(
+        self, telegram_id: int, firework_id: int
+    ) -> FavoriteDBCreate:
+        """Добавляет фейерверк в избранное."""
+        return await self._call(
+            'add_to_favorite',
+            'POST',
+            '/favorites',
+            FavoriteDBCreate,
+            expected_status=201,
+            json=dict(telegram_id=telegram_id, firework_id=firework_id),
+        )
+
+    async def create_order(self, telegram_id: int) -> ReadOrderSchema:
+        """Оформляет заказ из корзины пользователя."""
+        return await self._call(
+            'create_order',
+            'POST',
+            '/orders/',
+            ReadOrderSchema,
+            json=self._telegram_body(telegram_id),
+        )
+
+    async def get_orders(self, telegram_id: int) -> list[ReadOrderSchema]:
+        """Заказы пользователя."""
+        return await self._call(
+            'get_orders',
+            'POST',
+            '/orders/me',
+            list[ReadOrderSchema],
+            json=self._telegram_body(telegram_id),
+        )
+
+    async def get_discounts(self) -> list[ReadDiscountsSchema]:
+        """Действующие акции."""
+        return await self._call(
+            'get_discounts', 'GET', '/discounts', list[ReadDiscountsSchema]
+        )
+
+    async def get_discount_fireworks(
+        self, discount_id: int
+    ) -> list[FireworkDB]:
+        """Фейерверки, участвующие в акции."""
+        return await self._call(
+            'get_discount_fireworks',
+            'GET',
+            f'/discounts/{discount_id}',
+            list[FireworkDB],
+        )
+
+    async def get_bot_info(self) -> ReadBotInfoSchema:
+        """Информация о боте и компании."""
+        return await self._call(
+            'get_bot_info', 'GET', '/botinfo', ReadBotInfoSchema
+        )
+
+    async def set_media_file_id(
+        self, media_id: int, telegram_file_id: str
+    ) -> MediaDB:
+        """Сохраняет file_id медиа товара, загруженного в Telegram."""
+        return await self._call(
+            'set_media_file_id',
+            'PATCH',
+            f'/media/{media_id}/telegram_file_id',
+            MediaDB,
+            json=MediaFileIdUpdate(
+                telegram_file_id=telegram_file_id
+            ).model_dump(),
+        )
+
+    async def set_formatted_media_file_id(
+        self, formatted_media_id: int, telegram_file_id: str
+    ) -> FormattedMediaDB:
+        """Сохраняет file_id варианта фото, загруженного в Telegram."""
+        return await self._call(
+            'set_formatted_media_file_id',
+            'PATCH',
+            f'/formatted_media/{formatted_media_id}/telegram_file_id',
+            FormattedMediaDB,
+            json=MediaFileIdUpdate(
+                telegram_file_id=telegram_file_id
+            ).model_dump(),
+        )
+
+    async def add_newsletter_click(
+        self, newsletter_id: int, wave: int
+    ) -> None:
+        """Учитывает нажатие на кнопку тега в рассылке."""
+        await self._call(
+            'add_newsletter_click',
+            'POST',
+            f'/newsletters/{newsletter_id}/waves/{wave}/clicks',
+            None,
+            expected_status=204,
+        )
+
+    async def get_tag_landing(self, tag: str) -> TagLanding:
+        """Готовая страница результатов по тегу из кнопки рассылки."""
+        return await self._call(
+            'get_tag_landing',
+            'GET',
+            '/newsletters/tag_landing',
+            TagLanding,
+            params=dict(tag=tag),
+        )
+
+
+api_client = APIClient()
@@ -0,0 +1,29 @@
+"""Декодирование ответов API в pydantic-схемы из src/schemas.
+
+Ответ валидируется сразу из байтов через TypeAdapter.validate_json:
+без промежуточного json.loads и словарей. Адаптеры строятся один раз
+на тип и переиспользуются между запросами.
+"""
+
+from functools import lru_cache
+from typing import Any, TypeVar
+
+from pydantic import TypeAdapter
+
+SchemaType = TypeVar('SchemaType')
+
+
+@lru_cache(maxsize=None)
+def get_adapter(schema: Any) -> TypeAdapter:
+    """Возвращает закешированный TypeAdapter для схемы или типа."""
+    return TypeAdapter(schema)
+
+
+def decode(schema: type[SchemaType], raw: bytes | str) -> SchemaType:
+    """Преобразует тело ответа в объект схемы.
+
+    Аргументы:
+        1. schema: схема или тип (например, list[ReadCartSchema]).
+        2. raw (bytes | str): тело ответа в формате JSON.
+    """
+    return get_adapter(schema).validate_json(raw)
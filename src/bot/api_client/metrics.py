@@ -0,0 +1,71 @@
+"""Метрики задержек вызовов API из бота."""
+
+import logging
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+CALL_LOG_MESSAGE = 'API %s: %.1f мс%s'
+
+
+@dataclass
+class CallStats:
+    """Накопленная статистика одного метода клиента."""
+
+    count: int = 0
+    errors: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+    last_seconds: float = 0.0
+
+    @property
+    def avg_seconds(self) -> float:
+        return self.total_seconds / self.count if self.count else 0.0
+
+
+class APICallMetrics:
+    """Сборщик задержек по именам методов клиента."""
+
+    def __init__(self) -> None:
+        """Создает пустую статистику."""
+        self._stats: dict[str, CallStats] = {}
+
+    def observe(self, name: str, seconds: float, error: bool) -> None:
+        """Учитывает один вызов метода.
+
+        Аргументы:
+            1. name (str): имя метода клиента.
+            2. seconds (float): длительность вызова.
+            3. error (bool): завершился ли вызов ошибкой.
+        """
+        stats = self._stats.setdefault(name, CallStats())
+        stats.count += 1
+        stats.errors += int(error)
+        stats.total_seconds += seconds
+        stats.last_seconds = seconds
+        stats.max_seconds = max(stats.max_seconds, seconds)
+        logger.debug(
+            CALL_LOG_MESSAGE,
+            name,
+            seconds * 1000,
+            ' (ошибка)' if error else '',
+        )
+
+    def snapshot(self) -> dict[str, dict[str, float]]:
+        """Возвращает текущую статистику по всем методам."""
+        return {
+            name: dict(
+                count=stats.count,
+                errors=stats.errors,
+                avg_ms=stats.avg_seconds * 1000,
+                max_ms=stats.max_seconds * 1000,
+                last_ms=stats.last_seconds * 1000,
+            )
+            for name, stats in self._stats.items()
+        }
+
+    def reset(self) -> None:
+        self._stats.clear()
+
+
+api_metrics = APICallMetrics()
@@ -6,3 +6,16 @@ load_dotenv()
 
 
 TOKEN = os.getenv('TELEGRAM_BOT_TOKEN')
+
+# Настройки пула соединений бота с API.
+API_BASE_URL = os.getenv('API_BASE_URL', 'http://nginx:8000')
+API_POOL_LIMIT = int(os.getenv('API_POOL_LIMIT', '100'))
+API_POOL_LIMIT_PER_HOST = int(os.getenv('API_POOL_LIMIT_PER_HOST', '30'))
+API_KEEPALIVE_TIMEOUT = float(os.getenv('API_KEEPALIVE_TIMEOUT', '30'))
+API_REQUEST_TIMEOUT = float(os.getenv('API_REQUEST_TIMEOUT', '15'))
+API_CONNECT_TIMEOUT = float(os.getenv('API_CONNECT_TIMEOUT', '3'))
+API_RETRIES = int(os.getenv('API_RETRIES', '2'))
+API_RETRY_BACKOFF = float(os.getenv('API_RETRY_BACKOFF', '0.2'))
+
+# Сколько секунд бот хранит страницу тега из кнопки рассылки.
+TAG_LANDING_CACHE_TTL = float(os.getenv('TAG_LANDING_CACHE_TTL', '300'))
@@ -1,8 +1,9 @@
-from aiohttp import ClientSession
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup, Update
 from telegram.ext import ContextTypes
 from telegram.helpers import escape_markdown
 
+from src.bot.api_client import APIClientError, api_client
+
 BOT_INFO_CARD = """
 🤖 *Информация о боте* 🤖
 ──────────────────────
@@ -16,9 +17,6 @@ BOT_INFO_CARD = """
 ──────────────────────
 """
 
-# API_URL = 'http://app:8000'
-API_URL = 'http://nginx:8000'
-
 
 def build_bot_info_card(fields: dict) -> str:
     """Формирует карточку информации о боте."""
@@ -40,17 +38,14 @@ async def show_bot_info(update: Update, context: ContextTypes.DEFAULT_TYPE):
     query = update.callback_query
     await query.answer()
 
-    async with ClientSession() as session:
-        async with session.get(f'{API_URL}/botinfo') as response:
-            data = await response.json()
-            if response.status == 200:
-                data = await response.json()
-            else:
-                data = {
-                    'bot_info': 'Информация временно недоступна',
-                    'about_company': 'Информация временно недоступна',
-                    'contacts': 'Информация временно недоступна',
-                }
+    try:
+        data = (await api_client.get_bot_info()).model_dump()
+    except APIClientError:
+        data = {
+            'bot_info': 'Информация временно недоступна',
+            'about_company': 'Информация временно недоступна',
+            'contacts': 'Информация временно недоступна',
+        }
 
     # Создаем клавиатуру с кнопкой возврата
     keyboard = [
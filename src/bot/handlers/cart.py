@@ -1,7 +1,6 @@
 import logging
 from enum import Enum
 
-import aiohttp
 from telegram import (
     InlineKeyboardButton,
     InlineKeyboardMarkup,
@@ -17,12 +16,12 @@ from telegram.ext import (
     filters,
 )
 
+from src.bot.api_client import api_client
 from src.bot.handlers.users import TelegramUserManager
+from src.bot.http_client import api_http_client
 
 logging.basicConfig(level=logging.INFO)
 
-API_BASE_URL = 'http://nginx:8000'
-
 
 class CartState(Enum):
     CHANGE_QUANTITY = 1
@@ -35,13 +34,12 @@ async def send_request(method: str, url: str, data: dict = None) -> dict:
     """Универсальная функция для отправки запросов на сервер."""
     method = method.lower()
     try:
-        async with aiohttp.ClientSession() as session:
-            async with getattr(session, method)(url, json=data) as response:
-                if response.ok:
-                    return await response.json()
-                error_message = await response.text()
-                logging.error(f'Ошибка запроса: {error_message}')
-                return {'error': error_message}
+        async with api_http_client.request(method, url, json=data) as response:
+            if response.ok:
+                return await response.json()
+            error_message = await response.text()
+            logging.error(f'Ошибка запроса: {error_message}')
+            return {'error': error_message}
     except Exception as e:
         logging.error(f'Ошибка соединения: {e}')
         return {'error': 'Ошибка соединения с сервером'}
@@ -52,21 +50,19 @@ async def checkout(update: Update, context: CallbackContext) -> None:
     query = update.callback_query
     await query.answer()
 
-    user_id = str(update.effective_user.id)
     await delete_cart_messages(update, context)
 
-    data = await send_request(
-        'post', f'{API_BASE_URL}/orders', {'telegram_id': user_id}
-    )
-
-    if 'error' not in data:
+    try:
+        await api_client.create_order(update.effective_user.id)
+    except Exception as e:
+        logging.error(f'Ошибка оформления заказа: {e}')
         await query.message.reply_text(
-            '✅ Ваш заказ успешно оформлен! Спасибо за покупку.'
+            '❌ Произошла ошибка при оформлении заказа.'
+            'Пожалуйста, попробуйте снова.'
         )
     else:
         await query.message.reply_text(
-            '❌ Произошла ошибка при оформлении заказа.'
-            'Пожалуйста, попробуйте снова.'
+            '✅ Ваш заказ успешно оформлен! Спасибо за покупку.'
         )
 
 
@@ -74,18 +70,16 @@ async def view_cart(update: Update, context: CallbackContext) -> None:
     message = (
         update.message if update.message else update.callback_query.message
     )
-    user_id = str(update.effective_user.id)
     await delete_cart_messages(update, context)
-    data = await send_request(
-        'post', f'{API_BASE_URL}/user/cart/me', {'telegram_id': user_id}
-    )
-    if 'error' in data:
+    try:
+        cart = await api_client.get_cart(update.effective_user.id)
+    except Exception as e:
         await message.reply_text(
-            f'❌ Ошибка при получении данных корзины: {data["error"]}'
+            f'❌ Ошибка при получении данных корзины: {e}'
         )
         return
 
-    cart_items = data if isinstance(data, list) else data.get('items', [])
+    cart_items = [item.model_dump(mode='json') for item in cart]
     if not cart_items:
         await message.reply_text('Ваша корзина пуста.')
         return
@@ -165,7 +159,7 @@ async def remove_item(
 
     await send_request(
         'delete',
-        f'{API_BASE_URL}/user/cart/{item_id}',
+        f'/user/cart/{item_id}',
         {'telegram_id': user_id},
     )
     await query.message.reply_text(
@@ -181,9 +175,7 @@ async def clear_cart_handler(update: Update, context: CallbackContext) -> None:
     user_id = str(update.effective_user.id)
     await delete_cart_messages(update, context)
 
-    await send_request(
-        'delete', f'{API_BASE_URL}/user/cart/', {'telegram_id': user_id}
-    )
+    await send_request('delete', '/user/cart/', {'telegram_id': user_id})
     await query.message.reply_text('✅ Корзина успешно очищена!')
     await view_cart(update, context)
 
@@ -241,7 +233,7 @@ async def handle_new_quantity(update: Update, context: CallbackContext) -> int:
     user_id = str(update.effective_user.id)
     await send_request(
         'patch',
-        f'{API_BASE_URL}/user/cart/{item_id}',
+        f'/user/cart/{item_id}',
         {
             'update_data': {'telegram_id': user_id, 'amount': new_amount},
             'user_ident': {'telegram_id': user_id},
@@ -1,18 +1,15 @@
 """Файл с обработчиками кнопок для каталога."""
 
-import os
-import ssl
-import tempfile
+import logging
 from http import HTTPStatus
+from types import SimpleNamespace
 from typing import Any, Callable, Union
 
 import aiohttp
-import certifi
 from telegram import (
     CallbackQuery,
     InlineKeyboardButton,
     InlineKeyboardMarkup,
-    InputMediaPhoto,
     Message,
     Update,
 )
@@ -25,11 +22,22 @@ from telegram.ext import (
     filters,
 )
 
+from src.bot.api_client import APIClientError, api_client
 from src.bot.bot_messages import build_firework_card
+from src.bot.config import API_BASE_URL
+from src.bot.http_client import api_http_client
 from src.bot.utils import croling_content
-from src.schemas.cart import UserIdentificationSchema
+from src.service.images import CARD, DETAIL
+from src.service.telegram_media import PHOTO, MediaGroupSender, pick_variant
+from src.service.yandex_disk import is_yandex_disk_url
+
+logger = logging.getLogger(__name__)
 
 TEXT_FILTER = filters.TEXT & ~filters.COMMAND
+FORMATTED_MEDIA_URL = (
+    API_BASE_URL.rstrip('/')
+    + '/formatted_media/{formatted_media_id}?sha256={sha256}'
+)
 
 (
     NAME,
@@ -118,9 +126,17 @@ EMPTY_TAGS_MESSAGE = 'Для товара теги не указаны'
 EMPTY_PACKING_MATERIAL_MESSAGE = 'Материал упаковки не указан'
 EMPTY_DISCOUNS_MESSAGE = 'Скоро появятся 🎆'
 
-PRODUCT_PAGINATE_CALLBACK_DATA = 'pg-pr_{url}'
-CATEGORY_PAGINATE_CALLBACK_DATA = 'pg-cat_{url}'
-PRODUCT_FILTER_PAGINATE_CALLBACK_DATA = 'pg-pr-filter_{url}'
+# В callback_data кнопок пагинации передается короткий курсор API:
+# Telegram ограничивает callback_data 64 байтами.
+PRODUCT_PAGINATE_CALLBACK_DATA = 'pg-pr_{cursor}'
+CATEGORY_PAGINATE_CALLBACK_DATA = 'pg-cat_{cursor}'
+PRODUCT_FILTER_PAGINATE_CALLBACK_DATA = 'pg-pr-filter_{cursor}'
+CATEGORY_PRODUCTS_PAGINATE_CALLBACK_DATA = 'pg-pr-cat_{category_id}:{{cursor}}'
+
+FIREWORKS_URL = '/fireworks'
+CATEGORIES_URL = '/categories'
+CATEGORY_FIREWORKS_URL = '/fireworks/by_category/{category_id}'
+CURSOR_PAGINATION_PARAMS = {'use_cursor': 'true', 'with_count': 'false'}
 
 CLIENT_CONNECTION_ERROR = '❗Ошибка соединения❗'
 ADD_TO_CART_ERROR = 'Ошибка добавления товара в корзину ❗'
@@ -196,7 +212,33 @@ main_menu_back_button = InlineKeyboardButton(
     MAIN_MENU_BACK_MESSAGE, callback_data=MAIN_MENU_CALLBACK
 )
 
-ssl_context = ssl.create_default_context(cafile=certifi.where())
+
+def build_cursor_params(cursor: str | None) -> dict:
+    """Query-параметры запроса страницы по курсору."""
+    if cursor:
+        return dict(CURSOR_PAGINATION_PARAMS, cursor=cursor)
+    return CURSOR_PAGINATION_PARAMS
+
+
+def build_pagination_keyboard(
+    data: dict, paginate_callback_data_pattern: str
+) -> list[list[InlineKeyboardButton]]:
+    """Кнопки `вперед` и `назад` по курсорам из ответа API."""
+    keyboard = []
+    for message, cursor in (
+        (NEXT_PAGINATION_MESSAGE, data.get('next_cursor')),
+        (PREV_PAGINATION_MESSAGE, data.get('previous_cursor')),
+    ):
+        if cursor:
+            keyboard.append([
+                InlineKeyboardButton(
+                    message,
+                    callback_data=paginate_callback_data_pattern.format(
+                        cursor=cursor
+                    ),
+                )
+            ])
+    return keyboard
 
 
 def build_category_card(fields: dict, full_info: bool = True) -> str:
@@ -248,9 +290,9 @@ def add_to_favorite_button(firework_id: str):
     )
 
 
-def firework_read_more_button(firework_url: str):
+def firework_read_more_button(firework_id: int):
     return InlineKeyboardButton(
-        READ_MORE_MESSAGE, callback_data=f'firework_{firework_url}'
+        READ_MORE_MESSAGE, callback_data=f'firework_{firework_id}'
     )
 
 
@@ -269,10 +311,9 @@ def build_show_all_products_keyboard(
         1. В корзину.
         2. В избранное.
     """
-    firework_url = f'http://nginx:8000/fireworks/{firework_id}'
     return [
         [add_to_cart_button(firework_id), add_to_favorite_button(firework_id)],
-        [firework_read_more_button(firework_url)],
+        [firework_read_more_button(firework_id)],
     ]
 
 
@@ -312,33 +353,22 @@ async def add_to_cart(
     query = update.callback_query
     await query.answer()
     try:
-        async with aiohttp.ClientSession() as session:
-            telegram_id = update.effective_user.id
-            firework_id = int(query.data.split('_')[-1])
-            async with session.post(
-                'http://nginx:8000/user/cart',
-                json=dict(
-                    create_data=dict(amount=1, firework_id=firework_id),
-                    user_ident=UserIdentificationSchema(
-                        telegram_id=telegram_id
-                    ).model_dump(),
+        telegram_id = update.effective_user.id
+        firework_id = int(query.data.split('_')[-1])
+        await api_client.add_to_cart(telegram_id, firework_id)
+        new_keyboard = [
+            [
+                InlineKeyboardButton(
+                    SUCCESS_ADD_MESSAGE_TO_CART,
+                    callback_data=ADD_TO_CART_CALLBACK.format(id=firework_id),
                 ),
-            ):
-                new_keyboard = [
-                    [
-                        InlineKeyboardButton(
-                            SUCCESS_ADD_MESSAGE_TO_CART,
-                            callback_data=ADD_TO_CART_CALLBACK.format(
-                                id=firework_id
-                            ),
-                        ),
-                        add_to_favorite_button(firework_id),
-                    ],
-                    [go_back_button(CATALOG_BACK_MESSAGE, CATALOG_CALLBACK)],
-                ]
-                await query.edit_message_reply_markup(
-                    reply_markup=InlineKeyboardMarkup(new_keyboard)
-                )
+                add_to_favorite_button(firework_id),
+            ],
+            [go_back_button(CATALOG_BACK_MESSAGE, CATALOG_CALLBACK)],
+        ]
+        await query.edit_message_reply_markup(
+            reply_markup=InlineKeyboardMarkup(new_keyboard)
+        )
     except Exception:
         await query.message.reply_text(ADD_TO_CART_ERROR)
 
@@ -349,30 +379,26 @@ async def add_to_favorite(
     query = update.callback_query
     await query.answer()
     try:
-        async with aiohttp.ClientSession() as session:
-            # TODO добавить свое id
-            # telegram_id = int(query.data)
-            telegram_id = update.effective_user.id
-            firework_id = int(query.data.split('_')[-1])
-            async with session.post(
-                'http://nginx:8000/favorites',
-                json=dict(telegram_id=telegram_id, firework_id=firework_id),
-            ):
-                new_keyboard = [
-                    [
-                        add_to_cart_button(firework_id),
-                        InlineKeyboardButton(
-                            SUCCESS_ADD_MESSAGE_TO_FAVORITE,
-                            callback_data=ADD_TO_FAVORITE_CALLBACK.format(
-                                id=firework_id
-                            ),
-                        ),
-                    ],
-                    [go_back_button(CATALOG_BACK_MESSAGE, CATALOG_CALLBACK)],
-                ]
-                await query.edit_message_reply_markup(
-                    reply_markup=InlineKeyboardMarkup(new_keyboard)
-                )
+        # TODO добавить свое id
+        # telegram_id = int(query.data)
+        telegram_id = update.effective_user.id
+        firework_id = int(query.data.split('_')[-1])
+        await api_client.add_to_favorite(telegram_id, firework_id)
+        new_keyboard = [
+            [
+                add_to_cart_button(firework_id),
+                InlineKeyboardButton(
+                    SUCCESS_ADD_MESSAGE_TO_FAVORITE,
+                    callback_data=ADD_TO_FAVORITE_CALLBACK.format(
+                        id=firework_id
+                    ),
+                ),
+            ],
+            [go_back_button(CATALOG_BACK_MESSAGE, CATALOG_CALLBACK)],
+        ]
+        await query.edit_message_reply_markup(
+            reply_markup=InlineKeyboardMarkup(new_keyboard)
+        )
     except Exception:
         await query.message.reply_text(ADD_TO_FAVORITE_ERROR)
 
@@ -397,85 +423,88 @@ async def catalog_menu(
     )
 
 
-async def get_direct_yandex_url(public_url: str) -> str | None:
-    api_url = 'https://cloud-api.yandex.net/v1/disk/public/resources/download'
-    async with aiohttp.ClientSession() as session:
-        async with session.get(
-            api_url, params={'public_key': public_url}
-        ) as resp:
-            if resp.status == 200:
-                data = await resp.json()
-                return data.get('href')
-            print(f'⚠️ Ошибка получения href: {resp.status}')
-    return None
+def build_sendable_media(
+    media: dict, variant: str, **fields: Any
+) -> SimpleNamespace:
+    """Медиа для MediaGroupSender с вариантом фото для места показа.
 
+    Если вариант готов, отправляется он (файл скачивается из API),
+    иначе - исходный файл.
 
-async def download_yandex_image(public_url: str) -> str | None:
-    direct_url = await get_direct_yandex_url(public_url)
-    if not direct_url:
-        print('❌ Не удалось получить прямую ссылку.')
-        return None
-
-    async with aiohttp.ClientSession() as session:
-        try:
-            async with session.get(direct_url) as resp:
-                if resp.status == 200:
-                    suffix = '.jpg' if '.jpg' in public_url else '.png'
-                    with tempfile.NamedTemporaryFile(
-                        delete=False, suffix=suffix
-                    ) as tmp_file:
-                        tmp_file.write(await resp.read())
-                        return tmp_file.name
-                print(f'❌ Ошибка скачивания файла: {resp.status}')
-        except Exception as e:
-            print(f'❌ Исключение при скачивании: {e}')
-    return None
-
-
-PHOTO_FORMATS = ('.jpg', '.jpeg', '.png')
-VIDEO_FORMATS = ('.mp4', '.mov')
+    Аргументы:
+        media: медиа (MediaDB в JSON).
+        variant: место показа (CARD, DETAIL, NEWSLETTER).
+        fields: дополнительные поля, например caption.
+    """
+    item = SimpleNamespace(**media, **fields)
+    formatted_media = pick_variant(media.get('variants') or [], variant)
+    if formatted_media is not None:
+        item.formatted_media_id = formatted_media['id']
+        item.telegram_file_id = formatted_media['telegram_file_id']
+        # Хеш в ссылке: пересозданный вариант не возьмется из хранилища
+        # медиа бота по старой ссылке.
+        item.source_url = FORMATTED_MEDIA_URL.format(
+            formatted_media_id=formatted_media['id'],
+            sha256=formatted_media['sha256'],
+        )
+    return item
 
 
 async def show_media(
-    update: Update, context: ContextTypes.DEFAULT_TYPE, media_list: list[dict]
+    update: Update,
+    context: ContextTypes.DEFAULT_TYPE,
+    media_list: list[dict],
+    variant: str = CARD,
 ):
-    media_group = []
-    temp_files = []  # пути к временным файлам
-
-    for media in media_list[:10]:  # ограничение Telegram
-        url = media['media_url']
-        # async with aiohttp.ClientSession() as session:
-        # async with session.post(
-        #     f'http://nginx:8000/converted_media/{media["id"]}'
-        # ) as response:
-        #     data = await response.json()
-        #     with open(file_path, 'rb') as f:  # noqa: ASYNC230
-        #     if media_type == 'image':
-        #         media_group.append(InputMediaPhoto(media=f.read()))
-        media_type = media['media_type']
-
-        if 'disk.yandex.ru' in url:
-            file_path = await download_yandex_image(url)
-            if not file_path:
-                continue
-            temp_files.append(file_path)
-            with open(file_path, 'rb') as f:  # noqa: ASYNC230
-                if media_type == 'image':
-                    media_group.append(InputMediaPhoto(media=f.read()))
-        else:
-            continue
-
-    if media_group:
-        media_messages = await context.bot.send_media_group(
-            chat_id=update.effective_chat.id, media=media_group
-        )
-        # Сохраняем message_id всех отправленных сообщений с фото
-        media_ids = [msg.message_id for msg in media_messages]
-        await add_messages_to_memory(update, context, *media_ids)
+    """Отправляет фото товара медиагруппой.
 
-    # Удаляем временные файлы
-    for path in temp_files:
-        os.remove(path)
+    Фото, уже загруженные ботом, отправляются по file_id, остальные
+    скачиваются (варианты фото - из API, исходные файлы - с Яндекс
+    Диска), а их новые file_id сохраняются через API.
+    """
+    media_items = [
+        build_sendable_media(media, variant)
+        for media in media_list
+        if media['media_type'] == PHOTO
+    ]
+    sender = MediaGroupSender(
+        context.bot,
+        [
+            media
+            for media in media_items
+            if media.telegram_file_id
+            or getattr(media, 'source_url', None)
+            or is_yandex_disk_url(media.media_url)
+        ],
+        http_session=await api_http_client.get_session(),
+    )
+    if not sender:
+        return
+    media_messages = await sender.send(update.effective_chat.id)
+    # Сохраняем message_id всех отправленных сообщений с фото
+    media_ids = [msg.message_id for msg in media_messages]
+    await add_messages_to_memory(update, context, *media_ids)
+    await save_uploaded_media(sender)
+
+
+async def save_uploaded_media(sender: MediaGroupSender) -> None:
+    """Сохраняет через API file_id медиа, загруженных отправителем."""
+    uploaded, sender.uploaded = sender.uploaded, []
+    for media in uploaded:
+        formatted_media_id = getattr(media, 'formatted_media_id', None)
+        try:
+            if formatted_media_id is not None:
+                await api_client.set_formatted_media_file_id(
+                    formatted_media_id, media.telegram_file_id
+                )
+            elif media.id is not None:
+                await api_client.set_media_file_id(
+                    media.id, media.telegram_file_id
+                )
+        except (aiohttp.ClientError, APIClientError) as error:
+            logger.warning(
+                'Не удалось сохранить file_id медиа %s: %s', media.id, error
+            )
 
 
 async def send_callback_message(
@@ -530,91 +559,73 @@ async def get_paginated_response(
     method: str = 'GET',
     full_info: bool = False,
     request_data: dict = None,
+    cursor: str | None = None,
 ) -> None:
     """Базовая функция для возвращения списка объектов с пагинацией."""
     query = update.callback_query
     await query.answer()
-    next_page_url = previous_page_url = None
     if context.chat_data[update.effective_chat.id]:
         await catalog_delete_messages_from_memory(update, context)
     try:
-        async with aiohttp.ClientSession(
-            connector=aiohttp.TCPConnector(ssl=ssl_context)
-        ) as session:
-            if method == 'POST':
-                response_context_manager = await session.post(
-                    url, json=request_data
-                )
-            else:
-                response_context_manager = await session.get(url)
-            async with response_context_manager as response:
-                if response.status == HTTPStatus.OK:
-                    data = await response.json()
-                    objects = data[object_key]
-                    if not objects:
-                        await send_callback_message(
-                            query,
-                            update,
-                            context,
-                            EMPTY_QUERY_MESSAGE,
-                            reply_markup=None,
-                        )
-                    for obj in objects:
-                        caption = build_object_card(obj, full_info=full_info)
-                        if obj.get('media'):
-                            await show_media(update, context, obj['media'])
-                        await send_callback_message(
-                            query,
-                            update,
-                            context,
-                            escape_markdown_v2(caption),
-                            reply_markup=InlineKeyboardMarkup(
-                                object_keyboard_builder(obj['id'])
-                            ),
-                            parse_mode='MarkdownV2',
-                        )
-                    print(context.chat_data[update.effective_chat.id])
-                    next_page_url = data['next_page_url']
-                    previous_page_url = data['previous_page_url']
-                    if next_page_url:
-                        global_keyboard.append([
-                            InlineKeyboardButton(
-                                NEXT_PAGINATION_MESSAGE,
-                                callback_data=(
-                                    paginate_callback_data_pattern.format(
-                                        url=next_page_url
-                                    )
-                                ),
-                            )
-                        ])
-                    if previous_page_url:
-                        global_keyboard.append([
-                            InlineKeyboardButton(
-                                PREV_PAGINATION_MESSAGE,
-                                callback_data=(
-                                    paginate_callback_data_pattern.format(
-                                        url=previous_page_url
-                                    )
-                                ),
-                            )
-                        ])
+        async with api_http_client.request(
+            method,
+            url,
+            params=build_cursor_params(cursor),
+            json=request_data,
+        ) as response:
+            if response.status == HTTPStatus.OK:
+                data = await response.json()
+                objects = data[object_key]
+                if not objects:
                     await send_callback_message(
                         query,
                         update,
                         context,
-                        NAVIGATION_MESSAGE,
-                        InlineKeyboardMarkup(global_keyboard),
+                        EMPTY_QUERY_MESSAGE,
+                        reply_markup=None,
                     )
-                else:
+                for obj in objects:
+                    caption = build_object_card(obj, full_info=full_info)
+                    if obj.get('media'):
+                        await show_media(
+                            update,
+                            context,
+                            obj['media'],
+                            DETAIL if full_info else CARD,
+                        )
                     await send_callback_message(
                         query,
                         update,
                         context,
-                        croling_content(
-                            BAD_REQUEST_MESSAGE.format(code=response.status)
+                        escape_markdown_v2(caption),
+                        reply_markup=InlineKeyboardMarkup(
+                            object_keyboard_builder(obj['id'])
                         ),
-                        InlineKeyboardMarkup(keyboard_back),
+                        parse_mode='MarkdownV2',
+                    )
+                print(context.chat_data[update.effective_chat.id])
+                global_keyboard.extend(
+                    build_pagination_keyboard(
+                        data, paginate_callback_data_pattern
                     )
+                )
+                await send_callback_message(
+                    query,
+                    update,
+                    context,
+                    NAVIGATION_MESSAGE,
+                    InlineKeyboardMarkup(global_keyboard),
+                )
+            else:
+                await send_callback_message(
+                    query,
+                    update,
+                    context,
+                    croling_content(
+                        BAD_REQUEST_MESSAGE.format(code=response.status)
+                    ),
+                    InlineKeyboardMarkup(keyboard_back),
+                )
     except Exception:
         await send_callback_message(
             query,
@@ -628,7 +639,7 @@ async def get_paginated_response(
 async def show_all_products(
     update: Update,
     context: ContextTypes.DEFAULT_TYPE,
-    url: str | None = 'http://nginx:8000/fireworks',
+    cursor: str | None = None,
 ) -> None:
     """Возвращает весь список товаров."""
     global_keyboard = [
@@ -644,13 +655,14 @@ async def show_all_products(
     await get_paginated_response(
         update=update,
         context=context,
-        url=url,
+        url=FIREWORKS_URL,
         method='POST',
         object_key='fireworks',
         object_keyboard_builder=build_show_all_products_keyboard,
         build_object_card=build_firework_card,
         global_keyboard=global_keyboard,
         paginate_callback_data_pattern=PRODUCT_PAGINATE_CALLBACK_DATA,
+        cursor=cursor,
     )
 
 
@@ -661,29 +673,26 @@ async def read_more_about_product(
     query = update.callback_query
     await query.answer()
     # try:
-    async with aiohttp.ClientSession(
-        connector=aiohttp.TCPConnector(ssl=False)
-    ) as session:
-        url = query.data.split('_')[-1]
-        async with session.get(url) as response:
-            if response.status == HTTPStatus.OK:
-                firework = await response.json()
-                await query.edit_message_text(
-                    build_firework_card(firework, full_info=True),
-                    reply_markup=InlineKeyboardMarkup(
-                        build_read_more_about_keyboard(firework['id'])
-                    ),
-                    parse_mode='MarkdownV2',
-                )
-            else:
-                await send_callback_message(
-                    query,
-                    update,
-                    context,
-                    BAD_REQUEST_MESSAGE.format(code=response.status),
-                    InlineKeyboardMarkup(keyboard_back),
-                    add_to_chat_data=False,
-                )
+    firework_id = int(query.data.split('_')[-1])
+    try:
+        firework = await api_client.get_firework(firework_id)
+    except APIClientError as error:
+        await send_callback_message(
+            query,
+            update,
+            context,
+            BAD_REQUEST_MESSAGE.format(code=error.status),
+            InlineKeyboardMarkup(keyboard_back),
+            add_to_chat_data=False,
+        )
+        return
+    await query.edit_message_text(
+        build_firework_card(firework.model_dump(mode='json'), full_info=True),
+        reply_markup=InlineKeyboardMarkup(
+            build_read_more_about_keyboard(firework.id)
+        ),
+        parse_mode='MarkdownV2',
+    )
     # except Exception:
     #     await send_callback_message(
     #         query,
@@ -697,80 +706,61 @@ async def read_more_about_product(
 async def show_all_categories(
     update: Update,
     context: ContextTypes.DEFAULT_TYPE,
-    url: str | None = 'http://nginx:8000/categories',
+    cursor: str | None = None,
 ) -> None:
     """Возвращает все категории."""
     query = update.callback_query
     await query.answer()
-    next_page_url = previous_page_url = None
     global_keyboard = [
         [go_back_button(CATALOG_BACK_MESSAGE, CATALOG_CALLBACK)]
     ]
     if context.chat_data[update.effective_chat.id]:
         await catalog_delete_messages_from_memory(update, context)
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as response:
-                if response.status == HTTPStatus.OK:
-                    data = await response.json()
-                    categories = data['categories']
-                    if not categories:
-                        await query.message.reply_text(EMPTY_QUERY_MESSAGE)
-                    keyboard = [
-                        [
-                            category_read_more_button(
-                                build_category_card(category), category['id']
-                            )
-                        ]
-                        for category in categories
+        async with api_http_client.get(
+            CATEGORIES_URL, params=build_cursor_params(cursor)
+        ) as response:
+            if response.status == HTTPStatus.OK:
+                data = await response.json()
+                categories = data['categories']
+                if not categories:
+                    await query.message.reply_text(EMPTY_QUERY_MESSAGE)
+                keyboard = [
+                    [
+                        category_read_more_button(
+                            build_category_card(category), category['id']
+                        )
                     ]
-                    await send_callback_message(
-                        query,
-                        update,
-                        context,
-                        ALL_CATEGORIES_MESSAGE,
-                        reply_markup=InlineKeyboardMarkup(keyboard),
-                    )
-                    next_page_url = data['next_page_url']
-                    previous_page_url = data['previous_page_url']
-                    if next_page_url:
-                        global_keyboard.append([
-                            InlineKeyboardButton(
-                                NEXT_PAGINATION_MESSAGE,
-                                callback_data=(
-                                    CATEGORY_PAGINATE_CALLBACK_DATA.format(
-                                        url=next_page_url
-                                    )
-                                ),
-                            )
-                        ])
-                    if previous_page_url:
-                        global_keyboard.append([
-                            InlineKeyboardButton(
-                                PREV_PAGINATION_MESSAGE,
-                                callback_data=(
-                                    CATEGORY_PAGINATE_CALLBACK_DATA.format(
-                                        url=previous_page_url
-                                    )
-                                ),
-                            )
-                        ])
-                    message = await send_callback_message(
-                        query,
-                        update,
-                        context,
-                        NAVIGATION_MESSAGE,
-                        InlineKeyboardMarkup(global_keyboard),
-                    )
-                    print(message.id)
-                else:
-                    await send_callback_message(
-                        query,
-                        update,
-                        context,
-                        BAD_REQUEST_MESSAGE.format(code=response.status),
-                        InlineKeyboardMarkup(keyboard_back),
+                    for category in categories
+                ]
+                await send_callback_message(
+                    query,
+                    update,
+                    context,
+                    ALL_CATEGORIES_MESSAGE,
+                    reply_markup=InlineKeyboardMarkup(keyboard),
+                )
+                global_keyboard.extend(
+                    build_pagination_keyboard(
+                        data, CATEGORY_PAGINATE_CALLBACK_DATA
                     )
+                )
+                message = await send_callback_message(
+                    query,
+                    update,
+                    context,
+                    NAVIGATION_MESSAGE,
+                    InlineKeyboardMarkup(global_keyboard),
+                )
+                print(message.id)
+            else:
+                await send_callback_message(
+                    query,
+                    update,
+                    context,
+                    BAD_REQUEST_MESSAGE.format(code=response.status),
+                    InlineKeyboardMarkup(keyboard_back),
+                )
     except Exception:
         await send_callback_message(
             query,
@@ -784,25 +774,30 @@ async def show_all_categories(
 async def show_categories_fireworks(
     update: Update,
     context: ContextTypes.DEFAULT_TYPE,
-    url: str | None = (
-        'http://nginx:8000/fireworks/by_category/{category_id}'
-    ),
+    category_id: str | None = None,
+    cursor: str | None = None,
 ) -> None:
     """Возвращает товары определенной категории."""
     query = update.callback_query
     await query.answer()
-    category_id = query.data.split('_')[-1]
+    if category_id is None:
+        category_id = query.data.split('_')[-1]
     await get_paginated_response(
         update=update,
         context=context,
-        url=url.format(category_id=category_id),
+        url=CATEGORY_FIREWORKS_URL.format(category_id=category_id),
         object_key='fireworks',
         object_keyboard_builder=build_show_all_products_keyboard,
         build_object_card=build_firework_card,
         global_keyboard=build_back_keyboard(
             CATALOG_BACK_MESSAGE, CATALOG_CALLBACK
         ),
-        paginate_callback_data_pattern=PRODUCT_PAGINATE_CALLBACK_DATA,
+        paginate_callback_data_pattern=(
+            CATEGORY_PRODUCTS_PAGINATE_CALLBACK_DATA.format(
+                category_id=category_id
+            )
+        ),
+        cursor=cursor,
     )
 
 
@@ -828,14 +823,20 @@ async def pagination_handler(
     """Обработчик кнопок `вперед` и `назад` для пагинации."""
     query = update.callback_query
     await query.answer()
-    target_pagination_point, url = query.data.split('_')
+    target_pagination_point, cursor = query.data.split('_', 1)
     if target_pagination_point == 'pg-pr':
-        await show_all_products(update, context, url)
+        await show_all_products(update, context, cursor)
     elif target_pagination_point == 'pg-cat':
-        await show_all_categories(update, context, url)
+        await show_all_categories(update, context, cursor)
+    elif target_pagination_point == 'pg-pr-cat':
+        category_id, cursor = cursor.split(':', 1)
+        await show_categories_fireworks(update, context, category_id, cursor)
     elif target_pagination_point == 'pg-pr-filter':
         await apply_filters(
-            update, context, url, request_data=context.user_data['filter']
+            update,
+            context,
+            cursor,
+            request_data=context.user_data['filter'],
         )
 
 
@@ -1173,7 +1174,7 @@ async def cancel_filters(update: Update, context: ContextTypes.DEFAULT_TYPE):
 async def apply_filters(
     update: Update,
     context: ContextTypes.DEFAULT_TYPE,
-    url: str = 'http://nginx:8000/fireworks',
+    cursor: str | None = None,
     request_data: dict = None,
 ) -> None:
     if context.chat_data[update.effective_chat.id]:
@@ -1195,7 +1196,7 @@ async def apply_filters(
     await get_paginated_response(
         update=update,
         context=context,
-        url=url,
+        url=FIREWORKS_URL,
         method='POST',
         object_key='fireworks',
         object_keyboard_builder=build_show_all_products_keyboard,
@@ -1203,6 +1204,7 @@ async def apply_filters(
         global_keyboard=global_keyboard,
         paginate_callback_data_pattern=PRODUCT_FILTER_PAGINATE_CALLBACK_DATA,
         request_data=filter_data,
+        cursor=cursor,
     )
     return ConversationHandler.END
 
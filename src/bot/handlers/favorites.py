@@ -7,11 +7,12 @@ from telegram.ext import (
     ConversationHandler,
 )
 
+from src.bot.api_client import APIClientError, api_client
 from src.bot.bot_messages import build_firework_card
+from src.bot.http_client import api_http_client
 from src.schemas.cart import UserIdentificationSchema
 
 # Конфигурация
-API_BASE_URL = 'http://nginx:8000'
 FAVORITES_STATE = 1
 
 
@@ -46,19 +47,14 @@ def get_navigation_keyboard():
 
 
 async def fetch_favorites(telegram_id: int):
-    url = f'{API_BASE_URL}/favorites/me'
-    payload = {'telegram_id': telegram_id}
-    async with aiohttp.ClientSession() as session:
-        try:
-            async with session.post(
-                url, json=payload, headers={'Content-Type': 'application/json'}
-            ) as response:
-                if response.status == 200:
-                    return await response.json()
-                return []
-        except aiohttp.ClientError as e:
-            print(f'Connection error: {str(e)}')
-            return []
+    try:
+        favorites = await api_client.get_favorites(telegram_id)
+    except APIClientError:
+        return []
+    except aiohttp.ClientError as e:
+        print(f'Connection error: {str(e)}')
+        return []
+    return [favorite.model_dump(mode='json') for favorite in favorites]
 
 
 async def show_favorites(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -109,62 +105,59 @@ async def handle_favorites_actions(
 
         try:
             if data.startswith('details_'):
-                url = f'{API_BASE_URL}/fireworks/{firework_id}'
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(
-                        url, headers={'Accept': 'application/json'}
-                    ) as response:
-                        if response.status == 200:
-                            firework = await response.json()
-                        await query.edit_message_text(
-                            build_firework_card(firework),
-                            parse_mode='MarkdownV2',
-                            reply_markup=get_product_keyboard(firework_id),
-                        )
+                url = f'/fireworks/{firework_id}'
+                async with api_http_client.get(
+                    url, headers={'Accept': 'application/json'}
+                ) as response:
+                    if response.status == 200:
+                        firework = await response.json()
+                    await query.edit_message_text(
+                        build_firework_card(firework),
+                        parse_mode='MarkdownV2',
+                        reply_markup=get_product_keyboard(firework_id),
+                    )
 
             elif data.startswith('cart_'):
-                async with aiohttp.ClientSession() as session:
-                    try:
-                        async with session.post(
-                            f'{API_BASE_URL}/user/cart',
-                            json=dict(
-                                create_data=dict(
-                                    amount=1, firework_id=firework_id
-                                ),
-                                user_ident=UserIdentificationSchema(
-                                    telegram_id=telegram_id
-                                ).model_dump(),
+                try:
+                    async with api_http_client.post(
+                        '/user/cart',
+                        json=dict(
+                            create_data=dict(
+                                amount=1, firework_id=firework_id
                             ),
-                        ) as response:
-                            print(999, response.status)
-                            if response.status == 201:
-                                await query.edit_message_text(
-                                    'Товар добавлен в корзину 🛒'
-                                )
-                            else:
-                                error = await response.text()
-                                print(f'Error: {error}')
-                                await query.answer('⚠️ Ошибка!')
-                    except aiohttp.ClientError:
-                        await query.answer('🚫 Ошибка соединения с сервером')
+                            user_ident=UserIdentificationSchema(
+                                telegram_id=telegram_id
+                            ).model_dump(),
+                        ),
+                    ) as response:
+                        print(999, response.status)
+                        if response.status == 201:
+                            await query.edit_message_text(
+                                'Товар добавлен в корзину 🛒'
+                            )
+                        else:
+                            error = await response.text()
+                            print(f'Error: {error}')
+                            await query.answer('⚠️ Ошибка!')
+                except aiohttp.ClientError:
+                    await query.answer('🚫 Ошибка соединения с сервером')
 
             elif data.startswith('remove_'):
-                async with aiohttp.ClientSession() as session:
-                    try:
-                        async with session.delete(
-                            f'{API_BASE_URL}/favorites/{firework_id}',
-                            json={'telegram_id': telegram_id},
-                        ) as response:
-                            if response.status == 200:
-                                await query.edit_message_text(
-                                    '❌ Товар удалён из избранного'
-                                )
-                            else:
-                                error = await response.text()
-                                print(f'Delete error: {error}')
-                                await query.answer('⚠️ Не удалось удалить!')
-                    except aiohttp.ClientError:
-                        await query.answer('🚫 Ошибка соединения с сервером')
+                try:
+                    async with api_http_client.delete(
+                        f'/favorites/{firework_id}',
+                        json={'telegram_id': telegram_id},
+                    ) as response:
+                        if response.status == 200:
+                            await query.edit_message_text(
+                                '❌ Товар удалён из избранного'
+                            )
+                        else:
+                            error = await response.text()
+                            print(f'Delete error: {error}')
+                            await query.answer('⚠️ Не удалось удалить!')
+                except aiohttp.ClientError:
+                    await query.answer('🚫 Ошибка соединения с сервером')
             return FAVORITES_STATE
         except Exception as e:
             await query.answer(f'⚠️ Произошла ошибка: {str(e)}')
@@ -1,6 +1,5 @@
 import logging
 
-from aiohttp import ClientSession
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup, Update
 from telegram.ext import (
     Application,
@@ -11,7 +10,7 @@ from telegram.ext import (
     filters,
 )
 
-from src.bot.utils import API_BASE_URL
+from src.bot.http_client import api_http_client
 
 logger = logging.getLogger(__name__)
 
@@ -110,51 +109,50 @@ async def order_history(update: Update, context: CallbackContext) -> int:
     user_addresses_list = []
     user_addresses_map = {}
 
-    async with ClientSession() as session:
-        try:
-            async with session.post(
-                f'{API_BASE_URL}/orders/me',
-                headers=get_auth_headers(telegram_id),
-                json={'telegram_id': telegram_id},
-            ) as response:
-                if response.status != 200:
-                    logger.error(
-                        f'Order history fetch error {response.status}:'
-                        f' {await response.text()}'
-                    )
-                    await query.edit_message_text(ERROR_FETCHING_ORDERS)
-                    return ConversationHandler.END
-                orders = await response.json()
-        except Exception:
-            logger.exception('Exception during order fetch:')
-            await query.edit_message_text(ERROR_FETCHING_ORDERS)
-            return ConversationHandler.END
+    try:
+        async with api_http_client.post(
+            '/orders/me',
+            headers=get_auth_headers(telegram_id),
+            json={'telegram_id': telegram_id},
+        ) as response:
+            if response.status != 200:
+                logger.error(
+                    f'Order history fetch error {response.status}:'
+                    f' {await response.text()}'
+                )
+                await query.edit_message_text(ERROR_FETCHING_ORDERS)
+                return ConversationHandler.END
+            orders = await response.json()
+    except Exception:
+        logger.exception('Exception during order fetch:')
+        await query.edit_message_text(ERROR_FETCHING_ORDERS)
+        return ConversationHandler.END
 
-        try:
-            async with session.post(
-                f'{API_BASE_URL}/useraddresses/me',
-                json={'telegram_id': telegram_id},
-            ) as response:
-                if response.status != 200:
-                    logger.error(
-                        f'Failed to get user addresses for {telegram_id}: '
-                        f'{response.status} {await response.text()}'
-                    )
-                    await context.bot.send_message(
-                        chat_id=telegram_id, text=ERROR_FETCHING_ADDRESSES
-                    )
-                else:
-                    user_addresses_list = await response.json()
-                    user_addresses_map = {
-                        ua['user_address_id']: ua['address']
-                        for ua in user_addresses_list
-                        if 'user_address_id' in ua and 'address' in ua
-                    }
-        except Exception:
-            logger.exception('Exception during address fetch:')
-            await context.bot.send_message(
-                chat_id=telegram_id, text=ERROR_FETCHING_ADDRESSES
-            )
+    try:
+        async with api_http_client.post(
+            '/useraddresses/me',
+            json={'telegram_id': telegram_id},
+        ) as response:
+            if response.status != 200:
+                logger.error(
+                    f'Failed to get user addresses for {telegram_id}: '
+                    f'{response.status} {await response.text()}'
+                )
+                await context.bot.send_message(
+                    chat_id=telegram_id, text=ERROR_FETCHING_ADDRESSES
+                )
+            else:
+                user_addresses_list = await response.json()
+                user_addresses_map = {
+                    ua['user_address_id']: ua['address']
+                    for ua in user_addresses_list
+                    if 'user_address_id' in ua and 'address' in ua
+                }
+    except Exception:
+        logger.exception('Exception during address fetch:')
+        await context.bot.send_message(
+            chat_id=telegram_id, text=ERROR_FETCHING_ADDRESSES
+        )
 
     if not orders:
         await query.edit_message_text(INFO_NO_ORDERS)
@@ -324,33 +322,32 @@ async def check_delivery_status(
         ]
     ])
 
-    async with ClientSession() as session:
-        async with session.get(
-            f'{API_BASE_URL}/orders/{order_id}/delivery_status',
-            headers=get_auth_headers(telegram_id),
-        ) as response:
-            if response.status == 404:
-                await query.edit_message_text(
-                    INFO_ORDER_NOT_SHIPPED,
-                    reply_markup=back_to_details_keyboard,
-                )
-            elif response.status != 200:
-                logger.error(
-                    f'Check delivery status error {response.status} '
-                    f'for order {order_id}: '
-                    f'{await response.text()}'
-                )
-                await query.edit_message_text(
-                    ERROR_DELIVERY_STATUS.format(status=response.status),
-                    reply_markup=back_to_details_keyboard,
-                )
-            else:
-                data = await response.json()
-                await query.edit_message_text(
-                    f'Статус доставки заказа #{order_id}: '
-                    f'{data.get("delivery_status", "Нет данных")}',
-                    reply_markup=back_to_details_keyboard,
-                )
+    async with api_http_client.get(
+        f'/orders/{order_id}/delivery_status',
+        headers=get_auth_headers(telegram_id),
+    ) as response:
+        if response.status == 404:
+            await query.edit_message_text(
+                INFO_ORDER_NOT_SHIPPED,
+                reply_markup=back_to_details_keyboard,
+            )
+        elif response.status != 200:
+            logger.error(
+                f'Check delivery status error {response.status} '
+                f'for order {order_id}: '
+                f'{await response.text()}'
+            )
+            await query.edit_message_text(
+                ERROR_DELIVERY_STATUS.format(status=response.status),
+                reply_markup=back_to_details_keyboard,
+            )
+        else:
+            data = await response.json()
+            await query.edit_message_text(
+                f'Статус доставки заказа #{order_id}: '
+                f'{data.get("delivery_status", "Нет данных")}',
+                reply_markup=back_to_details_keyboard,
+            )
     return AWAITING_ORDER_DETAILS
 
 
@@ -373,30 +370,29 @@ async def edit_order_address(update: Update, context: CallbackContext) -> int:
 
     user_addresses_list = []
     user_addresses_map = {}
-    async with ClientSession() as session:
-        try:
-            async with session.post(
-                f'{API_BASE_URL}/useraddresses/me',
-                json={'telegram_id': telegram_id},
-            ) as response:
-                if response.status != 200:
-                    logger.error(
-                        f'Edit Address: '
-                        f'Failed to get user addresses for {telegram_id}: '
-                        f'{response.status} {await response.text()}'
-                    )
-                    await query.edit_message_text(ERROR_FETCHING_ADDRESSES)
-                else:
-                    user_addresses_list = await response.json()
-                    user_addresses_map = {
-                        ua['user_address_id']: ua['address']
-                        for ua in user_addresses_list
-                        if 'user_address_id' in ua
-                    }
-                    dialog_data['addresses_map'] = user_addresses_map
-        except Exception:
-            logger.exception('Edit Address: Exception during address fetch:')
-            await query.edit_message_text(ERROR_FETCHING_ADDRESSES)
+    try:
+        async with api_http_client.post(
+            '/useraddresses/me',
+            json={'telegram_id': telegram_id},
+        ) as response:
+            if response.status != 200:
+                logger.error(
+                    f'Edit Address: '
+                    f'Failed to get user addresses for {telegram_id}: '
+                    f'{response.status} {await response.text()}'
+                )
+                await query.edit_message_text(ERROR_FETCHING_ADDRESSES)
+            else:
+                user_addresses_list = await response.json()
+                user_addresses_map = {
+                    ua['user_address_id']: ua['address']
+                    for ua in user_addresses_list
+                    if 'user_address_id' in ua
+                }
+                dialog_data['addresses_map'] = user_addresses_map
+    except Exception:
+        logger.exception('Edit Address: Exception during address fetch:')
+        await query.edit_message_text(ERROR_FETCHING_ADDRESSES)
 
     keyboard = []
     if user_addresses_list:
@@ -477,37 +473,36 @@ async def set_existing_address(
         await query.edit_message_text(ERROR_TELEGRAM_ID_MISSING)
         return ConversationHandler.END
 
-    async with ClientSession() as session:
-        async with session.patch(
-            f'{API_BASE_URL}/orders/{order_id}/address',
-            headers=get_auth_headers(telegram_id),
-            json={
-                'telegram_schema': {'telegram_id': telegram_id},
-                'data': {'user_address_id': user_address_id},
-            },
-        ) as response:
-            if response.status not in (200, 201):
-                logger.error(
-                    f'Failed to update address '
-                    f'for order {order_id} to existing '
-                    f'{user_address_id}: '
-                    f'{response.status} {await response.text()}'
-                )
-                await query.edit_message_text(ERROR_ADDRESS_UPDATE)
-            else:
-                orders = dialog_data.get('orders', [])
-                for i, order in enumerate(orders):
-                    if order.get('id') == order_id:
-                        orders[i]['user_address_id'] = user_address_id
-                        break
-                dialog_data['orders'] = orders
+    async with api_http_client.patch(
+        f'/orders/{order_id}/address',
+        headers=get_auth_headers(telegram_id),
+        json={
+            'telegram_schema': {'telegram_id': telegram_id},
+            'data': {'user_address_id': user_address_id},
+        },
+    ) as response:
+        if response.status not in (200, 201):
+            logger.error(
+                f'Failed to update address '
+                f'for order {order_id} to existing '
+                f'{user_address_id}: '
+                f'{response.status} {await response.text()}'
+            )
+            await query.edit_message_text(ERROR_ADDRESS_UPDATE)
+        else:
+            orders = dialog_data.get('orders', [])
+            for i, order in enumerate(orders):
+                if order.get('id') == order_id:
+                    orders[i]['user_address_id'] = user_address_id
+                    break
+            dialog_data['orders'] = orders
 
-                address_text = dialog_data.get('addresses_map', {}).get(
-                    user_address_id, f'ID: {user_address_id}'
-                )
-                await query.edit_message_text(
-                    ADDRESS_SAVED_MESSAGE.format(address=address_text)
-                )
+            address_text = dialog_data.get('addresses_map', {}).get(
+                user_address_id, f'ID: {user_address_id}'
+            )
+            await query.edit_message_text(
+                ADDRESS_SAVED_MESSAGE.format(address=address_text)
+            )
 
     await context.bot.send_message(
         chat_id=query.message.chat_id,
@@ -544,94 +539,90 @@ async def handle_new_address_input(
     dialog_data['address_input'] = address_text
     user_address_id = None
 
-    async with ClientSession() as session:
-        try:
-            async with session.post(
-                f'{API_BASE_URL}/addresses',
-                json={'telegram_id': telegram_id, 'address': address_text},
-            ) as response:
-                if response.status not in (201, 200):
-                    logger.error(
-                        f'Edit Order: '
-                        f"Failed to save address '{address_text}' for "
-                        f'{telegram_id}: '
-                        f'{response.status} {await response.text()}'
-                    )
-                    await update.message.reply_text(
-                        f'{ERROR_ADDRESS_SAVE}\nПопробуйте ввести снова или '
-                        'выберите существующий адрес.',
-                        reply_markup=InlineKeyboardMarkup([
-                            [
-                                InlineKeyboardButton(
-                                    'Выбрать существующий',
-                                    callback_data=f'edit_addr_{order_id}',
-                                )
-                            ]
-                        ]),
-                    )
-                    return AWAITING_NEW_ADDRESS
-                address_data = await response.json()
-                user_address_id = address_data.get('user_address_id')
-                new_address_text = address_data.get('address')
-                if not user_address_id or not new_address_text:
-                    raise ValueError(
-                        'user_address_id or address not in response'
-                    )
-                dialog_data.setdefault('addresses_map', {})[
-                    user_address_id
-                ] = new_address_text
-                dialog_data['address_input'] = new_address_text
-        except Exception as e:
-            logger.exception('Edit Order: Exception during address save:')
-            await update.message.reply_text(
-                f'{ERROR_ADDRESS_SAVE}\nОшибка: {e}',
-                reply_markup=InlineKeyboardMarkup([
-                    [
-                        InlineKeyboardButton(
-                            'Выбрать существующий',
-                            callback_data=f'edit_addr_{order_id}',
-                        )
-                    ]
-                ]),
+    try:
+        async with api_http_client.post(
+            '/addresses',
+            json={'telegram_id': telegram_id, 'address': address_text},
+        ) as response:
+            if response.status not in (201, 200):
+                logger.error(
+                    f'Edit Order: '
+                    f"Failed to save address '{address_text}' for "
+                    f'{telegram_id}: '
+                    f'{response.status} {await response.text()}'
+                )
+                await update.message.reply_text(
+                    f'{ERROR_ADDRESS_SAVE}\nПопробуйте ввести снова или '
+                    'выберите существующий адрес.',
+                    reply_markup=InlineKeyboardMarkup([
+                        [
+                            InlineKeyboardButton(
+                                'Выбрать существующий',
+                                callback_data=f'edit_addr_{order_id}',
+                            )
+                        ]
+                    ]),
+                )
+                return AWAITING_NEW_ADDRESS
+            address_data = await response.json()
+            user_address_id = address_data.get('user_address_id')
+            new_address_text = address_data.get('address')
+            if not user_address_id or not new_address_text:
+                raise ValueError('user_address_id or address not in response')
+            dialog_data.setdefault('addresses_map', {})[user_address_id] = (
+                new_address_text
             )
-            return AWAITING_NEW_ADDRESS
+            dialog_data['address_input'] = new_address_text
+    except Exception as e:
+        logger.exception('Edit Order: Exception during address save:')
+        await update.message.reply_text(
+            f'{ERROR_ADDRESS_SAVE}\nОшибка: {e}',
+            reply_markup=InlineKeyboardMarkup([
+                [
+                    InlineKeyboardButton(
+                        'Выбрать существующий',
+                        callback_data=f'edit_addr_{order_id}',
+                    )
+                ]
+            ]),
+        )
+        return AWAITING_NEW_ADDRESS
 
     if user_address_id:
-        async with ClientSession() as session:
-            async with session.patch(
-                f'{API_BASE_URL}/orders/{order_id}/address',
-                headers=get_auth_headers(telegram_id),
-                json={
-                    'telegram_schema': {'telegram_id': telegram_id},
-                    'data': {'user_address_id': user_address_id},
-                },
-            ) as response:
-                if response.status not in (200, 201):
-                    logger.error(
-                        f'Edit Order: '
-                        f'Failed to update order {order_id} with NEW '
-                        f'address {user_address_id}: '
-                        f'{response.status} {await response.text()}'
-                    )
-                    await update.message.reply_text(
-                        f"{ERROR_ADDRESS_UPDATE}\nАдрес '{
-                            dialog_data['address_input']
-                        }' "
-                        f'сохранен, но не применен к заказу #{order_id}.'
-                    )
-                else:
-                    orders = dialog_data.get('orders', [])
-                    for i, order in enumerate(orders):
-                        if order.get('id') == order_id:
-                            orders[i]['user_address_id'] = user_address_id
-                            break
-                    dialog_data['orders'] = orders
-                    await update.message.reply_text(
-                        ADDRESS_SAVED_MESSAGE.format(
-                            address=dialog_data['address_input']
-                        )
+        async with api_http_client.patch(
+            f'/orders/{order_id}/address',
+            headers=get_auth_headers(telegram_id),
+            json={
+                'telegram_schema': {'telegram_id': telegram_id},
+                'data': {'user_address_id': user_address_id},
+            },
+        ) as response:
+            if response.status not in (200, 201):
+                logger.error(
+                    f'Edit Order: '
+                    f'Failed to update order {order_id} with NEW '
+                    f'address {user_address_id}: '
+                    f'{response.status} {await response.text()}'
+                )
+                await update.message.reply_text(
+                    f"{ERROR_ADDRESS_UPDATE}\nАдрес '{
+                        dialog_data['address_input']
+                    }' "
+                    f'сохранен, но не применен к заказу #{order_id}.'
+                )
+            else:
+                orders = dialog_data.get('orders', [])
+                for i, order in enumerate(orders):
+                    if order.get('id') == order_id:
+                        orders[i]['user_address_id'] = user_address_id
+                        break
+                dialog_data['orders'] = orders
+                await update.message.reply_text(
+                    ADDRESS_SAVED_MESSAGE.format(
+                        address=dialog_data['address_input']
                     )
-                    dialog_data.pop('address_input', None)
+                )
+                dialog_data.pop('address_input', None)
 
     await context.bot.send_message(
         chat_id=chat_id,
@@ -678,27 +669,26 @@ async def repeat_order(update: Update, context: CallbackContext) -> int:
         return ConversationHandler.END
 
     new_order_details = None
-    async with ClientSession() as session:
-        try:
-            async with session.post(
-                f'{API_BASE_URL}/orders/{order_id_to_repeat}/repeat_direct',
-                headers=get_auth_headers(telegram_id),
-                json={'telegram_id': telegram_id},
-            ) as response:
-                if response.status != 200:
-                    logger.error(
-                        f'Failed to repeat order {order_id_to_repeat}: '
-                        f'{response.status} {await response.text()}'
-                    )
-                    await query.edit_message_text(ERROR_REPEAT_ORDER)
-                    return AWAITING_ORDER_DETAILS
-                new_order_details = await response.json()
-                if not new_order_details or 'id' not in new_order_details:
-                    raise ValueError('Invalid response on repeat order')
-        except Exception as e:
-            logger.exception('Repeat order failed:')
-            await query.edit_message_text(f'{ERROR_REPEAT_ORDER}: {e}')
-            return AWAITING_ORDER_DETAILS
+    try:
+        async with api_http_client.post(
+            f'/orders/{order_id_to_repeat}/repeat_direct',
+            headers=get_auth_headers(telegram_id),
+            json={'telegram_id': telegram_id},
+        ) as response:
+            if response.status != 200:
+                logger.error(
+                    f'Failed to repeat order {order_id_to_repeat}: '
+                    f'{response.status} {await response.text()}'
+                )
+                await query.edit_message_text(ERROR_REPEAT_ORDER)
+                return AWAITING_ORDER_DETAILS
+            new_order_details = await response.json()
+            if not new_order_details or 'id' not in new_order_details:
+                raise ValueError('Invalid response on repeat order')
+    except Exception as e:
+        logger.exception('Repeat order failed:')
+        await query.edit_message_text(f'{ERROR_REPEAT_ORDER}: {e}')
+        return AWAITING_ORDER_DETAILS
 
     new_order_id = new_order_details['id']
     dialog_data['new_order_details'] = new_order_details
@@ -769,48 +759,46 @@ async def repeat_set_existing_address(
         context.user_data.pop(DIALOG_DATA, None)
         return ConversationHandler.END
 
-    async with ClientSession() as session:
-        async with session.patch(
-            f'{API_BASE_URL}/orders/{new_order_id}/address',
-            headers=get_auth_headers(telegram_id),
-            json={
-                'telegram_schema': {'telegram_id': telegram_id},
-                'data': {'user_address_id': user_address_id},
-            },
-        ) as response:
-            if response.status not in (200, 201):
-                logger.error(
-                    f'Repeat: '
-                    f'Failed to set address for order {new_order_id} to '
-                    f'{user_address_id}: '
-                    f'{response.status} {await response.text()}'
-                )
-                await query.edit_message_text(ERROR_ADDRESS_UPDATE)
-                await context.bot.send_message(
-                    chat_id=query.message.chat_id,
-                    text=(
-                        'Не удалось применить адрес. '
-                        'Попробуйте повторить заказ.'
-                    ),
-                )
-                context.user_data.pop(DIALOG_DATA, None)
-                return ConversationHandler.END
-            address_text = dialog_data.get('addresses_map', {}).get(
-                user_address_id, f'ID: {user_address_id}'
-            )
-            order_summary = '\n'.join(
-                f'{item["firework"]["name"]}: {item["amount"]} шт.'
-                for item in new_order_details.get('order_fireworks', [])
+    async with api_http_client.patch(
+        f'/orders/{new_order_id}/address',
+        headers=get_auth_headers(telegram_id),
+        json={
+            'telegram_schema': {'telegram_id': telegram_id},
+            'data': {'user_address_id': user_address_id},
+        },
+    ) as response:
+        if response.status not in (200, 201):
+            logger.error(
+                f'Repeat: '
+                f'Failed to set address for order {new_order_id} to '
+                f'{user_address_id}: '
+                f'{response.status} {await response.text()}'
             )
-            await query.edit_message_text(
-                REPEAT_ORDER_CONFIRMED_MESSAGE.format(
-                    order_id=new_order_id, address=address_text
-                )
-                + f'\n\nСостав:\n{order_summary}\nИтого: '
-                f'{new_order_details.get("total", 0)} руб.'
+            await query.edit_message_text(ERROR_ADDRESS_UPDATE)
+            await context.bot.send_message(
+                chat_id=query.message.chat_id,
+                text=(
+                    'Не удалось применить адрес. Попробуйте повторить заказ.'
+                ),
             )
             context.user_data.pop(DIALOG_DATA, None)
             return ConversationHandler.END
+        address_text = dialog_data.get('addresses_map', {}).get(
+            user_address_id, f'ID: {user_address_id}'
+        )
+        order_summary = '\n'.join(
+            f'{item["firework"]["name"]}: {item["amount"]} шт.'
+            for item in new_order_details.get('order_fireworks', [])
+        )
+        await query.edit_message_text(
+            REPEAT_ORDER_CONFIRMED_MESSAGE.format(
+                order_id=new_order_id, address=address_text
+            )
+            + f'\n\nСостав:\n{order_summary}\nИтого: '
+            f'{new_order_details.get("total", 0)} руб.'
+        )
+        context.user_data.pop(DIALOG_DATA, None)
+        return ConversationHandler.END
 
 
 async def repeat_ask_new_address_input(
@@ -918,97 +906,93 @@ async def repeat_handle_new_address_input(
     dialog_data['address_input'] = address_text
     user_address_id = None
 
-    async with ClientSession() as session:
-        try:
-            async with session.post(
-                f'{API_BASE_URL}/addresses',
-                json={'telegram_id': telegram_id, 'address': address_text},
-            ) as response:
-                if response.status not in (201, 200):
-                    logger.error(
-                        f"Repeat: Failed to save address '{address_text}' for "
-                        f'{telegram_id}: '
-                        f'{response.status} {await response.text()}'
-                    )
-                    await update.message.reply_text(
-                        f'{ERROR_ADDRESS_SAVE}\nПопробуйте ввести снова.',
-                        reply_markup=InlineKeyboardMarkup([
-                            [
-                                InlineKeyboardButton(
-                                    'Отмена',
-                                    callback_data=f'repeat_back_to_choice_{
-                                        new_order_id
-                                    }',
-                                )
-                            ]
-                        ]),
-                    )
-                    return AWAITING_NEW_ADDRESS
-                address_data = await response.json()
-                user_address_id = address_data.get('user_address_id')
-                new_address_text = address_data.get('address')
-                if not user_address_id or not new_address_text:
-                    raise ValueError('Invalid address save response')
-                dialog_data.setdefault('addresses_map', {})[
-                    user_address_id
-                ] = new_address_text
-                dialog_data['address_input'] = new_address_text
-        except Exception as e:
-            logger.exception('Repeat: Exception during address save:')
-            await update.message.reply_text(
-                f'{ERROR_ADDRESS_SAVE}: {e}',
-                reply_markup=InlineKeyboardMarkup([
-                    [
-                        InlineKeyboardButton(
-                            'Отмена',
-                            callback_data=f'repeat_back_to_choice_{
-                                new_order_id
-                            }',
-                        )
-                    ]
-                ]),
+    try:
+        async with api_http_client.post(
+            '/addresses',
+            json={'telegram_id': telegram_id, 'address': address_text},
+        ) as response:
+            if response.status not in (201, 200):
+                logger.error(
+                    f"Repeat: Failed to save address '{address_text}' for "
+                    f'{telegram_id}: '
+                    f'{response.status} {await response.text()}'
+                )
+                await update.message.reply_text(
+                    f'{ERROR_ADDRESS_SAVE}\nПопробуйте ввести снова.',
+                    reply_markup=InlineKeyboardMarkup([
+                        [
+                            InlineKeyboardButton(
+                                'Отмена',
+                                callback_data=f'repeat_back_to_choice_{
+                                    new_order_id
+                                }',
+                            )
+                        ]
+                    ]),
+                )
+                return AWAITING_NEW_ADDRESS
+            address_data = await response.json()
+            user_address_id = address_data.get('user_address_id')
+            new_address_text = address_data.get('address')
+            if not user_address_id or not new_address_text:
+                raise ValueError('Invalid address save response')
+            dialog_data.setdefault('addresses_map', {})[user_address_id] = (
+                new_address_text
             )
-            return AWAITING_NEW_ADDRESS
+            dialog_data['address_input'] = new_address_text
+    except Exception as e:
+        logger.exception('Repeat: Exception during address save:')
+        await update.message.reply_text(
+            f'{ERROR_ADDRESS_SAVE}: {e}',
+            reply_markup=InlineKeyboardMarkup([
+                [
+                    InlineKeyboardButton(
+                        'Отмена',
+                        callback_data=f'repeat_back_to_choice_{new_order_id}',
+                    )
+                ]
+            ]),
+        )
+        return AWAITING_NEW_ADDRESS
 
     if user_address_id:
-        async with ClientSession() as session:
-            async with session.patch(
-                f'{API_BASE_URL}/orders/{new_order_id}/address',
-                headers=get_auth_headers(telegram_id),
-                json={
-                    'telegram_schema': {'telegram_id': telegram_id},
-                    'data': {'user_address_id': user_address_id},
-                },
-            ) as response:
-                if response.status not in (200, 201):
-                    logger.error(
-                        f'Repeat: '
-                        f'Failed to update order {new_order_id} with NEW '
-                        f'address {user_address_id}: '
-                        f'{response.status} {await response.text()}'
-                    )
-                    await update.message.reply_text(
-                        f"{ERROR_ADDRESS_UPDATE}\nАдрес '{
-                            dialog_data['address_input']
-                        }' "
-                        f'сохранен, но не применен к заказу #{new_order_id}.'
-                    )
-                    context.user_data.pop(DIALOG_DATA, None)
-                    return ConversationHandler.END
-                order_summary = '\n'.join(
-                    f'{item["firework"]["name"]}: {item["amount"]} шт.'
-                    for item in new_order_details.get('order_fireworks', [])
+        async with api_http_client.patch(
+            f'/orders/{new_order_id}/address',
+            headers=get_auth_headers(telegram_id),
+            json={
+                'telegram_schema': {'telegram_id': telegram_id},
+                'data': {'user_address_id': user_address_id},
+            },
+        ) as response:
+            if response.status not in (200, 201):
+                logger.error(
+                    f'Repeat: '
+                    f'Failed to update order {new_order_id} with NEW '
+                    f'address {user_address_id}: '
+                    f'{response.status} {await response.text()}'
                 )
                 await update.message.reply_text(
-                    REPEAT_ORDER_CONFIRMED_MESSAGE.format(
-                        order_id=new_order_id,
-                        address=dialog_data['address_input'],
-                    )
-                    + f'\n\nСостав:\n{order_summary}\nИтого: '
-                    f'{new_order_details.get("total", 0)} руб.'
+                    f"{ERROR_ADDRESS_UPDATE}\nАдрес '{
+                        dialog_data['address_input']
+                    }' "
+                    f'сохранен, но не применен к заказу #{new_order_id}.'
                 )
                 context.user_data.pop(DIALOG_DATA, None)
                 return ConversationHandler.END
+            order_summary = '\n'.join(
+                f'{item["firework"]["name"]}: {item["amount"]} шт.'
+                for item in new_order_details.get('order_fireworks', [])
+            )
+            await update.message.reply_text(
+                REPEAT_ORDER_CONFIRMED_MESSAGE.format(
+                    order_id=new_order_id,
+                    address=dialog_data['address_input'],
+                )
+                + f'\n\nСостав:\n{order_summary}\nИтого: '
+                f'{new_order_details.get("total", 0)} руб.'
+            )
+            context.user_data.pop(DIALOG_DATA, None)
+            return ConversationHandler.END
     else:
         await update.message.reply_text(
             'Не удалось получить ID сохраненного адреса.'
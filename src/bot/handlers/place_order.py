@@ -2,7 +2,6 @@ import logging
 import re
 from decimal import Decimal
 
-from aiohttp import ClientSession
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup, Update
 from telegram.ext import (
     Application,
@@ -14,7 +13,8 @@ from telegram.ext import (
 )
 
 from src.bot.handlers.cart import delete_cart_messages
-from src.bot.utils import API_BASE_URL, get_user_id_from_telegram
+from src.bot.http_client import api_http_client
+from src.bot.utils import get_user_id_from_telegram
 
 logger = logging.getLogger(__name__)
 
@@ -104,17 +104,16 @@ async def place_order_start(update: Update, context: CallbackContext) -> int:
         await query.message.reply_text('🙀 Пользователь не найден ')
         return ConversationHandler.END
 
-    async with ClientSession() as session:
-        async with session.post(
-            f'{API_BASE_URL}/user/cart/me',
-            json={'telegram_id': update.effective_user.id},
-        ) as response:
-            if response.status != 200:
-                await query.message.reply_textt(
-                    '🆘 - Не удалось загрузить корзину, попробуйте еще'
-                )
-                return ConversationHandler.END
-            cart_items = await response.json()
+    async with api_http_client.post(
+        '/user/cart/me',
+        json={'telegram_id': update.effective_user.id},
+    ) as response:
+        if response.status != 200:
+            await query.message.reply_textt(
+                '🆘 - Не удалось загрузить корзину, попробуйте еще'
+            )
+            return ConversationHandler.END
+        cart_items = await response.json()
 
     if not cart_items:
         await query.message.reply_text(
@@ -164,29 +163,28 @@ async def confirm_cart(update: Update, context: CallbackContext) -> int:
     dialog_data = context.user_data[DIALOG_DATA]
     telegram_id = dialog_data['telegram_id']
 
-    async with ClientSession() as session:
-        async with session.post(
-            f'{API_BASE_URL}/orders/',
-            json={'telegram_id': telegram_id},
-        ) as response:
-            if response.status != 200:
-                await query.edit_message_text(
-                    f'😿 Ошибка при создании заказа: {await response.text()}'
-                )
-                return ConversationHandler.END
-            order = await response.json()
-            dialog_data['order_id'] = order['id']
-
-        async with session.post(
-            f'{API_BASE_URL}/useraddresses/me',
-            json={'telegram_id': telegram_id},
-        ) as response:
-            if response.status != 200:
-                await query.edit_message_text('😿 Ошибка при загрузке адресов')
-                return ConversationHandler.END
-            user_addresses = await response.json()
-            dialog_data['user_addresses'] = user_addresses
-            logger.info(f'User addresses response: {user_addresses}')
+    async with api_http_client.post(
+        '/orders/',
+        json={'telegram_id': telegram_id},
+    ) as response:
+        if response.status != 200:
+            await query.edit_message_text(
+                f'😿 Ошибка при создании заказа: {await response.text()}'
+            )
+            return ConversationHandler.END
+        order = await response.json()
+        dialog_data['order_id'] = order['id']
+
+    async with api_http_client.post(
+        '/useraddresses/me',
+        json={'telegram_id': telegram_id},
+    ) as response:
+        if response.status != 200:
+            await query.edit_message_text('😿 Ошибка при загрузке адресов')
+            return ConversationHandler.END
+        user_addresses = await response.json()
+        dialog_data['user_addresses'] = user_addresses
+        logger.info(f'User addresses response: {user_addresses}')
 
     if not user_addresses:
         await query.edit_message_text(PLACE_ORDER_ADDRESS_PROMPT)
@@ -303,21 +301,20 @@ async def handle_operator_call(
             'operator_call': operator_call,
         },
     }
-    async with ClientSession() as session:
-        async with session.patch(
-            f'{API_BASE_URL}/orders/{order_id}/address',
-            json=json_data,
-        ) as response:
-            response_text = await response.text()
-            logger.info(
-                f'PATCH /orders/{order_id}/address response: '
-                f'status={response.status}, body={response_text}'
+    async with api_http_client.patch(
+        f'/orders/{order_id}/address',
+        json=json_data,
+    ) as response:
+        response_text = await response.text()
+        logger.info(
+            f'PATCH /orders/{order_id}/address response: '
+            f'status={response.status}, body={response_text}'
+        )
+        if response.status not in (200, 201):
+            await query.edit_message_text(
+                f'😿 Ошибка при обновлении заказа: {response_text}'
             )
-            if response.status not in (200, 201):
-                await query.edit_message_text(
-                    f'😿 Ошибка при обновлении заказа: {response_text}'
-                )
-                return ConversationHandler.END
+            return ConversationHandler.END
 
     confirmation_text = PLACE_ORDER_CONFIRMATION_MESSAGE.format(
         order_id=order_id
@@ -347,59 +344,56 @@ async def handle_save_address(update: Update, context: CallbackContext) -> int:
     order_id = dialog_data['order_id']
 
     if query.data == 'save_yes':
-        async with ClientSession() as session:
-            async with session.post(
-                f'{API_BASE_URL}/addresses/',
-                json={
-                    'telegram_schema': {'telegram_id': telegram_id},
-                    'create_data': {
-                        'telegram_id': telegram_id,
-                        'address': dialog_data['address'],
-                    },
-                },
-            ) as response:
-                response_text = await response.text()
-                logger.info(
-                    f'POST /addresses/ response: '
-                    f'status={response.status}, body={response_text}'
-                )
-                if response.status != 201:
-                    logger.error(f'Failed to save address: {response_text}')
-                    await query.edit_message_text(
-                        '✅ Заказ оформлен, ‼️ но адрес не удалось сохранить'
-                    )
-                    return ConversationHandler.END
-                address_data = await response.json()
-                dialog_data['user_address_id'] = address_data[
-                    'user_address_id'
-                ]
-
-            json_data = {
+        async with api_http_client.post(
+            '/addresses/',
+            json={
                 'telegram_schema': {'telegram_id': telegram_id},
-                'data': {
-                    'user_address_id': dialog_data['user_address_id'],
-                    'fio': dialog_data['fio'],
-                    'phone': dialog_data['phone'],
-                    'operator_call': dialog_data['operator_call'],
+                'create_data': {
+                    'telegram_id': telegram_id,
+                    'address': dialog_data['address'],
                 },
-            }
-            async with session.patch(
-                f'{API_BASE_URL}/orders/{order_id}/address',
-                json=json_data,
-            ) as response:
-                response_text = await response.text()
-                logger.info(
-                    f'PATCH /orders/{order_id}/address response: '
-                    f'status={response.status}, body={response_text}'
+            },
+        ) as response:
+            response_text = await response.text()
+            logger.info(
+                f'POST /addresses/ response: '
+                f'status={response.status}, body={response_text}'
+            )
+            if response.status != 201:
+                logger.error(f'Failed to save address: {response_text}')
+                await query.edit_message_text(
+                    '✅ Заказ оформлен, ‼️ но адрес не удалось сохранить'
                 )
-                if response.status not in (200, 201):
-                    logger.error(
-                        f'Failed to update order with address: {response_text}'
-                    )
-                    await query.edit_message_text(
-                        '✅ Заказ оформлен, ‼️ но адрес не удалось привязать.'
-                    )
-                    return ConversationHandler.END
+                return ConversationHandler.END
+            address_data = await response.json()
+            dialog_data['user_address_id'] = address_data['user_address_id']
+
+        json_data = {
+            'telegram_schema': {'telegram_id': telegram_id},
+            'data': {
+                'user_address_id': dialog_data['user_address_id'],
+                'fio': dialog_data['fio'],
+                'phone': dialog_data['phone'],
+                'operator_call': dialog_data['operator_call'],
+            },
+        }
+        async with api_http_client.patch(
+            f'/orders/{order_id}/address',
+            json=json_data,
+        ) as response:
+            response_text = await response.text()
+            logger.info(
+                f'PATCH /orders/{order_id}/address response: '
+                f'status={response.status}, body={response_text}'
+            )
+            if response.status not in (200, 201):
+                logger.error(
+                    f'Failed to update order with address: {response_text}'
+                )
+                await query.edit_message_text(
+                    '✅ Заказ оформлен, ‼️ но адрес не удалось привязать.'
+                )
+                return ConversationHandler.END
 
         await query.edit_message_text('✅ Заказ оформлен, адрес сохранён!')
     else:
@@ -416,16 +410,15 @@ async def cancel(update: Update, context: CallbackContext) -> int:
     if dialog_data.get('order_id'):
         telegram_id = dialog_data['telegram_id']
         order_id = dialog_data['order_id']
-        async with ClientSession() as session:
-            async with session.patch(
-                f'{API_BASE_URL}/orders/{order_id}/status',
-                json={'telegram_id': telegram_id, 'status_id': 3},
-            ) as response:
-                if response.status != 200:
-                    logger.error(
-                        f'Failed to cancel order {order_id}:'
-                        f' {await response.text()}'
-                    )
+        async with api_http_client.patch(
+            f'/orders/{order_id}/status',
+            json={'telegram_id': telegram_id, 'status_id': 3},
+        ) as response:
+            if response.status != 200:
+                logger.error(
+                    f'Failed to cancel order {order_id}:'
+                    f' {await response.text()}'
+                )
     await query.edit_message_text('Оформление заказа отменено 💔')
     context.user_data.pop(DIALOG_DATA, None)
     return ConversationHandler.END
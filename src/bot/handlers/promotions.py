@@ -11,11 +11,12 @@
 from datetime import datetime, timedelta
 from decimal import Decimal
 
-from aiohttp import ClientSession
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup, Update
 from telegram.ext import CallbackContext
 from telegram.helpers import escape_markdown
 
+from src.bot.http_client import api_http_client
+
 # Данные для тестов
 MOCK_DISCOUNTS = [
     {
@@ -40,7 +41,6 @@ MOCK_FIREWORKS = {
     for i in range(1, 100)
 }
 
-API_URL = 'http://nginx:8000'
 
 ITEMS_PER_PAGE = 1
 PROMO_PER_PAGE = 1
@@ -81,9 +81,8 @@ async def show_promotions_list(
 ):
     """Показать список акций с пагинацией."""
     try:
-        async with ClientSession() as session:
-            async with session.get(f'{API_URL}/discounts') as response:
-                discounts = await response.json()
+        async with api_http_client.get('/discounts') as response:
+            discounts = await response.json()
 
         total_pages = (len(discounts) + PROMO_PER_PAGE - 1) // PROMO_PER_PAGE
         start_idx = (page - 1) * PROMO_PER_PAGE
@@ -168,11 +167,8 @@ async def show_promo_details(
     """Показать товары акции с пагинацией и упрощенными карточками."""
     try:
         # Тестовые данные вместо API
-        async with ClientSession() as session:
-            async with session.get(
-                f'{API_URL}/discounts/{promo_id}'
-            ) as response:
-                all_fireworks = await response.json()
+        async with api_http_client.get(f'/discounts/{promo_id}') as response:
+            all_fireworks = await response.json()
 
         # Пагинация
         total_pages = (
@@ -0,0 +1,160 @@
+"""Файл с обработчиками поиска товаров."""
+
+from html import escape
+
+from telegram import InlineKeyboardMarkup, Update
+from telegram.constants import ParseMode
+from telegram.ext import (
+    ApplicationBuilder,
+    CallbackQueryHandler,
+    ContextTypes,
+    ConversationHandler,
+    MessageHandler,
+    filters,
+)
+
+from src.bot.api_client import APIClientError, api_client
+from src.bot.handlers.catalog import (
+    EMPTY_PRICE_MESSAGE,
+    EMPTY_QUERY_MESSAGE,
+    MAIN_MENU_CALLBACK,
+    NAVIGATION_MESSAGE,
+    build_show_all_products_keyboard,
+    keyboard_back,
+)
+from src.bot.keyboards import keyboard_main
+from src.schemas.product import FireworkSearchResult
+
+SEARCH_QUERY = 0
+
+SEARCH_CALLBACK = 'search'
+SEARCH_RESULTS_LIMIT = 5
+SEARCH_QUERY_MIN_LENGTH = 2
+SEARCH_QUERY_MAX_LENGTH = 100
+
+WRITE_SEARCH_QUERY_MESSAGE = (
+    '🔎 Введите название, артикул или слова из описания товара:'
+)
+SHORT_SEARCH_QUERY_MESSAGE = (
+    f'✏️ Запрос должен содержать от {SEARCH_QUERY_MIN_LENGTH} '
+    f'до {SEARCH_QUERY_MAX_LENGTH} символов. Попробуйте еще раз:'
+)
+SEARCH_ERROR_MESSAGE = 'Ошибка поиска❗ Код: {code}'
+SEARCH_CANCEL_MESSAGE = 'Выберите пункт меню:'
+
+SEARCH_RESULT_CARD = """
+🎆 {name} 🎆
+────────────────
+💰 Цена: {price}
+{snippet}"""
+
+# ts_headline выделяет совпадения тегами <b></b>, остальной текст
+# экранируется, чтобы описание товара не ломало HTML-разметку.
+HIGHLIGHT_TAGS = {'&lt;b&gt;': '<b>', '&lt;/b&gt;': '</b>'}
+
+
+def escape_highlight(text: str | None) -> str:
+    """Экранирует текст, сохраняя выделение совпадений."""
+    if not text:
+        return ''
+    text = escape(text, quote=False)
+    for escaped_tag, tag in HIGHLIGHT_TAGS.items():
+        text = text.replace(escaped_tag, tag)
+    return text
+
+
+def build_search_card(result: FireworkSearchResult) -> str:
+    """Карточка найденного товара с подсвеченными совпадениями."""
+    price = result.firework.price
+    return SEARCH_RESULT_CARD.format(
+        name=escape_highlight(result.name_highlight),
+        price=f'{price} ₽' if price else EMPTY_PRICE_MESSAGE,
+        snippet=escape_highlight(result.snippet),
+    )
+
+
+async def start_search(
+    update: Update, context: ContextTypes.DEFAULT_TYPE
+) -> int:
+    """Просит пользователя ввести поисковый запрос."""
+    query = update.callback_query
+    await query.answer()
+    await query.message.reply_text(
+        WRITE_SEARCH_QUERY_MESSAGE,
+        reply_markup=InlineKeyboardMarkup(keyboard_back),
+    )
+    return SEARCH_QUERY
+
+
+async def handle_search_query(
+    update: Update, context: ContextTypes.DEFAULT_TYPE
+) -> int:
+    """Ищет товары по запросу и отправляет найденные карточки."""
+    search_query = ' '.join(update.message.text.split())
+    if not (
+        SEARCH_QUERY_MIN_LENGTH <= len(search_query) <= SEARCH_QUERY_MAX_LENGTH
+    ):
+        await update.message.reply_text(SHORT_SEARCH_QUERY_MESSAGE)
+        return SEARCH_QUERY
+    try:
+        results = await api_client.search_fireworks(
+            search_query, limit=SEARCH_RESULTS_LIMIT
+        )
+    except APIClientError as error:
+        await update.message.reply_text(
+            SEARCH_ERROR_MESSAGE.format(code=error.status),
+            reply_markup=InlineKeyboardMarkup(keyboard_back),
+        )
+        return ConversationHandler.END
+    if not results:
+        await update.message.reply_text(
+            EMPTY_QUERY_MESSAGE,
+            reply_markup=InlineKeyboardMarkup(keyboard_back),
+        )
+        return ConversationHandler.END
+    for result in results:
+        await update.message.reply_text(
+            build_search_card(result),
+            parse_mode=ParseMode.HTML,
+            reply_markup=InlineKeyboardMarkup(
+                build_show_all_products_keyboard(result.firework.id)
+            ),
+        )
+    await update.message.reply_text(
+        NAVIGATION_MESSAGE, reply_markup=InlineKeyboardMarkup(keyboard_back)
+    )
+    return ConversationHandler.END
+
+
+async def cancel_search(
+    update: Update, context: ContextTypes.DEFAULT_TYPE
+) -> int:
+    """Выход из поиска в главное меню."""
+    query = update.callback_query
+    await query.answer()
+    await query.message.reply_text(
+        SEARCH_CANCEL_MESSAGE,
+        reply_markup=InlineKeyboardMarkup(keyboard_main),
+    )
+    return ConversationHandler.END
+
+
+def setup_search_handler(application: ApplicationBuilder) -> None:
+    search_conv_handler = ConversationHandler(
+        entry_points=[
+            CallbackQueryHandler(start_search, pattern=f'^{SEARCH_CALLBACK}$')
+        ],
+        states={
+            SEARCH_QUERY: [
+                MessageHandler(
+                    filters.TEXT & ~filters.COMMAND, handle_search_query
+                ),
+            ],
+        },
+        fallbacks=[
+            CallbackQueryHandler(
+                cancel_search, pattern=f'^{MAIN_MENU_CALLBACK}$'
+            )
+        ],
+    )
+    application.add_handler(search_conv_handler)
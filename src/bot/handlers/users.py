@@ -1,7 +1,6 @@
 import logging
 from typing import List
 
-from aiohttp import ClientSession
 from telegram import (
     InlineKeyboardButton,
     InlineKeyboardMarkup,
@@ -19,9 +18,9 @@ from telegram.ext import (
     filters,
 )
 
+from src.bot.http_client import api_http_client
 from src.bot.keyboards import keyboard_main  # Импортируем keyboard_main
 
-API_URL = 'http://nginx:8000'
 (
     MAIN_MENU,
     EDIT_PROFILE,
@@ -260,25 +259,23 @@ class TelegramUserManager:
 
     async def _fetch_user_data(self, telegram_id: int) -> dict | None:
         """Общая функция для получения данных пользователя."""
-        async with ClientSession() as session:
-            async with session.post(
-                f'{API_URL}/users',
-                json={'telegram_id': telegram_id},
-            ) as response:
-                if response.status == 200:
-                    return await response.json()
-                return None
+        async with api_http_client.post(
+            '/users',
+            json={'telegram_id': telegram_id},
+        ) as response:
+            if response.status == 200:
+                return await response.json()
+            return None
 
     async def _admin_fetch_user_data(self, telegram_id: int) -> dict | None:
         """Общая функция для получения данных пользователя."""
-        async with ClientSession() as session:
-            async with session.post(
-                f'{API_URL}/moderator',
-                json={'telegram_id': telegram_id},
-            ) as response:
-                if response.status == 200:
-                    return await response.json()
-                return None
+        async with api_http_client.post(
+            '/moderator',
+            json={'telegram_id': telegram_id},
+        ) as response:
+            if response.status == 200:
+                return await response.json()
+            return None
 
     def _get_profile_keyboard(self, is_admin: bool) -> List[List[str]]:
         """Клавиатура для редактирования профиля."""
@@ -549,21 +546,20 @@ class TelegramUserManager:
             user_telegram_id = update.effective_user.id
             logging.debug(f'Отправка PATCH-запроса для поля {field}')
 
-            async with ClientSession() as session:
-                async with session.patch(
-                    f'{API_URL}/users',
-                    json={field: value, 'telegram_id': user_telegram_id},
-                ) as response:
-                    response_data = await response.json()
-                    logging.debug(
-                        f'Ответ сервера: {response.status} {response_data}'
-                    )
+            async with api_http_client.patch(
+                '/users',
+                json={field: value, 'telegram_id': user_telegram_id},
+            ) as response:
+                response_data = await response.json()
+                logging.debug(
+                    f'Ответ сервера: {response.status} {response_data}'
+                )
 
-                    if response.status != 200:
-                        error_msg = response_data.get(
-                            'detail', 'Неизвестная ошибка'
-                        )
-                        raise Exception(f'API Error: {error_msg}')
+                if response.status != 200:
+                    error_msg = response_data.get(
+                        'detail', 'Неизвестная ошибка'
+                    )
+                    raise Exception(f'API Error: {error_msg}')
 
         except Exception as e:
             logging.error(f'Ошибка при обновлении профиля: {str(e)}')
@@ -578,24 +574,23 @@ class TelegramUserManager:
             logging.debug(f'Отправка PATCH-запроса для поля {field}')
             print(field, value)
 
-            async with ClientSession() as session:
-                async with session.patch(
-                    f'{API_URL}/moderator/update-profile/',
-                    json={
-                        'admin_schema': {field: value},
-                        'telegram_schema': {'telegram_id': user_telegram_id},
-                    },
-                ) as response:
-                    response_data = await response.json()
-                    logging.debug(
-                        f'Ответ сервера: {response.status} {response_data}'
-                    )
+            async with api_http_client.patch(
+                '/moderator/update-profile/',
+                json={
+                    'admin_schema': {field: value},
+                    'telegram_schema': {'telegram_id': user_telegram_id},
+                },
+            ) as response:
+                response_data = await response.json()
+                logging.debug(
+                    f'Ответ сервера: {response.status} {response_data}'
+                )
 
-                    if response.status != 200:
-                        error_msg = response_data.get(
-                            'detail', 'Неизвестная ошибка'
-                        )
-                        raise Exception(f'API Error: {error_msg}')
+                if response.status != 200:
+                    error_msg = response_data.get(
+                        'detail', 'Неизвестная ошибка'
+                    )
+                    raise Exception(f'API Error: {error_msg}')
 
         except Exception as e:
             logging.error(f'Ошибка при обновлении профиля: {str(e)}')
@@ -645,25 +640,24 @@ class TelegramUserManager:
                 )
                 return False
 
-            async with ClientSession() as session:
-                async with session.post(
-                    f'{API_URL}/auth/telegram-register',
-                    json={
-                        'telegram_id': update.effective_user.id,
-                        'name': update.effective_user.full_name,
-                        'age_verified': True,
-                    },
-                ) as response:
-                    print(response.status)
-                    if response.status == 200:
-                        user_data = await response.json()
-                        is_admin = user_data.get('is_admin', False)
-                        await update.message.reply_text(
-                            '✅ Регистрация успешно завершена!',
-                            reply_markup=self.main_keyboard(is_admin),
-                        )
-                        return True
-                    return False
+            async with api_http_client.post(
+                '/auth/telegram-register',
+                json={
+                    'telegram_id': update.effective_user.id,
+                    'name': update.effective_user.full_name,
+                    'age_verified': True,
+                },
+            ) as response:
+                print(response.status)
+                if response.status == 200:
+                    user_data = await response.json()
+                    is_admin = user_data.get('is_admin', False)
+                    await update.message.reply_text(
+                        '✅ Регистрация успешно завершена!',
+                        reply_markup=self.main_keyboard(is_admin),
+                    )
+                    return True
+                return False
         except ValueError:
             await update.message.reply_text('Введите число!')
             return False
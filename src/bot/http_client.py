@@ -0,0 +1,194 @@
+"""Общий пул HTTP-соединений бота.
+
+Содержит:
+- Класс APIHttpClient: keep-alive пул соединений с лимитами,
+    таймаутами и повторами запросов.
+- Объект api_http_client, который создается один раз на все приложение.
+    Запускается в post_init и закрывается в post_shutdown (src/bot/main.py).
+"""
+
+import asyncio
+import logging
+import ssl
+from contextlib import asynccontextmanager
+from typing import Any, AsyncContextManager, AsyncIterator
+
+import aiohttp
+import certifi
+
+from src.bot import config
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'})
+# Ошибка, при которой запрос гарантированно не был отправлен:
+# не удалось соединиться. Повторяется для любого метода.
+SAFE_RETRY_ERRORS = (aiohttp.ClientConnectorError,)
+# Ошибки, после которых сервер мог успеть обработать запрос (например,
+# закрыл соединение, не отправив ответ). Повторяются только для
+# идемпотентных методов, чтобы заказ или товар в корзине
+# не создались дважды.
+IDEMPOTENT_RETRY_ERRORS = (
+    aiohttp.ServerDisconnectedError,
+    asyncio.TimeoutError,
+    aiohttp.ServerTimeoutError,
+)
+
+RETRY_MESSAGE = 'Повтор запроса {method} {url} ({attempt}/{attempts}): {error}'
+
+
+class APIHttpClient:
+    """Пул keep-alive соединений бота.
+
+    Одна aiohttp-сессия переиспользует TCP-соединения между нажатиями
+    кнопок, поэтому запросы не платят за установку соединения.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        limit: int = config.API_POOL_LIMIT,
+        limit_per_host: int = config.API_POOL_LIMIT_PER_HOST,
+        keepalive_timeout: float = config.API_KEEPALIVE_TIMEOUT,
+        request_timeout: float = config.API_REQUEST_TIMEOUT,
+        connect_timeout: float = config.API_CONNECT_TIMEOUT,
+        retries: int = config.API_RETRIES,
+        retry_backoff: float = config.API_RETRY_BACKOFF,
+    ) -> None:
+        """Сохраняет настройки пула. Сессия создается в start().
+
+        Аргументы:
+            1. base_url (str): адрес API, к которому добавляются пути.
+            2. limit (int): общий лимит соединений пула.
+            3. limit_per_host (int): лимит соединений на один хост.
+            4. keepalive_timeout (float): время жизни простаивающего
+                соединения, в секундах.
+            5. request_timeout (float): таймаут всего запроса, в секундах.
+            6. connect_timeout (float): таймаут соединения, в секундах.
+            7. retries (int): количество повторов при ошибках соединения.
+            8. retry_backoff (float): базовая пауза между повторами.
+        """
+        self.base_url = base_url.rstrip('/')
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.timeout = aiohttp.ClientTimeout(
+            total=request_timeout, connect=connect_timeout
+        )
+        self.retries = retries
+        self.retry_backoff = retry_backoff
+        self._session: aiohttp.ClientSession | None = None
+
+    @property
+    def is_started(self) -> bool:
+        return self._session is not None and not self._session.closed
+
+    async def start(self) -> None:
+        """Создает сессию с пулом соединений."""
+        if self.is_started:
+            return
+        connector = aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            ttl_dns_cache=300,
+            ssl=ssl.create_default_context(cafile=certifi.where()),
+        )
+        self._session = aiohttp.ClientSession(
+            connector=connector, timeout=self.timeout
+        )
+        logger.info(
+            'HTTP-пул бота запущен: limit=%s, limit_per_host=%s',
+            self.limit,
+            self.limit_per_host,
+        )
+
+    async def close(self) -> None:
+        """Закрывает сессию и все открытые соединения пула."""
+        if self.is_started:
+            await self._session.close()
+            logger.info('HTTP-пул бота закрыт')
+        self._session = None
+
+    async def get_session(self) -> aiohttp.ClientSession:
+        """Возвращает сессию пула, при необходимости запуская ее."""
+        if not self.is_started:
+            await self.start()
+        return self._session
+
+    def build_url(self, url: str) -> str:
+        """Достраивает путь до полного адреса API.
+
+        Абсолютные адреса (ссылки пагинации, внешние сервисы)
+        возвращаются без изменений.
+        """
+        if url.startswith(('http://', 'https://')):
+            return url
+        return f'{self.base_url}/{url.lstrip("/")}'
+
+    def _can_retry(self, method: str, error: Exception) -> bool:
+        if isinstance(error, SAFE_RETRY_ERRORS):
+            return True
+        return method in IDEMPOTENT_METHODS and isinstance(
+            error, IDEMPOTENT_RETRY_ERRORS
+        )
+
+    @asynccontextmanager
+    async def request(
+        self, method: str, url: str, **kwargs: Any
+    ) -> AsyncIterator[aiohttp.ClientResponse]:
+        """Выполняет запрос через общий пул с повторами.
+
+        Используется так же, как методы aiohttp.ClientSession:
+
+            async with api_http_client.post('/users', json=data) as resp:
+                data = await resp.json()
+        """
+        method = method.upper()
+        full_url = self.build_url(url)
+        session = await self.get_session()
+        attempts = self.retries + 1
+        for attempt in range(1, attempts + 1):
+            try:
+                response = await session.request(method, full_url, **kwargs)
+                break
+            except (*SAFE_RETRY_ERRORS, *IDEMPOTENT_RETRY_ERRORS) as error:
+                if attempt == attempts or not self._can_retry(method, error):
+                    raise
+                logger.warning(
+                    RETRY_MESSAGE.format(
+                        method=method,
+                        url=full_url,
+                        attempt=attempt,
+                        attempts=attempts,
+                        error=repr(error),
+                    )
+                )
+                await asyncio.sleep(self.retry_backoff * 2 ** (attempt - 1))
+        try:
+            yield response
+        finally:
+            response.release()
+
+    def get(
+        self, url: str, **kwargs: Any
+    ) -> AsyncContextManager[aiohttp.ClientResponse]:
+        return self.request('GET', url, **kwargs)
+
+    def post(
+        self, url: str, **kwargs: Any
+    ) -> AsyncContextManager[aiohttp.ClientResponse]:
+        return self.request('POST', url, **kwargs)
+
+    def patch(
+        self, url: str, **kwargs: Any
+    ) -> AsyncContextManager[aiohttp.ClientResponse]:
+        return self.request('PATCH', url, **kwargs)
+
+    def delete(
+        self, url: str, **kwargs: Any
+    ) -> AsyncContextManager[aiohttp.ClientResponse]:
+        return self.request('DELETE', url, **kwargs)
+
+
+api_http_client = APIHttpClient(config.API_BASE_URL)
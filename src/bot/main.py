@@ -1,13 +1,13 @@
 import asyncio
 import logging
 
-import httpx
 from telegram import (
     InlineKeyboardButton,
     InlineKeyboardMarkup,
     Update,
 )
 from telegram.ext import (
+    Application,
     ApplicationBuilder,
     CallbackContext,
     CallbackQueryHandler,
@@ -16,6 +16,7 @@ from telegram.ext import (
 )
 
 from src.bot import config
+from src.bot.api_client import APIClientError, api_client
 from src.bot.handlers.bot_info import show_bot_info
 from src.bot.handlers.cart import (
     checkout,
@@ -40,13 +41,14 @@ from src.bot.handlers.place_order import (
     register_handlers as register_place_order,
 )
 from src.bot.handlers.promotions import promotions_handler
+from src.bot.handlers.search import setup_search_handler
 from src.bot.handlers.select_filters import (
     apply_filtering,
     setup_select_filters,
 )
 from src.bot.handlers.users import TelegramUserManager
+from src.bot.http_client import api_http_client
 from src.bot.keyboards import keyboard_main, orders_summary_keyboard
-from src.bot.utils import API_BASE_URL
 from src.utils.scheduler.send_newsletter import handle_tag_callback
 
 logging.basicConfig(
@@ -127,15 +129,11 @@ async def button(update: Update, context: CallbackContext):
         await query.message.chat.send_message(
             '⛔ История заказов временно недоступна. Функция в разработке.'
         )
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f'{API_BASE_URL}/orders/me',
-                json={'telegram_id': update.effective_user.id},
-            )
-            if response.status_code != 200:
-                await query.edit_message_text('Ошибка при загрузке заказов.')
-                return
-            orders = response.json()
+        try:
+            orders = await api_client.get_orders(update.effective_user.id)
+        except APIClientError:
+            await query.edit_message_text('Ошибка при загрузке заказов.')
+            return
 
         if not orders:
             await query.edit_message_text(
@@ -147,12 +145,12 @@ async def button(update: Update, context: CallbackContext):
             return
 
         active_orders = len([
-            o for o in orders if o['status'] not in ['Delivered', 'Cancelled']
+            o for o in orders if o.status not in ['Delivered', 'Cancelled']
         ])
-        last_order = max(orders, key=lambda x: x['id'])
+        last_order = max(orders, key=lambda x: x.id)
         # Предполагаем, что id увеличивается
-        last_order_id = last_order['id']
-        last_order_status = last_order['status']
+        last_order_id = last_order.id
+        last_order_status = last_order.status
 
         summary_text = (
             '📦 *Ваши заказы*\n'
@@ -170,9 +168,25 @@ async def button(update: Update, context: CallbackContext):
     # await user_manager.refresh_keyboard(update)
 
 
+async def on_startup(application: Application) -> None:
+    """Открывает общий пул соединений с API при старте бота."""
+    await api_http_client.start()
+
+
+async def on_shutdown(application: Application) -> None:
+    """Закрывает пул соединений с API при остановке бота."""
+    await api_http_client.close()
+
+
 def main() -> None:
     print(f'Loaded TOKEN: {config.TOKEN}')
-    application = ApplicationBuilder().token(config.TOKEN).build()
+    application = (
+        ApplicationBuilder()
+        .token(config.TOKEN)
+        .post_init(on_startup)
+        .post_shutdown(on_shutdown)
+        .build()
+    )
     application.user_manager = TelegramUserManager(application)
     # application.add_handler(conv_handler)
 
@@ -185,6 +199,7 @@ def main() -> None:
     setup_catalog_handler(application)
     setup_favorites_handler(application)
     setup_select_filters(application)
+    setup_search_handler(application)
     # register_order_history(application)
     # Регистрация хэндлеров из order_history.py
     register_place_order(application)
@@ -1,7 +1,6 @@
 from http import HTTPStatus
 from typing import Callable
 
-import aiohttp
 from telegram import (
     CallbackQuery,
     InlineKeyboardButton,
@@ -14,6 +13,8 @@ from telegram import (
 from telegram.ext import ContextTypes
 from telegram.helpers import escape_markdown
 
+from src.bot.config import API_BASE_URL  # noqa: F401
+from src.bot.http_client import api_http_client
 from src.bot.keyboards import keyboard_back, keyboard_main
 
 MARCDOWN_VERSION = 2
@@ -30,20 +31,16 @@ BAD_REQUEST_MESSAGE = 'Ошибка❗ Код: {code}. Вернуться в м
 CLIENT_CONNECTION_ERROR = '❗Ошибка соединения❗'
 
 
-API_BASE_URL = 'http://nginx:8000'
-
-
 async def get_user_id_from_telegram(update: Update) -> str | None:
     """Получение user_id по telegram_id."""
-    async with aiohttp.ClientSession() as session:
-        async with session.post(
-            f'{API_BASE_URL}/users',
-            json={'telegram_id': update.effective_user.id},
-        ) as response:
-            if response.status == 200:
-                data = await response.json()  # Ждём результат JSON
-                return data.get('id')
-            return None
+    async with api_http_client.post(
+        '/users',
+        json={'telegram_id': update.effective_user.id},
+    ) as response:
+        if response.status == 200:
+            data = await response.json()  # Ждём результат JSON
+            return data.get('id')
+        return None
 
 
 async def return_to_main(query: CallbackQuery) -> None:
@@ -108,67 +105,62 @@ async def get_paginated_response(
     await query.answer()
     next_page_url = previous_page_url = None
     try:
-        async with aiohttp.ClientSession() as session:
-            if method == 'POST':
-                response_context_manager = await session.post(
-                    url, json=request_data
-                )
-            else:
-                response_context_manager = await session.get(url)
-            async with response_context_manager as response:
-                if response.status == HTTPStatus.OK:
-                    data = await response.json()
-                    objects = data[object_key]
-                    if not objects:
-                        await query.message.reply_text(EMPTY_QUERY_MESSAGE)
-                    for obj in objects:
-                        caption = build_object_card(obj, full_info=full_info)
-                        if obj.get('media'):
-                            await show_media(query, context, obj['media'])
-                        await send_callback_message(
-                            query,
-                            caption,
-                            reply_markup=InlineKeyboardMarkup(
-                                object_keyboard_builder(obj['id'])
-                            ),
-                        )
-                    next_page_url = data['next_page_url']
-                    previous_page_url = data['previous_page_url']
-                    if next_page_url:
-                        global_keyboard.append([
-                            InlineKeyboardButton(
-                                NEXT_PAGINATION_MESSAGE,
-                                callback_data=(
-                                    paginate_callback_data_pattern.format(
-                                        url=next_page_url
-                                    )
-                                ),
-                            )
-                        ])
-                    if previous_page_url:
-                        global_keyboard.append([
-                            InlineKeyboardButton(
-                                PREV_PAGINATION_MESSAGE,
-                                callback_data=(
-                                    paginate_callback_data_pattern.format(
-                                        url=previous_page_url
-                                    )
-                                ),
-                            )
-                        ])
-                    await send_callback_message(
-                        query,
-                        NAVIGATION_MESSAGE,
-                        InlineKeyboardMarkup(global_keyboard),
-                    )
-                else:
+        async with api_http_client.request(
+            method, url, json=request_data
+        ) as response:
+            if response.status == HTTPStatus.OK:
+                data = await response.json()
+                objects = data[object_key]
+                if not objects:
+                    await query.message.reply_text(EMPTY_QUERY_MESSAGE)
+                for obj in objects:
+                    caption = build_object_card(obj, full_info=full_info)
+                    if obj.get('media'):
+                        await show_media(query, context, obj['media'])
                     await send_callback_message(
                         query,
-                        croling_content(
-                            BAD_REQUEST_MESSAGE.format(code=response.status)
+                        caption,
+                        reply_markup=InlineKeyboardMarkup(
+                            object_keyboard_builder(obj['id'])
                         ),
-                        InlineKeyboardMarkup(keyboard_back),
                     )
+                next_page_url = data['next_page_url']
+                previous_page_url = data['previous_page_url']
+                if next_page_url:
+                    global_keyboard.append([
+                        InlineKeyboardButton(
+                            NEXT_PAGINATION_MESSAGE,
+                            callback_data=(
+                                paginate_callback_data_pattern.format(
+                                    url=next_page_url
+                                )
+                            ),
+                        )
+                    ])
+                if previous_page_url:
+                    global_keyboard.append([
+                        InlineKeyboardButton(
+                            PREV_PAGINATION_MESSAGE,
+                            callback_data=(
+                                paginate_callback_data_pattern.format(
+                                    url=previous_page_url
+                                )
+                            ),
+                        )
+                    ])
+                await send_callback_message(
+                    query,
+                    NAVIGATION_MESSAGE,
+                    InlineKeyboardMarkup(global_keyboard),
+                )
+            else:
+                await send_callback_message(
+                    query,
+                    croling_content(
+                        BAD_REQUEST_MESSAGE.format(code=response.status)
+                    ),
+                    InlineKeyboardMarkup(keyboard_back),
+                )
     except Exception:
         await send_callback_message(
             query,
@@ -25,7 +25,103 @@ class Settings(BaseSettings):
     verification_token_secret: str = os.getenv('VERIFICATION_SECRET', '123')
     redis_host: str = os.getenv('REDIS_HOST')
     redis_port: str = os.getenv('REDIS_PORT')
+    db_pool_size: int = int(os.getenv('DB_POOL_SIZE', '5'))
+    db_max_overflow: int = int(os.getenv('DB_MAX_OVERFLOW', '10'))
+    catalog_cache_ttl: int = int(os.getenv('CATALOG_CACHE_TTL', '300'))
+    catalog_cache_max_entries: int = int(
+        os.getenv('CATALOG_CACHE_MAX_ENTRIES', '1024')
+    )
+    tag_landing_ttl: int = int(os.getenv('TAG_LANDING_TTL', '86400'))
+    media_store_dir: str = os.getenv('MEDIA_STORE_DIR', 'storage/media/store')
+    media_store_max_size: int = int(
+        os.getenv('MEDIA_STORE_MAX_SIZE', str(2 * 1024**3))
+    )
+    media_store_accel_prefix: str = os.getenv('MEDIA_STORE_ACCEL_PREFIX', '')
+    media_warmup_concurrency: int = int(
+        os.getenv('MEDIA_WARMUP_CONCURRENCY', '8')
+    )
+    media_gateway_pool_limit: int = int(
+        os.getenv('MEDIA_GATEWAY_POOL_LIMIT', '100')
+    )
+    media_gateway_connect_timeout: float = float(
+        os.getenv('MEDIA_GATEWAY_CONNECT_TIMEOUT', '10')
+    )
+    media_gateway_read_timeout: float = float(
+        os.getenv('MEDIA_GATEWAY_READ_TIMEOUT', '60')
+    )
+    media_cache_max_age: int = int(
+        os.getenv('MEDIA_CACHE_MAX_AGE', str(30 * 24 * 3600))
+    )
+    blob_storage: str = os.getenv('BLOB_STORAGE', 'local')
+    blob_storage_dir: str = os.getenv('BLOB_STORAGE_DIR', 'storage/blobs')
+    s3_endpoint_url: str = os.getenv('S3_ENDPOINT_URL', '')
+    s3_bucket: str = os.getenv('S3_BUCKET', '')
+    s3_access_key: str = os.getenv('S3_ACCESS_KEY', '')
+    s3_secret_key: str = os.getenv('S3_SECRET_KEY', '')
+    s3_region: str = os.getenv('S3_REGION', 'us-east-1')
+    image_workers: int = int(os.getenv('IMAGE_WORKERS', '2'))
+    yandex_href_ttl: int = int(os.getenv('YANDEX_HREF_TTL', '1800'))
+    yandex_href_max_entries: int = int(
+        os.getenv('YANDEX_HREF_MAX_ENTRIES', '4096')
+    )
     telegram_token: str = os.getenv('TELEGRAM_BOT_TOKEN')
+    telegram_api_url: str = os.getenv(
+        'TELEGRAM_API_URL', 'https://api.telegram.org/bot'
+    )
+    newsletter_concurrency: int = int(
+        os.getenv('NEWSLETTER_CONCURRENCY', '20')
+    )
+    newsletter_rate_limit: float = float(
+        os.getenv('NEWSLETTER_RATE_LIMIT', '30')
+    )
+    newsletter_chat_interval: float = float(
+        os.getenv('NEWSLETTER_CHAT_INTERVAL', '1')
+    )
+    newsletter_max_retries: int = int(os.getenv('NEWSLETTER_MAX_RETRIES', '3'))
+    newsletter_batch_size: int = int(os.getenv('NEWSLETTER_BATCH_SIZE', '500'))
+    newsletter_delivery_lease: int = int(
+        os.getenv('NEWSLETTER_DELIVERY_LEASE', '600')
+    )
+    newsletter_sweep_interval: float = float(
+        os.getenv('NEWSLETTER_SWEEP_INTERVAL', '600')
+    )
+    newsletter_rollout_check_interval: float = float(
+        os.getenv('NEWSLETTER_ROLLOUT_CHECK_INTERVAL', '60')
+    )
+    newsletter_rollout_max_latency: float = float(
+        os.getenv('NEWSLETTER_ROLLOUT_MAX_LATENCY', '1')
+    )
+    newsletter_rollout_latency_percentile: float = float(
+        os.getenv('NEWSLETTER_ROLLOUT_LATENCY_PERCENTILE', '0.95')
+    )
+    api_latency_window: float = float(os.getenv('API_LATENCY_WINDOW', '60'))
+    api_latency_flush_interval: float = float(
+        os.getenv('API_LATENCY_FLUSH_INTERVAL', '1')
+    )
+    scheduler_in_app: bool = os.getenv(
+        'SCHEDULER_IN_APP', 'false'
+    ).lower() in ('1', 'true', 'yes')
+    scheduler_lock_key: int = int(os.getenv('SCHEDULER_LOCK_KEY', '4242001'))
+    scheduler_leader_check_interval: float = float(
+        os.getenv('SCHEDULER_LEADER_CHECK_INTERVAL', '5')
+    )
+    scheduler_leader_retry_interval: float = float(
+        os.getenv('SCHEDULER_LEADER_RETRY_INTERVAL', '10')
+    )
+    segment_refresh_interval: float = float(
+        os.getenv('SEGMENT_REFRESH_INTERVAL', '300')
+    )
+    segment_full_refresh_interval: float = float(
+        os.getenv('SEGMENT_FULL_REFRESH_INTERVAL', '86400')
+    )
+    csv_import_dir: str = os.getenv('CSV_IMPORT_DIR', 'storage/imports')
+    csv_import_chunk_size: int = int(
+        os.getenv('CSV_IMPORT_CHUNK_SIZE', '2000')
+    )
+    csv_import_poll_interval: float = float(
+        os.getenv('CSV_IMPORT_POLL_INTERVAL', '5')
+    )
+    csv_import_job_lease: int = int(os.getenv('CSV_IMPORT_JOB_LEASE', '600'))
 
     @property
     def database_url(self):
@@ -4,21 +4,27 @@
 - Определения типов: ModelType, CreateSchemaType, UpdateSchemaType.
 - Константу COMMIT_ON для управления автокоммитом.
 - Класс CRUDBaseREAD с безопасными методами get и get_multi.
+    Связи объектов загружаются только через load_options
+    (см. src/crud/load_options.py). Метод get_multi_by_cursor
+    отдает страницы по курсору (см. src/crud/cursor.py).
 - Класс CRUDBase(CRUDBaseREAD) с методами create, update и remove
     для возможности внесения изменений в БД.
 """
 
 from http import HTTPStatus
-from typing import Generic, List, Optional, Type, TypeVar
+from typing import Any, Generic, List, Optional, Sequence, Type, TypeVar
 
 from fastapi import HTTPException
 from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
-from sqlalchemy import and_, asc, desc, func, select
+from sqlalchemy import and_, asc, desc, false, func, or_, select
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm.query import Query
+from sqlalchemy.sql.base import ExecutableOption
+from sqlalchemy.sql.elements import ColumnElement
 
+from src.crud.cursor import BACKWARD, FORWARD, decode_cursor, encode_cursor
 from src.models.base import BaseJFModel
 from src.models.product import Category, Tag
 from src.schemas.filter_shema import FireworkFilterSchema
@@ -54,17 +60,43 @@ DELETE_ERROR_500 = (
 PAGINATION_LIMIT = 10
 PAGINATION_OFFSET = 0
 
+CURSOR_OBJECT_NOT_FOUND_ERROR = (
+    'Объект курсора пагинации (id = {object_id}) не найден.'
+)
+
 
 class CRUDBaseRead(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     """Базовый CRUD-класс только с безопасными методами."""
 
-    def __init__(self, model: Type[ModelType]) -> None:
+    def __init__(
+        self,
+        model: Type[ModelType],
+        load_options: Sequence[ExecutableOption] = (),
+    ) -> None:
         """Инициализирует CRUD-класс с указанной моделью.
 
         Аргументы:
             model: SQLAlchemy-модель, связанная с таблицей в БД.
+            load_options: опции загрузки связей, которые get и get_multi
+                применяют по умолчанию (по умолчанию связи не грузятся).
         """
         self.model = model
+        self.load_options = tuple(load_options)
+
+    def get_load_options(
+        self, options: Optional[Sequence[ExecutableOption]] = None
+    ) -> tuple[ExecutableOption, ...]:
+        """Возвращает опции загрузки для запроса.
+
+        Аргументы:
+            options: опции конкретного запроса. None - опции CRUD-класса,
+                пустая последовательность - без загрузки связей.
+        """
+        return self.load_options if options is None else tuple(options)
+
+    def apply_default_filters(self, query: Query) -> Query:
+        """Фильтры, которые списки объектов применяют всегда."""
+        return query
 
     def apply_filters(
         self, query: Query, filter_schema: FireworkFilterSchema
@@ -124,18 +156,25 @@ class CRUDBaseRead(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         session: AsyncSession,
         filter_schema: Optional[FireworkFilterSchema] = None,
         pagination_schema: PaginationSchema = None,
+        options: Optional[Sequence[ExecutableOption]] = None,
     ) -> Optional[List[ModelType]]:
         """Возвращает все объекты модели.
 
         Аргументы:
             1. session (AsyncSession): объект сессии.
             2. filter_schema (FireworkFilterSchema): схема для фильтрации.
+            3. pagination_schema (PaginationSchema): схема пагинации.
+            4. options: опции загрузки связей (см. get_load_options).
 
         Возвращаемое значение:
             list[self.model]: список всех объектов модели.
         """
-        query = select(self.model)
-        count_query = select(func.count()).select_from(self.model)
+        query = self.apply_default_filters(
+            select(self.model).options(*self.get_load_options(options))
+        )
+        count_query = self.apply_default_filters(
+            select(func.count()).select_from(self.model)
+        )
         if filter_schema:
             query = self.apply_filters(query, filter_schema)
             if filter_schema.order_by:
@@ -149,21 +188,182 @@ class CRUDBaseRead(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         fireworks = await session.execute(query)
         return fireworks.unique().scalars().all(), total
 
+    def get_sort_fields(
+        self, order_by_fields: Optional[list[str]]
+    ) -> list[tuple[ColumnElement, bool]]:
+        """Возвращает поля сортировки с признаком убывания.
+
+        В конец всегда добавляется id, чтобы порядок был строгим.
+        """
+        sort_fields = []
+        for sorted_field in order_by_fields or []:
+            descending = sorted_field.startswith('-')
+            column = getattr(self.model, sorted_field.lstrip('-'))
+            sort_fields.append((column, descending))
+        sort_fields.append((self.model.id, False))
+        return sort_fields
+
+    @staticmethod
+    def _after(
+        column: ColumnElement, value: Any, greater: bool
+    ) -> ColumnElement:
+        """Условие «column строго больше/меньше value».
+
+        NULL считается больше любого значения: так сортирует PostgreSQL
+        (ASC - NULLS LAST, DESC - NULLS FIRST).
+        """
+        if greater:
+            if value is None:
+                return false()
+            return or_(column > value, column.is_(None))
+        if value is None:
+            return column.is_not(None)
+        return column < value
+
+    def apply_keyset(
+        self,
+        query: Query,
+        sort_fields: list[tuple[ColumnElement, bool]],
+        boundary: tuple,
+        forward: bool,
+    ) -> Query:
+        """Оставляет в запросе объекты после граничного.
+
+        Аргументы:
+            query: запрос, к которому применяется условие.
+            sort_fields: поля сортировки (см. get_sort_fields).
+            boundary: значения полей сортировки граничного объекта.
+            forward: True - объекты после границы, False - до нее.
+        """
+        conditions = []
+        equal_so_far = []
+        for (column, descending), value in zip(sort_fields, boundary):
+            greater = descending != forward
+            conditions.append(
+                and_(*equal_so_far, self._after(column, value, greater))
+            )
+            equal_so_far.append(
+                column.is_(None) if value is None else column == value
+            )
+        return query.where(or_(*conditions))
+
+    async def get_multi_by_cursor(
+        self,
+        session: AsyncSession,
+        filter_schema: Optional[FireworkFilterSchema] = None,
+        limit: int = PAGINATION_LIMIT,
+        cursor: Optional[str] = None,
+        order_by: Optional[list[str]] = None,
+        options: Optional[Sequence[ExecutableOption]] = None,
+    ) -> tuple[list[ModelType], Optional[str], Optional[str]]:
+        """Возвращает страницу объектов по курсору.
+
+        В отличие от get_multi не использует OFFSET и не считает
+        количество объектов: страница выбирается по индексу полей
+        сортировки, начиная с граничного объекта курсора.
+
+        Аргументы:
+            1. session (AsyncSession): объект сессии.
+            2. filter_schema (FireworkFilterSchema): схема для фильтрации.
+            3. limit (int): количество объектов на странице.
+            4. cursor (str): курсор страницы, None - первая страница.
+            5. order_by (list[str]): сортировка, если ее нет в фильтрах.
+            6. options: опции загрузки связей (см. get_load_options).
+
+        Возвращаемое значение:
+            tuple: объекты страницы, курсор следующей
+                и курсор предыдущей страницы.
+        """
+        if filter_schema and filter_schema.order_by:
+            order_by = filter_schema.order_by
+        sort_fields = self.get_sort_fields(order_by)
+        query = self.apply_default_filters(
+            select(self.model).options(*self.get_load_options(options))
+        )
+        if filter_schema:
+            query = self.apply_filters(query, filter_schema)
+        direction = FORWARD
+        if cursor:
+            direction, object_id = decode_cursor(cursor)
+            boundary = (
+                await session.execute(
+                    select(*(column for column, _ in sort_fields)).where(
+                        self.model.id == object_id
+                    )
+                )
+            ).first()
+            if boundary is None:
+                raise HTTPException(
+                    status_code=HTTPStatus.BAD_REQUEST,
+                    detail=CURSOR_OBJECT_NOT_FOUND_ERROR.format(
+                        object_id=object_id
+                    ),
+                )
+            query = self.apply_keyset(
+                query, sort_fields, tuple(boundary), direction == FORWARD
+            )
+        backward = direction == BACKWARD
+        query = query.order_by(
+            *(
+                desc(column) if descending != backward else asc(column)
+                for column, descending in sort_fields
+            )
+        ).limit(limit + 1)
+        objects = list((await session.execute(query)).unique().scalars())
+        has_more = len(objects) > limit
+        objects = objects[:limit]
+        if backward:
+            objects.reverse()
+        if not objects:
+            return objects, None, None
+        has_next = has_more if not backward else True
+        has_previous = has_more if backward else cursor is not None
+        next_cursor = (
+            encode_cursor(FORWARD, objects[-1].id) if has_next else None
+        )
+        previous_cursor = (
+            encode_cursor(BACKWARD, objects[0].id) if has_previous else None
+        )
+        return objects, next_cursor, previous_cursor
+
+    async def get_filtered_count(
+        self,
+        session: AsyncSession,
+        filter_schema: Optional[FireworkFilterSchema] = None,
+    ) -> int:
+        """Количество объектов, подходящих под фильтры.
+
+        Используется постраничной выборкой по курсору; результат
+        кешируется на уровне эндпоинта (см. src/service/catalog_cache.py).
+        """
+        count_query = self.apply_default_filters(
+            select(func.count()).select_from(self.model)
+        )
+        if filter_schema:
+            count_query = self.apply_filters(count_query, filter_schema)
+        return (await session.execute(count_query)).scalar()
+
     async def get(
-        self, object_id: int, session: AsyncSession
+        self,
+        object_id: int,
+        session: AsyncSession,
+        options: Optional[Sequence[ExecutableOption]] = None,
     ) -> Optional[ModelType]:
         """Получение объекта по id.
 
         Аргументы:
             1. object_id (int): id объекта.
             2. session (AsyncSession): объект сессии.
+            3. options: опции загрузки связей (см. get_load_options).
 
         Возвращаемое значение:
             self.model: объект модели.
         """
         return (
             await session.execute(
-                select(self.model).where(self.model.id == object_id)
+                select(self.model)
+                .options(*self.get_load_options(options))
+                .where(self.model.id == object_id)
             )
         ).scalar()
 
@@ -0,0 +1,45 @@
+"""Курсоры для постраничной выборки по ключу (keyset pagination).
+
+Курсор - это закодированные направление и id граничного объекта
+страницы. Значения полей сортировки в курсор не попадают: они читаются
+из БД по id, поэтому курсор всегда короткий (укладывается в 64 байта
+callback_data Telegram) и не раскрывает структуру запроса.
+"""
+
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from http import HTTPStatus
+
+from fastapi import HTTPException
+
+FORWARD = 'a'
+BACKWARD = 'b'
+
+INVALID_CURSOR_ERROR = 'Некорректный курсор пагинации: {cursor}'
+
+
+def encode_cursor(direction: str, object_id: int) -> str:
+    """Кодирует направление и id граничного объекта в курсор.
+
+    Аргументы:
+        1. direction (str): FORWARD - следующая страница,
+            BACKWARD - предыдущая.
+        2. object_id (int): id граничного объекта текущей страницы.
+    """
+    raw = f'{direction}{object_id}'.encode()
+    return urlsafe_b64encode(raw).rstrip(b'=').decode()
+
+
+def decode_cursor(cursor: str) -> tuple[str, int]:
+    """Раскодирует курсор в направление и id граничного объекта."""
+    try:
+        padding = '=' * (-len(cursor) % 4)
+        raw = urlsafe_b64decode(cursor + padding).decode()
+        direction, object_id = raw[0], int(raw[1:])
+    except (ValueError, IndexError):
+        direction = object_id = None
+    if direction not in (FORWARD, BACKWARD):
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST,
+            detail=INVALID_CURSOR_ERROR.format(cursor=cursor),
+        )
+    return direction, object_id
@@ -5,6 +5,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.crud.base import CRUDBase, ModelType
+from src.crud.load_options import FIREWORK_DB_OPTIONS
 from src.models.discounts import Discount
 from src.models.product import Firework
 
@@ -45,9 +46,9 @@ class CRUDDiscounts(CRUDBase):
             Фейерверки.
         """
         fireworks = await session.execute(
-            select(Firework).where(
-                Firework.discounts.any(Discount.id == discount_id)
-            )
+            select(Firework)
+            .options(*FIREWORK_DB_OPTIONS)
+            .where(Firework.discounts.any(Discount.id == discount_id))
         )
         return fireworks.unique().scalars().all()
 
@@ -6,6 +6,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload, selectinload
 
+from src.crud.load_options import FIREWORK_DB_OPTIONS
 from src.models.base import BaseJFModel
 from src.models.favorite import FavoriteFirework
 from src.schemas.favourite import FavoriteCreate
@@ -66,7 +67,9 @@ class CRUDFavourite:
         """Метод для получения избранных по telegram_id."""
         query = (
             select(self.model)
-            .options(joinedload(self.model.firework))
+            .options(
+                joinedload(self.model.firework).options(*FIREWORK_DB_OPTIONS)
+            )
             .where(self.model.user_id == user_id)
             .order_by(self.model.created_at)
         )
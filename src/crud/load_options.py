@@ -0,0 +1,23 @@
+"""Стратегии загрузки связей для запросов CRUD.
+
+Связи каталога (Firework, Category, Tag, Media, Discount) объявлены
+с lazy='raise': по умолчанию они не загружаются, а случайное обращение
+к незагруженной связи сразу падает, а не порождает каскад запросов.
+Каждый запрос явно подключает ровно те связи, которые нужны его
+схеме ответа.
+"""
+
+from sqlalchemy.orm import selectinload
+
+from src.models.media import Media
+from src.models.product import Firework
+
+# Связи, которые сериализует схема MediaDB.
+MEDIA_DB_OPTIONS = (selectinload(Media.formatted_media),)
+
+# Связи, которые сериализует схема FireworkDB.
+FIREWORK_DB_OPTIONS = (
+    selectinload(Firework.tags),
+    selectinload(Firework.discounts),
+    selectinload(Firework.media).options(*MEDIA_DB_OPTIONS),
+)
@@ -1,67 +1,210 @@
-from typing import Optional, Type, TypeVar
+import hashlib
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Sequence, Type, TypeVar
 
-from fastapi import HTTPException
 from pydantic import BaseModel
-from sqlalchemy import select
-from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy import func, select
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.crud.base import CRUDBaseRead
+from src.crud.load_options import MEDIA_DB_OPTIONS
 from src.models.base import BaseJFModel
 from src.models.media import FormattedMedia, Media
-from src.schemas.media import FormattedMediaCreate, MediaCreate, MediaUpdate
+from src.schemas.media import MediaCreate, MediaUpdate
+from src.service.blob_storage import blob_storage
+from src.service.images import (
+    CONTENT_TYPES,
+    VARIANT_FORMATS,
+    VARIANT_WIDTHS,
+    ImageVariant,
+)
 
 ModelType = TypeVar('ModelType', bound=BaseJFModel)
 CreateSchemaType = TypeVar('CreateSchemaType', bound=BaseModel)
 UpdateSchemaType = TypeVar('UpdateSchemaType', bound=BaseModel)
 
+FORMATTED_MEDIA_PREFIX = 'formatted_media'
+FORMATTED_MEDIA_PATH = (
+    FORMATTED_MEDIA_PREFIX + '/{media_id}/{variant}/{sha256}.{format}'
+)
+# Значение Media.media_type для фото (см. src/service/csv_loader.py).
+PHOTO_MEDIA_TYPE = 'image'
+
 
 class FormattedMediaCRUD:
-    """CRUD для работы с медиа."""
+    """CRUD для работы с вариантами фото."""
 
     def __init__(self, model: Type[ModelType]) -> None:
         """Инициализатор FormattedMedia круда."""
         self.model = model
 
-    async def create(
+    async def get(
+        self, formatted_media_id: int, session: AsyncSession
+    ) -> Optional[FormattedMedia]:
+        return (
+            await session.execute(
+                select(self.model).where(self.model.id == formatted_media_id)
+            )
+        ).scalar_one_or_none()
+
+    async def get_by_media_id(
+        self, media_id: int, session: AsyncSession
+    ) -> list[FormattedMedia]:
+        return list(
+            (
+                await session.execute(
+                    select(self.model)
+                    .where(self.model.media_id == media_id)
+                    .order_by(self.model.id)
+                )
+            ).scalars()
+        )
+
+    async def save_variants(
         self,
         session: AsyncSession,
-        formatted_media_schema: FormattedMediaCreate,
-    ) -> ModelType:
-        schema_data = formatted_media_schema.model_dump()
-        db_object = self.model(
-            file=schema_data['file'], media_id=schema_data['media_id']
-        )
+        media_id: int,
+        variants: Sequence[ImageVariant],
+    ) -> list[FormattedMedia]:
+        """Сохраняет варианты фото, заменяя прежние варианты медиа.
+
+        Файлы записываются в хранилище до фиксации в БД, а файлы
+        замененных вариантов удаляются после нее. file_id Telegram
+        сохраняется, только если файл варианта не изменился.
+        """
+        existing = {
+            (row.variant, row.format): row
+            for row in await self.get_by_media_id(media_id, session)
+        }
+        old_paths = {row.path for row in existing.values()}
+        new_paths = set()
+        rows = []
+        for variant in variants:
+            sha256 = hashlib.sha256(variant.data).hexdigest()
+            path = FORMATTED_MEDIA_PATH.format(
+                media_id=media_id,
+                variant=variant.variant,
+                sha256=sha256,
+                format=variant.format,
+            )
+            if path not in old_paths:
+                await blob_storage.put(
+                    path, variant.data, CONTENT_TYPES[variant.format]
+                )
+                new_paths.add(path)
+            row = existing.pop((variant.variant, variant.format), None)
+            if row is None:
+                row = self.model(
+                    media_id=media_id,
+                    variant=variant.variant,
+                    format=variant.format,
+                )
+                session.add(row)
+            if row.sha256 != sha256:
+                row.telegram_file_id = None
+            row.path = path
+            row.size = len(variant.data)
+            row.sha256 = sha256
+            row.width = variant.width
+            row.height = variant.height
+            rows.append(row)
+        for row in existing.values():
+            await session.delete(row)
         try:
-            session.add(db_object)
             await session.commit()
-            await session.refresh(db_object)
-            return db_object
-        except IntegrityError as error:
-            await session.rollback()
-            raise HTTPException(
-                code=400, detail=f'Ошибка в данных: {str(error)}'
-            )
-        except SQLAlchemyError as error:
+        except SQLAlchemyError:
             await session.rollback()
-            raise HTTPException(
-                code=500, detail=f'Ошибка сервера! Текст ошибки: {str(error)}'
-            )
+            for path in new_paths:
+                await blob_storage.delete(path)
+            raise
+        for path in old_paths - {row.path for row in rows}:
+            await blob_storage.delete(path)
+        return rows
 
-    async def get_by_media_id(
-        self, media_id: int, session: AsyncSession
-    ) -> Optional[FormattedMedia]:
-        return (
-            await session.execute(
-                select(FormattedMedia).where(
-                    FormattedMedia.media_id == media_id
+    async def set_telegram_file_id(
+        self,
+        formatted_media: FormattedMedia,
+        telegram_file_id: str,
+        session: AsyncSession,
+    ) -> FormattedMedia:
+        """Сохраняет file_id варианта, загруженного ботом в Telegram."""
+        formatted_media.telegram_file_id = telegram_file_id
+        await session.commit()
+        return formatted_media
+
+    async def read_file(self, formatted_media: FormattedMedia) -> bytes:
+        """Содержимое файла из хранилища."""
+        return await blob_storage.get(formatted_media.path)
+
+    async def delete_orphaned_files(
+        self, session: AsyncSession, min_age: timedelta
+    ) -> int:
+        """Удаляет файлы вариантов, на которые не ссылаются записи.
+
+        Такие файлы остаются, если удаление после фиксации не удалось
+        или записи удалены без файлов (миграция 12). Файлы моложе
+        min_age не удаляются: save_variants записывает файлы до
+        фиксации записей в БД. Возвращает число удаленных файлов.
+        """
+        # Список файлов берется до запроса путей из БД: файл записи,
+        # зафиксированной между ними, не окажется лишним.
+        files = await blob_storage.list_keys(FORMATTED_MEDIA_PREFIX)
+        paths = set((await session.execute(select(self.model.path))).scalars())
+        deadline = datetime.now(timezone.utc) - min_age
+        orphans = [
+            path
+            for path, modified in files.items()
+            if path not in paths and modified < deadline
+        ]
+        for path in orphans:
+            await blob_storage.delete(path)
+        return len(orphans)
+
+    async def get_media_without_variants(
+        self, session: AsyncSession
+    ) -> list[Media]:
+        """Фото каталога, для которых готовы не все варианты."""
+        variants_count = (
+            select(func.count(self.model.id))
+            .where(self.model.media_id == Media.id)
+            .scalar_subquery()
+        )
+        return list(
+            (
+                await session.execute(
+                    select(Media)
+                    .where(
+                        Media.media_type == PHOTO_MEDIA_TYPE,
+                        variants_count
+                        < len(VARIANT_WIDTHS) * len(VARIANT_FORMATS),
+                    )
+                    .order_by(Media.id)
                 )
-            )
-        ).scalar()
+            ).scalars()
+        )
+
 
+class MediaCRUD(CRUDBaseRead[Media, MediaCreate, MediaUpdate]):
+    async def set_telegram_file_id(
+        self, media: Media, telegram_file_id: str, session: AsyncSession
+    ) -> Media:
+        """Сохраняет file_id медиа, загруженного ботом в Telegram."""
+        media.telegram_file_id = telegram_file_id
+        await session.commit()
+        await session.refresh(media)
+        return media
 
-class MediaCRUD(CRUDBaseRead[Media, MediaCreate, MediaUpdate]): ...
+    async def get_urls(self, session: AsyncSession) -> list[str]:
+        """Ссылки на все медиа каталога."""
+        return list(
+            (
+                await session.execute(
+                    select(self.model.media_url).order_by(self.model.id)
+                )
+            ).scalars()
+        )
 
 
 formatted_media_crud = FormattedMediaCRUD(FormattedMedia)
-media_crud = CRUDBaseRead(Media)
+media_crud = MediaCRUD(Media, load_options=MEDIA_DB_OPTIONS)
@@ -1,36 +1,25 @@
-import asyncio
 from datetime import datetime, timedelta, timezone
-from typing import List, Optional
+from typing import Optional
 
-from sqlalchemy import and_, func, or_, select
+from sqlalchemy import and_, case, func, literal, or_, select, update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+from sqlalchemy.sql.elements import ColumnElement
 
+from src.config import settings
 from src.crud.base import CRUDBase
-from src.database.db_dependencies import get_async_session
-from src.models.favorite import FavoriteFirework
-from src.models.newsletter import AccountAge, Newsletter
-from src.models.order import Order, OrderFirework
-from src.models.product import Firework, FireworkTag
-from src.models.user import User
+from src.crud.user_segment import account_age_filters, user_segment_crud
+from src.models.newsletter import (
+    DeliveryStatus,
+    Newsletter,
+    NewsletterDelivery,
+    NewsletterWave,
+)
+from src.models.user_segment import UserSegment
 from src.schemas.newsletter import NewsletterCreate, NewsletterUpdate
 
-current_now = datetime.now(timezone.utc)
-
-
-account_age_filters = {
-    AccountAge.LESS_3_MONTHS: lambda: User.created_at
-    >= current_now - timedelta(days=90),
-    AccountAge.FROM_3_TO_12_MONTHS: lambda: and_(
-        User.created_at < current_now - timedelta(days=90),
-        User.created_at >= current_now - timedelta(days=365),
-    ),
-    AccountAge.FROM_1_TO_3_YEARS: lambda: and_(
-        User.created_at < current_now - timedelta(days=365),
-        User.created_at >= current_now - timedelta(days=365 * 3),
-    ),
-    AccountAge.MORE_THAN_3_YEARS: lambda: User.created_at
-    < current_now - timedelta(days=365 * 3),
-}
+PERCENT = 100
 
 
 class NewsletterCRUD(CRUDBase[Newsletter, NewsletterCreate, NewsletterUpdate]):
@@ -53,117 +42,300 @@ class NewsletterCRUD(CRUDBase[Newsletter, NewsletterCreate, NewsletterUpdate]):
         )
         return all_newslatters.scalars().all()
 
-    async def filtered_users_for_newsletter(
+    def get_pending_filters(self) -> list[ColumnElement]:
+        """Условия неотправленной и не отмененной рассылки."""
+        return [
+            Newsletter.switch_send.is_(False),
+            Newsletter.canceled.is_not(True),
+        ]
+
+    async def get_due_newsletters(
         self,
-        newsletter: Newsletter,
         session: AsyncSession,
-    ) -> List[User]:
-        """Фильтрует пользователей для рассылки на основе критериев."""
-        order_count_subquery = (
-            select(func.count(Order.id).label('order_count'))
-            .where(Order.user_id == User.id)
-            .scalar_subquery()
+        now: datetime,
+        send_window: timedelta,
+        newsletter_id: Optional[int] = None,
+    ) -> list[Newsletter]:
+        """Рассылки, которые пора отправить или доотправить.
+
+        Отбираются в SQL: время отправки наступило не раньше чем
+        send_window назад, либо рассылка уже поставлена в очередь
+        (продолжение после перезапуска).
+
+        Параметры:
+            1. session (AsyncSession): объект сессии.
+            2. now (datetime): текущее время.
+            3. send_window (timedelta): сколько после datetime_send
+               рассылку еще можно начать отправлять.
+            4. newsletter_id (int | None): проверить только эту рассылку.
+        """
+        query = (
+            select(Newsletter)
+            .where(
+                *self.get_pending_filters(),
+                Newsletter.datetime_send <= now,
+                or_(
+                    Newsletter.queued_at.is_not(None),
+                    Newsletter.datetime_send >= now - send_window,
+                ),
+            )
+            .order_by(Newsletter.datetime_send)
+        )
+        if newsletter_id is not None:
+            query = query.where(Newsletter.id == newsletter_id)
+        return (await session.execute(query)).scalars().all()
+
+    async def get_schedule(
+        self,
+        session: AsyncSession,
+        since: datetime,
+        newsletter_id: Optional[int] = None,
+    ) -> list[tuple[int, datetime]]:
+        """Время отправки неотправленных рассылок начиная с since.
+
+        Параметры:
+            1. session (AsyncSession): объект сессии.
+            2. since (datetime): не раньше этого времени отправки.
+            3. newsletter_id (int | None): только эта рассылка.
+
+        Возвращаемое значение:
+            list[tuple[int, datetime]]: пары (id рассылки, datetime_send).
+        """
+        query = select(Newsletter.id, Newsletter.datetime_send).where(
+            *self.get_pending_filters(),
+            Newsletter.queued_at.is_(None),
+            Newsletter.datetime_send >= since,
         )
+        if newsletter_id is not None:
+            query = query.where(Newsletter.id == newsletter_id)
+        return (await session.execute(query)).all()
+
+    def get_recipients_query(
+        self, newsletter: Newsletter, *columns: ColumnElement
+    ) -> Select:
+        """Запрос получателей рассылки по ее критериям.
 
-        query = select(User)
+        Получатели отбираются по сегментам аудитории (таблица
+        user_segment, см. src/crud/user_segment.py): количество заказов
+        и теги пользователя в ней уже посчитаны, а границы возраста
+        аккаунта вычисляются в момент выполнения запроса. Выбираются
+        только нужные колонки (по умолчанию telegram_id).
+        Администраторы и пользователи без telegram_id исключаются.
+
+        Аргументы:
+            1. newsletter (Newsletter): объект рассылки.
+            2. columns: выбираемые колонки.
+        """
+        query = user_segment_crud.get_eligible_query(
+            *(columns or (UserSegment.telegram_id,))
+        ).select_from(UserSegment)
 
         if newsletter.age_verified:
-            query = query.where(User.age_verified.is_(True))
+            query = query.where(UserSegment.age_verified.is_(True))
 
         if newsletter.account_age:
-            query = query.where(account_age_filters[newsletter.account_age]())
+            query = query.where(account_age_filters[newsletter.account_age])
 
-        query = query.where(
-            order_count_subquery >= newsletter.number_of_orders
-        )
+        if newsletter.number_of_orders:
+            query = query.where(
+                UserSegment.order_count >= newsletter.number_of_orders
+            )
 
         if newsletter.users_related_to_tag and newsletter.tags:
-            tag_ids = [tag.id for tag in newsletter.tags]
-
-            # Проверка заказов с фейерверками нужных тегов
-            order_subq = (
-                select(1)
-                .select_from(OrderFirework)
-                .join(Firework, OrderFirework.firework_id == Firework.id)
-                .join(FireworkTag, Firework.id == FireworkTag.firework_id)
-                .where(
-                    OrderFirework.order_id.in_(
-                        select(Order.id).where(Order.user_id == User.id)
-                    ),
-                    FireworkTag.tag_id.in_(tag_ids),
-                )
-                .exists()
+            # Пользователи, заказывавшие или добавлявшие в избранное
+            # товары с тегами рассылки.
+            query = query.where(
+                UserSegment.tag_ids.overlap([
+                    tag.id for tag in newsletter.tags
+                ])
             )
 
-            # Проверка избранного с нужными фейерверками
-            favorite_subq = (
-                select(1)
-                .select_from(FavoriteFirework)
-                .join(Firework, FavoriteFirework.firework_id == Firework.id)
-                .join(FireworkTag, Firework.id == FireworkTag.firework_id)
-                .where(
-                    FavoriteFirework.user_id == User.id,
-                    FireworkTag.tag_id.in_(tag_ids),
-                )
-                .exists()
+        return query
+
+    async def count_recipients(
+        self,
+        newsletter: Newsletter,
+        session: AsyncSession,
+    ) -> int:
+        """Количество получателей рассылки (предпросмотр аудитории)."""
+        return await session.scalar(
+            select(func.count()).select_from(
+                self.get_recipients_query(newsletter).subquery()
             )
+        )
 
-            query = query.where(or_(order_subq, favorite_subq))
-
-        result = await session.execute(query)
-        return result.scalars().all()
-
-    # async def filtered_users_for_newsletter(
-    #     self,
-    #     newsletter: Newsletter,
-    #     session: AsyncSession,
-    # ) -> List[User]:
-    #     """Фильтрует пользователей для рассылки на основе критериев.
-
-    #     Аргументы:
-    #         1. newsletter (Newsletter): объект рассылки.
-    #         2. session (AsyncSession): объект сессии.
-
-    #     Возвращаемое значение:
-    #         List[User]: список пользователей, подходящих под критерии.
-    #     """
-    #     order_count_subquery = (
-    #         select(func.count(Order.id).label('order_count'))
-    #         .where(Order.user_id == User.id)
-    #         .scalar_subquery()
-    #     )
-    #     query = select(User)
-    #     if newsletter.age_verified:
-    #         query = query.where(User.age_verified.is_(True))
-    #     if newsletter.account_age:
-    #         query = query.where(
-    # account_age_filters[newsletter.account_age]())
-    #     query = query.where(
-    #         order_count_subquery >= newsletter.number_of_orders
-    #     )
-    #     result = await session.execute(query)
-    #     return result.scalars().all()
+    async def get_waves(
+        self,
+        newsletter: Newsletter,
+        session: AsyncSession,
+    ) -> list[NewsletterWave]:
+        """Волны рассылки; рассылке без волн добавляется одна волна."""
+        if not newsletter.waves:
+            newsletter.waves.append(NewsletterWave(number=1))
+            await session.flush()
+        return newsletter.waves
 
+    def get_wave_case(
+        self, newsletter: Newsletter, waves: list[NewsletterWave]
+    ) -> ColumnElement:
+        """Номер волны получателя по его telegram_id.
 
-newsletter_crud = NewsletterCRUD(Newsletter)
+        Получатель попадает в один из PERCENT сегментов по хешу
+        telegram_id и id рассылки, так что каждая рассылка начинается
+        с разных пользователей, а повторный расчет дает ту же волну.
+        """
+        bucket = func.abs(
+            func.hashtext(
+                func.concat(UserSegment.telegram_id, ':', newsletter.id)
+            )
+            % PERCENT
+        )
+        whens = []
+        share = 0
+        for wave in waves[:-1]:
+            share += wave.audience_percent
+            whens.append((bucket < share, wave.number))
+        if not whens:
+            return literal(waves[-1].number)
+        return case(*whens, else_=waves[-1].number)
 
+    async def enqueue_deliveries(
+        self,
+        newsletter: Newsletter,
+        session: AsyncSession,
+    ) -> int:
+        """Добавляет получателей рассылки в очередь отправки.
+
+        Сначала обновляются сегменты аудитории пользователей, изменившихся
+        с прошлого обновления. Затем получатели (см. get_recipients_query)
+        отбираются, распределяются по волнам рассылки (см.
+        get_wave_case) и записываются в newsletter_delivery одним
+        запросом INSERT ... SELECT, не попадая в память приложения.
+        Повторный вызов не создает дублей.
+
+        Возвращаемое значение:
+            int: количество добавленных получателей.
+        """
+        await user_segment_crud.refresh(session)
+        waves = await self.get_waves(newsletter, session)
+        recipients = self.get_recipients_query(
+            newsletter,
+            literal(newsletter.id),
+            UserSegment.telegram_id,
+            self.get_wave_case(newsletter, waves),
+        )
+        result = await session.execute(
+            insert(NewsletterDelivery)
+            .from_select(['newsletter_id', 'telegram_id', 'wave'], recipients)
+            .on_conflict_do_nothing(
+                constraint='uq_newsletter_delivery_recipient'
+            )
+        )
+        newsletter.queued_at = datetime.now(timezone.utc)
+        return result.rowcount
+
+    async def claim_deliveries(
+        self,
+        newsletter_id: int,
+        session: AsyncSession,
+        limit: int = settings.newsletter_batch_size,
+        wave: Optional[int] = None,
+    ) -> dict[int, int]:
+        """Забирает в работу пачку доставок рассылки (или ее волны).
+
+        Строки блокируются FOR UPDATE SKIP LOCKED, поэтому несколько
+        обработчиков получают разные пачки. Доставки, зависшие в статусе
+        SENDING дольше settings.newsletter_delivery_lease секунд
+        (обработчик упал), забираются повторно.
+
+        Возвращаемое значение:
+            dict[int, int]: telegram_id получателя -> id доставки.
+        """
+        stale_claimed_at = func.now() - timedelta(
+            seconds=settings.newsletter_delivery_lease
+        )
+        claimable = (
+            select(NewsletterDelivery.id)
+            .where(
+                NewsletterDelivery.newsletter_id == newsletter_id,
+                or_(
+                    NewsletterDelivery.status == DeliveryStatus.PENDING,
+                    and_(
+                        NewsletterDelivery.status == DeliveryStatus.SENDING,
+                        NewsletterDelivery.claimed_at < stale_claimed_at,
+                    ),
+                ),
+            )
+            .order_by(NewsletterDelivery.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        if wave is not None:
+            claimable = claimable.where(NewsletterDelivery.wave == wave)
+        result = await session.execute(
+            update(NewsletterDelivery)
+            .where(NewsletterDelivery.id.in_(claimable.scalar_subquery()))
+            .values(
+                status=DeliveryStatus.SENDING,
+                attempts=NewsletterDelivery.attempts + 1,
+                claimed_at=func.now(),
+            )
+            .returning(NewsletterDelivery.telegram_id, NewsletterDelivery.id)
+        )
+        return dict(result.all())
 
-async def test_filter():
-    session = await anext(get_async_session())
-    newsletter = Newsletter(
-        age_verified=True,
-        account_age=AccountAge.MORE_THAN_3_YEARS,
-        number_of_orders=1,
-    )
+    async def complete_deliveries(
+        self,
+        results: list[dict],
+        session: AsyncSession,
+    ) -> None:
+        """Записывает результаты доставок одним пакетным UPDATE.
 
-    users = await newsletter_crud.filtered_users_for_newsletter(
-        newsletter=newsletter, session=session
-    )
+        Аргументы:
+            1. results (list[dict]): словари id, status, error, sent_at.
+        """
+        if results:
+            await session.execute(update(NewsletterDelivery), results)
 
-    print(f'Найдено пользователей: {len(users)}')
-    for user in users:
-        print(user.id, user.created_at, user.age_verified)
+    async def has_unfinished_deliveries(
+        self,
+        newsletter_id: int,
+        session: AsyncSession,
+        wave: Optional[int] = None,
+    ) -> bool:
+        """Есть ли доставки рассылки (или волны) в PENDING и SENDING."""
+        query = select(NewsletterDelivery.id).where(
+            NewsletterDelivery.newsletter_id == newsletter_id,
+            NewsletterDelivery.status.in_((
+                DeliveryStatus.PENDING,
+                DeliveryStatus.SENDING,
+            )),
+        )
+        if wave is not None:
+            query = query.where(NewsletterDelivery.wave == wave)
+        return await session.scalar(select(query.exists()))
 
+    async def add_click(
+        self,
+        newsletter_id: int,
+        wave: int,
+        session: AsyncSession,
+    ) -> bool:
+        """Учитывает нажатие на кнопку тега в сообщении волны рассылки.
 
-if __name__ == '__main__':
-    asyncio.run(test_filter())
+        Возвращаемое значение:
+            bool: найдена ли волна.
+        """
+        result = await session.execute(
+            update(NewsletterWave)
+            .where(
+                NewsletterWave.newsletter_id == newsletter_id,
+                NewsletterWave.number == wave,
+            )
+            .values(clicks=NewsletterWave.clicks + 1)
+        )
+        await session.commit()
+        return bool(result.rowcount)
+
+
+newsletter_crud = NewsletterCRUD(Newsletter)
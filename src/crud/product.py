@@ -1,5 +1,13 @@
+from typing import Optional
+
+from sqlalchemy import func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.query import Query
+
 from src.crud.base import CRUDBase
-from src.models.product import Category, Firework
+from src.crud.load_options import FIREWORK_DB_OPTIONS
+from src.models.product import SEARCH_CONFIG, Category, Firework
+from src.schemas.filter_shema import FireworkFilterSchema
 from src.schemas.product import (
     CategoryCreate,
     CategoryUpdate,
@@ -7,14 +15,95 @@ from src.schemas.product import (
     FireworkUpdate,
 )
 
+SEARCH_LIMIT = 10
+# Параметры ts_headline: совпадения оборачиваются в <b></b>,
+# из описания берется до двух коротких фрагментов.
+HEADLINE_OPTIONS = (
+    'StartSel=<b>, StopSel=</b>, MaxWords=20, MinWords=8, '
+    'MaxFragments=2, FragmentDelimiter=" … "'
+)
+NAME_HEADLINE_OPTIONS = 'StartSel=<b>, StopSel=</b>, HighlightAll=true'
+
 
 class FireworkCRUD(CRUDBase[Firework, FireworkCreate, FireworkUpdate]):
-    pass
+    def apply_default_filters(self, query: Query) -> Query:
+        """Скрывает товары, снятые с каталога при загрузке прайс-листа."""
+        return query.where(self.model.is_active)
+
+    async def search_fireworks(
+        self,
+        session: AsyncSession,
+        query: str,
+        filter_schema: Optional[FireworkFilterSchema] = None,
+        limit: int = SEARCH_LIMIT,
+    ) -> list[dict]:
+        """Полнотекстовый поиск фейерверков с ранжированием.
+
+        Товар находится, если запрос совпал с поисковым вектором
+        (название, артикул, код, описание с учетом словоформ) или
+        название похоже на запрос по триграммам (опечатки).
+
+        Аргументы:
+            1. session (AsyncSession): объект сессии.
+            2. query (str): поисковый запрос пользователя.
+            3. filter_schema (FireworkFilterSchema): дополнительные
+                фильтры; сортировка из схемы не применяется.
+            4. limit (int): максимум результатов.
+
+        Возвращаемое значение:
+            Список словарей firework, rank, name_highlight, snippet,
+            отсортированный по убыванию ранга.
+        """
+        ts_query = func.websearch_to_tsquery(SEARCH_CONFIG, query)
+        rank = func.ts_rank_cd(self.model.search_vector, ts_query) + (
+            func.similarity(self.model.name, query)
+        )
+        statement = (
+            select(
+                self.model,
+                rank.label('rank'),
+                func.ts_headline(
+                    SEARCH_CONFIG,
+                    self.model.name,
+                    ts_query,
+                    NAME_HEADLINE_OPTIONS,
+                ).label('name_highlight'),
+                func.ts_headline(
+                    SEARCH_CONFIG,
+                    self.model.description,
+                    ts_query,
+                    HEADLINE_OPTIONS,
+                ).label('snippet'),
+            )
+            .options(*self.get_load_options())
+            .where(
+                or_(
+                    self.model.search_vector.op('@@')(ts_query),
+                    self.model.name.op('%')(query),
+                )
+            )
+        )
+        statement = self.apply_default_filters(statement)
+        if filter_schema:
+            statement = self.apply_filters(statement, filter_schema)
+        statement = statement.order_by(rank.desc(), self.model.id).limit(limit)
+        result = await session.execute(statement)
+        return [
+            dict(
+                firework=firework,
+                rank=firework_rank,
+                name_highlight=name_highlight,
+                snippet=snippet,
+            )
+            for firework, firework_rank, name_highlight, snippet in (
+                result.all()
+            )
+        ]
 
 
 class CategoryCRUD(CRUDBase[Category, CategoryCreate, CategoryUpdate]):
     pass
 
 
-firework_crud = FireworkCRUD(Firework)
+firework_crud = FireworkCRUD(Firework, load_options=FIREWORK_DB_OPTIONS)
 category_crud = CategoryCRUD(Category)
@@ -0,0 +1,245 @@
+"""Сегменты аудитории рассылок.
+
+Содержит:
+- Словарь account_age_filters: условия возраста аккаунта. Границы
+    считаются от now() базы данных в момент выполнения запроса.
+- Класс UserSegmentCRUD: пересчет таблицы user_segment (признаки
+    пользователей для отбора получателей) и размеры сегментов для
+    предпросмотра аудитории в админке.
+
+Таблица обновляется инкрементально: пересчитываются только
+пользователи, у которых с прошлого обновления изменились профиль,
+заказы или избранное. Раз в settings.segment_full_refresh_interval
+секунд (и при первом обновлении в процессе) пересчитываются все
+пользователи - так учитываются удаленные заказы, избранное и изменения
+тегов товаров.
+"""
+
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import (
+    and_,
+    bindparam,
+    func,
+    literal_column,
+    select,
+    text,
+)
+from sqlalchemy.dialects.postgresql import TIMESTAMP
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+from sqlalchemy.sql.elements import ColumnElement
+
+from src.config import settings
+from src.models.newsletter import AccountAge
+from src.models.product import Tag
+from src.models.user_segment import UserSegment
+
+logger = logging.getLogger(__name__)
+
+# Запас на транзакции, которые начались до прошлого обновления,
+# а зафиксировались после него.
+REFRESH_OVERLAP = timedelta(minutes=5)
+ORDER_COUNT_TIERS = (1, 2, 5)
+TOP_TAGS_LIMIT = 10
+
+
+def days_ago(days: int) -> ColumnElement:
+    """Момент days дней назад по часам базы данных."""
+    return func.now() - timedelta(days=days)
+
+
+account_age_filters = {
+    AccountAge.LESS_3_MONTHS: UserSegment.registered_at >= days_ago(90),
+    AccountAge.FROM_3_TO_12_MONTHS: and_(
+        UserSegment.registered_at < days_ago(90),
+        UserSegment.registered_at >= days_ago(365),
+    ),
+    AccountAge.FROM_1_TO_3_YEARS: and_(
+        UserSegment.registered_at < days_ago(365),
+        UserSegment.registered_at >= days_ago(365 * 3),
+    ),
+    AccountAge.MORE_THAN_3_YEARS: UserSegment.registered_at
+    < days_ago(365 * 3),
+}
+
+# Пользователи, у которых с :since изменились профиль, заказы или
+# избранное (при :since = NULL - все пользователи), пересчитываются
+# одним запросом. Строки без изменений не перезаписываются.
+REFRESH_SEGMENTS = text("""
+    WITH candidates AS (
+        SELECT id AS user_id FROM "user"
+        WHERE :since IS NULL OR updated_at >= :since
+        UNION
+        SELECT user_id FROM "order" WHERE updated_at >= :since
+        UNION
+        SELECT user_id FROM favoritefirework WHERE created_at >= :since
+    ),
+    order_stats AS (
+        SELECT o.user_id, count(*) AS order_count
+        FROM "order" AS o
+        JOIN candidates AS c ON c.user_id = o.user_id
+        GROUP BY o.user_id
+    ),
+    user_tags AS (
+        SELECT o.user_id, ft.tag_id
+        FROM "order" AS o
+        JOIN candidates AS c ON c.user_id = o.user_id
+        JOIN orderfirework AS ofw ON ofw.order_id = o.id
+        JOIN firework_tag AS ft ON ft.firework_id = ofw.firework_id
+        UNION
+        SELECT f.user_id, ft.tag_id
+        FROM favoritefirework AS f
+        JOIN candidates AS c ON c.user_id = f.user_id
+        JOIN firework_tag AS ft ON ft.firework_id = f.firework_id
+    ),
+    tag_stats AS (
+        SELECT user_id, array_agg(tag_id ORDER BY tag_id) AS tag_ids
+        FROM user_tags
+        GROUP BY user_id
+    )
+    INSERT INTO user_segment (
+        user_id, telegram_id, is_admin, age_verified, registered_at,
+        order_count, tag_ids, refreshed_at, created_at, updated_at
+    )
+    SELECT
+        u.id, u.telegram_id, u.is_admin, u.age_verified, u.created_at,
+        coalesce(os.order_count, 0), coalesce(ts.tag_ids, '{}'),
+        now(), now(), now()
+    FROM "user" AS u
+    JOIN candidates AS c ON c.user_id = u.id
+    LEFT JOIN order_stats AS os ON os.user_id = u.id
+    LEFT JOIN tag_stats AS ts ON ts.user_id = u.id
+    ON CONFLICT (user_id) DO UPDATE
+    SET telegram_id = EXCLUDED.telegram_id,
+        is_admin = EXCLUDED.is_admin,
+        age_verified = EXCLUDED.age_verified,
+        registered_at = EXCLUDED.registered_at,
+        order_count = EXCLUDED.order_count,
+        tag_ids = EXCLUDED.tag_ids,
+        refreshed_at = EXCLUDED.refreshed_at,
+        updated_at = EXCLUDED.updated_at
+    WHERE (
+        user_segment.telegram_id, user_segment.is_admin,
+        user_segment.age_verified, user_segment.registered_at,
+        user_segment.order_count, user_segment.tag_ids
+    ) IS DISTINCT FROM (
+        EXCLUDED.telegram_id, EXCLUDED.is_admin, EXCLUDED.age_verified,
+        EXCLUDED.registered_at, EXCLUDED.order_count, EXCLUDED.tag_ids
+    )
+""").bindparams(bindparam('since', type_=TIMESTAMP(timezone=True)))
+
+
+class UserSegmentCRUD:
+    """Обновление и чтение сегментов аудитории (таблица user_segment)."""
+
+    def __init__(
+        self,
+        full_refresh_interval: float = (
+            settings.segment_full_refresh_interval
+        ),
+    ) -> None:
+        """Создает CRUD без истории обновлений.
+
+        Аргументы:
+            full_refresh_interval: как часто (в секундах) пересчитывать
+                всех пользователей, а не только измененных.
+        """
+        self.full_refresh_interval = timedelta(seconds=full_refresh_interval)
+        self._refreshed_at: Optional[datetime] = None
+        self._full_refreshed_at: Optional[datetime] = None
+
+    def get_eligible_query(self, *columns: ColumnElement) -> Select:
+        """Пользователи, которым в принципе можно отправить рассылку."""
+        return select(*columns).where(
+            UserSegment.telegram_id.is_not(None),
+            UserSegment.is_admin.is_(False),
+        )
+
+    async def refresh(self, session: AsyncSession, full: bool = False) -> int:
+        """Пересчитывает сегменты измененных пользователей.
+
+        Изменения не фиксируются: commit делает вызывающий код (например,
+        вместе с постановкой рассылки в очередь).
+
+        Аргументы:
+            1. session (AsyncSession): объект сессии.
+            2. full (bool): пересчитать всех пользователей.
+
+        Возвращаемое значение:
+            int: количество добавленных и измененных строк.
+        """
+        started_at = datetime.now(timezone.utc)
+        full = (
+            full
+            or self._refreshed_at is None
+            or started_at - self._full_refreshed_at
+            >= self.full_refresh_interval
+        )
+        since = None if full else self._refreshed_at - REFRESH_OVERLAP
+        result = await session.execute(REFRESH_SEGMENTS, {'since': since})
+        self._refreshed_at = started_at
+        if full:
+            self._full_refreshed_at = started_at
+        logger.info(
+            'Сегменты аудитории обновлены (%s): изменено строк %s',
+            'полностью' if full else 'инкрементально',
+            result.rowcount,
+        )
+        return result.rowcount
+
+    async def get_sizes(self, session: AsyncSession) -> dict:
+        """Размеры основных сегментов для предпросмотра в админке.
+
+        Возвращаемое значение:
+            dict: total, age_verified, account_age (AccountAge -> размер),
+                orders (минимум заказов -> размер), tags (название
+                тега -> размер, самые крупные), refreshed_at.
+        """
+        count = func.count()
+        columns = {
+            'total': count,
+            'age_verified': count.filter(UserSegment.age_verified),
+            'refreshed_at': func.max(UserSegment.refreshed_at),
+        }
+        columns.update({
+            age: count.filter(condition)
+            for age, condition in account_age_filters.items()
+        })
+        columns.update({
+            tier: count.filter(UserSegment.order_count >= tier)
+            for tier in ORDER_COUNT_TIERS
+        })
+        row = (
+            await session.execute(
+                self.get_eligible_query(*columns.values()).select_from(
+                    UserSegment
+                )
+            )
+        ).one()
+        sizes = dict(zip(columns, row))
+        tag_id = func.unnest(UserSegment.tag_ids).label('tag_id')
+        tag_counts = (
+            self.get_eligible_query(tag_id, count.label('size'))
+            .group_by(literal_column('tag_id'))
+            .subquery()
+        )
+        top_tags = await session.execute(
+            select(Tag.name, tag_counts.c.size)
+            .join(tag_counts, tag_counts.c.tag_id == Tag.id)
+            .order_by(tag_counts.c.size.desc())
+            .limit(TOP_TAGS_LIMIT)
+        )
+        return {
+            'total': sizes['total'],
+            'age_verified': sizes['age_verified'],
+            'refreshed_at': sizes['refreshed_at'],
+            'account_age': {age: sizes[age] for age in account_age_filters},
+            'orders': {tier: sizes[tier] for tier in ORDER_COUNT_TIERS},
+            'tags': dict(top_tags.all()),
+        }
+
+
+user_segment_crud = UserSegmentCRUD()
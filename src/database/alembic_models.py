@@ -2,13 +2,20 @@ from src.models.base import BaseJFModel  # noqa: I001
 from src.models.address import Address, UserAddress
 from src.models.bot_info import BotInfo
 from src.models.cart import Cart
+from src.models.csv_import import CsvImportJob
 from src.models.discounts import Discount, FireworkDiscount
 from src.models.favorite import FavoriteFirework
 from src.models.media import FireworkMedia, Media
-from src.models.newsletter import Newsletter, NewsletterMedia
+from src.models.newsletter import (
+    Newsletter,
+    NewsletterDelivery,
+    NewsletterMedia,
+    NewsletterWave,
+)
 from src.models.order import Order, OrderFirework, OrderStatus
 from src.models.product import Category, Firework, FireworkTag, Tag
 from src.models.user import User
+from src.models.user_segment import UserSegment
 
 
 __all__ = [
@@ -16,6 +23,8 @@ __all__ = [
     'BotInfo',
     'Newsletter',
     'NewsletterMedia',
+    'NewsletterDelivery',
+    'NewsletterWave',
     'Category',
     'FavoriteFirework',
     'Firework',
@@ -26,7 +35,9 @@ __all__ = [
     'Address',
     'UserAddress',
     'Cart',
+    'CsvImportJob',
     'User',
+    'UserSegment',
     'Order',
     'OrderFirework',
     'OrderStatus',
@@ -9,7 +9,11 @@ from src.config import settings
 from src.crud.user import user_crud
 from src.schemas.cart import UserIdentificationSchema
 
-engine = create_async_engine(settings.database_url)
+engine = create_async_engine(
+    settings.database_url,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+)
 AsyncSessionLocal = sessionmaker(
     engine, class_=AsyncSession, expire_on_commit=False
 )
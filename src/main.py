@@ -1,4 +1,5 @@
 from contextlib import asynccontextmanager
+from time import perf_counter
 
 from fastapi import FastAPI, Request, Response
 from fastapi.staticfiles import StaticFiles
@@ -10,19 +11,36 @@ from src.admin.config import setup_admin
 from src.api.v1.router import main_router
 from src.config import settings
 from src.database.db_dependencies import engine
+from src.service.api_latency import api_latency
+from src.service.blob_storage import blob_storage
+from src.service.csv_import_jobs import csv_import_worker
+from src.service.media_gateway import media_gateway
+from src.service.media_variants import shutdown_pool
+from src.utils.scheduler.delivery import close_bots
 from src.utils.scheduler.scheduler import setup_scheduler, shutdown_scheduler
 
 configure_mappers()
 admin_app = None
+ADMIN_PATH = '/admin'
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     global admin_app
-    setup_scheduler()
+    # Рассылки отправляет отдельный процесс (src/utils/scheduler/worker.py);
+    # запуск планировщика в приложении нужен для локальной разработки.
+    if settings.scheduler_in_app:
+        setup_scheduler()
     admin_app = await setup_admin(app)
+    csv_import_worker.start()
     yield
-    shutdown_scheduler()
+    await csv_import_worker.stop()
+    await shutdown_scheduler()
+    await api_latency.close()
+    shutdown_pool()
+    await media_gateway.close()
+    await blob_storage.close()
+    await close_bots()
     await engine.dispose()
 
 
@@ -42,6 +60,17 @@ async def check_http(request: Request, call_next):  # noqa: ANN001, ANN201
     return await call_next(request)
 
 
+@app.middleware('http')
+async def measure_latency(request: Request, call_next):  # noqa: ANN001, ANN201
+    """Замер задержки API для выпуска волн рассылок."""
+    if request.url.path.startswith(ADMIN_PATH):
+        return await call_next(request)
+    started = perf_counter()
+    response = await call_next(request)
+    api_latency.record(perf_counter() - started)
+    return response
+
+
 app.router.include_router(main_router)
 
 
@@ -2,12 +2,19 @@
 from .product import Firework, Tag, Category, FireworkTag
 from .order import Order, OrderStatus, OrderFirework
 from .user import User
+from .user_segment import UserSegment
 from .media import Media, FireworkMedia
 from .favorite import FavoriteFirework
 from .discounts import Discount, FireworkDiscount
 from .cart import Cart
 from .address import Address, UserAddress
-from .newsletter import Newsletter, NewsletterMedia, NewsletterTag
+from .newsletter import (
+    Newsletter,
+    NewsletterDelivery,
+    NewsletterMedia,
+    NewsletterTag,
+    NewsletterWave,
+)
 
 __all__ = [
     'Firework',
@@ -18,6 +25,7 @@ __all__ = [
     'OrderStatus',
     'OrderFirework',
     'User',
+    'UserSegment',
     'Media',
     'FireworkMedia',
     'FavoriteFirework',
@@ -29,4 +37,6 @@ __all__ = [
     'Newsletter',
     'NewsletterMedia',
     'NewsletterTag',
+    'NewsletterDelivery',
+    'NewsletterWave',
 ]
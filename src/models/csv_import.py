@@ -0,0 +1,90 @@
+import enum
+import uuid
+from datetime import datetime
+
+from sqlalchemy import Enum as SQLEnum
+from sqlalchemy import Text, false, text
+from sqlalchemy.dialects.postgresql import JSONB, TIMESTAMP
+from sqlalchemy.dialects.postgresql import UUID as PGUUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.models.base import BaseJFModel
+
+
+class ImportJobStatus(enum.Enum):
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+
+    def __str__(self) -> str:
+        return {
+            self.QUEUED: 'в очереди',
+            self.RUNNING: 'выполняется',
+            self.DONE: 'завершена',
+            self.FAILED: 'ошибка',
+        }[self]
+
+
+class CsvImportJob(BaseJFModel):
+    """Задача загрузки прайс-листа из CSV.
+
+    Поля:
+        1. id: UUID задачи, он же имя сохраненного файла.
+        2. file_name: имя файла, загруженного администратором.
+        3. file_path: путь к сохраненному файлу.
+        4. status: статус задачи (ImportJobStatus).
+        5. total_rows: количество строк в файле (известно после чтения).
+        6. processed_rows: количество загруженных строк.
+        7. error: текст ошибки, если загрузка не удалась.
+        8. report: время и количество строк по этапам загрузки.
+        9. started_at: время начала загрузки.
+        10. finished_at: время окончания загрузки.
+        11. remove_missing: снять с каталога товары, которых нет в файле.
+        12. heartbeat_at: когда обработчик последний раз отметил задачу;
+            запущенная задача без отметки дольше
+            settings.csv_import_job_lease секунд (обработчик упал)
+            забирается повторно.
+    """
+
+    __tablename__ = 'csv_import_job'
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        PGUUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+    )
+    file_name: Mapped[str]
+    file_path: Mapped[str]
+    status: Mapped[ImportJobStatus] = mapped_column(
+        SQLEnum(ImportJobStatus, name='import_job_status_enum'),
+        default=ImportJobStatus.QUEUED,
+        server_default=ImportJobStatus.QUEUED.name,
+        index=True,
+    )
+    total_rows: Mapped[int | None]
+    processed_rows: Mapped[int] = mapped_column(
+        default=0, server_default=text('0')
+    )
+    error: Mapped[str | None] = mapped_column(Text)
+    report: Mapped[dict | None] = mapped_column(JSONB)
+    remove_missing: Mapped[bool] = mapped_column(
+        default=False, server_default=false()
+    )
+    started_at: Mapped[datetime | None] = mapped_column(
+        TIMESTAMP(timezone=True)
+    )
+    finished_at: Mapped[datetime | None] = mapped_column(
+        TIMESTAMP(timezone=True)
+    )
+    heartbeat_at: Mapped[datetime | None] = mapped_column(
+        TIMESTAMP(timezone=True)
+    )
+
+    @property
+    def progress(self) -> int:
+        """Процент загруженных строк."""
+        if not self.total_rows:
+            return 100 if self.status is ImportJobStatus.DONE else 0
+        return min(100, self.processed_rows * 100 // self.total_rows)
+
+    def __repr__(self) -> str:
+        return f'{self.file_name} ({self.status})'
@@ -50,7 +50,7 @@ class Discount(BaseJFModel):
     fireworks: Mapped[list['Firework']] = relationship(
         secondary='fireworkdiscount',
         back_populates='discounts',
-        lazy='selectin',
+        lazy='raise',
     )
 
     def __repr__(self) -> str:
@@ -1,6 +1,6 @@
 from typing import TYPE_CHECKING
 
-from sqlalchemy import ForeignKey, LargeBinary
+from sqlalchemy import BigInteger, ForeignKey, String, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.database.annotations import int_pk, str_not_null_and_unique
@@ -9,6 +9,10 @@ from src.models.base import BaseJFModel
 if TYPE_CHECKING:
     from src.models.product import Firework
 
+FORMATTED_MEDIA_PATH_LENGTH = 255
+FORMATTED_MEDIA_VARIANT_LENGTH = 32
+FORMATTED_MEDIA_FORMAT_LENGTH = 8
+
 
 class FireworkMedia(BaseJFModel):
     """Промежуточная модель many-to-many.
@@ -40,23 +44,25 @@ class Media(BaseJFModel):
         1. id: уникальный индетификатор.
         2. media_url: ссылка на медиа-файл.
         3. media_type: тип медиа-файла.
-        4. fireworks: товары, относящиеся к медиа-файлу.
+        4. telegram_file_id: file_id файла, уже загруженного в Telegram.
+        5. fireworks: товары, относящиеся к медиа-файлу.
     """
 
     id: Mapped[int_pk]
     media_url: Mapped[str_not_null_and_unique]
     media_type: Mapped[str] = mapped_column(nullable=False)
+    telegram_file_id: Mapped[str | None]
     fireworks: Mapped[list['Firework']] = relationship(
         'Firework',
         back_populates='media',
         secondary='firework_media',
-        lazy='selectin',
+        lazy='raise',
         cascade='all, delete',
     )
     formatted_media: Mapped[list['FormattedMedia']] = relationship(
         'FormattedMedia',
         back_populates='media',
-        lazy='selectin',
+        lazy='raise',
         cascade='all, delete',
     )
 
@@ -65,14 +71,56 @@ class Media(BaseJFModel):
 
 
 class FormattedMedia(BaseJFModel):
+    """Модель варианта фото, подготовленного для показа.
+
+    Поля:
+        1. id: уникальный индетификатор.
+        2. media_id: id исходного медиа.
+        3. variant: место показа (card, detail, newsletter - см.
+            src/service/images.py).
+        4. format: формат файла (jpeg, webp).
+        5. path: ключ файла в хранилище blob_storage
+            (src/service/blob_storage.py); само содержимое в БД
+            не хранится.
+        6. size: размер файла в байтах.
+        7. sha256: хеш содержимого файла.
+        8. width, height: размеры изображения.
+        9. telegram_file_id: file_id варианта, уже загруженного
+            в Telegram.
+
+    Для каждого медиа вариант с данными местом показа и форматом один.
+    """
+
+    __table_args__ = (
+        UniqueConstraint(
+            'media_id',
+            'variant',
+            'format',
+            name='unique_formatted_media_variant',
+        ),
+    )
+
     id: Mapped[int_pk]
-    file: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
     media_id: Mapped[int] = mapped_column(
         ForeignKey('media.id'), primary_key=True
     )
+    variant: Mapped[str] = mapped_column(
+        String(FORMATTED_MEDIA_VARIANT_LENGTH), nullable=False
+    )
+    format: Mapped[str] = mapped_column(
+        String(FORMATTED_MEDIA_FORMAT_LENGTH), nullable=False
+    )
+    path: Mapped[str] = mapped_column(
+        String(FORMATTED_MEDIA_PATH_LENGTH), nullable=False
+    )
+    size: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    sha256: Mapped[str] = mapped_column(String(64), nullable=False)
+    width: Mapped[int | None]
+    height: Mapped[int | None]
+    telegram_file_id: Mapped[str | None]
     media: Mapped[Media] = relationship(
         'Media', back_populates='formatted_media', lazy='selectin'
     )
 
     def __repr__(self) -> str:
-        return f'{self.id}: {self.type}'
+        return f'{self.id}: {self.path}'
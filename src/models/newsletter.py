@@ -2,9 +2,22 @@ import enum
 from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Boolean, ForeignKey, Integer, text
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    ForeignKey,
+    Index,
+    Integer,
+    SmallInteger,
+    Text,
+    UniqueConstraint,
+    func,
+    select,
+    text,
+)
 from sqlalchemy import Enum as SQLEnum
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.dialects.postgresql import TIMESTAMP
+from sqlalchemy.orm import Mapped, column_property, mapped_column, relationship
 
 from src.models.base import BaseJFModel
 
@@ -27,6 +40,161 @@ class AccountAge(enum.Enum):
         }[self]
 
 
+class DeliveryStatus(enum.Enum):
+    PENDING = 'pending'
+    SENDING = 'sending'
+    SENT = 'sent'
+    FAILED = 'failed'
+
+    def __str__(self) -> str:
+        return {
+            self.PENDING: 'ожидает отправки',
+            self.SENDING: 'отправляется',
+            self.SENT: 'доставлена',
+            self.FAILED: 'ошибка',
+        }[self]
+
+
+class NewsletterDelivery(BaseJFModel):
+    """Доставка рассылки одному получателю (очередь отправки).
+
+    Поля:
+        1. id: int - primary key.
+        2. newsletter_id: int - id рассылки.
+        3. telegram_id: int - чат получателя.
+        4. status: DeliveryStatus - статус доставки.
+        5. attempts: int - сколько раз доставка забиралась в работу.
+        6. error: str - текст последней ошибки.
+        7. claimed_at: datetime - когда доставка забрана обработчиком;
+           зависшие в статусе SENDING доставки забираются повторно.
+        8. sent_at: datetime - время доставки.
+        9. wave: int - номер волны рассылки (NewsletterWave.number),
+           в которой отправляется доставка.
+    """
+
+    __tablename__ = 'newsletter_delivery'
+    __table_args__ = (
+        UniqueConstraint(
+            'newsletter_id',
+            'telegram_id',
+            name='uq_newsletter_delivery_recipient',
+        ),
+        Index(
+            'ix_newsletter_delivery_wave_status',
+            'newsletter_id',
+            'wave',
+            'status',
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    newsletter_id: Mapped[int] = mapped_column(
+        ForeignKey('newsletter.id', ondelete='CASCADE')
+    )
+    telegram_id: Mapped[int] = mapped_column(BigInteger)
+    status: Mapped[DeliveryStatus] = mapped_column(
+        SQLEnum(DeliveryStatus, name='delivery_status_enum'),
+        default=DeliveryStatus.PENDING,
+        server_default=DeliveryStatus.PENDING.name,
+    )
+    attempts: Mapped[int] = mapped_column(default=0, server_default=text('0'))
+    error: Mapped[str | None] = mapped_column(Text)
+    claimed_at: Mapped[datetime | None] = mapped_column(
+        TIMESTAMP(timezone=True)
+    )
+    sent_at: Mapped[datetime | None] = mapped_column(TIMESTAMP(timezone=True))
+    wave: Mapped[int] = mapped_column(
+        SmallInteger, default=1, server_default=text('1')
+    )
+
+    def __repr__(self) -> str:
+        return f'{self.telegram_id} ({self.status})'
+
+
+def count_deliveries(
+    newsletter_id: Mapped[int],
+    *statuses: DeliveryStatus,
+    wave: Mapped[int] | None = None,
+) -> Mapped[int]:
+    """Количество доставок рассылки (или ее волны) в статусах."""
+    query = select(func.count(NewsletterDelivery.id)).where(
+        NewsletterDelivery.newsletter_id == newsletter_id,
+        NewsletterDelivery.status.in_(statuses),
+    )
+    if wave is not None:
+        query = query.where(NewsletterDelivery.wave == wave)
+    return column_property(
+        query.correlate_except(NewsletterDelivery).scalar_subquery(),
+        deferred=True,
+        group='delivery_stats',
+    )
+
+
+class NewsletterWave(BaseJFModel):
+    """Волна постепенной отправки рассылки.
+
+    Получатели рассылки делятся между волнами при постановке в очередь.
+    Первая волна уходит в datetime_send, каждая следующая - после
+    окончания предыдущей и паузы pause_minutes, если API отвечает
+    быстрее settings.newsletter_rollout_max_latency (см.
+    src/utils/scheduler/send_newsletter.py). Рассылка без волн
+    отправляется одной волной всем получателям.
+
+    Поля:
+        1. id: int - primary key.
+        2. newsletter_id: int - id рассылки.
+        3. number: int - порядковый номер волны.
+        4. audience_percent: int - доля получателей рассылки, %;
+           получатели сверх суммы долей попадают в последнюю волну.
+        5. rate_limit: float - лимит сообщений в секунду для волны
+           (не выше settings.newsletter_rate_limit).
+        6. pause_minutes: int - пауза после окончания предыдущей волны.
+        7. released_at: datetime - когда волна начала отправляться.
+        8. finished_at: datetime - когда волна доставлена.
+        9. clicks: int - нажатия на кнопки тегов в сообщениях волны.
+        10. sent_count, failed_count: int - статистика доставки
+           (отложенные поля, группа delivery_stats).
+    """
+
+    __tablename__ = 'newsletter_wave'
+    __table_args__ = (
+        UniqueConstraint(
+            'newsletter_id', 'number', name='uq_newsletter_wave_number'
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    newsletter_id: Mapped[int] = mapped_column(
+        ForeignKey('newsletter.id', ondelete='CASCADE')
+    )
+    number: Mapped[int] = mapped_column(SmallInteger)
+    audience_percent: Mapped[int] = mapped_column(
+        SmallInteger, default=100, server_default=text('100')
+    )
+    rate_limit: Mapped[float | None]
+    pause_minutes: Mapped[int] = mapped_column(
+        default=0, server_default=text('0')
+    )
+    released_at: Mapped[datetime | None] = mapped_column(
+        TIMESTAMP(timezone=True)
+    )
+    finished_at: Mapped[datetime | None] = mapped_column(
+        TIMESTAMP(timezone=True)
+    )
+    clicks: Mapped[int] = mapped_column(default=0, server_default=text('0'))
+    sent_count: Mapped[int] = count_deliveries(
+        newsletter_id, DeliveryStatus.SENT, wave=number
+    )
+    failed_count: Mapped[int] = count_deliveries(
+        newsletter_id, DeliveryStatus.FAILED, wave=number
+    )
+
+    newsletter: Mapped['Newsletter'] = relationship(back_populates='waves')
+
+    def __repr__(self) -> str:
+        return f'Волна {self.number} ({self.audience_percent}%)'
+
+
 class Newsletter(BaseJFModel):
     """Основная модель для рассылок.
 
@@ -40,6 +208,11 @@ class Newsletter(BaseJFModel):
         6. age_verified: bool - поле фильтрации юзеров по совершеннолетию.
         7. canceled: bool - флаг, отменить ли рассылку.
         5. tags: list['Tag'] поле списка связанных объектов модели Tag.
+        9. queued_at: datetime - когда получатели добавлены в очередь
+           отправки (NewsletterDelivery).
+        10. sent_count, failed_count, pending_count: int - статистика
+           доставки (отложенные поля, группа delivery_stats).
+        11. waves: list['NewsletterWave'] - волны отправки.
     """
 
     id: Mapped[int] = mapped_column(
@@ -71,6 +244,21 @@ class Newsletter(BaseJFModel):
     )
     users_related_to_tag: Mapped[bool | None]
     canceled: Mapped[bool] = mapped_column(Boolean, default=False)
+    waves: Mapped[list['NewsletterWave']] = relationship(
+        back_populates='newsletter',
+        order_by='NewsletterWave.number',
+        cascade='all, delete-orphan',
+        passive_deletes=True,
+        lazy='selectin',
+    )
+    queued_at: Mapped[datetime | None] = mapped_column(
+        TIMESTAMP(timezone=True)
+    )
+    sent_count: Mapped[int] = count_deliveries(id, DeliveryStatus.SENT)
+    failed_count: Mapped[int] = count_deliveries(id, DeliveryStatus.FAILED)
+    pending_count: Mapped[int] = count_deliveries(
+        id, DeliveryStatus.PENDING, DeliveryStatus.SENDING
+    )
 
     def __repr__(self) -> str:
         max_len = 30
@@ -100,6 +288,8 @@ class NewsletterMedia(BaseJFModel):
         Integer, primary_key=True, autoincrement=True
     )
     media_url: Mapped[str]
+    # file_id загруженного в Telegram файла (src/service/telegram_media.py).
+    telegram_file_id: Mapped[str | None]
 
     newsletters: Mapped[list['Newsletter']] = relationship(
         secondary='newslettermedialink',
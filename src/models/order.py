@@ -25,7 +25,7 @@ class OrderStatus(BaseJFModel):
 class Order(BaseJFModel):
     id: Mapped[int_pk]
     user_id: Mapped[UUID] = mapped_column(
-        ForeignKey('user.id'), nullable=False
+        ForeignKey('user.id'), nullable=False, index=True
     )
     status_id: Mapped['OrderStatus'] = mapped_column(
         ForeignKey('orderstatus.id'), nullable=False
@@ -1,7 +1,17 @@
 from decimal import Decimal
 from typing import TYPE_CHECKING, List, Optional
 
-from sqlalchemy import ForeignKey, Numeric, func, select
+from sqlalchemy import (
+    Computed,
+    ForeignKey,
+    Index,
+    Numeric,
+    String,
+    func,
+    select,
+    true,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -21,6 +31,17 @@ if TYPE_CHECKING:
 
 FIREWORK_PRICE_NUMBER_OF_DIGITS = 10
 FIREWORK_PRICE_FRACTIONAL_PART = 2
+CONTENT_HASH_LENGTH = 32
+SEARCH_CONFIG = 'russian'
+# Поисковый вектор товара: название важнее артикула и кода,
+# описание - наименее важно. Артикул и код не стеммируются.
+FIREWORK_SEARCH_VECTOR = (
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('simple', "
+    "coalesce(article, '') || ' ' || coalesce(code, '')), 'B') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', "
+    "coalesce(description, '')), 'C')"
+)
 print('>>> Загрузка Firework')
 
 
@@ -63,13 +84,13 @@ class Tag(BaseJFModel):
         'Firework',
         secondary='firework_tag',
         back_populates='tags',
-        lazy='selectin',
+        lazy='raise',
     )
     newsletters: Mapped[list['Newsletter']] = relationship(
         'Newsletter',
         secondary='newslettertag',
         back_populates='tags',
-        lazy='selectin',
+        lazy='raise',
     )
 
     def __repr__(self) -> str:
@@ -103,7 +124,7 @@ class Category(BaseJFModel):
         'Category', back_populates='categories', remote_side=[id]
     )
     fireworks: Mapped[list['Firework']] = relationship(
-        'Firework', back_populates='category', lazy='selectin'
+        'Firework', back_populates='category', lazy='raise'
     )
 
     def __repr__(self) -> str:
@@ -132,8 +153,27 @@ class Firework(BaseJFModel):
         14. packing_material: материал упаковки (опционально).
         15. article: артикул товара (обязательное поле).
         16. caliber: калибр фейерверка (опционально).
+        17. search_vector: поисковый вектор (вычисляется в БД).
+        18. content_hash: хеш строки прайс-листа, из которой товар был
+            загружен последний раз (см. src/service/csv_loader.py).
+        19. is_active: товар показывается в каталоге; снимается,
+            если товара нет в загруженном прайс-листе.
     """
 
+    __table_args__ = (
+        Index(
+            'ix_firework_search_vector',
+            'search_vector',
+            postgresql_using='gin',
+        ),
+        Index(
+            'ix_firework_name_trgm',
+            'name',
+            postgresql_using='gin',
+            postgresql_ops={'name': 'gin_trgm_ops'},
+        ),
+    )
+
     id: Mapped[int_pk]
     code: Mapped[str_not_null_and_unique]
     name: Mapped[str_not_null_and_unique]
@@ -148,18 +188,18 @@ class Firework(BaseJFModel):
         ForeignKey('category.id'), nullable=True
     )
     category: Mapped['Category'] = relationship(
-        'Category', back_populates='fireworks', lazy='selectin'
+        'Category', back_populates='fireworks', lazy='raise'
     )
     tags: Mapped[list['Tag']] = relationship(
         'Tag',
         secondary='firework_tag',
         back_populates='fireworks',
-        lazy='selectin',
+        lazy='raise',
     )
     media: Mapped[list['Media']] = relationship(
         'Media',
         back_populates='fireworks',
-        lazy='selectin',
+        lazy='raise',
         secondary='firework_media',
         cascade='all, delete',
     )
@@ -176,7 +216,7 @@ class Firework(BaseJFModel):
     discounts: Mapped[list['Discount']] = relationship(
         'Discount',
         secondary='fireworkdiscount',
-        lazy='selectin',
+        lazy='raise',
         back_populates='fireworks',
     )
     carts: Mapped[List['Cart']] = relationship(
@@ -188,9 +228,21 @@ class Firework(BaseJFModel):
     properties: Mapped[list['FireworkProperty']] = relationship(
         'FireworkProperty',
         back_populates='firework',
-        lazy='selectin',
+        lazy='raise',
         cascade='all, delete-orphan',
     )
+    search_vector: Mapped[str | None] = mapped_column(
+        TSVECTOR,
+        Computed(FIREWORK_SEARCH_VECTOR, persisted=True),
+        deferred=True,
+        deferred_raiseload=True,
+    )
+    content_hash: Mapped[str | None] = mapped_column(
+        String(CONTENT_HASH_LENGTH)
+    )
+    is_active: Mapped[bool] = mapped_column(
+        default=True, server_default=true()
+    )
 
     def __repr__(self) -> str:
         return self.name
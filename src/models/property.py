@@ -1,6 +1,6 @@
 from typing import TYPE_CHECKING
 
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.database.annotations import int_pk
@@ -40,6 +40,11 @@ class FireworkProperty(BaseJFModel):
     """
 
     __tablename__ = 'firework_property'
+    __table_args__ = (
+        UniqueConstraint(
+            'firework_id', 'field_id', name='uq_firework_property_field'
+        ),
+    )
 
     id: Mapped[int_pk]
     field_id: Mapped[int] = mapped_column(ForeignKey('property_field.id'))
@@ -0,0 +1,56 @@
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import BigInteger, ForeignKey, Index, Integer, func, text
+from sqlalchemy.dialects.postgresql import ARRAY, TIMESTAMP
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.models.base import BaseJFModel
+
+
+class UserSegment(BaseJFModel):
+    """Признаки пользователя для отбора аудитории рассылок.
+
+    Таблица заполняется и обновляется src/crud/user_segment.py по данным
+    пользователей, заказов и избранного, чтобы рассылки и предпросмотр
+    аудитории в админке не пересчитывали их по всем таблицам.
+
+    Поля:
+        1. user_id: id пользователя.
+        2. telegram_id: id пользователя в Telegram.
+        3. is_admin: является ли пользователь админом.
+        4. age_verified: подтвердил ли пользователь совершеннолетие.
+        5. registered_at: дата регистрации (граница возраста аккаунта
+            вычисляется при отборе, а не при обновлении таблицы).
+        6. order_count: количество заказов.
+        7. tag_ids: теги товаров из заказов и избранного пользователя.
+        8. refreshed_at: время последнего пересчета строки.
+    """
+
+    __tablename__ = 'user_segment'
+
+    user_id: Mapped[UUID] = mapped_column(
+        ForeignKey('user.id', ondelete='CASCADE'), primary_key=True
+    )
+    telegram_id: Mapped[int | None] = mapped_column(BigInteger)
+    is_admin: Mapped[bool]
+    age_verified: Mapped[bool]
+    registered_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True), index=True
+    )
+    order_count: Mapped[int] = mapped_column(
+        Integer, server_default=text('0'), index=True
+    )
+    tag_ids: Mapped[list[int]] = mapped_column(
+        ARRAY(Integer), server_default=text("'{}'")
+    )
+    refreshed_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True), server_default=func.now()
+    )
+
+    __table_args__ = (
+        Index('ix_user_segment_tag_ids', 'tag_ids', postgresql_using='gin'),
+    )
+
+    def __repr__(self) -> str:
+        return f'UserSegment(user_id={self.user_id})'
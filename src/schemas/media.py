@@ -1,6 +1,7 @@
 from datetime import datetime
+from typing import Optional
 
-from pydantic import BaseModel, Field, HttpUrl
+from pydantic import AliasChoices, BaseModel, Field, HttpUrl
 
 MEDIA_BASE_SCHEMA_TITLE = 'Базовый класс Pydantic-схемы для модели Media'
 MEDIA_DB_SCHEMA_TITLE = 'Схема для отображения медиа в ответе сервера'
@@ -19,6 +20,12 @@ CREATED_AT_TITLE = 'Дата и время создания медиа'
 
 UPDATED_AT_TITLE = 'Дата и время последнего редактирования медиа'
 
+TELEGRAM_FILE_ID_MAX_LENGTH = 256
+TELEGRAM_FILE_ID_TITLE = 'file_id медиа-файла, загруженного в Telegram'
+MEDIA_FILE_ID_SCHEMA_TITLE = 'Схема для сохранения file_id медиа'
+FORMATTED_MEDIA_DB_SCHEMA_TITLE = 'Схема для отображения варианта фото'
+VARIANTS_TITLE = 'Варианты фото для показа'
+
 CORRECT_REQUEST = {
     'summary': 'Корректный запрос',
     'description': 'Все параметры запроса корректны',
@@ -49,6 +56,45 @@ INVALID_MEDIA_URL_FORMAT_REQUEST = {
 }
 
 
+class FormattedMediaBase(BaseModel):
+    media_id: int
+
+
+class FormattedMediaDB(FormattedMediaBase):
+    """Вариант фото для показа (см. src/service/images.py).
+
+    Поля:
+        id (int): идентификатор варианта.
+        media_id (int): идентификатор исходного медиа.
+        variant (str): место показа: card, detail или newsletter.
+        format (str): формат файла: jpeg или webp.
+        size (int): размер файла в байтах.
+        sha256 (str): хеш содержимого файла.
+        width, height (int | None): размеры изображения.
+        telegram_file_id (str | None): file_id варианта в Telegram.
+    """
+
+    id: int
+    variant: str
+    format: str
+    size: int
+    sha256: str
+    width: Optional[int] = None
+    height: Optional[int] = None
+    telegram_file_id: Optional[str] = Field(None, title=TELEGRAM_FILE_ID_TITLE)
+
+    class Config:
+        """Конфигурация Pydantic для схемы FormattedMediaDB.
+
+        Поля:
+            title: заголовок схемы.
+            from_attributes: сериализация объекта ORM-модели.
+        """
+
+        title = FORMATTED_MEDIA_DB_SCHEMA_TITLE
+        from_attributes = True
+
+
 class MediaBase(BaseModel):
     """Базовая схема для модели Media.
 
@@ -86,14 +132,27 @@ class MediaDB(MediaBase):
     """Схема для отображения объекта класса Media в ответе сервера.
 
     Поля:
+        id (int | None): идентификатор медиа.
         media_url (HttpUrl): ссылка на медиа-файл.
         media_type (str): тип медиа-файла.
+        telegram_file_id (str | None): file_id файла в Telegram.
         created_at (datetime): дата и время создания.
         updated_at (datetime): Дата и время последнего редактирования.
+        variants (list[FormattedMediaDB]): варианты фото для показа
+            (связь formatted_media модели).
     """
 
+    # Необязательны для совместимости с ответами, сохраненными в кеше
+    # каталога до появления этих полей.
+    id: Optional[int] = None
+    telegram_file_id: Optional[str] = Field(None, title=TELEGRAM_FILE_ID_TITLE)
     created_at: datetime = Field(..., title=CREATED_AT_TITLE)
     updated_at: datetime = Field(..., title=UPDATED_AT_TITLE)
+    variants: list[FormattedMediaDB] = Field(
+        [],
+        validation_alias=AliasChoices('variants', 'formatted_media'),
+        title=VARIANTS_TITLE,
+    )
 
     class Config:
         """Конфигурация Pydantic для схемы MediaDB.
@@ -161,13 +220,25 @@ class MediaUpdate(MediaBase):
         title = MEDIA_UPDATE_SCHEMA_TITLE
 
 
-class FormattedMediaBase(BaseModel):
-    media_id: int
+class MediaFileIdUpdate(BaseModel):
+    """Схема для сохранения file_id медиа после загрузки в Telegram.
 
+    Поля:
+        telegram_file_id (str): file_id, полученный от Telegram.
+    """
 
-class FormattedMediaCreate(FormattedMediaBase):
-    file: bytes
+    telegram_file_id: str = Field(
+        ...,
+        min_length=1,
+        max_length=TELEGRAM_FILE_ID_MAX_LENGTH,
+        title=TELEGRAM_FILE_ID_TITLE,
+    )
 
+    class Config:
+        """Конфигурация Pydantic для схемы MediaFileIdUpdate.
 
-class FormattedMediaDB(FormattedMediaBase):
-    id: int
+        Поля:
+            title: заголовок схемы.
+        """
+
+        title = MEDIA_FILE_ID_SCHEMA_TITLE
@@ -1,4 +1,8 @@
-from pydantic import BaseModel
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+from src.schemas.media import MediaDB
 
 
 class NewsletterBase(BaseModel):
@@ -11,3 +15,27 @@ class NewsletterCreate(NewsletterBase):
 
 class NewsletterUpdate(NewsletterBase):
     pass
+
+
+class TagLandingCard(BaseModel):
+    """Карточка фейерверка на странице тега рассылки.
+
+    Поля:
+        firework_id (int): id фейерверка.
+        text (str): полная карточка (Markdown).
+        caption (str): подпись к медиа - полная карточка или, если она
+            не помещается в подпись Telegram, краткая.
+        media (MediaDB | None): первое медиа фейерверка.
+    """
+
+    firework_id: int
+    text: str
+    caption: str
+    media: Optional[MediaDB] = None
+
+
+class TagLanding(BaseModel):
+    """Готовая страница результатов по тегу из кнопки рассылки."""
+
+    tag: str
+    cards: list[TagLandingCard] = Field(default_factory=list)
@@ -95,3 +95,39 @@ class TagUpdate(BaseModel):
         None,
         max_length=MAX_LENGTH,
     )
+
+
+class PageSchema(BaseModel):
+    """Общие поля ответа со страницей объектов."""
+
+    next_page_url: Optional[str] = None
+    previous_page_url: Optional[str] = None
+    pages_count: Optional[int] = None
+    next_cursor: Optional[str] = None
+    previous_cursor: Optional[str] = None
+
+
+class FireworkListSchema(PageSchema):
+    """Страница фейерверков из POST /fireworks."""
+
+    fireworks: list[FireworkDB]
+    fireworks_count: Optional[int] = None
+
+
+class CategoryListSchema(PageSchema):
+    """Страница категорий из GET /categories."""
+
+    categories: list[CategoryDB]
+    categories_count: Optional[int] = None
+
+
+class FireworkSearchResult(BaseModel):
+    """Найденный фейерверк с рангом и подсвеченными совпадениями.
+
+    Совпадения в name_highlight и snippet обернуты в <b></b>.
+    """
+
+    firework: FireworkDB
+    rank: float
+    name_highlight: str
+    snippet: Optional[str] = None
@@ -0,0 +1,126 @@
+"""Задержка ответов API, общая для всех процессов.
+
+Содержит:
+- Класс ApiLatencyMonitor: процессы API записывают длительность
+    запросов в отсортированное множество Redis (оценка - время ответа),
+    а процесс рассылок читает перцентиль задержки за последние
+    settings.api_latency_window секунд, чтобы не отправлять следующую
+    волну рассылки, пока API перегружен.
+- Объект api_latency, общий для middleware приложения и планировщика.
+
+Замеры копятся в процессе и записываются в Redis одним пакетом не чаще
+раза в settings.api_latency_flush_interval секунд фоновой задачей,
+поэтому запрос к API не ждет Redis. Если Redis недоступен, замеры
+теряются, а задержка считается неизвестной.
+"""
+
+import asyncio
+import logging
+from time import monotonic, time
+from typing import Any, Optional
+
+from redis import asyncio as redis_asyncio
+from redis.exceptions import RedisError
+
+from src.config import settings
+
+logger = logging.getLogger(__name__)
+
+API_LATENCY_KEY = 'api:latency'
+
+REDIS_ERROR_MESSAGE = 'Redis недоступен, задержка API не учитывается: {}'
+
+
+class ApiLatencyMonitor:
+    """Замеры задержки API в Redis за скользящее окно."""
+
+    def __init__(
+        self,
+        redis_client: Any = None,
+        window: float = settings.api_latency_window,
+        flush_interval: float = settings.api_latency_flush_interval,
+    ) -> None:
+        """Создает монитор без замеров.
+
+        Аргументы:
+            redis_client: асинхронный клиент Redis (или его подделка).
+                None - замеры не сохраняются.
+            window: за сколько последних секунд считается задержка.
+            flush_interval: как часто записывать замеры в Redis.
+        """
+        self.redis = redis_client
+        self.window = window
+        self.flush_interval = flush_interval
+        self._samples: dict[str, float] = {}
+        self._flushed_at = monotonic()
+        self._flush_task: Optional[asyncio.Task] = None
+
+    def record(self, seconds: float) -> None:
+        """Учитывает длительность одного запроса.
+
+        Запись в Redis запускается фоновой задачей и не задерживает
+        запрос; пока предыдущая запись не закончилась, новая
+        не запускается.
+        """
+        now = time()
+        # Время ответа делает элемент множества уникальным.
+        self._samples[f'{now:.6f}:{seconds:.6f}'] = now
+        if monotonic() - self._flushed_at < self.flush_interval or (
+            self._flush_task is not None and not self._flush_task.done()
+        ):
+            return
+        self._flush_task = asyncio.create_task(self.flush())
+
+    async def close(self) -> None:
+        """Дожидается фоновой записи и записывает оставшиеся замеры."""
+        if self._flush_task is not None:
+            await self._flush_task
+            self._flush_task = None
+        await self.flush()
+
+    async def flush(self) -> None:
+        """Записывает накопленные замеры и удаляет устаревшие."""
+        samples, self._samples = self._samples, {}
+        self._flushed_at = monotonic()
+        if self.redis is None or not samples:
+            return
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                pipe.zadd(API_LATENCY_KEY, samples)
+                pipe.zremrangebyscore(
+                    API_LATENCY_KEY, '-inf', time() - self.window
+                )
+                pipe.expire(API_LATENCY_KEY, int(self.window * 2))
+                await pipe.execute()
+        except (RedisError, OSError) as error:
+            logger.warning(REDIS_ERROR_MESSAGE.format(error))
+
+    async def get_percentile(self, percentile: float) -> Optional[float]:
+        """Перцентиль задержки API за окно, в секундах.
+
+        Возвращает None, если за окно не было запросов или Redis
+        недоступен.
+        """
+        if self.redis is None:
+            return None
+        try:
+            members = await self.redis.zrangebyscore(
+                API_LATENCY_KEY, time() - self.window, '+inf'
+            )
+        except (RedisError, OSError) as error:
+            logger.warning(REDIS_ERROR_MESSAGE.format(error))
+            return None
+        if not members:
+            return None
+        latencies = sorted(
+            float(member.rsplit(b':', 1)[1]) for member in members
+        )
+        index = min(len(latencies) - 1, int(len(latencies) * percentile))
+        return latencies[index]
+
+
+api_latency = ApiLatencyMonitor(
+    redis_asyncio.Redis(
+        host=settings.redis_host, port=int(settings.redis_port)
+    )
+)
@@ -0,0 +1,311 @@
+"""Хранилище двоичных данных (файлов) вне БД.
+
+Содержимое обработанных медиа (FormattedMedia) хранится здесь, а в БД -
+только путь к нему, размер, хеш и размеры изображения, поэтому загрузка
+медиа не тянет файлы через БД.
+
+Содержит:
+- Класс BlobStorage: интерфейс хранилища (put, get, delete, list_keys).
+- Класс LocalBlobStorage: каталог на диске (settings.blob_storage_dir).
+- Класс S3BlobStorage: S3-совместимое хранилище (AWS S3, MinIO, Yandex
+    Object Storage) через aiohttp с подписью запросов AWS Signature V4.
+- Функцию get_blob_storage: хранилище по settings.blob_storage
+    ('local' или 's3').
+- Объект blob_storage, общий для API и админки.
+"""
+
+import abc
+import asyncio
+import contextlib
+import hashlib
+import hmac
+import os
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path, PurePosixPath
+from typing import Optional
+from urllib.parse import quote, urlparse
+from xml.etree import ElementTree
+
+import aiohttp
+from yarl import URL
+
+from src.config import settings
+
+LOCAL_STORAGE = 'local'
+S3_STORAGE = 's3'
+S3_SERVICE = 's3'
+S3_ALGORITHM = 'AWS4-HMAC-SHA256'
+S3_NAMESPACES = {'s3': 'http://s3.amazonaws.com/doc/2006-03-01/'}
+
+
+class BlobNotFoundError(LookupError):
+    """Файла с таким ключом нет в хранилище."""
+
+
+def check_key(key: str) -> str:
+    """Ключ файла: относительный путь без '..'."""
+    path = PurePosixPath(key)
+    if not key or path.is_absolute() or '..' in path.parts:
+        raise ValueError(f'Недопустимый ключ файла: {key}')
+    return path.as_posix()
+
+
+class BlobStorage(abc.ABC):
+    """Интерфейс хранилища файлов по ключам вида 'каталог/имя'."""
+
+    @abc.abstractmethod
+    async def put(
+        self, key: str, data: bytes, content_type: Optional[str] = None
+    ) -> None:
+        """Сохраняет файл (заменяя существующий с тем же ключом)."""
+
+    @abc.abstractmethod
+    async def get(self, key: str) -> bytes:
+        """Содержимое файла; BlobNotFoundError, если его нет."""
+
+    @abc.abstractmethod
+    async def delete(self, key: str) -> None:
+        """Удаляет файл; отсутствие файла не считается ошибкой."""
+
+    @abc.abstractmethod
+    async def list_keys(self, prefix: str) -> dict[str, datetime]:
+        """Ключи файлов, начинающиеся с prefix, и время их изменения."""
+
+    async def close(self) -> None:
+        """Освобождает соединения хранилища."""
+
+
+class LocalBlobStorage(BlobStorage):
+    """Файлы в каталоге на диске; запись атомарная, в потоке."""
+
+    def __init__(self, root: str = settings.blob_storage_dir) -> None:
+        """Создает хранилище; каталоги создаются при записи.
+
+        Аргументы:
+            root: каталог хранилища.
+        """
+        self.root = Path(root)
+
+    def get_path(self, key: str) -> Path:
+        return self.root / check_key(key)
+
+    async def put(
+        self, key: str, data: bytes, content_type: Optional[str] = None
+    ) -> None:
+        await asyncio.to_thread(self._write, self.get_path(key), data)
+
+    async def get(self, key: str) -> bytes:
+        try:
+            return await asyncio.to_thread(self.get_path(key).read_bytes)
+        except FileNotFoundError:
+            raise BlobNotFoundError(key)
+
+    async def delete(self, key: str) -> None:
+        with contextlib.suppress(FileNotFoundError):
+            await asyncio.to_thread(self.get_path(key).unlink)
+
+    async def list_keys(self, prefix: str) -> dict[str, datetime]:
+        return await asyncio.to_thread(self._list, check_key(prefix))
+
+    def _list(self, prefix: str) -> dict[str, datetime]:
+        keys = {}
+        for directory, _, names in os.walk(self.root / prefix):
+            for name in names:
+                path = Path(directory) / name
+                with contextlib.suppress(FileNotFoundError):
+                    keys[path.relative_to(self.root).as_posix()] = (
+                        datetime.fromtimestamp(
+                            path.stat().st_mtime, timezone.utc
+                        )
+                    )
+        return keys
+
+    def _write(self, path: Path, data: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        file = tempfile.NamedTemporaryFile(dir=path.parent, delete=False)
+        try:
+            with file:
+                file.write(data)
+            os.replace(file.name, path)
+        finally:
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(file.name)
+
+
+class S3BlobStorage(BlobStorage):
+    """S3-совместимое хранилище (адресация bucket в пути запроса)."""
+
+    def __init__(
+        self,
+        endpoint_url: str = settings.s3_endpoint_url,
+        bucket: str = settings.s3_bucket,
+        access_key: str = settings.s3_access_key,
+        secret_key: str = settings.s3_secret_key,
+        region: str = settings.s3_region,
+    ) -> None:
+        """Настраивает доступ к bucket.
+
+        Аргументы:
+            endpoint_url: адрес хранилища, например http://minio:9000.
+            bucket: имя bucket (должен существовать).
+            access_key, secret_key: ключи доступа.
+            region: регион, участвует в подписи запросов.
+        """
+        self.endpoint_url = endpoint_url.rstrip('/')
+        self.host = urlparse(self.endpoint_url).netloc
+        self.bucket = bucket
+        self.access_key = access_key
+        self.secret_key = secret_key
+        self.region = region
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    def get_uri(self, key: str) -> str:
+        return quote(f'/{self.bucket}/{check_key(key)}', safe='/~')
+
+    def sign(
+        self,
+        method: str,
+        uri: str,
+        payload_hash: str,
+        now: Optional[datetime] = None,
+        query: str = '',
+    ) -> dict[str, str]:
+        """Заголовки запроса с подписью AWS Signature V4.
+
+        query - строка параметров запроса в каноническом виде (параметры
+        отсортированы и закодированы, см. get_query).
+        """
+        now = now or datetime.now(timezone.utc)
+        amz_date = now.strftime('%Y%m%dT%H%M%SZ')
+        date = amz_date[:8]
+        headers = {
+            'host': self.host,
+            'x-amz-content-sha256': payload_hash,
+            'x-amz-date': amz_date,
+        }
+        signed_headers = ';'.join(headers)
+        canonical_request = '\n'.join((
+            method,
+            uri,
+            query,
+            ''.join(f'{name}:{value}\n' for name, value in headers.items()),
+            signed_headers,
+            payload_hash,
+        ))
+        scope = f'{date}/{self.region}/{S3_SERVICE}/aws4_request'
+        string_to_sign = '\n'.join((
+            S3_ALGORITHM,
+            amz_date,
+            scope,
+            hashlib.sha256(canonical_request.encode()).hexdigest(),
+        ))
+        key = f'AWS4{self.secret_key}'.encode()
+        for part in (date, self.region, S3_SERVICE, 'aws4_request'):
+            key = hmac.new(key, part.encode(), hashlib.sha256).digest()
+        signature = hmac.new(
+            key, string_to_sign.encode(), hashlib.sha256
+        ).hexdigest()
+        headers['authorization'] = (
+            f'{S3_ALGORITHM} Credential={self.access_key}/{scope}, '
+            f'SignedHeaders={signed_headers}, Signature={signature}'
+        )
+        return headers
+
+    async def put(
+        self, key: str, data: bytes, content_type: Optional[str] = None
+    ) -> None:
+        headers = {}
+        if content_type:
+            headers['content-type'] = content_type
+        async with await self._request(
+            'PUT', self.get_uri(key), data, headers
+        ) as response:
+            response.raise_for_status()
+
+    async def get(self, key: str) -> bytes:
+        async with await self._request('GET', self.get_uri(key)) as response:
+            if response.status == 404:
+                raise BlobNotFoundError(key)
+            response.raise_for_status()
+            return await response.read()
+
+    async def delete(self, key: str) -> None:
+        async with await self._request(
+            'DELETE', self.get_uri(key)
+        ) as response:
+            if response.status != 404:
+                response.raise_for_status()
+
+    async def list_keys(self, prefix: str) -> dict[str, datetime]:
+        """Ключи файлов (запрос ListObjectsV2, по 1000 ключей за ответ)."""
+        keys = {}
+        params = {'list-type': '2', 'prefix': check_key(prefix)}
+        while True:
+            async with await self._request(
+                'GET', quote(f'/{self.bucket}', safe='/~'), params=params
+            ) as response:
+                response.raise_for_status()
+                result = ElementTree.fromstring(await response.read())
+            for item in result.iterfind('s3:Contents', S3_NAMESPACES):
+                keys[item.findtext('s3:Key', namespaces=S3_NAMESPACES)] = (
+                    datetime.fromisoformat(
+                        item.findtext(
+                            's3:LastModified', namespaces=S3_NAMESPACES
+                        )
+                    )
+                )
+            token = result.findtext(
+                's3:NextContinuationToken', namespaces=S3_NAMESPACES
+            )
+            if not token:
+                return keys
+            params['continuation-token'] = token
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def get_query(self, params: dict[str, str]) -> str:
+        return '&'.join(
+            f'{quote(name, safe="-_.~")}={quote(value, safe="-_.~")}'
+            for name, value in sorted(params.items())
+        )
+
+    async def _request(
+        self,
+        method: str,
+        uri: str,
+        data: bytes = b'',
+        headers: Optional[dict[str, str]] = None,
+        params: Optional[dict[str, str]] = None,
+    ) -> aiohttp.ClientResponse:
+        if self._session is None:
+            self._session = aiohttp.ClientSession()
+        query = self.get_query(params or {})
+        signed = self.sign(
+            method, uri, hashlib.sha256(data).hexdigest(), query=query
+        )
+        # Адрес уже закодирован так же, как в подписи.
+        url = URL(
+            f'{self.endpoint_url}{uri}' + (f'?{query}' if query else ''),
+            encoded=True,
+        )
+        return await self._session.request(
+            method,
+            url,
+            data=data or None,
+            headers={**(headers or {}), **signed},
+        )
+
+
+def get_blob_storage() -> BlobStorage:
+    if settings.blob_storage == S3_STORAGE:
+        return S3BlobStorage()
+    if settings.blob_storage == LOCAL_STORAGE:
+        return LocalBlobStorage()
+    raise ValueError(f'Неизвестное хранилище файлов: {settings.blob_storage}')
+
+
+blob_storage = get_blob_storage()
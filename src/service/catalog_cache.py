@@ -0,0 +1,243 @@
+"""Кеш чтения каталога (фейерверки, категории, акции).
+
+Содержит:
+- Класс LocalLRUCache: ограниченный по размеру кеш процесса с TTL.
+- Класс CatalogCache: кеш в два уровня (процесс и Redis) перед
+    firework_crud, category_crud и discounts_crud. Ключ строится из
+    версии каталога, имени выборки и нормализованных параметров
+    (FireworkFilterSchema, пагинация). Любое изменение каталога
+    (загрузка CSV, правка в админке) увеличивает версию, и все старые
+    ключи перестают использоваться.
+- Объект catalog_cache, общий для API и админки.
+
+Redis-клиент передается в конструктор, поэтому вместо него можно
+подставить локальную подделку с теми же методами (get, set, incr).
+"""
+
+import hashlib
+import json
+import logging
+from collections import OrderedDict
+from functools import lru_cache
+from time import monotonic
+from typing import Any, Awaitable, Callable, Optional
+
+from pydantic import BaseModel, TypeAdapter
+from redis import asyncio as redis_asyncio
+from redis.exceptions import RedisError
+
+from src.config import settings
+
+logger = logging.getLogger(__name__)
+
+CATALOG_VERSION_KEY = 'catalog:version'
+CATALOG_KEY_TEMPLATE = 'catalog:{version}:{namespace}:{digest}'
+# Как часто (в секундах) процесс сверяет версию каталога с Redis.
+VERSION_CHECK_INTERVAL = 1.0
+
+REDIS_ERROR_MESSAGE = 'Redis недоступен, кеш каталога работает локально: {}'
+
+
+@lru_cache(maxsize=None)
+def get_adapter(schema: Any) -> TypeAdapter:
+    """TypeAdapter для схемы ответа, создается один раз на схему."""
+    return TypeAdapter(schema)
+
+
+def normalize_params(value: Any) -> Any:
+    """Приводит параметры выборки к каноническому виду.
+
+    Пустые значения отбрасываются, списки фильтров (категории, теги)
+    сортируются, чтобы одинаковые запросы давали один ключ.
+    Порядок order_by сохраняется - он влияет на результат.
+    """
+    if isinstance(value, BaseModel):
+        return normalize_params(value.model_dump(exclude_none=True))
+    if isinstance(value, dict):
+        return {
+            key: (
+                [normalize_params(item) for item in item_value]
+                if key == 'order_by'
+                else normalize_params(item_value)
+            )
+            for key, item_value in value.items()
+            if item_value is not None
+        }
+    if isinstance(value, (list, tuple, set)):
+        return sorted(normalize_params(item) for item in value)
+    return value
+
+
+class LocalLRUCache:
+    """Кеш процесса: хранит не более max_entries последних ключей."""
+
+    def __init__(self, max_entries: int, ttl: float) -> None:
+        """Создает пустой кеш.
+
+        Аргументы:
+            max_entries: максимальное количество ключей.
+            ttl: время жизни записи, в секундах.
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._data: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+
+    def get(self, key: str) -> Optional[bytes]:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        expires_at, value = item
+        if expires_at < monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        self._data[key] = (monotonic() + (ttl or self.ttl), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+
+class CatalogCache:
+    """Кеш выборок каталога: процесс -> Redis -> БД."""
+
+    def __init__(
+        self,
+        redis_client: Any = None,
+        ttl: int = settings.catalog_cache_ttl,
+        max_entries: int = settings.catalog_cache_max_entries,
+    ) -> None:
+        """Настраивает уровни кеша.
+
+        Аргументы:
+            redis_client: асинхронный клиент Redis (или его подделка).
+                None - работает только кеш процесса.
+            ttl: время жизни записи в обоих уровнях, в секундах.
+            max_entries: размер кеша процесса.
+        """
+        self.redis = redis_client
+        self.ttl = ttl
+        self.local = LocalLRUCache(max_entries, ttl)
+        self._version = 0
+        self._version_checked_at: Optional[float] = None
+
+    async def get_version(self) -> int:
+        """Текущая версия каталога.
+
+        Версия из Redis переиспользуется VERSION_CHECK_INTERVAL секунд,
+        так что изменение в одном процессе видно остальным почти сразу,
+        а Redis не опрашивается на каждый запрос.
+        """
+        now = monotonic()
+        if self.redis is None or (
+            self._version_checked_at is not None
+            and now - self._version_checked_at < VERSION_CHECK_INTERVAL
+        ):
+            return self._version
+        try:
+            version = int(await self.redis.get(CATALOG_VERSION_KEY) or 0)
+        except (RedisError, OSError) as error:
+            logger.warning(REDIS_ERROR_MESSAGE.format(error))
+            version = self._version
+        if version != self._version:
+            self.local.clear()
+            self._version = version
+        self._version_checked_at = now
+        return self._version
+
+    async def bump_version(self) -> None:
+        """Сбрасывает кеш каталога, увеличивая его версию."""
+        self.local.clear()
+        version = self._version + 1
+        if self.redis is not None:
+            try:
+                version = int(await self.redis.incr(CATALOG_VERSION_KEY))
+            except (RedisError, OSError) as error:
+                logger.warning(REDIS_ERROR_MESSAGE.format(error))
+        self._version = version
+        self._version_checked_at = monotonic()
+        logger.info('Версия каталога: %s', version)
+
+    def build_key(self, version: int, namespace: str, params: dict) -> str:
+        payload = json.dumps(
+            normalize_params(params),
+            sort_keys=True,
+            ensure_ascii=False,
+            default=str,
+        )
+        digest = hashlib.sha1(payload.encode()).hexdigest()
+        return CATALOG_KEY_TEMPLATE.format(
+            version=version, namespace=namespace, digest=digest
+        )
+
+    async def _redis_get(self, key: str) -> Optional[bytes]:
+        if self.redis is None:
+            return None
+        try:
+            return await self.redis.get(key)
+        except (RedisError, OSError) as error:
+            logger.warning(REDIS_ERROR_MESSAGE.format(error))
+            return None
+
+    async def _redis_set(
+        self, key: str, value: bytes, ttl: Optional[int] = None
+    ) -> None:
+        if self.redis is None:
+            return
+        try:
+            await self.redis.set(key, value, ex=ttl or self.ttl)
+        except (RedisError, OSError) as error:
+            logger.warning(REDIS_ERROR_MESSAGE.format(error))
+
+    async def get_or_load(
+        self,
+        namespace: str,
+        params: dict,
+        loader: Callable[[], Awaitable[Any]],
+        schema: Any,
+        ttl: Optional[int] = None,
+    ) -> Any:
+        """Возвращает выборку из кеша или загружает ее из БД.
+
+        Аргументы:
+            namespace: имя выборки (например, 'fireworks').
+            params: параметры выборки: фильтры, пагинация.
+            loader: корутина без аргументов, которая делает запрос к БД.
+                Исключения (например, HTTPException 404) не кешируются.
+            schema: тип результата для сериализации, например
+                tuple[list[FireworkDB], int].
+            ttl: время жизни записи в Redis, если оно отличается
+                от общего (например, для заранее подготовленных выборок).
+
+        Возвращает результат, провалидированный схемой schema.
+        """
+        adapter = get_adapter(schema)
+        version = await self.get_version()
+        key = self.build_key(version, namespace, params)
+        raw = self.local.get(key)
+        if raw is None:
+            raw = await self._redis_get(key)
+            if raw is not None:
+                self.local.set(key, raw)
+        if raw is not None:
+            return adapter.validate_json(raw)
+        value = adapter.validate_python(await loader(), from_attributes=True)
+        raw = adapter.dump_json(value)
+        self.local.set(key, raw)
+        await self._redis_set(key, raw, ttl)
+        return value
+
+
+catalog_cache = CatalogCache(
+    redis_asyncio.Redis(
+        host=settings.redis_host, port=int(settings.redis_port)
+    )
+)
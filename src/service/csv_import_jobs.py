@@ -0,0 +1,259 @@
+"""Очередь фоновых задач загрузки прайс-листов.
+
+Содержит:
+- enqueue_import: сохраняет загруженный файл под UUID задачи
+    и ставит задачу в очередь (таблица csv_import_job).
+- Класс CsvImportWorker: asyncio-задача приложения, которая забирает
+    задачи из очереди (FOR UPDATE SKIP LOCKED, поэтому несколько
+    экземпляров приложения не возьмут одну задачу) и потоково загружает
+    файл частями по settings.csv_import_chunk_size строк. После каждой
+    части изменения фиксируются, а прогресс и отметка heartbeat_at
+    записываются в задачу. Задача, прерванная остановкой приложения,
+    возвращается в очередь, а задача упавшего обработчика (без отметки
+    дольше settings.csv_import_job_lease секунд) забирается повторно;
+    файл загружается заново с начала, повторная загрузка строк
+    безопасна.
+    Когда очередь пуста, для новых фото каталога создаются варианты
+    (src/service/media_variants.py).
+- Объект csv_import_worker, запускаемый в lifespan приложения.
+"""
+
+import asyncio
+import contextlib
+import logging
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Optional
+
+import anyio
+from fastapi import UploadFile
+from sqlalchemy import and_, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import settings
+from src.database.db_dependencies import AsyncSessionLocal
+from src.models.csv_import import CsvImportJob, ImportJobStatus
+from src.service.catalog_cache import catalog_cache
+from src.service.csv_loader import (
+    CODE_COLUMN,
+    ImportReport,
+    count_rows,
+    deactivate_missing,
+    import_price_list,
+    read_chunks,
+)
+from src.service.media_variants import generate_missing_variants
+
+logger = logging.getLogger(__name__)
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+RECENT_JOBS_LIMIT = 10
+
+
+def get_job_path(job_id: uuid.UUID) -> Path:
+    return Path(settings.csv_import_dir) / f'{job_id}.csv'
+
+
+async def save_upload(upload: UploadFile, path: Path) -> None:
+    """Сохраняет загруженный файл частями, не держа его в памяти."""
+    await anyio.Path(path.parent).mkdir(parents=True, exist_ok=True)
+    async with await anyio.open_file(path, 'wb') as buffer:
+        while chunk := await upload.read(UPLOAD_CHUNK_SIZE):
+            await buffer.write(chunk)
+
+
+async def enqueue_import(
+    session: AsyncSession, upload: UploadFile, remove_missing: bool = False
+) -> CsvImportJob:
+    """Сохраняет файл и ставит задачу загрузки в очередь.
+
+    Аргументы:
+        remove_missing: снять с каталога товары, которых нет в файле.
+    """
+    job_id = uuid.uuid4()
+    path = get_job_path(job_id)
+    await save_upload(upload, path)
+    job = CsvImportJob(
+        id=job_id,
+        file_name=upload.filename or path.name,
+        file_path=str(path),
+        remove_missing=remove_missing,
+    )
+    session.add(job)
+    await session.commit()
+    csv_import_worker.notify()
+    logger.info('Задача загрузки %s поставлена в очередь', job_id)
+    return job
+
+
+async def get_job(
+    session: AsyncSession, job_id: uuid.UUID
+) -> Optional[CsvImportJob]:
+    return await session.get(CsvImportJob, job_id)
+
+
+async def get_recent_jobs(
+    session: AsyncSession, limit: int = RECENT_JOBS_LIMIT
+) -> list[CsvImportJob]:
+    jobs = await session.execute(
+        select(CsvImportJob)
+        .order_by(CsvImportJob.created_at.desc())
+        .limit(limit)
+    )
+    return jobs.scalars().all()
+
+
+async def claim_next_job(session: AsyncSession) -> Optional[CsvImportJob]:
+    """Забирает самую старую задачу из очереди и помечает ее запущенной.
+
+    Запущенные задачи без отметки heartbeat_at дольше
+    settings.csv_import_job_lease секунд (обработчик упал) забираются
+    повторно.
+    """
+    now = datetime.now(timezone.utc)
+    stale_heartbeat_at = now - timedelta(seconds=settings.csv_import_job_lease)
+    job = (
+        await session.execute(
+            select(CsvImportJob)
+            .where(
+                or_(
+                    CsvImportJob.status == ImportJobStatus.QUEUED,
+                    and_(
+                        CsvImportJob.status == ImportJobStatus.RUNNING,
+                        CsvImportJob.heartbeat_at < stale_heartbeat_at,
+                    ),
+                )
+            )
+            .order_by(CsvImportJob.created_at)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        )
+    ).scalar_one_or_none()
+    if job is None:
+        await session.rollback()
+        return None
+    if job.status is ImportJobStatus.RUNNING:
+        logger.warning('Задача загрузки %s забрана повторно', job.id)
+    job.status = ImportJobStatus.RUNNING
+    job.processed_rows = 0
+    job.started_at = job.heartbeat_at = now
+    await session.commit()
+    return job
+
+
+async def requeue_job(session: AsyncSession, job: CsvImportJob) -> None:
+    """Возвращает прерванную задачу в очередь."""
+    await session.rollback()
+    job.status = ImportJobStatus.QUEUED
+    job.processed_rows = 0
+    job.heartbeat_at = None
+    await session.commit()
+
+
+async def run_job(session: AsyncSession, job: CsvImportJob) -> None:
+    """Загружает файл задачи частями, записывая прогресс после каждой."""
+    report = ImportReport()
+    job_id = job.id
+    codes = set()
+    try:
+        job.total_rows = await anyio.to_thread.run_sync(
+            count_rows, job.file_path
+        )
+        await session.commit()
+        async for chunk in read_chunks(job.file_path):
+            await import_price_list(session, chunk, report)
+            job.processed_rows += len(chunk)
+            job.heartbeat_at = datetime.now(timezone.utc)
+            await session.commit()
+            if job.remove_missing:
+                codes.update(chunk[CODE_COLUMN])
+        if job.remove_missing:
+            await deactivate_missing(session, codes, report)
+            await session.commit()
+        job.status = ImportJobStatus.DONE
+        Path(job.file_path).unlink(missing_ok=True)
+    except asyncio.CancelledError:
+        # Приложение останавливается: задача загрузится заново после
+        # перезапуска, а не останется запущенной навсегда.
+        logger.warning('Загрузка прервана (задача %s)', job_id)
+        await requeue_job(session, job)
+        await catalog_cache.bump_version()
+        raise
+    except Exception as error:
+        await session.rollback()
+        logger.exception('Ошибка загрузки прайс-листа (задача %s)', job_id)
+        job.status = ImportJobStatus.FAILED
+        job.error = str(error)
+    job.report = report.as_dict()
+    job.finished_at = datetime.now(timezone.utc)
+    await session.commit()
+    # Даже неудачная загрузка могла зафиксировать часть файла.
+    await catalog_cache.bump_version()
+
+
+class CsvImportWorker:
+    """Фоновый обработчик очереди загрузок прайс-листов."""
+
+    def __init__(
+        self, poll_interval: float = settings.csv_import_poll_interval
+    ) -> None:
+        """Создает остановленный обработчик.
+
+        Аргументы:
+            poll_interval: как часто (в секундах) проверять очередь,
+                если новых задач не поступало.
+        """
+        self.poll_interval = poll_interval
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+    def notify(self) -> None:
+        """Будит обработчик сразу после постановки задачи в очередь."""
+        self._wakeup.set()
+
+    async def process_next(self) -> bool:
+        """Выполняет одну задачу из очереди, если она есть."""
+        async with AsyncSessionLocal() as session:
+            job = await claim_next_job(session)
+            if job is None:
+                return False
+            logger.info('Начата загрузка прайс-листа (задача %s)', job.id)
+            await run_job(session, job)
+            return True
+
+    async def _run(self) -> None:
+        while True:
+            self._wakeup.clear()
+            imported = False
+            try:
+                while await self.process_next():
+                    imported = True
+            except Exception:
+                logger.exception('Ошибка обработчика очереди загрузок')
+            if imported:
+                # Варианты фото создаются один раз за все загрузки
+                # из очереди, а не после каждой.
+                try:
+                    await generate_missing_variants()
+                except Exception:
+                    logger.exception('Ошибка создания вариантов фото')
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(
+                    self._wakeup.wait(), timeout=self.poll_interval
+                )
+
+
+csv_import_worker = CsvImportWorker()
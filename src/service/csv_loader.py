@@ -1,342 +1,689 @@
-import asyncio
-import logging
-from datetime import datetime
-from decimal import Decimal
-
-import pandas as pd
-from sqlalchemy.dialects.postgresql import insert as pg_insert
-from sqlalchemy.ext.asyncio import AsyncSession
-
-from src.config import Settings
-from src.models.media import FireworkMedia, Media
-from src.models.product import Category, Firework
-from src.models.property import FireworkProperty, PropertyField
-
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
-
-settings = Settings()
-
-
-async def load_data(session: AsyncSession):
-    try:
-        # 1. Чтение CSV файла
-        df = pd.read_csv(
-            "price.csv",
-            delimiter=",",
-            quotechar='"',
-            encoding="utf-8",
-            thousands=',',
-            keep_default_na=False
-        )
-        logger.info("CSV файл успешно прочитан")
-
-        # 2. Обработка категорий
-        category_map = await process_categories(session, df)
-
-        # 3. Загрузка фейерверков
-        firework_map = await process_fireworks(session, df, category_map)
-
-        # 4. Загрузка медиа
-        await process_media(session, df, firework_map)
-
-        await session.commit()
-        logger.info("Все данные успешно загружены")
-
-    except Exception as e:
-        await session.rollback()
-        logger.error(f"Ошибка при загрузке данных: {str(e)}")
-        raise
-
-
-def convert_number(value: str) -> int | None:
-    """Конвертирует строковые числа с запятыми в int."""
-    if not value or pd.isna(value):
-        return None
-    try:
-        # Заменяем запятые на точки и конвертируем в float
-        return int(float(value.replace(",", ".")))
-    except (ValueError, TypeError) as e:
-        logger.error(f"Ошибка конвертации числа '{value}': {str(e)}")
-        return None
-
-
-async def process_categories(session: AsyncSession, df: pd.DataFrame) -> dict:
-    """Обработка иерархии категорий."""
-    categories = {}
-    default_category_name = "товары без категории"
-    default_category_id = 1  # ID дефолтной категории
-
-    # Проверяем, существует ли категория с id=1
-    existing_category = await session.get(Category, default_category_id)
-    if not existing_category:
-        # Если категория с id=1 не существует, создаем её
-        stmt = (
-            pg_insert(Category)
-            .values(id=default_category_id, name=default_category_name)
-            .on_conflict_do_nothing()
-        )
-        await session.execute(stmt)
-        logger.info(
-            f"Создана дефолтная категория: {default_category_name} "
-            f"(id={default_category_id})"
-        )
-
-    # Добавляем дефолтную категорию в словарь
-    categories[default_category_name] = None
-
-    # Собираем уникальные категории
-    for _, row in (
-            df[["Товарная группа", "Товарная подгруппа"]]
-                    .drop_duplicates()
-                    .iterrows()
-    ):
-        parent_name = row["Товарная группа"]
-        child_name = row["Товарная подгруппа"] or parent_name
-
-        if parent_name not in categories:
-            categories[parent_name] = None  # Родительская категория
-        if child_name and child_name not in categories:
-            categories[child_name] = parent_name
-
-    # Загрузка в БД
-    category_map = {}
-    for name, parent_name in categories.items():
-        # Вставляем родительскую категорию, если нужно
-        if parent_name and parent_name not in category_map:
-            parent_stmt = pg_insert(Category).values(
-                name=parent_name
-            ).on_conflict_do_nothing()
-            await session.execute(parent_stmt)
-
-        # Получаем ID родителя
-        parent_id = category_map.get(parent_name) if parent_name else None
-
-        # Вставляем категорию
-        stmt = (
-            pg_insert(Category)
-            .values(name=name, parent_category_id=parent_id)
-            .on_conflict_do_update(
-                index_elements=["name"],
-                set_=dict(parent_category_id=parent_id)
-            )
-            .returning(Category.id, Category.name)
-        )
-        result = await session.execute(stmt)
-        category = result.first()
-        category_map[name] = category.id
-
-    await session.flush()
-    logger.info(f"Загружено {len(category_map)} категорий")
-    return category_map
-
-
-async def process_fireworks(
-        session: AsyncSession, df: pd.DataFrame, category_map: dict
-) -> dict:
-    """Обработка фейерверков."""
-    firework_map = {}
-    default_category_id = 1  # ID дефолтной категории
-
-    # Список полей, которые уже обрабатываются
-    excluded_fields = {
-        "Код", "Артикул", "Наименование", "Единица измерения",
-        "Кол-во зарядов", "Кол-во эффектов", "Описание — как на Рутуб",
-        "Размер изделия, мм", "Материал упаковки", "За единицу, ₽",
-        "Калибр, \"", "Фото", "Видео", "Товарная группа", "Товарная подгруппа"
-    }
-
-    # Сначала собираем все уникальные имена полей
-    field_names = set()
-    for column in df.columns:
-        if column not in excluded_fields:
-            field_names.add(column)
-
-    # Загружаем имена полей в PropertyField
-    field_map = {}
-    for field_name in field_names:
-        stmt = (
-            pg_insert(PropertyField)
-            .values(field_name=field_name)
-            .on_conflict_do_nothing()
-            .returning(PropertyField.id, PropertyField.field_name)
-        )
-        result = await session.execute(stmt)
-        field = result.first()
-        if field:
-            field_map[field.field_name] = field.id
-
-    # Преобразование данных
-    for _, row in df.iterrows():
-        # Если "Товарная группа" отсутствует, используем дефолтную категорию
-        if pd.isna(row["Товарная группа"]) or not row["Товарная группа"]:
-            category_id = default_category_id
-        else:
-            # Иначе используем "Товарная подгруппа" или "Товарная группа"
-            category_name = row["Товарная подгруппа"] or row["Товарная группа"]
-            category_id = category_map.get(category_name, default_category_id)
-
-        # Конвертация цены
-        try:
-            price = Decimal(str(row["За единицу, ₽"]).replace(",", "."))
-        except (ValueError, TypeError):
-            price = Decimal("0.0")
-
-        # Обработка калибра
-        caliber = row.get('Калибр, "', '').strip()
-
-        # Собираем данные для вставки в таблицу Firework
-        firework_data = {
-            "code": row["Код"],
-            "article": row["Артикул"],
-            "name": row["Наименование"],
-            "measurement_unit": row["Единица измерения"],
-            "charges_count": convert_number(row["Кол-во зарядов"]),
-            "effects_count": convert_number(row["Кол-во эффектов"]),
-            "description": row["Описание — как на Рутуб"],
-            "product_size": row["Размер изделия, мм"],
-            "packing_material": row["Материал упаковки"],
-            "price": price,
-            "category_id": category_id,
-            "caliber": caliber,
-        }
-
-        # Вставляем фейерверк и получаем его ID
-        stmt = (
-            pg_insert(Firework)
-            .values(**firework_data)
-            .on_conflict_do_update(
-                index_elements=["code"],
-                set_=dict(
-                    article=firework_data["article"],
-                    name=firework_data["name"],
-                    price=firework_data["price"],
-                    category_id=firework_data["category_id"],
-                    caliber=firework_data["caliber"],
-                )
-            )
-            .returning(Firework.id, Firework.code)
-        )
-        result = await session.execute(stmt)
-        fw = result.first()
-        firework_id = fw.id
-        firework_map[firework_data["code"]] = firework_id
-
-        # Обрабатываем каждое свойство отдельно
-        for column in df.columns:
-            if (column not in excluded_fields
-                    and pd.notna(row[column])
-                    and row[column] != ""):
-                field_id = field_map.get(column)
-                if not field_id:
-                    continue
-
-                # Вставляем каждое свойство как отдельную запись
-                stmt = (
-                    pg_insert(FireworkProperty)
-                    .values(
-                        firework_id=firework_id,
-                        field_id=field_id,
-                        value=str(row[column]),
-                    )
-                    .on_conflict_do_nothing()
-                )
-                await session.execute(stmt)
-
-    await session.flush()
-    logger.info(f"Загружено {len(firework_map)} фейерверков")
-    return firework_map
-
-
-async def process_media(
-        session: AsyncSession, df: pd.DataFrame, firework_map: dict
-):
-    """Обработка медиа-файлов и связей с фейерверками."""
-    media_map = {}  # Кэш URL медиа -> ID
-    firework_media_records = []
-
-    # Собираем все медиа и связи
-    for _, row in df.iterrows():
-        fw_code = row["Код"]
-        fw_id = firework_map.get(fw_code)
-        if not fw_id:
-            logger.warning(f"Фейерверк {fw_code} не найден, пропуск медиа")
-            continue
-
-        # Обрабатываем фото и видео
-        for url, media_type in [(row["Фото"], "image"), (
-                row["Видео"], "video"
-        )]:
-            if not url:
-                continue
-
-            # Добавляем медиа в кэш или получаем существующий ID
-            if url not in media_map:
-                stmt = (
-                    pg_insert(Media)
-                    .values(
-                        media_url=url,
-                        media_type=media_type,
-                        created_at=datetime.now(),
-                        updated_at=datetime.now()
-                    )
-                    .on_conflict_do_update(
-                        index_elements=["media_url"],
-                        set_=dict(
-                            media_type=media_type,
-                            updated_at=datetime.now()
-                        )
-                    )
-                    .returning(Media.id)
-                )
-                result = await session.execute(stmt)
-                media_id = result.scalar_one()
-                media_map[url] = media_id
-            else:
-                media_id = media_map[url]
-
-            # Добавляем связь в firework_media
-            firework_media_records.append({
-                "firework_id": fw_id,
-                "image_id": media_id,
-                "created_at": datetime.now(),
-                "updated_at": datetime.now()
-            })
-
-    # Пакетная вставка связей
-    if firework_media_records:
-        await session.execute(
-            pg_insert(FireworkMedia)
-            .values(firework_media_records)
-            .on_conflict_do_nothing()
-        )
-
-    await session.flush()
-    logger.info(
-        f"Загружено {len(media_map)} медиа и {len(
-            firework_media_records)} связей"
-    )
-
-
-if __name__ == "__main__":
-    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-    from sqlalchemy.orm import sessionmaker
-
-    async def async_main():
-        db_url = settings.database_url
-
-        # Создаем движок и сессию
-        engine = create_async_engine(db_url)
-        async_session = sessionmaker(
-            engine, class_=AsyncSession, expire_on_commit=False
-        )
-
-        # Запускаем загрузку
-        async with async_session() as session:
-            await load_data(session)
-
-        await engine.dispose()
-        print("Загрузка завершена!")
-
-    # Запуск асинхронного event loop
-    asyncio.run(async_main())
+"""Загрузка прайс-листа из CSV в каталог.
+
+Загрузка выполняется набором операций над множествами:
+1. CSV читается потоково частями по settings.csv_import_chunk_size
+    строк (read_chunks) - память не зависит от размера файла. Каждая
+    часть нормализуется векторно средствами pandas (prepare_* функции)
+    и проходит шаги 2-4 целиком, до чтения следующей части.
+2. Подготовленные строки копируются командой COPY во временные
+    таблицы (stage_rows).
+3. Товары, хеш строки которых (content_hash) совпадает с сохраненным
+    при прошлой загрузке, удаляются из временных таблиц вместе с их
+    характеристиками и медиа - неизменные строки не перезаписываются.
+4. Каждая таблица каталога (category, firework, property_field,
+    firework_property, media, firework_media) обновляется несколькими
+    запросами INSERT ... SELECT ... ON CONFLICT.
+5. По желанию товары, которых нет в файле, снимаются с каталога
+    (is_active = false, deactivate_missing).
+
+Время и количество строк каждого этапа, а также количество добавленных,
+измененных, неизмененных и снятых товаров собираются в ImportReport.
+"""
+
+import asyncio
+import csv
+import gc
+import hashlib
+import logging
+from dataclasses import asdict, dataclass, field
+from time import perf_counter
+from typing import IO, AsyncIterator, Collection, Iterator, Sequence, Union
+
+import pandas as pd
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import Settings
+from src.service.catalog_cache import catalog_cache
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+settings = Settings()
+
+CSV_PATH = 'price.csv'
+# Путь к файлу или открытый файл (например, UploadFile.file).
+CsvSource = Union[str, IO]
+CSV_READ_OPTIONS = dict(
+    delimiter=',',
+    quotechar='"',
+    encoding='utf-8',
+    dtype=str,
+    keep_default_na=False,
+)
+
+DEFAULT_CATEGORY_ID = 1
+DEFAULT_CATEGORY_NAME = 'товары без категории'
+
+CODE_COLUMN = 'Код'
+GROUP_COLUMN = 'Товарная группа'
+SUBGROUP_COLUMN = 'Товарная подгруппа'
+PRICE_COLUMN = 'За единицу, ₽'
+PHOTO_COLUMN = 'Фото'
+VIDEO_COLUMN = 'Видео'
+# Колонки CSV -> поля модели Firework.
+FIREWORK_COLUMNS = {
+    CODE_COLUMN: 'code',
+    'Артикул': 'article',
+    'Наименование': 'name',
+    'Единица измерения': 'measurement_unit',
+    'Кол-во зарядов': 'charges_count',
+    'Кол-во эффектов': 'effects_count',
+    'Описание — как на Рутуб': 'description',
+    'Размер изделия, мм': 'product_size',
+    'Материал упаковки': 'packing_material',
+    PRICE_COLUMN: 'price',
+    'Калибр, "': 'caliber',
+}
+NUMBER_FIELDS = ('charges_count', 'effects_count')
+# Все остальные колонки CSV считаются дополнительными характеристиками.
+EXCLUDED_PROPERTY_COLUMNS = {
+    *FIREWORK_COLUMNS,
+    PHOTO_COLUMN,
+    VIDEO_COLUMN,
+    GROUP_COLUMN,
+    SUBGROUP_COLUMN,
+}
+MEDIA_COLUMNS = {PHOTO_COLUMN: 'image', VIDEO_COLUMN: 'video'}
+# Меняется, если меняется разбор строки: старые хеши станут недействительны.
+# Версия 2: прежняя загрузка обновляла не все колонки товара, поэтому
+# сохраненные хеши могли не соответствовать данным.
+CONTENT_HASH_VERSION = '2'
+
+STAGE_CATEGORY_COLUMNS = ('name', 'parent_name')
+STAGE_FIREWORK_COLUMNS = (
+    *FIREWORK_COLUMNS.values(),
+    'category_name',
+    'content_hash',
+)
+STAGE_PROPERTY_COLUMNS = ('code', 'field_name', 'value')
+STAGE_MEDIA_COLUMNS = ('code', 'media_url', 'media_type')
+
+STAGE_TABLES = {
+    'import_category': STAGE_CATEGORY_COLUMNS,
+    'import_firework': STAGE_FIREWORK_COLUMNS,
+    'import_property': STAGE_PROPERTY_COLUMNS,
+    'import_media': STAGE_MEDIA_COLUMNS,
+}
+
+INSERT_DEFAULT_CATEGORY = text(
+    """
+    INSERT INTO category (id, name)
+    VALUES (:id, :name)
+    ON CONFLICT DO NOTHING
+    """
+)
+INSERT_PARENT_CATEGORIES = text(
+    """
+    INSERT INTO category (name)
+    SELECT DISTINCT parent_name FROM import_category
+    WHERE parent_name IS NOT NULL
+    ON CONFLICT (name) DO NOTHING
+    """
+)
+UPSERT_CATEGORIES = text(
+    """
+    INSERT INTO category (name, parent_category_id)
+    SELECT stage.name, parent.id
+    FROM import_category AS stage
+    LEFT JOIN category AS parent ON parent.name = stage.parent_name
+    ON CONFLICT (name) DO UPDATE
+    SET parent_category_id = EXCLUDED.parent_category_id,
+        updated_at = now()
+    WHERE category.parent_category_id
+        IS DISTINCT FROM EXCLUDED.parent_category_id
+    """
+)
+DELETE_UNCHANGED_FIREWORKS = text(
+    """
+    DELETE FROM import_firework AS stage
+    USING firework
+    WHERE firework.code = stage.code
+        AND firework.content_hash = stage.content_hash
+        AND firework.is_active
+    """
+)
+DELETE_UNCHANGED_PROPERTIES = text(
+    """
+    DELETE FROM import_property AS stage
+    WHERE NOT EXISTS (
+        SELECT 1 FROM import_firework WHERE import_firework.code = stage.code
+    )
+    """
+)
+DELETE_UNCHANGED_MEDIA = text(
+    """
+    DELETE FROM import_media AS stage
+    WHERE NOT EXISTS (
+        SELECT 1 FROM import_firework WHERE import_firework.code = stage.code
+    )
+    """
+)
+COUNT_NEW_FIREWORKS = text(
+    """
+    SELECT count(*) FROM import_firework AS stage
+    WHERE NOT EXISTS (
+        SELECT 1 FROM firework WHERE firework.code = stage.code
+    )
+    """
+)
+UPSERT_FIREWORKS = text(
+    """
+    INSERT INTO firework (
+        code, article, name, measurement_unit, charges_count,
+        effects_count, description, product_size, packing_material,
+        price, caliber, category_id, content_hash
+    )
+    SELECT
+        stage.code, stage.article, stage.name, stage.measurement_unit,
+        stage.charges_count::integer, stage.effects_count::integer,
+        stage.description, stage.product_size, stage.packing_material,
+        stage.price::numeric, stage.caliber,
+        coalesce(category.id, :default_category_id), stage.content_hash
+    FROM import_firework AS stage
+    LEFT JOIN category ON category.name = stage.category_name
+    ON CONFLICT (code) DO UPDATE
+    SET article = EXCLUDED.article,
+        name = EXCLUDED.name,
+        measurement_unit = EXCLUDED.measurement_unit,
+        charges_count = EXCLUDED.charges_count,
+        effects_count = EXCLUDED.effects_count,
+        description = EXCLUDED.description,
+        product_size = EXCLUDED.product_size,
+        packing_material = EXCLUDED.packing_material,
+        price = EXCLUDED.price,
+        category_id = EXCLUDED.category_id,
+        caliber = EXCLUDED.caliber,
+        content_hash = EXCLUDED.content_hash,
+        is_active = true,
+        updated_at = now()
+    """
+)
+DEACTIVATE_MISSING_FIREWORKS = text(
+    """
+    UPDATE firework
+    SET is_active = false,
+        updated_at = now()
+    WHERE firework.is_active
+        AND NOT EXISTS (
+            SELECT 1 FROM unnest(CAST(:codes AS varchar[])) AS file(code)
+            WHERE file.code = firework.code
+        )
+    """
+)
+INSERT_PROPERTY_FIELDS = text(
+    """
+    INSERT INTO property_field (field_name)
+    SELECT unnest(CAST(:field_names AS varchar[]))
+    ON CONFLICT (field_name) DO NOTHING
+    """
+)
+UPSERT_PROPERTIES = text(
+    """
+    INSERT INTO firework_property (firework_id, field_id, value)
+    SELECT firework.id, property_field.id, stage.value
+    FROM import_property AS stage
+    JOIN firework ON firework.code = stage.code
+    JOIN property_field ON property_field.field_name = stage.field_name
+    ON CONFLICT (firework_id, field_id) DO UPDATE
+    SET value = EXCLUDED.value,
+        updated_at = now()
+    WHERE firework_property.value IS DISTINCT FROM EXCLUDED.value
+    """
+)
+UPSERT_MEDIA = text(
+    """
+    INSERT INTO media (media_url, media_type)
+    SELECT DISTINCT ON (media_url) media_url, media_type
+    FROM import_media
+    ORDER BY media_url
+    ON CONFLICT (media_url) DO UPDATE
+    SET media_type = EXCLUDED.media_type,
+        updated_at = now()
+    WHERE media.media_type IS DISTINCT FROM EXCLUDED.media_type
+    """
+)
+INSERT_FIREWORK_MEDIA = text(
+    """
+    INSERT INTO firework_media (firework_id, image_id)
+    SELECT DISTINCT firework.id, media.id
+    FROM import_media AS stage
+    JOIN firework ON firework.code = stage.code
+    JOIN media ON media.media_url = stage.media_url
+    ON CONFLICT DO NOTHING
+    """
+)
+
+
+@dataclass
+class ImportStage:
+    """Этап загрузки: название, длительность и затронутые строки."""
+
+    name: str
+    seconds: float
+    rows: int
+
+
+@dataclass
+class ImportChanges:
+    """Количество товаров по результату сравнения с каталогом."""
+
+    added: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    removed: int = 0
+
+
+@dataclass
+class ImportReport:
+    """Отчет о загрузке прайс-листа по этапам и изменениям товаров."""
+
+    stages: list[ImportStage] = field(default_factory=list)
+    changes: ImportChanges = field(default_factory=ImportChanges)
+
+    def add(self, name: str, started: float, rows: int) -> None:
+        stage = ImportStage(name, perf_counter() - started, rows)
+        self.stages.append(stage)
+        logger.info(
+            'Этап %s: %.3f с, строк: %s', stage.name, stage.seconds, rows
+        )
+
+    @property
+    def total_seconds(self) -> float:
+        return sum(stage.seconds for stage in self.stages)
+
+    def as_dict(self) -> dict:
+        """Итоги по этапам; повторы этапа (загрузка частями) суммируются."""
+        totals = {}
+        for stage in self.stages:
+            total = totals.setdefault(stage.name, {'seconds': 0.0, 'rows': 0})
+            total['seconds'] += stage.seconds
+            total['rows'] += stage.rows
+        return {'stages': totals, 'changes': asdict(self.changes)}
+
+
+def strip_values(df: pd.DataFrame) -> pd.DataFrame:
+    return df.apply(lambda column: column.str.strip())
+
+
+def read_price_list(source: CsvSource = CSV_PATH) -> pd.DataFrame:
+    """Читает прайс-лист: все значения - строки без пробелов по краям."""
+    return strip_values(pd.read_csv(source, **CSV_READ_OPTIONS))
+
+
+async def read_chunks(
+    source: CsvSource, chunk_size: int = settings.csv_import_chunk_size
+) -> AsyncIterator[pd.DataFrame]:
+    """Читает прайс-лист частями по chunk_size строк.
+
+    Разбор CSV выполняется в отдельном потоке, чтобы не блокировать
+    event loop; в памяти одновременно находится только одна часть.
+    """
+    reader = await asyncio.to_thread(
+        pd.read_csv, source, chunksize=chunk_size, **CSV_READ_OPTIONS
+    )
+    with reader:
+        while (
+            chunk := await asyncio.to_thread(next, reader, None)
+        ) is not None:
+            yield strip_values(chunk)
+            # Объекты pandas обработанной части связаны циклическими
+            # ссылками; без сборки мусора они копятся до редкой полной
+            # сборки, и память растет с размером файла.
+            del chunk
+            gc.collect()
+
+
+def count_rows(path: str) -> int:
+    """Количество строк прайс-листа без заголовка (файл читается потоково).
+
+    Использует модуль csv, а не подсчет переводов строк: описания
+    в кавычках могут быть многострочными.
+    """
+    with open(path, newline='', encoding=CSV_READ_OPTIONS['encoding']) as file:
+        return max(sum(1 for _ in csv.reader(file)) - 1, 0)
+
+
+def to_nullable(frame: pd.DataFrame) -> pd.DataFrame:
+    """Заменяет NaN на None для записи в БД."""
+    frame = frame.astype(object)
+    return frame.where(frame.notna(), None)
+
+
+def convert_numbers(values: pd.Series) -> pd.Series:
+    """Конвертирует строковые числа с запятыми в целые (строкой)."""
+    numbers = pd.to_numeric(
+        values.str.replace(',', '.', regex=False), errors='coerce'
+    )
+    return numbers.dropna().astype('int64').astype(str).reindex(values.index)
+
+
+def get_product_category(df: pd.DataFrame) -> pd.Series:
+    """Категория товара: подгруппа, иначе группа, иначе дефолтная."""
+    category = df[SUBGROUP_COLUMN].mask(
+        df[SUBGROUP_COLUMN].eq(''), df[GROUP_COLUMN]
+    )
+    return category.mask(df[GROUP_COLUMN].eq(''), DEFAULT_CATEGORY_NAME)
+
+
+def prepare_categories(df: pd.DataFrame) -> pd.DataFrame:
+    """Категории прайс-листа: группы и подгруппы со ссылкой на группу.
+
+    Если имя встречается несколько раз, побеждает первое вхождение
+    в порядке строк файла (группа строки раньше ее подгруппы).
+    """
+    groups = df[GROUP_COLUMN]
+    children = df[SUBGROUP_COLUMN].mask(df[SUBGROUP_COLUMN].eq(''), groups)
+    positions = pd.RangeIndex(len(df)) * 2
+    categories = pd.concat([
+        pd.DataFrame(
+            {'name': [DEFAULT_CATEGORY_NAME], 'parent_name': [None]},
+            index=[-1],
+        ),
+        pd.DataFrame(
+            {'name': groups.to_numpy(), 'parent_name': None},
+            index=positions,
+        ),
+        pd.DataFrame(
+            {
+                'name': children.to_numpy(),
+                'parent_name': groups.to_numpy(),
+            },
+            index=positions + 1,
+        ),
+    ]).sort_index(kind='stable')
+    categories = categories[
+        categories['name'].ne('')
+        & categories['name'].ne(categories['parent_name'])
+    ]
+    categories = categories.drop_duplicates('name', keep='first')
+    return to_nullable(categories[list(STAGE_CATEGORY_COLUMNS)])
+
+
+def get_content_hashes(df: pd.DataFrame) -> pd.Series:
+    """Хеш содержимого строк прайс-листа для каждого кода товара.
+
+    Учитываются все непустые колонки строки (включая характеристики и
+    медиа) независимо от их порядка в файле, поэтому добавление пустой
+    колонки не меняет хеш. Если код встречается несколько раз, хеш
+    считается по всем его строкам.
+    """
+    content = pd.Series(CONTENT_HASH_VERSION, index=df.index)
+    for column in sorted(df.columns):
+        values = df[column]
+        content += (f'\x1e{column}\x1f' + values).where(values.ne(''), '')
+    codes = df[CODE_COLUMN]
+    duplicated = codes.duplicated(keep=False)
+    if duplicated.any():
+        joined = (
+            content[duplicated].groupby(codes[duplicated]).agg('\x1d'.join)
+        )
+        content[duplicated] = codes[duplicated].map(joined)
+    return content.map(lambda value: hashlib.md5(value.encode()).hexdigest())
+
+
+def prepare_fireworks(df: pd.DataFrame) -> pd.DataFrame:
+    """Товары прайс-листа; при повторе кода побеждает последняя строка.
+
+    Запятая в цене - разделитель тысяч, в количестве зарядов и
+    эффектов - десятичный разделитель.
+    """
+    fireworks = df.reindex(columns=list(FIREWORK_COLUMNS), fill_value='')
+    fireworks = fireworks.rename(columns=FIREWORK_COLUMNS)
+    for number_field in NUMBER_FIELDS:
+        fireworks[number_field] = convert_numbers(fireworks[number_field])
+    fireworks['price'] = (
+        pd.to_numeric(
+            fireworks['price']
+            .str.replace(' ', '', regex=False)
+            .str.replace(',', '', regex=False),
+            errors='coerce',
+        )
+        .fillna(0)
+        .round(2)
+        .astype(str)
+    )
+    fireworks['category_name'] = get_product_category(df)
+    fireworks['content_hash'] = get_content_hashes(df)
+    fireworks = fireworks.drop_duplicates('code', keep='last')
+    return to_nullable(fireworks[list(STAGE_FIREWORK_COLUMNS)])
+
+
+def get_property_columns(df: pd.DataFrame) -> list[str]:
+    return [
+        column
+        for column in df.columns
+        if column not in EXCLUDED_PROPERTY_COLUMNS
+    ]
+
+
+def prepare_properties(df: pd.DataFrame) -> pd.DataFrame:
+    """Непустые дополнительные характеристики в формате код-поле-значение."""
+    properties = df[[CODE_COLUMN, *get_property_columns(df)]].melt(
+        id_vars=CODE_COLUMN, var_name='field_name', value_name='value'
+    )
+    properties = properties[properties['value'].ne('')]
+    properties = properties.rename(columns={CODE_COLUMN: 'code'})
+    properties = properties.drop_duplicates(
+        ['code', 'field_name'], keep='last'
+    )
+    return properties[list(STAGE_PROPERTY_COLUMNS)]
+
+
+def prepare_media(df: pd.DataFrame) -> pd.DataFrame:
+    """Ссылки на фото и видео товаров."""
+    media = df[[CODE_COLUMN, *MEDIA_COLUMNS]].melt(
+        id_vars=CODE_COLUMN, var_name='column', value_name='media_url'
+    )
+    media = media[media['media_url'].ne('')]
+    media['media_type'] = media['column'].map(MEDIA_COLUMNS)
+    media = media.rename(columns={CODE_COLUMN: 'code'})
+    media = media.drop_duplicates(['code', 'media_url'], keep='last')
+    return media[list(STAGE_MEDIA_COLUMNS)]
+
+
+def iter_records(frame: pd.DataFrame) -> Iterator[tuple]:
+    return frame.itertuples(index=False, name=None)
+
+
+async def create_stage_tables(session: AsyncSession) -> None:
+    """Создает временные таблицы загрузки (живут до конца транзакции)."""
+    for table_name, columns in STAGE_TABLES.items():
+        columns_sql = ', '.join(f'{column} text' for column in columns)
+        await session.execute(
+            text(
+                f'CREATE TEMP TABLE IF NOT EXISTS {table_name} '
+                f'({columns_sql}) ON COMMIT DROP'
+            )
+        )
+        await session.execute(text(f'TRUNCATE {table_name}'))
+
+
+async def stage_rows(
+    session: AsyncSession,
+    table_name: str,
+    columns: Sequence[str],
+    frame: pd.DataFrame,
+) -> int:
+    """Копирует строки во временную таблицу одной командой COPY."""
+    connection = await session.connection()
+    raw_connection = await connection.get_raw_connection()
+    await raw_connection.driver_connection.copy_records_to_table(
+        table_name, records=iter_records(frame), columns=list(columns)
+    )
+    return len(frame)
+
+
+async def stage_price_list(
+    session: AsyncSession, df: pd.DataFrame, report: ImportReport
+) -> None:
+    """Нормализует прайс-лист и загружает его во временные таблицы."""
+    started = perf_counter()
+    frames = {
+        'import_category': prepare_categories(df),
+        'import_firework': prepare_fireworks(df),
+        'import_property': prepare_properties(df),
+        'import_media': prepare_media(df),
+    }
+    report.add('prepare', started, len(df))
+    started = perf_counter()
+    await create_stage_tables(session)
+    rows = 0
+    for table_name, frame in frames.items():
+        rows += await stage_rows(
+            session, table_name, STAGE_TABLES[table_name], frame
+        )
+    report.add('copy', started, rows)
+
+
+async def skip_unchanged(
+    session: AsyncSession, df: pd.DataFrame, report: ImportReport
+) -> None:
+    """Убирает из временных таблиц товары, не изменившиеся с прошлой загрузки.
+
+    Заодно считает, сколько из оставшихся товаров будут добавлены.
+    """
+    started = perf_counter()
+    result = await session.execute(DELETE_UNCHANGED_FIREWORKS)
+    unchanged = result.rowcount
+    await session.execute(DELETE_UNCHANGED_PROPERTIES)
+    await session.execute(DELETE_UNCHANGED_MEDIA)
+    added = (await session.execute(COUNT_NEW_FIREWORKS)).scalar_one()
+    changed = df[CODE_COLUMN].nunique() - unchanged
+    report.changes.unchanged += unchanged
+    report.changes.added += added
+    report.changes.updated += changed - added
+    report.add('diff', started, unchanged)
+
+
+async def process_categories(
+    session: AsyncSession, report: ImportReport
+) -> None:
+    """Создает категории и обновляет их иерархию."""
+    started = perf_counter()
+    await session.execute(
+        INSERT_DEFAULT_CATEGORY,
+        {'id': DEFAULT_CATEGORY_ID, 'name': DEFAULT_CATEGORY_NAME},
+    )
+    await session.execute(INSERT_PARENT_CATEGORIES)
+    result = await session.execute(UPSERT_CATEGORIES)
+    report.add('categories', started, result.rowcount)
+
+
+async def process_fireworks(
+    session: AsyncSession, df: pd.DataFrame, report: ImportReport
+) -> None:
+    """Создает и обновляет товары и их характеристики."""
+    started = perf_counter()
+    result = await session.execute(
+        UPSERT_FIREWORKS, {'default_category_id': DEFAULT_CATEGORY_ID}
+    )
+    report.add('fireworks', started, result.rowcount)
+    started = perf_counter()
+    await session.execute(
+        INSERT_PROPERTY_FIELDS, {'field_names': get_property_columns(df)}
+    )
+    result = await session.execute(UPSERT_PROPERTIES)
+    report.add('properties', started, result.rowcount)
+
+
+async def process_media(session: AsyncSession, report: ImportReport) -> None:
+    """Создает медиа-файлы и связи с фейерверками."""
+    started = perf_counter()
+    result = await session.execute(UPSERT_MEDIA)
+    report.add('media', started, result.rowcount)
+    started = perf_counter()
+    result = await session.execute(INSERT_FIREWORK_MEDIA)
+    report.add('firework_media', started, result.rowcount)
+
+
+async def deactivate_missing(
+    session: AsyncSession, codes: Collection[str], report: ImportReport
+) -> None:
+    """Снимает с каталога товары, коды которых не переданы.
+
+    Аргументы:
+        codes: коды всех товаров прайс-листа - всего файла,
+            а не одной части.
+    """
+    started = perf_counter()
+    result = await session.execute(
+        DEACTIVATE_MISSING_FIREWORKS, {'codes': list(codes)}
+    )
+    report.changes.removed += result.rowcount
+    report.add('deactivate', started, result.rowcount)
+
+
+async def import_price_list(
+    session: AsyncSession, df: pd.DataFrame, report: ImportReport
+) -> None:
+    """Загружает подготовленный прайс-лист в каталог (без коммита)."""
+    await stage_price_list(session, df, report)
+    await skip_unchanged(session, df, report)
+    await process_categories(session, report)
+    await process_fireworks(session, df, report)
+    await process_media(session, report)
+
+
+async def load_data(
+    session: AsyncSession,
+    source: CsvSource = CSV_PATH,
+    remove_missing: bool = False,
+    chunk_size: int = settings.csv_import_chunk_size,
+) -> ImportReport:
+    """Загружает прайс-лист из CSV и сбрасывает кеш каталога.
+
+    Файл читается и загружается частями в одной транзакции, поэтому
+    память не растет с размером файла, а при ошибке каталог не меняется.
+
+    Аргументы:
+        source: путь к файлу или открытый файл (например,
+            UploadFile.file) - сохранять загрузку на диск не нужно.
+        remove_missing: снять с каталога товары, которых нет в файле.
+        chunk_size: количество строк в одной части.
+    """
+    report = ImportReport()
+    codes = set()
+    rows = 0
+    try:
+        started = perf_counter()
+        async for chunk in read_chunks(source, chunk_size):
+            report.add('read', started, len(chunk))
+            await import_price_list(session, chunk, report)
+            if remove_missing:
+                codes.update(chunk[CODE_COLUMN])
+            rows += len(chunk)
+            started = perf_counter()
+        if remove_missing:
+            await deactivate_missing(session, codes, report)
+
+        started = perf_counter()
+        await session.commit()
+        report.add('commit', started, rows)
+        logger.info(
+            'Все данные успешно загружены за %.3f с', report.total_seconds
+        )
+
+        await catalog_cache.bump_version()
+    except Exception as e:
+        await session.rollback()
+        logger.error(f'Ошибка при загрузке данных: {str(e)}')
+        raise
+    return report
+
+
+if __name__ == '__main__':
+    from sqlalchemy.ext.asyncio import create_async_engine
+    from sqlalchemy.orm import sessionmaker
+
+    async def async_main() -> None:
+        engine = create_async_engine(settings.database_url)
+        async_session = sessionmaker(
+            engine, class_=AsyncSession, expire_on_commit=False
+        )
+        async with async_session() as session:
+            report = await load_data(session)
+        await engine.dispose()
+        print(f'Загрузка завершена: {report.as_dict()}')
+
+    asyncio.run(async_main())
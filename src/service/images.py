@@ -0,0 +1,128 @@
+"""Обработка изображений (Pillow).
+
+Фото поставщиков приходят в полном разрешении, а Telegram все равно
+сжимает их. Поэтому из каждого фото заранее делаются варианты,
+ограниченные по ширине, под каждое место показа: карточка в списке
+каталога (CARD), подробный просмотр товара (DETAIL) и рассылки
+(NEWSLETTER). Каждый вариант сохраняется в JPEG (его отправляет бот)
+и WebP (меньше по размеру, для клиентов, которые его поддерживают).
+
+Содержит:
+- Функцию get_image_size: ширина и высота изображения по его байтам.
+- Класс ImageVariant: готовый вариант изображения.
+- Функцию transcode: все варианты изображения. Декодирование занимает
+    процессор, поэтому функция вызывается в пуле процессов (см.
+    src/service/media_variants.py); модуль не импортирует ничего,
+    кроме Pillow, чтобы процессы пула запускались быстро.
+"""
+
+from dataclasses import dataclass
+from io import BytesIO
+from typing import Optional
+
+from PIL import Image, ImageOps
+
+CARD = 'card'
+DETAIL = 'detail'
+NEWSLETTER = 'newsletter'
+# Наибольшая ширина варианта; меньшие фото не увеличиваются.
+VARIANT_WIDTHS = {CARD: 480, DETAIL: 1280, NEWSLETTER: 1080}
+
+JPEG = 'jpeg'
+WEBP = 'webp'
+VARIANT_FORMATS = (JPEG, WEBP)
+CONTENT_TYPES = {JPEG: 'image/jpeg', WEBP: 'image/webp'}
+QUALITY = {JPEG: 85, WEBP: 80}
+SAVE_OPTIONS = {
+    JPEG: dict(format='JPEG', optimize=True, progressive=True),
+    WEBP: dict(format='WEBP', method=4),
+}
+# Фон для прозрачных изображений: в JPEG прозрачности нет.
+BACKGROUND = (255, 255, 255)
+
+
+@dataclass
+class ImageVariant:
+    """Вариант изображения."""
+
+    variant: str
+    format: str
+    data: bytes
+    width: int
+    height: int
+
+
+def get_image_size(data: bytes) -> tuple[Optional[int], Optional[int]]:
+    """Ширина и высота изображения.
+
+    Pillow читает только заголовок файла, без декодирования пикселей.
+    Для файлов, которые не являются изображениями (например, видео),
+    возвращает (None, None).
+    """
+    try:
+        with Image.open(BytesIO(data)) as image:
+            return image.size
+    except (OSError, Image.DecompressionBombError):
+        return None, None
+
+
+def to_rgb(image: Image.Image) -> Image.Image:
+    """Изображение в RGB; прозрачные области заливаются BACKGROUND."""
+    if image.mode == 'RGB':
+        return image
+    if image.mode == 'P':
+        image = image.convert('RGBA')
+    if image.mode in ('RGBA', 'LA'):
+        background = Image.new('RGB', image.size, BACKGROUND)
+        background.paste(image, mask=image.getchannel('A'))
+        return background
+    return image.convert('RGB')
+
+
+def resize(image: Image.Image, width: int) -> Image.Image:
+    if image.width <= width:
+        return image
+    height = max(1, round(image.height * width / image.width))
+    return image.resize((width, height), Image.Resampling.LANCZOS)
+
+
+def transcode(data: bytes) -> list[ImageVariant]:
+    """Все варианты изображения (VARIANT_WIDTHS x VARIANT_FORMATS).
+
+    Ориентация берется из EXIF. Ошибки разбора файла (OSError,
+    Image.DecompressionBombError) передаются вызывающему.
+    """
+    with Image.open(BytesIO(data)) as source:
+        # JPEG декодируется сразу в уменьшенном масштабе, если
+        # самый большой вариант это позволяет.
+        max_width = max(VARIANT_WIDTHS.values())
+        if source.width > max_width:
+            source.draft(
+                'RGB',
+                (max_width, round(source.height * max_width / source.width)),
+            )
+        image = to_rgb(ImageOps.exif_transpose(source))
+    variants = []
+    # От большего варианта к меньшему: каждый следующий получается
+    # из предыдущего, а не из исходного фото.
+    for variant, width in sorted(
+        VARIANT_WIDTHS.items(), key=lambda item: item[1], reverse=True
+    ):
+        image = resize(image, width)
+        for image_format in VARIANT_FORMATS:
+            buffer = BytesIO()
+            image.save(
+                buffer,
+                quality=QUALITY[image_format],
+                **SAVE_OPTIONS[image_format],
+            )
+            variants.append(
+                ImageVariant(
+                    variant=variant,
+                    format=image_format,
+                    data=buffer.getvalue(),
+                    width=image.width,
+                    height=image.height,
+                )
+            )
+    return variants
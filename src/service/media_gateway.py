@@ -0,0 +1,201 @@
+"""Шлюз медиа товаров для /proxy.
+
+Файлы с Яндекс Диска отдаются из хранилища медиа
+(src/service/media_store.py):
+- с ETag по хешу содержимого (имя файла в хранилище), Content-Length
+  и Cache-Control, поэтому nginx, браузеры и Telegram кешируют файл
+  и переспрашивают его условным запросом (If-None-Match -> 304);
+- за nginx (settings.media_store_accel_prefix) файл отдает nginx по
+  X-Accel-Redirect, иначе - FileResponse; оба поддерживают Range.
+
+Видео (.mp4, .mov), которого еще нет в хранилище, не ждет скачивания
+целиком: ответ Яндекс Диска передается клиенту по частям, вместе
+с заголовком Range запроса (перемотка работает сразу), а файл
+параллельно скачивается в хранилище для следующих запросов.
+
+Содержит:
+- Класс MediaGateway: общий пул соединений aiohttp и сборка ответов.
+- Объект media_gateway; пул закрывается в lifespan приложения.
+"""
+
+import asyncio
+import logging
+from contextlib import AsyncExitStack
+from pathlib import PurePosixPath
+from typing import AsyncIterator, Optional
+from urllib.parse import urlparse
+
+import aiohttp
+from fastapi import Request
+from fastapi.responses import FileResponse, Response, StreamingResponse
+from starlette.background import BackgroundTask
+
+from src.config import settings
+from src.service.media_store import CHUNK_SIZE, StoredMedia, media_store
+from src.service.yandex_disk import is_yandex_disk_url, yandex_resolver
+
+logger = logging.getLogger(__name__)
+
+# Файлы, для которых передается Range (перемотка видео).
+RANGE_FORMATS = ('.mp4', '.mov')
+# Заголовки ответа источника, передаваемые клиенту при потоковой отдаче.
+STREAM_HEADERS = (
+    'Content-Type',
+    'Content-Length',
+    'Content-Range',
+    'Accept-Ranges',
+)
+
+
+def get_etag(stored: StoredMedia) -> str:
+    """ETag файла: хеш содержимого из имени файла в хранилище."""
+    return f'"{PurePosixPath(stored.relative_path).stem}"'
+
+
+def is_range_media(url: str) -> bool:
+    return PurePosixPath(urlparse(url).path).suffix.lower() in RANGE_FORMATS
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get('If-None-Match')
+    if not if_none_match:
+        return False
+    return if_none_match.strip() == '*' or etag in (
+        tag.strip().removeprefix('W/') for tag in if_none_match.split(',')
+    )
+
+
+class MediaGateway:
+    """Отдача медиа товаров через общий пул соединений."""
+
+    def __init__(
+        self,
+        limit: int = settings.media_gateway_pool_limit,
+        connect_timeout: float = settings.media_gateway_connect_timeout,
+        read_timeout: float = settings.media_gateway_read_timeout,
+        max_age: int = settings.media_cache_max_age,
+    ) -> None:
+        """Сохраняет настройки; сессия создается при первом запросе.
+
+        Аргументы:
+            limit: наибольшее число одновременных соединений.
+            connect_timeout: таймаут соединения, в секундах.
+            read_timeout: таймаут чтения очередной части ответа,
+                в секундах (общего таймаута нет: видео скачиваются
+                долго).
+            max_age: время кеширования файла клиентом, в секундах.
+        """
+        self.limit = limit
+        self.timeout = aiohttp.ClientTimeout(
+            total=None, connect=connect_timeout, sock_read=read_timeout
+        )
+        self.cache_control = f'public, max-age={max_age}'
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._prefetches: set[asyncio.Task] = set()
+
+    def get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.limit, ttl_dns_cache=300
+                ),
+                timeout=self.timeout,
+            )
+        return self._session
+
+    async def close(self) -> None:
+        for task in list(self._prefetches):
+            task.cancel()
+        await asyncio.gather(*self._prefetches, return_exceptions=True)
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def fetch(self, url: str) -> StoredMedia:
+        """Файл из хранилища; при отсутствии скачивается."""
+        return await media_store.fetch(self.get_session(), url)
+
+    def build_response(
+        self, request: Request, stored: StoredMedia
+    ) -> Response:
+        """Ответ с файлом из хранилища (или 304 на условный запрос)."""
+        headers = {
+            'ETag': get_etag(stored),
+            'Cache-Control': self.cache_control,
+        }
+        if is_not_modified(request, headers['ETag']):
+            return Response(status_code=304, headers=headers)
+        if settings.media_store_accel_prefix:
+            # Content-Length и Range обрабатывает nginx.
+            headers['X-Accel-Redirect'] = (
+                settings.media_store_accel_prefix + stored.relative_path
+            )
+            return Response(headers=headers, media_type=stored.content_type)
+        return FileResponse(
+            stored.path, headers=headers, media_type=stored.content_type
+        )
+
+    async def stream(self, request: Request, url: str) -> Response:
+        """Передает файл от источника по частям, не дожидаясь скачивания.
+
+        Заголовок Range запроса передается источнику, а его ответ
+        (200, 206 или 416) - клиенту. Файл тем временем скачивается
+        в хранилище. Ошибки соединения (aiohttp.ClientError, KeyError
+        при ответе API Яндекс Диска без ссылки) передаются вызывающему.
+        """
+        self.prefetch(url)
+        session = self.get_session()
+        headers = {}
+        if 'Range' in request.headers:
+            headers['Range'] = request.headers['Range']
+        if is_yandex_disk_url(url):
+            opened = yandex_resolver.open(session, url, headers=headers)
+        else:
+            opened = session.get(url, headers=headers)
+        stack = AsyncExitStack()
+        response = await stack.enter_async_context(opened)
+        if response.status >= 400 and response.status != 416:
+            await stack.aclose()
+            raise aiohttp.ClientResponseError(
+                response.request_info,
+                response.history,
+                status=response.status,
+            )
+        return StreamingResponse(
+            self._iterate(response, stack),
+            status_code=response.status,
+            headers={
+                **{
+                    name: response.headers[name]
+                    for name in STREAM_HEADERS
+                    if name in response.headers
+                },
+                'Cache-Control': self.cache_control,
+            },
+            # Если передача не началась, ответ закроется здесь.
+            background=BackgroundTask(stack.aclose),
+        )
+
+    def prefetch(self, url: str) -> None:
+        """Скачивает файл в хранилище в фоне."""
+        task = asyncio.create_task(self._prefetch(url))
+        self._prefetches.add(task)
+        task.add_done_callback(self._prefetches.discard)
+
+    async def _prefetch(self, url: str) -> None:
+        try:
+            await self.fetch(url)
+        except (aiohttp.ClientError, KeyError) as error:
+            logger.warning('Не удалось скачать медиа %s: %s', url, error)
+
+    async def _iterate(
+        self, response: aiohttp.ClientResponse, stack: AsyncExitStack
+    ) -> AsyncIterator[bytes]:
+        # Ответ источника закрывается здесь, после передачи последней
+        # части или отключения клиента, а не при выходе из обработчика.
+        async with stack:
+            async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                yield chunk
+
+
+media_gateway = MediaGateway()
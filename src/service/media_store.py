@@ -0,0 +1,258 @@
+"""Локальное хранилище медиа товаров на диске (том media_value).
+
+Файл по ссылке скачивается один раз и хранится по хешу содержимого:
+blobs/<2 символа>/<sha256><расширение>. Ссылка на источник связана
+с файлом символической ссылкой urls/<2 символа>/<sha1 ссылки>, поэтому
+файл находится по ссылке одним обращением к диску, а одинаковые файлы
+под разными ссылками хранятся один раз. Файлы и ссылки появляются
+атомарно (запись во временный файл и os.replace), поэтому хранилищем
+одновременно пользуются API, бот и процесс рассылок.
+
+Размер хранилища ограничен settings.media_store_max_size: при
+превышении удаляются давно не использованные файлы (время изменения
+файла обновляется при каждом обращении). Файлы отдает nginx (sendfile)
+по X-Accel-Redirect, см. /proxy.
+
+Содержит:
+- Класс StoredMedia: файл в хранилище.
+- Класс MediaStore: поиск, скачивание (с Яндекс Диска - через
+    yandex_resolver) и вытеснение файлов. Одновременные запросы одной
+    ссылки ждут одно скачивание.
+- Объект media_store, общий для API, бота и прогрева
+    (src/utils/media_warmup.py).
+
+Запись и чтение файлов выполняются в потоках (asyncio.to_thread),
+чтобы не блокировать цикл событий.
+"""
+
+import asyncio
+import contextlib
+import hashlib
+import logging
+import mimetypes
+import os
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path, PurePosixPath
+from time import time
+from typing import BinaryIO, Optional
+from urllib.parse import urlparse
+
+import aiohttp
+
+from src.config import settings
+from src.service.yandex_disk import is_yandex_disk_url, yandex_resolver
+
+logger = logging.getLogger(__name__)
+
+BLOBS_DIR = 'blobs'
+URLS_DIR = 'urls'
+TMP_DIR = 'tmp'
+CHUNK_SIZE = 64 * 1024
+# Время изменения файла обновляется не чаще раза в TOUCH_INTERVAL секунд.
+TOUCH_INTERVAL = 60
+# Вытеснение освобождает место с запасом, чтобы не запускаться на
+# каждую следующую запись.
+EVICTION_RATIO = 0.9
+# Через сколько секунд временный файл считается брошенным.
+STALE_TMP_AGE = 3600
+DEFAULT_CONTENT_TYPE = 'application/octet-stream'
+
+
+@dataclass
+class StoredMedia:
+    """Файл в хранилище."""
+
+    path: Path
+    relative_path: str
+    content_type: str
+    size: int
+
+
+class MediaStore:
+    """Хранилище файлов по хешу содержимого с вытеснением LRU."""
+
+    def __init__(
+        self,
+        root: str = settings.media_store_dir,
+        max_size: int = settings.media_store_max_size,
+    ) -> None:
+        """Создает хранилище; каталоги создаются при первой записи.
+
+        Аргументы:
+            root: каталог хранилища.
+            max_size: наибольший суммарный размер файлов, в байтах.
+        """
+        self.root = Path(root).resolve()
+        self.max_size = max_size
+        self._size: Optional[int] = None
+        self._pending: dict[str, asyncio.Task] = {}
+        self._eviction: Optional[asyncio.Task] = None
+
+    def get_url_path(self, url: str) -> Path:
+        digest = hashlib.sha1(url.encode()).hexdigest()
+        return self.root / URLS_DIR / digest[:2] / digest
+
+    def get_blob_path(self, digest: str, suffix: str) -> Path:
+        return self.root / BLOBS_DIR / digest[:2] / f'{digest}{suffix}'
+
+    async def get(self, url: str) -> Optional[StoredMedia]:
+        """Файл по ссылке на источник или None, если его нет."""
+        return await asyncio.to_thread(self._get, url)
+
+    async def fetch(
+        self, session: aiohttp.ClientSession, url: str
+    ) -> StoredMedia:
+        """Файл по ссылке; при отсутствии он скачивается и сохраняется.
+
+        Ошибки скачивания (aiohttp.ClientError, KeyError при ответе
+        API Яндекс Диска без ссылки) передаются вызывающему.
+        """
+        stored = await self.get(url)
+        if stored is not None:
+            return stored
+        task = self._pending.get(url)
+        if task is None:
+            task = asyncio.create_task(self._download(session, url))
+            self._pending[url] = task
+            task.add_done_callback(lambda _: self._pending.pop(url, None))
+        # Отмена одного из ожидающих не должна отменять скачивание.
+        return await asyncio.shield(task)
+
+    async def read(self, stored: StoredMedia) -> bytes:
+        return await asyncio.to_thread(stored.path.read_bytes)
+
+    async def evict(self) -> None:
+        """Удаляет давно не использованные файлы сверх max_size."""
+        if self._eviction is None or self._eviction.done():
+            self._eviction = asyncio.create_task(
+                asyncio.to_thread(self._evict)
+            )
+        await asyncio.shield(self._eviction)
+
+    async def _download(
+        self, session: aiohttp.ClientSession, url: str
+    ) -> StoredMedia:
+        if is_yandex_disk_url(url):
+            opened = yandex_resolver.open(session, url)
+        else:
+            opened = session.get(url)
+        tmp_dir = self.root / TMP_DIR
+        await asyncio.to_thread(tmp_dir.mkdir, parents=True, exist_ok=True)
+        file = await asyncio.to_thread(
+            tempfile.NamedTemporaryFile, dir=tmp_dir, delete=False
+        )
+        try:
+            async with opened as response:
+                response.raise_for_status()
+                content_type = response.content_type
+                digest = hashlib.sha256()
+                async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                    digest.update(chunk)
+                    await asyncio.to_thread(file.write, chunk)
+            stored = await asyncio.to_thread(
+                self._place,
+                file,
+                url,
+                digest.hexdigest(),
+                self._get_suffix(url, content_type),
+            )
+        finally:
+            await asyncio.to_thread(self._discard, file)
+        if self._size is None or self._size + stored.size > self.max_size:
+            await self.evict()
+        else:
+            self._size += stored.size
+        return stored
+
+    def _get_suffix(self, url: str, content_type: str) -> str:
+        """Расширение файла: по нему nginx определяет Content-Type."""
+        if content_type != DEFAULT_CONTENT_TYPE:
+            suffix = mimetypes.guess_extension(content_type)
+            if suffix:
+                return suffix
+        return PurePosixPath(urlparse(url).path).suffix.lower()
+
+    def _build_stored(self, path: Path, size: int) -> StoredMedia:
+        content_type, _ = mimetypes.guess_type(path.name)
+        return StoredMedia(
+            path=path,
+            relative_path=path.relative_to(self.root).as_posix(),
+            content_type=content_type or DEFAULT_CONTENT_TYPE,
+            size=size,
+        )
+
+    def _get(self, url: str) -> Optional[StoredMedia]:
+        link = self.get_url_path(url)
+        try:
+            path = (link.parent / os.readlink(link)).resolve()
+            stat = path.stat()
+            if time() - stat.st_mtime > TOUCH_INTERVAL:
+                os.utime(path)
+        except OSError:
+            # Файла нет или он вытеснен: ссылка удалится при вытеснении.
+            return None
+        return self._build_stored(path, stat.st_size)
+
+    def _place(
+        self, file: BinaryIO, url: str, digest: str, suffix: str
+    ) -> StoredMedia:
+        file.close()
+        size = os.path.getsize(file.name)
+        path = self.get_blob_path(digest, suffix)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.exists():
+            os.utime(path)
+        else:
+            os.chmod(file.name, 0o644)
+            os.replace(file.name, path)
+        link = self.get_url_path(url)
+        link.parent.mkdir(parents=True, exist_ok=True)
+        # Относительная ссылка работает при любой точке монтирования.
+        tmp_link = link.with_name(f'{link.name}.{os.getpid()}.tmp')
+        with contextlib.suppress(FileNotFoundError):
+            tmp_link.unlink()
+        os.symlink(os.path.relpath(path, link.parent), tmp_link)
+        os.replace(tmp_link, link)
+        return self._build_stored(path, size)
+
+    def _discard(self, file: BinaryIO) -> None:
+        file.close()
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(file.name)
+
+    def _evict(self) -> None:
+        # Временные файлы прерванных скачиваний.
+        for path in (self.root / TMP_DIR).glob('*'):
+            with contextlib.suppress(FileNotFoundError):
+                if time() - path.stat().st_mtime > STALE_TMP_AGE:
+                    path.unlink()
+        blobs = []
+        for path in (self.root / BLOBS_DIR).glob('*/*'):
+            with contextlib.suppress(FileNotFoundError):
+                stat = path.stat()
+                blobs.append((stat.st_mtime, stat.st_size, path))
+        size = sum(blob_size for _, blob_size, _ in blobs)
+        if size > self.max_size:
+            blobs.sort()
+            removed = 0
+            for _, blob_size, path in blobs:
+                if size <= self.max_size * EVICTION_RATIO:
+                    break
+                with contextlib.suppress(FileNotFoundError):
+                    path.unlink()
+                size -= blob_size
+                removed += 1
+            for link in (self.root / URLS_DIR).glob('*/*'):
+                if not link.exists():
+                    with contextlib.suppress(FileNotFoundError):
+                        link.unlink()
+            logger.info(
+                'Из хранилища медиа вытеснено файлов: %s, занято %s байт',
+                removed,
+                size,
+            )
+        self._size = size
+
+
+media_store = MediaStore()
@@ -0,0 +1,192 @@
+"""Подготовка вариантов фото каталога для показа.
+
+Исходное фото берется из хранилища медиа (src/service/media_store.py,
+при отсутствии скачивается), перекодируется в варианты
+(src/service/images.py) и сохраняется в blob_storage, а в БД -
+записи FormattedMedia с размерами вариантов. Бот отправляет
+вариант, подходящий месту показа (см. src/bot/handlers/catalog.py).
+
+Декодирование и сжатие изображений занимают процессор на сотни
+миллисекунд, поэтому выполняются в пуле процессов
+(settings.image_workers процессов): цикл событий API в это время
+продолжает отвечать на запросы.
+
+Содержит:
+- Функцию transcode: варианты изображения, посчитанные в пуле.
+- Функцию generate_variants: варианты одного медиа.
+- Функцию refresh_variants: пересоздание вариантов медиа после
+    изменения в админке.
+- Функцию generate_missing_variants: варианты всех фото каталога,
+    для которых их еще нет; запускается после загрузки прайс-листа
+    (src/service/csv_import_jobs.py) и вручную
+    (src/utils/media_variants.py).
+- Функцию delete_orphaned_files: удаление файлов вариантов, на которые
+    не ссылаются записи FormattedMedia (src/utils/media_variants.py).
+- Функцию shutdown_pool: остановка пула процессов.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import timedelta
+from typing import Optional
+
+import aiohttp
+from PIL import Image
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import settings
+from src.crud.media import PHOTO_MEDIA_TYPE, formatted_media_crud
+from src.database.db_dependencies import AsyncSessionLocal
+from src.models.media import FormattedMedia, Media
+from src.service import images
+from src.service.catalog_cache import catalog_cache
+from src.service.media_store import media_store
+
+logger = logging.getLogger(__name__)
+
+# Ошибки, из-за которых варианты одного медиа не созданы: файл
+# не скачался (KeyError - ответ Яндекс Диска без ссылки) или
+# не является изображением, или процесс пула упал.
+VARIANT_ERRORS = (
+    aiohttp.ClientError,
+    BrokenProcessPool,
+    KeyError,
+    OSError,
+    Image.DecompressionBombError,
+    SQLAlchemyError,
+)
+
+# Возраст, после которого файл варианта без записи в БД считается
+# лишним: файлы записываются в хранилище до фиксации записей.
+ORPHAN_MIN_AGE = timedelta(hours=1)
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_pool() -> ProcessPoolExecutor:
+    """Пул процессов, создаваемый при первом обращении.
+
+    Процессы запускаются методом spawn: fork процесса с потоками
+    и открытыми соединениями небезопасен.
+    """
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(
+            max_workers=settings.image_workers,
+            mp_context=multiprocessing.get_context('spawn'),
+        )
+    return _pool
+
+
+def shutdown_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(cancel_futures=True)
+        _pool = None
+
+
+async def transcode(data: bytes) -> list[images.ImageVariant]:
+    try:
+        return await asyncio.get_running_loop().run_in_executor(
+            get_pool(), images.transcode, data
+        )
+    except BrokenProcessPool:
+        # Процесс пула завершился аварийно (например, не хватило
+        # памяти), и пул больше не принимает задачи: следующий вызов
+        # создаст новый.
+        shutdown_pool()
+        raise
+
+
+async def generate_variants(
+    session: AsyncSession,
+    media: Media,
+    http_session: aiohttp.ClientSession,
+) -> list[FormattedMedia]:
+    """Создает (или пересоздает) варианты фото медиа."""
+    stored = await media_store.fetch(http_session, media.media_url)
+    variants = await transcode(await media_store.read(stored))
+    return await formatted_media_crud.save_variants(
+        session, media.id, variants
+    )
+
+
+async def refresh_variants(media_id: int) -> None:
+    """Пересоздает варианты фото медиа; ошибки только логируются."""
+    async with AsyncSessionLocal() as session:
+        media = await session.get(Media, media_id)
+        if media is None or media.media_type != PHOTO_MEDIA_TYPE:
+            return
+        try:
+            async with aiohttp.ClientSession() as http_session:
+                await generate_variants(session, media, http_session)
+        except VARIANT_ERRORS as error:
+            logger.warning(
+                'Не удалось создать варианты медиа %s: %s',
+                media.media_url,
+                error,
+            )
+
+
+async def generate_missing_variants(
+    concurrency: int = settings.image_workers,
+) -> Counter:
+    """Создает варианты фото каталога, для которых готовы не все.
+
+    Возвращает итоги: generated - обработано медиа, failed - ошибок.
+    Ошибка одного медиа не останавливает остальные.
+    """
+    async with AsyncSessionLocal() as session:
+        media_list = await formatted_media_crud.get_media_without_variants(
+            session
+        )
+    stats = Counter()
+    if not media_list:
+        return stats
+    logger.info('Фото без вариантов: %s', len(media_list))
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def generate(
+        http_session: aiohttp.ClientSession, media: Media
+    ) -> None:
+        async with semaphore, AsyncSessionLocal() as session:
+            try:
+                await generate_variants(session, media, http_session)
+            except VARIANT_ERRORS as error:
+                logger.warning(
+                    'Не удалось создать варианты медиа %s: %s',
+                    media.media_url,
+                    error,
+                )
+                stats['failed'] += 1
+                return
+        stats['generated'] += 1
+
+    async with aiohttp.ClientSession() as http_session:
+        await asyncio.gather(
+            *(generate(http_session, media) for media in media_list)
+        )
+    if stats['generated']:
+        # Варианты входят в ответы каталога (MediaDB.variants).
+        await catalog_cache.bump_version()
+    logger.info(
+        'Варианты фото созданы: %s, ошибок: %s',
+        stats['generated'],
+        stats['failed'],
+    )
+    return stats
+
+
+async def delete_orphaned_files(min_age: timedelta = ORPHAN_MIN_AGE) -> int:
+    """Удаляет из хранилища файлы вариантов без записей FormattedMedia."""
+    async with AsyncSessionLocal() as session:
+        deleted = await formatted_media_crud.delete_orphaned_files(
+            session, min_age
+        )
+    logger.info('Удалено лишних файлов вариантов: %s', deleted)
+    return deleted
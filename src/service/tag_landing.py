@@ -0,0 +1,115 @@
+"""Страницы результатов по тегам из кнопок рассылок.
+
+После рассылки тысячи получателей почти одновременно нажимают одни и те
+же кнопки тегов. Чтобы нажатие не стоило запросов к БД, страница тега
+(первые TAG_FIREWORKS_LIMIT фейерверков с готовыми карточками и медиа,
+включая сохраненные file_id Telegram) собирается заранее - перед
+отправкой рассылки - и хранится в кеше каталога (процесс и Redis)
+settings.tag_landing_ttl секунд. Ключ содержит версию каталога,
+поэтому изменение каталога сбрасывает и эти страницы.
+
+Содержит:
+- build_tag_landing: сборка страницы тега из БД.
+- get_tag_landing: страница из кеша (при промахе - из БД).
+- warm_tag_landings: подготовка страниц тегов рассылки.
+"""
+
+import logging
+from typing import Iterable, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.bot.bot_messages import build_firework_card
+from src.config import settings
+from src.crud.product import firework_crud
+from src.database.db_dependencies import AsyncSessionLocal
+from src.schemas.filter_shema import FireworkFilterSchema
+from src.schemas.media import MediaDB
+from src.schemas.newsletter import TagLanding, TagLandingCard
+from src.schemas.pagination_schema import PaginationSchema
+from src.schemas.product import FireworkDB
+from src.service.catalog_cache import catalog_cache
+from src.service.telegram_media import get_media_kind
+
+logger = logging.getLogger(__name__)
+
+TAG_LANDING_NAMESPACE = 'tag_landing'
+TAG_FIREWORKS_LIMIT = 10
+# Лимит подписи к медиа в Telegram.
+CAPTION_LIMIT = 1024
+
+
+def get_landing_media(firework: FireworkDB) -> Optional[MediaDB]:
+    """Первое медиа фейерверка, которое можно отправить в Telegram."""
+    for media in firework.media or []:
+        if get_media_kind(media):
+            return media
+    return None
+
+
+def build_card(firework: FireworkDB) -> TagLandingCard:
+    text = build_firework_card(firework.model_dump(mode='json'))
+    caption = text
+    if len(caption) > CAPTION_LIMIT:
+        caption = build_firework_card(
+            firework.model_dump(mode='json'), full_info=False
+        )
+    return TagLandingCard(
+        firework_id=firework.id,
+        text=text,
+        caption=caption[:CAPTION_LIMIT],
+        media=get_landing_media(firework),
+    )
+
+
+async def build_tag_landing(
+    session: AsyncSession, tag_name: str
+) -> TagLanding:
+    """Собирает страницу тега из БД."""
+    fireworks, _ = await firework_crud.get_multi(
+        session,
+        filter_schema=FireworkFilterSchema(tags=[tag_name]),
+        pagination_schema=PaginationSchema(
+            offset=0, limit=TAG_FIREWORKS_LIMIT
+        ),
+    )
+    return TagLanding(
+        tag=tag_name,
+        cards=[
+            build_card(FireworkDB.model_validate(firework))
+            for firework in fireworks
+        ],
+    )
+
+
+async def get_tag_landing(session: AsyncSession, tag_name: str) -> TagLanding:
+    """Страница тега из кеша; при промахе собирается и сохраняется."""
+    return await catalog_cache.get_or_load(
+        TAG_LANDING_NAMESPACE,
+        {'tag': tag_name},
+        lambda: build_tag_landing(session, tag_name),
+        TagLanding,
+        ttl=settings.tag_landing_ttl,
+    )
+
+
+async def warm_tag_landings(tag_names: Iterable[str]) -> None:
+    """Готовит страницы тегов рассылки до ее отправки.
+
+    Уже подготовленные для текущей версии каталога страницы берутся
+    из кеша, поэтому повторный вызов почти ничего не стоит. Страницы
+    собираются в отдельной сессии, и ошибка не мешает отправке рассылки:
+    такая страница соберется при первом нажатии на кнопку.
+    """
+    for tag_name in tag_names:
+        try:
+            async with AsyncSessionLocal() as session:
+                landing = await get_tag_landing(session, tag_name)
+        except Exception:
+            logger.exception(
+                'Не удалось подготовить страницу тега %s', tag_name
+            )
+            continue
+        logger.info(
+            'Страница тега %s готова: %s товаров', tag_name, len(landing.cards)
+        )
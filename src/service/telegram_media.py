@@ -0,0 +1,285 @@
+"""Отправка медиа в Telegram с повторным использованием file_id.
+
+Telegram возвращает для каждого загруженного фото и видео file_id,
+по которому тот же файл можно отправить снова без повторной загрузки.
+Модуль загружает медиа один раз, сохраняет file_id в поле
+telegram_file_id медиа (Media, NewsletterMedia), а следующие отправки
+ссылаются на него.
+
+Содержит:
+- Функции get_media_kind и read_media: тип медиа и скачивание файлов
+    с Яндекс Диска (Telegram не умеет скачивать их по публичной ссылке
+    сам); скачанные файлы хранятся в media_store.
+- Функцию pick_variant: вариант фото для места показа
+    (см. src/service/images.py).
+- Класс MediaGroupSender: отправляет набор медиа в чаты; первая
+    успешная отправка загружает недостающие файлы и запоминает их
+    file_id, остальные отправляются по file_id.
+"""
+
+import asyncio
+import logging
+from functools import partial
+from pathlib import PurePosixPath
+from typing import Any, Awaitable, Callable, Optional, Sequence
+from urllib.parse import urlparse
+
+import aiohttp
+from telegram import Bot, InputMediaPhoto, InputMediaVideo, Message
+from telegram.error import BadRequest
+
+from src.service.media_store import media_store
+from src.service.yandex_disk import is_yandex_disk_url
+
+logger = logging.getLogger(__name__)
+
+PHOTO = 'image'
+VIDEO = 'video'
+# Формат вариантов фото, которые отправляются в Telegram.
+TELEGRAM_VARIANT_FORMAT = 'jpeg'
+PHOTO_FORMATS = ('.jpg', '.jpeg', '.png')
+VIDEO_FORMATS = ('.mp4', '.mov')
+TELEGRAM_MEDIA_LIMIT = 10
+
+SendCall = Callable[..., Awaitable[Any]]
+
+
+def get_media_kind(
+    media: Any, content_type: Optional[str] = None
+) -> Optional[str]:
+    """Тип медиа (PHOTO или VIDEO) или None, если Telegram его не примет.
+
+    Тип берется из поля media_type, затем из расширения файла в ссылке,
+    затем из Content-Type скачанного файла.
+    """
+    media_type = getattr(media, 'media_type', None)
+    if media_type in (PHOTO, VIDEO):
+        return media_type
+    suffix = PurePosixPath(urlparse(str(media.media_url)).path).suffix.lower()
+    if suffix in PHOTO_FORMATS:
+        return PHOTO
+    if suffix in VIDEO_FORMATS:
+        return VIDEO
+    if content_type and content_type.startswith('image/'):
+        return PHOTO
+    if content_type and content_type.startswith('video/'):
+        return VIDEO
+    return None
+
+
+async def read_media(
+    session: aiohttp.ClientSession, url: str
+) -> tuple[bytes, str]:
+    """Читает файл из хранилища медиа, при отсутствии скачивая его.
+
+    Возвращает содержимое файла и его Content-Type.
+    """
+    stored = await media_store.fetch(session, url)
+    return await media_store.read(stored), stored.content_type
+
+
+def pick_variant(variants: Sequence[dict], variant: str) -> Optional[dict]:
+    """Вариант фото (MediaDB.variants в JSON) для отправки в Telegram.
+
+    None, если варианты для медиа еще не созданы.
+    """
+    for formatted_media in variants:
+        if (
+            formatted_media['variant'] == variant
+            and formatted_media['format'] == TELEGRAM_VARIANT_FORMAT
+        ):
+            return formatted_media
+    return None
+
+
+def get_file_id(message: Message) -> Optional[str]:
+    if message.photo:
+        # Самый крупный из размеров, которые Telegram сделал из фото.
+        return message.photo[-1].file_id
+    if message.video:
+        return message.video.file_id
+    return None
+
+
+async def _call_directly(
+    chat_id: int, method: SendCall, cost: int = 1, **kwargs: Any
+) -> Any:
+    return await method(chat_id=chat_id, **kwargs)
+
+
+class MediaGroupSender:
+    """Отправка одного набора медиа в несколько чатов.
+
+    Медиа - объекты с полями media_url и telegram_file_id (и, если
+    есть, media_type, caption - подпись в разметке parse_mode
+    и source_url - ссылка, по которой файл скачивается вместо
+    media_url, например вариант фото в API).
+    Новые file_id записываются прямо в эти объекты:
+    для моделей БД они сохранятся при следующем commit, а список
+    uploaded позволяет передать их дальше (например, в API).
+    """
+
+    def __init__(
+        self,
+        bot: Bot,
+        media: Sequence[Any],
+        http_session: Optional[aiohttp.ClientSession] = None,
+        parse_mode: Optional[str] = None,
+    ) -> None:
+        """Создает отправителя.
+
+        Аргументы:
+            bot: бот, от имени которого отправляются медиа (file_id
+                действительны только для него).
+            media: медиа в порядке отправки, не больше
+                TELEGRAM_MEDIA_LIMIT.
+            http_session: сессия для скачивания файлов (с Яндекс Диска
+                и по source_url); если не задана, создается на время
+                загрузки.
+            parse_mode: разметка подписей медиа.
+        """
+        self.bot = bot
+        self.media = list(media[:TELEGRAM_MEDIA_LIMIT])
+        self.http_session = http_session
+        self.parse_mode = parse_mode
+        self.uploaded: list[Any] = []
+        self._kinds: dict[int, str] = {}
+        self._is_uploaded = False
+        self._lock = asyncio.Lock()
+
+    def __bool__(self) -> bool:
+        return bool(self.media)
+
+    def __len__(self) -> int:
+        return len(self.media)
+
+    async def send(
+        self, chat_id: int, call: Optional[SendCall] = None
+    ) -> list[Message]:
+        """Отправляет медиа в чат.
+
+        Аргументы:
+            chat_id: чат получателя.
+            call: корутина с сигнатурой DeliveryEngine.send без chat_id
+                (method, cost, **kwargs), через которую идет запрос;
+                по умолчанию метод бота вызывается напрямую.
+        """
+        call = call or partial(_call_directly, chat_id)
+        if not self._is_uploaded:
+            async with self._lock:
+                # Пока первый чат загружает файлы, остальные ждут
+                # и затем получают их по file_id.
+                if not self._is_uploaded:
+                    return await self._upload(call)
+        return await self._send(call, self._build_group())
+
+    def _build_group(self, sources: Optional[dict] = None) -> list:
+        group = []
+        for media in self.media:
+            source = (sources or {}).get(id(media))
+            if source is None:
+                source = media.telegram_file_id
+            input_media = (
+                InputMediaVideo
+                if self._kinds.get(id(media)) == VIDEO
+                else InputMediaPhoto
+            )
+            group.append(
+                input_media(
+                    media=source,
+                    caption=getattr(media, 'caption', None),
+                    parse_mode=self.parse_mode,
+                )
+            )
+        return group
+
+    async def _send(self, call: SendCall, group: list) -> list[Message]:
+        if not group:
+            return []
+        if len(group) > 1:
+            return list(
+                await call(
+                    self.bot.send_media_group, cost=len(group), media=group
+                )
+            )
+        # Медиагруппа Telegram должна содержать от 2 до 10 файлов.
+        media = group[0]
+        caption = dict(caption=media.caption, parse_mode=media.parse_mode)
+        if isinstance(media, InputMediaVideo):
+            return [
+                await call(self.bot.send_video, video=media.media, **caption)
+            ]
+        return [await call(self.bot.send_photo, photo=media.media, **caption)]
+
+    async def _read_sources(self) -> dict:
+        """Источники для медиа без file_id: ссылка или скачанный файл."""
+        sources = {}
+        missing = [media for media in self.media if not media.telegram_file_id]
+        downloads = {}
+        for media in missing:
+            url = getattr(media, 'source_url', None)
+            if url is None and is_yandex_disk_url(media.media_url):
+                url = media.media_url
+            if url is None:
+                sources[id(media)] = media.media_url
+            else:
+                downloads[id(media)] = url
+        if not downloads:
+            return sources
+        session = self.http_session or aiohttp.ClientSession()
+        try:
+            for media in missing:
+                url = downloads.get(id(media))
+                if url is None:
+                    continue
+                try:
+                    content, content_type = await read_media(session, url)
+                except (aiohttp.ClientError, KeyError) as error:
+                    logger.warning(
+                        'Не удалось скачать медиа %s: %s', url, error
+                    )
+                    continue
+                sources[id(media)] = content
+                self._kinds[id(media)] = get_media_kind(media, content_type)
+        finally:
+            if session is not self.http_session:
+                await session.close()
+        return sources
+
+    async def _upload(self, call: SendCall) -> list[Message]:
+        sources = await self._read_sources()
+        self.media = [
+            media
+            for media in self.media
+            if media.telegram_file_id or id(media) in sources
+        ]
+        for media in self.media:
+            # Тип медиа с file_id без расширения в ссылке неизвестен:
+            # отправляем как фото, а если это видео, Telegram ответит
+            # BadRequest и файл будет загружен заново.
+            self._kinds.setdefault(
+                id(media),
+                get_media_kind(media)
+                or (PHOTO if media.telegram_file_id else None),
+            )
+        self.media = [media for media in self.media if self._kinds[id(media)]]
+        try:
+            messages = await self._send(call, self._build_group(sources))
+        except BadRequest as error:
+            cached = [
+                media for media in self.media if id(media) not in sources
+            ]
+            if not cached or 'file' not in error.message.lower():
+                raise
+            # file_id другого бота или удаленного файла - загружаем заново.
+            logger.warning('Сохраненные file_id медиа недействительны')
+            for media in cached:
+                media.telegram_file_id = None
+            return await self._upload(call)
+        for media, message in zip(self.media, messages):
+            if id(media) in sources:
+                media.telegram_file_id = get_file_id(message)
+                self.uploaded.append(media)
+        self.media = [media for media in self.media if media.telegram_file_id]
+        self._is_uploaded = True
+        return messages
@@ -0,0 +1,200 @@
+"""Прямые ссылки на файлы Яндекс Диска.
+
+Публичную ссылку Яндекс Диска нельзя скачать напрямую: сначала API
+(YANDEX_DOWNLOAD_API) выдает временную прямую ссылку href, и только
+по ней отдается файл. Бот (src/service/telegram_media.py) и /proxy
+API разрешают одни и те же ссылки товаров снова и снова, поэтому
+href запоминается.
+
+Содержит:
+- Функцию is_yandex_disk_url.
+- Класс YandexDiskResolver: кеш href в два уровня (процесс и Redis,
+    общий для бота и API) со временем жизни settings.yandex_href_ttl
+    (или меньше, если ссылка сама сообщает срок действия). Одновременные
+    запросы одной ссылки ждут один запрос к API Яндекс Диска.
+- Объект yandex_resolver, общий для бота и API.
+
+Redis-клиент и адрес API передаются в конструктор, поэтому их можно
+заменить локальной подделкой (см. tests/test_yandex_disk.py).
+"""
+
+import asyncio
+import hashlib
+import logging
+from contextlib import asynccontextmanager
+from time import time
+from typing import Any, AsyncIterator, Optional
+from urllib.parse import parse_qs, urlparse
+
+import aiohttp
+from redis import asyncio as redis_asyncio
+from redis.exceptions import RedisError
+
+from src.config import settings
+from src.service.catalog_cache import LocalLRUCache
+
+logger = logging.getLogger(__name__)
+
+YANDEX_DISK_HOSTS = ('disk.yandex.ru', 'yadi.sk')
+YANDEX_DOWNLOAD_API = (
+    'https://cloud-api.yandex.net/v1/disk/public/resources/download'
+)
+YANDEX_HREF_KEY = 'yandex:href:{digest}'
+# Запас до истечения срока действия прямой ссылки, в секундах.
+EXPIRY_MARGIN = 60
+# Ответы на устаревшую прямую ссылку: ее нужно получить заново.
+STALE_STATUSES = (403, 404, 410)
+
+REDIS_ERROR_MESSAGE = 'Redis недоступен, ссылки Яндекс Диска не общие: {}'
+
+
+def is_yandex_disk_url(url: str) -> bool:
+    return urlparse(str(url)).netloc.endswith(YANDEX_DISK_HOSTS)
+
+
+class YandexDiskResolver:
+    """Кеш прямых ссылок Яндекс Диска: процесс -> Redis -> API."""
+
+    def __init__(
+        self,
+        redis_client: Any = None,
+        ttl: int = settings.yandex_href_ttl,
+        max_entries: int = settings.yandex_href_max_entries,
+        api_url: str = YANDEX_DOWNLOAD_API,
+    ) -> None:
+        """Создает пустой кеш.
+
+        Аргументы:
+            redis_client: асинхронный клиент Redis (или его подделка).
+                None - ссылки хранятся только в процессе.
+            ttl: наибольшее время жизни прямой ссылки в кеше, в секундах.
+            max_entries: размер кеша процесса.
+            api_url: адрес метода API, выдающего прямую ссылку.
+        """
+        self.redis = redis_client
+        self.ttl = ttl
+        self.api_url = api_url
+        self.local = LocalLRUCache(max_entries, ttl)
+        self._pending: dict[str, asyncio.Task] = {}
+
+    def build_key(self, public_key: str) -> str:
+        digest = hashlib.sha1(public_key.encode()).hexdigest()
+        return YANDEX_HREF_KEY.format(digest=digest)
+
+    def get_ttl(self, href: str) -> int:
+        """Время жизни href: ttl, но не дольше срока действия ссылки.
+
+        Срок берется из параметра expires ссылки (unix-время), если он
+        есть.
+        """
+        expires = parse_qs(urlparse(href).query).get('expires')
+        if not expires or not expires[0].isdigit():
+            return self.ttl
+        return max(
+            1, min(self.ttl, int(expires[0]) - int(time()) - EXPIRY_MARGIN)
+        )
+
+    async def resolve(
+        self, session: aiohttp.ClientSession, public_key: str
+    ) -> str:
+        """Прямая ссылка на файл по публичной ссылке Яндекс Диска.
+
+        Ошибки API (aiohttp.ClientError, KeyError при ответе без href)
+        передаются вызывающему и не кешируются.
+        """
+        key = self.build_key(public_key)
+        href = self.local.get(key)
+        if href is None:
+            href = await self._redis_get(key)
+            if href is not None:
+                self.local.set(key, href, self.get_ttl(href.decode()))
+        if href is not None:
+            return href.decode()
+        task = self._pending.get(key)
+        if task is None:
+            task = asyncio.create_task(self._load(session, public_key, key))
+            self._pending[key] = task
+            task.add_done_callback(lambda _: self._pending.pop(key, None))
+        # Отмена одного из ожидающих не должна отменять запрос остальных.
+        return await asyncio.shield(task)
+
+    async def invalidate(
+        self, public_key: str, href: Optional[str] = None
+    ) -> None:
+        """Забывает прямую ссылку, которая перестала работать.
+
+        С href ссылка забывается, только если в кеше все еще она, -
+        новую ссылку, уже полученную другим запросом, это не сбросит.
+        """
+        key = self.build_key(public_key)
+        cached = self.local.get(key)
+        if href is None or cached is None or cached.decode() == href:
+            self.local.delete(key)
+        if self.redis is None:
+            return
+        try:
+            if href is None or await self.redis.get(key) == href.encode():
+                await self.redis.delete(key)
+        except (RedisError, OSError) as error:
+            logger.warning(REDIS_ERROR_MESSAGE.format(error))
+
+    @asynccontextmanager
+    async def open(
+        self, session: aiohttp.ClientSession, public_key: str, **kwargs: Any
+    ) -> AsyncIterator[aiohttp.ClientResponse]:
+        """Открывает файл по публичной ссылке Яндекс Диска.
+
+        Если сохраненная прямая ссылка устарела, она запрашивается
+        заново один раз. Статус ответа проверяет вызывающий.
+
+        Аргументы:
+            kwargs: параметры запроса файла, например headers с Range.
+        """
+        href = await self.resolve(session, public_key)
+        response = await session.get(href, **kwargs)
+        try:
+            if response.status in STALE_STATUSES:
+                response.release()
+                await self.invalidate(public_key, href)
+                href = await self.resolve(session, public_key)
+                response = await session.get(href, **kwargs)
+            yield response
+        finally:
+            response.release()
+
+    async def _load(
+        self, session: aiohttp.ClientSession, public_key: str, key: str
+    ) -> str:
+        async with session.get(
+            self.api_url, params={'public_key': public_key}
+        ) as response:
+            response.raise_for_status()
+            href = (await response.json())['href']
+        ttl = self.get_ttl(href)
+        self.local.set(key, href.encode(), ttl)
+        await self._redis_set(key, href, ttl)
+        return href
+
+    async def _redis_get(self, key: str) -> Optional[bytes]:
+        if self.redis is None:
+            return None
+        try:
+            return await self.redis.get(key)
+        except (RedisError, OSError) as error:
+            logger.warning(REDIS_ERROR_MESSAGE.format(error))
+            return None
+
+    async def _redis_set(self, key: str, href: str, ttl: int) -> None:
+        if self.redis is None:
+            return
+        try:
+            await self.redis.set(key, href, ex=ttl)
+        except (RedisError, OSError) as error:
+            logger.warning(REDIS_ERROR_MESSAGE.format(error))
+
+
+yandex_resolver = YandexDiskResolver(
+    redis_asyncio.Redis(
+        host=settings.redis_host, port=int(settings.redis_port)
+    )
+)
@@ -0,0 +1,45 @@
+"""Создание вариантов фото каталога.
+
+Запуск: python -m src.utils.media_variants
+
+Создает варианты (src/service/media_variants.py) для всех фото
+каталога, для которых они еще не готовы, например после развертывания
+или если часть файлов не скачалась при загрузке прайс-листа. Повторный
+запуск обрабатывает только оставшиеся фото. Затем удаляет из хранилища
+файлы вариантов, на которые не ссылаются записи в БД.
+"""
+
+import asyncio
+import logging
+
+from sqlalchemy.orm import configure_mappers
+
+import src.models  # noqa: F401
+from src.database.db_dependencies import engine
+from src.service.media_variants import (
+    delete_orphaned_files,
+    generate_missing_variants,
+    shutdown_pool,
+)
+
+
+async def run() -> None:
+    try:
+        await generate_missing_variants()
+        await delete_orphaned_files()
+    finally:
+        shutdown_pool()
+        await engine.dispose()
+
+
+def main() -> None:
+    logging.basicConfig(
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        level=logging.INFO,
+    )
+    configure_mappers()
+    asyncio.run(run())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""Прогрев хранилища медиа.
+
+Запуск: python -m src.utils.media_warmup
+
+Скачивает в хранилище (src/service/media_store.py) все медиа каталога,
+которых там еще нет, по settings.media_warmup_concurrency файлов
+одновременно. После прогрева бот и /proxy берут файлы с диска, не
+обращаясь к Яндекс Диску. Повторный запуск скачивает только новые
+и вытесненные файлы.
+"""
+
+import asyncio
+import logging
+from collections import Counter
+
+import aiohttp
+from sqlalchemy.orm import configure_mappers
+
+import src.models  # noqa: F401
+from src.config import settings
+from src.crud.media import media_crud
+from src.database.db_dependencies import AsyncSessionLocal, engine
+from src.service.media_store import media_store
+
+logger = logging.getLogger(__name__)
+
+
+async def warm_media(urls: list[str], concurrency: int) -> Counter:
+    """Скачивает недостающие файлы; возвращает итоги по ссылкам."""
+    stats = Counter()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def warm(session: aiohttp.ClientSession, url: str) -> None:
+        async with semaphore:
+            if await media_store.get(url) is not None:
+                stats['stored'] += 1
+                return
+            try:
+                await media_store.fetch(session, url)
+            except (aiohttp.ClientError, KeyError) as error:
+                logger.warning('Не удалось скачать медиа %s: %s', url, error)
+                stats['failed'] += 1
+                return
+            stats['downloaded'] += 1
+
+    async with aiohttp.ClientSession() as session:
+        await asyncio.gather(*(warm(session, url) for url in urls))
+    return stats
+
+
+async def run() -> None:
+    async with AsyncSessionLocal() as session:
+        urls = await media_crud.get_urls(session)
+    await engine.dispose()
+    logger.info('Медиа в каталоге: %s', len(urls))
+    stats = await warm_media(urls, settings.media_warmup_concurrency)
+    logger.info(
+        'Уже в хранилище: %s, скачано: %s, ошибок: %s',
+        stats['stored'],
+        stats['downloaded'],
+        stats['failed'],
+    )
+
+
+def main() -> None:
+    logging.basicConfig(
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        level=logging.INFO,
+    )
+    configure_mappers()
+    asyncio.run(run())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,285 @@
+"""Доставка рассылок в Telegram с ограничением скорости.
+
+Содержит:
+- Класс TokenBucket: общий для всех обработчиков лимит запросов
+    (по умолчанию settings.newsletter_rate_limit сообщений в секунду,
+    около лимита Telegram в 30 сообщений в секунду).
+- Класс ChatPacer: минимальный интервал между сообщениями в один чат.
+- Класс DeliveryEngine: пул из settings.newsletter_concurrency
+    обработчиков, которые отправляют сообщения получателям, соблюдая
+    оба лимита, ждут при RetryAfter и повторяют запрос при сетевых
+    ошибках. Итоги доставки возвращаются в DeliveryStats.
+- Функции get_bot и close_bots: один Bot с пулом соединений на токен
+    вместо нового Bot на каждую рассылку.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass, fields
+from time import monotonic, perf_counter
+from typing import Any, AsyncIterable, Awaitable, Callable, Iterable, Union
+
+from telegram import Bot
+from telegram.error import BadRequest, Forbidden, NetworkError, RetryAfter
+from telegram.request import HTTPXRequest
+
+from src.config import settings
+
+logger = logging.getLogger(__name__)
+
+RETRY_BACKOFF = 1.0
+QUEUE_SIZE_PER_WORKER = 2
+
+Recipients = Union[Iterable[int], AsyncIterable[int]]
+
+_bots: dict[str, Bot] = {}
+
+
+@dataclass
+class DeliveryStats:
+    """Итоги доставки рассылки."""
+
+    recipients: int = 0
+    delivered: int = 0
+    failed: int = 0
+    messages: int = 0
+    retries: int = 0
+    seconds: float = 0.0
+
+    def add(self, other: 'DeliveryStats') -> None:
+        """Добавляет итоги другой доставки (например, следующей пачки)."""
+        for stat in fields(self):
+            setattr(
+                self,
+                stat.name,
+                getattr(self, stat.name) + getattr(other, stat.name),
+            )
+
+    @property
+    def throughput(self) -> float:
+        """Отправлено сообщений в секунду."""
+        return self.messages / self.seconds if self.seconds else 0.0
+
+
+class TokenBucket:
+    """Лимит запросов: rate токенов в секунду, запас не больше capacity.
+
+    Токены резервируются сразу при вызове acquire (бакет может уйти
+    в минус), поэтому одновременные обработчики получают места в очереди
+    по порядку, без блокировки, а крупный запрос (медиагруппа) просто
+    ждет дольше.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1) -> None:
+        """Создает полный бакет.
+
+        Аргументы:
+            rate: скорость пополнения, токенов в секунду.
+            capacity: размер бакета - допустимый всплеск запросов.
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = monotonic()
+
+    def pause(self, seconds: float) -> None:
+        """Останавливает выдачу токенов (ограничение Telegram на бота)."""
+        self._updated = max(self._updated, monotonic() + seconds)
+        self._tokens = min(self._tokens, 0)
+
+    async def acquire(self, tokens: float = 1) -> None:
+        """Резервирует tokens токенов и ждет, пока они накопятся."""
+        now = monotonic()
+        self._tokens = min(
+            self.capacity,
+            self._tokens + max(0, now - self._updated) * self.rate,
+        )
+        self._updated = max(self._updated, now)
+        self._tokens -= tokens
+        delay = self._updated - now + max(0, -self._tokens) / self.rate
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class ChatPacer:
+    """Минимальный интервал между сообщениями в один чат."""
+
+    def __init__(self, interval: float) -> None:
+        """Создает пустой планировщик.
+
+        Аргументы:
+            interval: интервал между сообщениями в один чат, в секундах.
+        """
+        self.interval = interval
+        self._ready_at: dict[int, float] = {}
+
+    async def wait(self, chat_id: int) -> None:
+        now = monotonic()
+        ready_at = self._ready_at.get(chat_id, now)
+        self._ready_at[chat_id] = max(ready_at, now) + self.interval
+        if ready_at > now:
+            await asyncio.sleep(ready_at - now)
+
+    def forget(self, chat_id: int) -> None:
+        self._ready_at.pop(chat_id, None)
+
+
+class DeliveryEngine:
+    """Пул обработчиков, доставляющих рассылку списку чатов."""
+
+    def __init__(
+        self,
+        concurrency: int = settings.newsletter_concurrency,
+        rate: float = settings.newsletter_rate_limit,
+        chat_interval: float = settings.newsletter_chat_interval,
+        max_retries: int = settings.newsletter_max_retries,
+    ) -> None:
+        """Создает движок доставки.
+
+        Аргументы:
+            concurrency: количество одновременно обслуживаемых чатов.
+            rate: общий лимит сообщений в секунду.
+            chat_interval: интервал между сообщениями в один чат.
+            max_retries: повторов одного запроса при RetryAfter
+                и сетевых ошибках.
+        """
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.bucket = TokenBucket(rate)
+        self.pacer = ChatPacer(chat_interval)
+        self.stats = DeliveryStats()
+
+    async def send(
+        self,
+        chat_id: int,
+        method: Callable[..., Awaitable[Any]],
+        cost: int = 1,
+        **kwargs: Any,
+    ) -> Any:
+        """Вызывает метод Bot API для чата с учетом лимитов и повторов.
+
+        Аргументы:
+            chat_id: чат получателя.
+            method: метод бота, например bot.send_message.
+            cost: сколько сообщений отправляет запрос (размер
+                медиагруппы).
+            kwargs: аргументы метода, кроме chat_id.
+        """
+        attempt = 0
+        while True:
+            await self.bucket.acquire(cost)
+            await self.pacer.wait(chat_id)
+            try:
+                result = await method(chat_id=chat_id, **kwargs)
+            except (BadRequest, Forbidden):
+                # Чат недоступен или запрос неверен - повтор не поможет.
+                raise
+            except RetryAfter as error:
+                if attempt == self.max_retries:
+                    raise
+                # Ограничение действует на весь бот, а не на один чат.
+                self.bucket.pause(error.retry_after)
+                delay = error.retry_after
+            except NetworkError:
+                if attempt == self.max_retries:
+                    raise
+                delay = RETRY_BACKOFF * 2**attempt
+            else:
+                self.stats.messages += cost
+                return result
+            attempt += 1
+            self.stats.retries += 1
+            await asyncio.sleep(delay)
+
+    async def run(
+        self,
+        chat_ids: Recipients,
+        deliver: Callable[[int], Awaitable[None]],
+    ) -> DeliveryStats:
+        """Доставляет рассылку всем чатам и возвращает итоги.
+
+        Аргументы:
+            chat_ids: чаты получателей (обычный или асинхронный
+                итератор; читается по мере освобождения обработчиков).
+            deliver: корутина, отправляющая рассылку в один чат через
+                send. Ошибка доставки в чат не прерывает рассылку.
+        """
+        self.stats = DeliveryStats()
+        queue = asyncio.Queue(maxsize=self.concurrency * QUEUE_SIZE_PER_WORKER)
+        started = perf_counter()
+        workers = [
+            asyncio.create_task(self._worker(queue, deliver))
+            for _ in range(self.concurrency)
+        ]
+        try:
+            if isinstance(chat_ids, AsyncIterable):
+                async for chat_id in chat_ids:
+                    await queue.put(chat_id)
+            else:
+                for chat_id in chat_ids:
+                    await queue.put(chat_id)
+            await queue.join()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+        self.stats.seconds = perf_counter() - started
+        logger.info(
+            'Рассылка доставлена: %s из %s получателей, ошибок: %s, '
+            'сообщений: %s, повторов: %s, %.1f с (%.1f сообщ./с)',
+            self.stats.delivered,
+            self.stats.recipients,
+            self.stats.failed,
+            self.stats.messages,
+            self.stats.retries,
+            self.stats.seconds,
+            self.stats.throughput,
+        )
+        return self.stats
+
+    async def _worker(
+        self,
+        queue: asyncio.Queue,
+        deliver: Callable[[int], Awaitable[None]],
+    ) -> None:
+        while True:
+            chat_id = await queue.get()
+            self.stats.recipients += 1
+            try:
+                await deliver(chat_id)
+                self.stats.delivered += 1
+            except Exception as error:
+                self.stats.failed += 1
+                logger.warning(
+                    'Рассылка не доставлена в чат %s: %s', chat_id, error
+                )
+            finally:
+                self.pacer.forget(chat_id)
+                queue.task_done()
+
+
+async def get_bot(token: str) -> Bot:
+    """Инициализированный бот для токена, общий для всех рассылок.
+
+    Пул соединений рассчитан на settings.newsletter_concurrency
+    одновременных запросов; адрес Bot API задается
+    settings.telegram_api_url (например, локальный тестовый сервер).
+    """
+    bot = _bots.get(token)
+    if bot is None:
+        bot = _bots[token] = Bot(
+            token=token,
+            base_url=settings.telegram_api_url,
+            request=HTTPXRequest(
+                connection_pool_size=settings.newsletter_concurrency
+            ),
+        )
+    await bot.initialize()
+    return bot
+
+
+async def close_bots() -> None:
+    """Закрывает соединения ботов (при остановке приложения)."""
+    for bot in _bots.values():
+        await bot.shutdown()
+    _bots.clear()
@@ -0,0 +1,135 @@
+"""Выбор одного ведущего процесса среди экземпляров приложения.
+
+Содержит:
+- Класс LeaderElection: процесс становится ведущим, захватив
+    сессионную advisory-блокировку Postgres на отдельном соединении.
+    Блокировка держится, пока живо соединение, поэтому при падении
+    ведущего процесса (или потере связи с БД) ее захватывает другой
+    процесс - без ручного переключения. Ведущий периодически проверяет
+    соединение и, потеряв его, слагает полномочия.
+    На этом же соединении ведущий слушает каналы LISTEN/NOTIFY, чтобы
+    остальные процессы могли передавать ему события.
+"""
+
+import asyncio
+import contextlib
+import logging
+from typing import Awaitable, Callable, Optional
+
+import asyncpg
+
+from src.config import settings
+from src.database.db_dependencies import engine
+
+logger = logging.getLogger(__name__)
+
+Callback = Callable[[], Awaitable[None]]
+Listener = Callable[[str], Awaitable[None]]
+
+
+def get_dsn() -> str:
+    """Адрес БД для asyncpg (без имени драйвера SQLAlchemy)."""
+    return engine.url.set(drivername='postgresql').render_as_string(
+        hide_password=False
+    )
+
+
+class LeaderElection:
+    """Ведущий процесс по advisory-блокировке Postgres."""
+
+    def __init__(
+        self,
+        lock_key: int,
+        on_elected: Callback,
+        on_demoted: Callback,
+        listeners: Optional[dict[str, Listener]] = None,
+        check_interval: float = settings.scheduler_leader_check_interval,
+        retry_interval: float = settings.scheduler_leader_retry_interval,
+    ) -> None:
+        """Создает участника выборов.
+
+        Аргументы:
+            lock_key: ключ advisory-блокировки, общий для всех процессов.
+            on_elected: вызывается, когда процесс стал ведущим.
+            on_demoted: вызывается, когда процесс перестал быть ведущим.
+            listeners: обработчики уведомлений NOTIFY по каналам;
+                получают payload и работают только у ведущего.
+            check_interval: как часто ведущий проверяет соединение.
+            retry_interval: как часто остальные пытаются захватить
+                блокировку.
+        """
+        self.lock_key = lock_key
+        self.on_elected = on_elected
+        self.on_demoted = on_demoted
+        self.listeners = listeners or {}
+        self.check_interval = check_interval
+        self.retry_interval = retry_interval
+        self.is_leader = False
+        self._task: Optional[asyncio.Task] = None
+        self._handlers: set[asyncio.Task] = set()
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Слагает полномочия и прекращает участие в выборах."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                connection = await asyncpg.connect(get_dsn())
+                try:
+                    if await connection.fetchval(
+                        'SELECT pg_try_advisory_lock($1)', self.lock_key
+                    ):
+                        await self._lead(connection)
+                finally:
+                    # Закрытие соединения снимает и блокировку.
+                    await connection.close(timeout=self.check_interval)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception('Ошибка выбора ведущего процесса')
+            await asyncio.sleep(self.retry_interval)
+
+    async def _lead(self, connection: asyncpg.Connection) -> None:
+        logger.info('Процесс стал ведущим (блокировка %s)', self.lock_key)
+        self.is_leader = True
+        try:
+            for channel in self.listeners:
+                await connection.add_listener(channel, self._notify)
+            await self.on_elected()
+            while True:
+                await asyncio.sleep(self.check_interval)
+                await connection.fetchval(
+                    'SELECT 1', timeout=self.check_interval
+                )
+        finally:
+            self.is_leader = False
+            logger.info('Процесс перестал быть ведущим')
+            await self.on_demoted()
+
+    def _notify(
+        self,
+        connection: asyncpg.Connection,
+        pid: int,
+        channel: str,
+        payload: str,
+    ) -> None:
+        task = asyncio.create_task(self._handle(channel, payload))
+        # Ссылка на задачу нужна, чтобы ее не удалил сборщик мусора.
+        self._handlers.add(task)
+        task.add_done_callback(self._handlers.discard)
+
+    async def _handle(self, channel: str, payload: str) -> None:
+        try:
+            await self.listeners[channel](payload)
+        except Exception:
+            logger.exception('Ошибка обработки уведомления %s', channel)
@@ -1,46 +1,88 @@
+"""Планировщик рассылок.
+
+Для каждой неотправленной рассылки заводится задача APScheduler на ее
+datetime_send: при запуске приложения - для всех запланированных
+рассылок, а при создании и изменении рассылки в админке - через
+schedule_newsletter. Задача проверяет в SQL только свою рассылку,
+поэтому рассылки уходят в назначенную секунду без постоянного опроса БД.
+
+Рассылка отправляется волнами (см. send_newsletter_to_users): пока
+следующая волна ждет выпуска, задача рассылки переносится на
+settings.newsletter_rollout_check_interval секунд.
+
+Редкая проверка всех рассылок (settings.newsletter_sweep_interval)
+остается как страховка: она продолжает рассылки, прерванные
+перезапуском, и отправляет рассылки, задачи которых были потеряны.
+
+Планировщик работает только в одном процессе - ведущем (см.
+src/utils/scheduler/leader.py), сколько бы экземпляров приложения ни
+было запущено. Остальные процессы сообщают ему об изменении рассылок
+через notify_newsletter_changed (Postgres NOTIFY); если ведущий
+процесс падает, планировщик запускается в другом.
+"""
+
+import contextlib
 from datetime import datetime, timedelta
+from typing import Optional
 
+from apscheduler.jobstores.base import JobLookupError
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from apscheduler.schedulers.base import STATE_STOPPED
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.config import settings
 from src.crud.newsletter import newsletter_crud
-from src.database.db_dependencies import get_async_session
+from src.crud.user_segment import user_segment_crud
+from src.database.db_dependencies import AsyncSessionLocal, get_async_session
+from src.service.tag_landing import warm_tag_landings
+from src.utils.scheduler.leader import LeaderElection
 from src.utils.scheduler.send_newsletter import send_newsletter_to_users
 
+# Сколько после datetime_send рассылку еще можно начать отправлять.
+SEND_WINDOW = timedelta(days=1)
+NEWSLETTER_JOB_ID = 'newsletter:{newsletter_id}'
+NEWSLETTER_CHANNEL = 'newsletter_changed'
+
 
-async def check_newsletters(session: AsyncSession):
-    """Проверяет рассылки и отправляет их, если наступило время.
+async def check_newsletters(
+    session: AsyncSession, newsletter_id: Optional[int] = None
+):
+    """Отправляет рассылки, время которых наступило.
 
     Параметры функции:
-        1) session (AsyncSession) - сессия базы данных.
+        1) session (AsyncSession) - сессия базы данных;
+        2) newsletter_id (int | None) - проверить только эту рассылку.
     """
-    all_newsletters_unsett = await newsletter_crud.get_all_unsett_newslatter(
-        session
+    due_newsletters = await newsletter_crud.get_due_newsletters(
+        session, datetime.now(), SEND_WINDOW, newsletter_id
     )
-    current_time = datetime.now()
-    if all_newsletters_unsett is None:
-        return
-    for newsletter in all_newsletters_unsett:
-        if (
-            newsletter.datetime_send <= current_time
-            and current_time - newsletter.datetime_send <= timedelta(days=1)
-            and newsletter.canceled is False
-        ):
-            filtered_users = (
-                await newsletter_crud.filtered_users_for_newsletter(
-                    newsletter=newsletter,
-                    session=session,
-                )
-            )
-            # TODO проверочная функция отправки рассылки самостоятельно.
-            # TODO заменить на передачу данных в телеграм-бот и рассылку юзерам
-            #  в цикле. За основу можно брать функцию send_newsletter_to_users.
-            await send_newsletter_to_users(
+    for newsletter in due_newsletters:
+        if newsletter.queued_at is None:
+            await newsletter_crud.enqueue_deliveries(
                 newsletter=newsletter,
-                users=filtered_users,
                 session=session,
-                bot_token=settings.telegram_token,
+            )
+            await session.commit()
+        # Страницы тегов рассылки готовятся до отправки, чтобы нажатия
+        # на кнопки тегов не обращались к БД.
+        await warm_tag_landings([tag.name for tag in newsletter.tags])
+        # Уже поставленная в очередь рассылка продолжается с
+        # недоставленных получателей (например, после перезапуска).
+        await send_newsletter_to_users(
+            newsletter=newsletter,
+            session=session,
+            bot_token=settings.telegram_token,
+        )
+        if not newsletter.switch_send:
+            # Следующая волна еще не выпущена или часть доставок
+            # обрабатывает другой процесс - проверим рассылку позже.
+            schedule_newsletter(
+                newsletter.id,
+                datetime.now()
+                + timedelta(
+                    seconds=settings.newsletter_rollout_check_interval
+                ),
             )
 
 
@@ -48,11 +90,14 @@ async def check_newsletters(session: AsyncSession):
 scheduler = AsyncIOScheduler()
 
 
-async def check_newsletters_wrapper() -> None:
+async def check_newsletters_wrapper(
+    newsletter_id: Optional[int] = None,
+) -> None:
     """Асинхронная обёртка для проверки и отправки рассылок через планировщик.
 
     Этот метод используется планировщиком (APScheduler) для выполнения
-    задачи "check_newsletters" с заданным интервалом времени.
+    задачи "check_newsletters": по времени одной рассылки
+    (newsletter_id) или для страховочной проверки всех рассылок.
     Он отвечает за создание асинхронной сессии базы данных,
     передачу её в "check_newsletters" и корректное
     закрытие сессии после выполнения.
@@ -67,22 +112,148 @@ async def check_newsletters_wrapper() -> None:
     """
     async for session in get_async_session():
         try:
-            await check_newsletters(session)
+            await check_newsletters(session, newsletter_id)
         finally:
             await session.close()
 
 
-def setup_scheduler():
-    """Функция, которая настраивает планировщик для проверки рассылок."""
+def schedule_newsletter(newsletter_id: int, datetime_send: datetime) -> None:
+    """Заводит (или переносит) задачу отправки рассылки на datetime_send.
+
+    Рассылка с прошедшим временем отправки проверяется сразу.
+    """
+    if not scheduler_leader.is_leader:
+        return
+    scheduler.add_job(
+        check_newsletters_wrapper,
+        'date',
+        run_date=datetime_send,
+        args=[newsletter_id],
+        id=NEWSLETTER_JOB_ID.format(newsletter_id=newsletter_id),
+        replace_existing=True,
+        misfire_grace_time=None,
+    )
+
+
+def unschedule_newsletter(newsletter_id: int) -> None:
+    """Удаляет задачу отправки рассылки (рассылка отменена или удалена)."""
+    if not scheduler_leader.is_leader:
+        return
+    with contextlib.suppress(JobLookupError):
+        scheduler.remove_job(
+            NEWSLETTER_JOB_ID.format(newsletter_id=newsletter_id)
+        )
+
+
+async def restore_newsletter_jobs(
+    newsletter_id: Optional[int] = None,
+) -> None:
+    """Заводит задачи для запланированных рассылок.
+
+    Без newsletter_id - для всех рассылок (при запуске планировщика),
+    с newsletter_id - для одной измененной рассылки; если она больше
+    не ждет отправки (отменена, удалена), ее задача удаляется.
+    """
+    async for session in get_async_session():
+        try:
+            # При запуске наступившие рассылки отправит первая общая
+            # проверка, а измененная рассылка с прошедшим временем
+            # отправки проверяется сразу.
+            schedule = await newsletter_crud.get_schedule(
+                session,
+                datetime.now()
+                - (SEND_WINDOW if newsletter_id else timedelta()),
+                newsletter_id,
+            )
+        finally:
+            await session.close()
+    if newsletter_id is not None and not schedule:
+        unschedule_newsletter(newsletter_id)
+    for scheduled_id, datetime_send in schedule:
+        schedule_newsletter(scheduled_id, datetime_send)
+
+
+async def notify_newsletter_changed(newsletter_id: int) -> None:
+    """Сообщает ведущему процессу, что рассылка создана или изменена.
+
+    Может вызываться из любого процесса: уведомление получит тот,
+    в котором работает планировщик.
+    """
+    async with AsyncSessionLocal() as session:
+        await session.execute(
+            select(func.pg_notify(NEWSLETTER_CHANNEL, str(newsletter_id)))
+        )
+        await session.commit()
+
+
+async def on_newsletter_changed(payload: str) -> None:
+    await restore_newsletter_jobs(int(payload))
+
+
+async def refresh_segments_wrapper() -> None:
+    """Обновляет сегменты аудитории рассылок (таблица user_segment).
+
+    Между рассылками таблица поддерживается актуальной, чтобы
+    предпросмотр аудитории в админке был точным, а обновление перед
+    постановкой рассылки в очередь затрагивало мало строк.
+    """
+    async for session in get_async_session():
+        try:
+            await user_segment_crud.refresh(session)
+            await session.commit()
+        finally:
+            await session.close()
+
+
+async def start_scheduler() -> None:
+    """Запускает планировщик в ведущем процессе."""
+    if scheduler.state == STATE_STOPPED:
+        scheduler.start(paused=True)
+    scheduler.add_job(restore_newsletter_jobs)
     scheduler.add_job(
         check_newsletters_wrapper,
         'interval',
-        seconds=60,
+        seconds=settings.newsletter_sweep_interval,
+        next_run_time=datetime.now(),
     )
-    scheduler.start()
+    scheduler.add_job(
+        refresh_segments_wrapper,
+        'interval',
+        seconds=settings.segment_refresh_interval,
+        next_run_time=datetime.now(),
+    )
+    scheduler.resume()
+
+
+async def stop_scheduler() -> None:
+    """Останавливает планировщик, когда процесс перестает быть ведущим.
+
+    Уже начатая отправка рассылки доводит текущую пачку до конца;
+    остальные доставки продолжит новый ведущий процесс.
+    """
+    if scheduler.running:
+        scheduler.remove_all_jobs()
+        scheduler.pause()
+
+
+scheduler_leader = LeaderElection(
+    settings.scheduler_lock_key,
+    on_elected=start_scheduler,
+    on_demoted=stop_scheduler,
+    listeners={NEWSLETTER_CHANNEL: on_newsletter_changed},
+)
+
+
+def setup_scheduler():
+    """Функция, которая настраивает планировщик для проверки рассылок.
+
+    Планировщик запустится, когда процесс станет ведущим.
+    """
+    scheduler_leader.start()
 
 
-def shutdown_scheduler():
+async def shutdown_scheduler():
     """Функция останавливающая планировщик."""
+    await scheduler_leader.stop()
     if scheduler.running:
         scheduler.shutdown()
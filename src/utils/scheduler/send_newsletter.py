@@ -1,147 +1,357 @@
+import asyncio
 import logging
-from typing import List
+import re
+from datetime import datetime, timedelta, timezone
+from functools import partial
+from time import monotonic
+from types import SimpleNamespace
+from typing import Optional
 
-import httpx
+import aiohttp
 from sqlalchemy.ext.asyncio import AsyncSession
 from telegram import (
     Bot,
     InlineKeyboardButton,
     InlineKeyboardMarkup,
-    InputMediaPhoto,
-    InputMediaVideo,
     Update,
 )
 from telegram.ext import CallbackContext
 
-from src.bot.handlers.catalog import build_firework_card
-from src.models import Newsletter, User
+from src.bot.api_client import APIClientError, api_client
+from src.bot.config import TAG_LANDING_CACHE_TTL
+from src.bot.handlers.catalog import (
+    build_sendable_media,
+    save_uploaded_media,
+)
+from src.bot.http_client import api_http_client
+from src.config import settings
+from src.crud.newsletter import newsletter_crud
+from src.models import Newsletter
+from src.models.newsletter import DeliveryStatus, NewsletterWave
+from src.schemas.newsletter import TagLanding
+from src.service.api_latency import api_latency
+from src.service.images import NEWSLETTER
+from src.service.telegram_media import MediaGroupSender
+from src.utils.scheduler.delivery import (
+    DeliveryEngine,
+    DeliveryStats,
+    get_bot,
+)
+
+logger = logging.getLogger(__name__)
+
+# newsletter_tag_<id рассылки>.<номер волны>:<тег>; в сообщениях,
+# отправленных до появления волн, - newsletter_tag_<тег>.
+TAG_CALLBACK = 'newsletter_tag_{newsletter_id}.{wave}:{tag}'
+LEGACY_TAG_CALLBACK = 'newsletter_tag_{tag}'
+CALLBACK_DATA_LIMIT = 64
+TAG_CALLBACK_PATTERN = re.compile(
+    r'^newsletter_tag_(?:(?P<newsletter_id>\d+)\.(?P<wave>\d+):)?(?P<tag>.*)$',
+    re.DOTALL,
+)
+
+
+def get_tag_callback(
+    newsletter: Newsletter, wave: NewsletterWave, tag_name: str
+) -> str:
+    """callback_data кнопки тега.
+
+    Если с id рассылки и номером волны данные не помещаются в лимит
+    Telegram (64 байта), кнопка остается без учета нажатий.
+    """
+    callback_data = TAG_CALLBACK.format(
+        newsletter_id=newsletter.id, wave=wave.number, tag=tag_name
+    )
+    if len(callback_data.encode()) > CALLBACK_DATA_LIMIT:
+        return LEGACY_TAG_CALLBACK.format(tag=tag_name)
+    return callback_data
+
+
+def build_tags_markup(
+    newsletter: Newsletter, wave: NewsletterWave
+) -> Optional[InlineKeyboardMarkup]:
+    """Кнопки тегов рассылки; нажатия учитываются в волне wave."""
+    if not newsletter.tags:
+        return None
+    return InlineKeyboardMarkup([
+        [
+            InlineKeyboardButton(
+                tag.name,
+                callback_data=get_tag_callback(newsletter, wave, tag.name),
+            )
+        ]
+        for tag in newsletter.tags
+    ])
 
-API_URL = 'http://localhost:8000/fireworks'
 
-PHOTO_FORMATS = ('.jpg', '.jpeg', '.png')
-VIDEO_FORMATS = ('.mp4', '.mov')
-TELEGRAM_MEDIA_LIMIT = 10
+async def can_release_wave(
+    wave: NewsletterWave, previous: Optional[NewsletterWave]
+) -> bool:
+    """Можно ли начать отправку волны.
+
+    Первая волна уходит сразу. Следующая - когда предыдущая доставлена,
+    прошла ее пауза pause_minutes и задержка API (перцентиль
+    settings.newsletter_rollout_latency_percentile за последнюю минуту)
+    не выше settings.newsletter_rollout_max_latency. Если задержка
+    неизвестна (запросов не было или Redis недоступен), волна выходит.
+    """
+    if previous is None:
+        return True
+    if previous.finished_at is None:
+        return False
+    release_at = previous.finished_at + timedelta(minutes=wave.pause_minutes)
+    if datetime.now(timezone.utc) < release_at:
+        return False
+    latency = await api_latency.get_percentile(
+        settings.newsletter_rollout_latency_percentile
+    )
+    if latency is not None and (
+        latency > settings.newsletter_rollout_max_latency
+    ):
+        logger.info(
+            'Волна %s рассылки %s отложена: задержка API %.0f мс',
+            wave.number,
+            wave.newsletter_id,
+            latency * 1000,
+        )
+        return False
+    return True
 
 
 async def send_newsletter_to_users(
     newsletter: Newsletter,
-    users: List[User],
     session: AsyncSession,
     bot_token: str,
-):
-    """Отправляет рассылку отфильтрованным пользователям через Telegram.
+) -> DeliveryStats:
+    """Отправляет рассылку получателям из очереди отправки.
+
+    Рассылка отправляется волнами (NewsletterWave) по порядку: волна
+    выходит, когда это разрешает can_release_wave, и отправляется
+    не быстрее своего rate_limit. Если следующую волну выпускать рано,
+    функция возвращает управление - планировщик проверит рассылку снова
+    через settings.newsletter_rollout_check_interval секунд.
+
+    Получатели волны (NewsletterDelivery) забираются пачками по
+    settings.newsletter_batch_size, каждая пачка обслуживается
+    параллельно пулом DeliveryEngine с общим лимитом скорости
+    (см. src/utils/scheduler/delivery.py), а результат каждой доставки
+    записывается в очередь. После сбоя отправка продолжается
+    с недоставленных получателей. Рассылка помечается отправленной,
+    когда доставлены все ее волны.
+
+    Медиафайлы загружаются в Telegram только при отправке первому
+    получателю, остальным они отправляются по сохраненному file_id
+    (см. src/service/telegram_media.py).
 
     Параметры:
         1) newsletter (Newsletter) - объект рассылки;
-        2) users (List[User]) - Список пользователей,
-           которым отправляется рассылка;
-        3) session (AsyncSession) - сессия базы данных;
-        4) bot_token (str) - токен Telegram-бота.
+        2) session (AsyncSession) - сессия базы данных;
+        3) bot_token (str) - токен Telegram-бота.
+
+    Возвращаемое значение:
+        DeliveryStats: итоги доставки.
     """
-    bot = Bot(token=bot_token)
-    if newsletter.tags:
-        keyboard = [
-            [
-                InlineKeyboardButton(
-                    tag.name, callback_data=f'newsletter_tag_{tag.name}'
+    bot = await get_bot(bot_token)
+    media = MediaGroupSender(bot, newsletter.mediafiles)
+    stats = DeliveryStats()
+    previous = None
+    for wave in await newsletter_crud.get_waves(newsletter, session):
+        if wave.finished_at is None:
+            if wave.released_at is None:
+                if not await can_release_wave(wave, previous):
+                    break
+                wave.released_at = datetime.now(timezone.utc)
+                await session.commit()
+                logger.info(
+                    'Волна %s рассылки %s выпущена',
+                    wave.number,
+                    newsletter.id,
                 )
-            ]
-            for tag in newsletter.tags
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
+            stats.add(await send_wave(newsletter, wave, media, bot, session))
+            if await newsletter_crud.has_unfinished_deliveries(
+                newsletter.id, session, wave.number
+            ):
+                break
+            wave.finished_at = datetime.now(timezone.utc)
+            await session.commit()
+        previous = wave
     else:
-        reply_markup = None
-    media_group = []
-    media_urls = [media.media_url for media in newsletter.mediafiles][
-        :TELEGRAM_MEDIA_LIMIT
-    ]
-    for media_url in media_urls:
-        if media_url.endswith(PHOTO_FORMATS):
-            media_group.append(InputMediaPhoto(media=media_url, caption=None))
-        elif media_url.endswith(VIDEO_FORMATS):
-            media_group.append(InputMediaVideo(media=media_url, caption=None))
-    for user in users:
-        if not user.telegram_id or user.is_admin:
-            continue
+        newsletter.switch_send = True
+        await session.commit()
+    return stats
+
+
+async def send_wave(
+    newsletter: Newsletter,
+    wave: NewsletterWave,
+    media: MediaGroupSender,
+    bot: Bot,
+    session: AsyncSession,
+) -> DeliveryStats:
+    """Доставляет получателям волны сообщения рассылки."""
+    reply_markup = build_tags_markup(newsletter, wave)
+    engine = DeliveryEngine(
+        rate=min(
+            wave.rate_limit or settings.newsletter_rate_limit,
+            settings.newsletter_rate_limit,
+        )
+    )
+    stats = DeliveryStats()
+    errors = {}
+
+    async def deliver(chat_id: int) -> None:
         try:
-            if media_group:
-                await bot.send_media_group(
-                    chat_id=user.telegram_id, media=media_group
+            await send_to_chat(chat_id)
+        except Exception as error:
+            errors[chat_id] = str(error)
+            raise
+
+    async def send_to_chat(chat_id: int) -> None:
+        if media:
+            await media.send(chat_id, partial(engine.send, chat_id))
+        if reply_markup:
+            await engine.send(
+                chat_id,
+                bot.send_message,
+                text=f'{newsletter.content}\nТеги:',
+                reply_markup=reply_markup,
+            )
+
+    while deliveries := await newsletter_crud.claim_deliveries(
+        newsletter.id, session, wave=wave.number
+    ):
+        await session.commit()
+        errors.clear()
+        stats.add(await engine.run(deliveries, deliver))
+        finished_at = datetime.now(timezone.utc)
+        await newsletter_crud.complete_deliveries(
+            [
+                dict(
+                    id=delivery_id,
+                    status=DeliveryStatus.FAILED,
+                    error=errors[chat_id],
+                )
+                if chat_id in errors
+                else dict(
+                    id=delivery_id,
+                    status=DeliveryStatus.SENT,
+                    error=None,
+                    sent_at=finished_at,
+                )
+                for chat_id, delivery_id in deliveries.items()
+            ],
+            session,
+        )
+        await session.commit()
+    return stats
+
+
+def get_media_key(media: SimpleNamespace) -> tuple:
+    """Медиа страницы тега: исходное медиа и его вариант фото."""
+    return media.id, getattr(media, 'formatted_media_id', None)
+
+
+class TagLandingSenders:
+    """Страницы тегов из кнопок рассылок в процессе бота.
+
+    Страница тега запрашивается у API один раз на
+    TAG_LANDING_CACHE_TTL секунд (одновременные нажатия ждут первый
+    запрос), а медиа страницы загружаются в Telegram при первом
+    нажатии и дальше отправляются по file_id.
+    """
+
+    def __init__(self, ttl: float = TAG_LANDING_CACHE_TTL) -> None:
+        """Создает пустой кеш страниц.
+
+        Аргументы:
+            ttl: сколько секунд хранить страницу тега.
+        """
+        self.ttl = ttl
+        self._pages: dict[str, tuple[float, TagLanding, MediaGroupSender]] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    async def get(
+        self, bot: Bot, tag_name: str
+    ) -> tuple[TagLanding, MediaGroupSender]:
+        """Страница тега и отправитель ее медиагруппы."""
+        page = self._pages.get(tag_name)
+        if page and monotonic() - page[0] < self.ttl:
+            return page[1:]
+        lock = self._locks.setdefault(tag_name, asyncio.Lock())
+        async with lock:
+            page = self._pages.get(tag_name)
+            if page and monotonic() - page[0] < self.ttl:
+                return page[1:]
+            landing = await api_client.get_tag_landing(tag_name)
+            # file_id, полученные ботом после подготовки страницы,
+            # переносятся в обновленную страницу.
+            file_ids = {
+                get_media_key(media): media.telegram_file_id
+                for media in (page[2].media if page else [])
+            }
+            media = []
+            for card in landing.cards:
+                if card.media is None:
+                    continue
+                item = build_sendable_media(
+                    card.media.model_dump(mode='json'),
+                    NEWSLETTER,
+                    caption=card.caption,
+                    firework_id=card.firework_id,
                 )
-            if reply_markup:
-                await bot.send_message(
-                    chat_id=user.telegram_id,
-                    text=f'{newsletter.content}\nТеги:',
-                    reply_markup=reply_markup,
+                item.telegram_file_id = item.telegram_file_id or (
+                    file_ids.get(get_media_key(item))
                 )
-        except Exception as e:
-            logging.error(f'User {user.id}: {str(e)}')
-            continue
-    newsletter.switch_send = True
-    await session.commit()
+                media.append(item)
+            sender = MediaGroupSender(
+                bot,
+                media,
+                http_session=await api_http_client.get_session(),
+                parse_mode='Markdown',
+            )
+            self._pages[tag_name] = (monotonic(), landing, sender)
+        return landing, sender
+
+
+tag_landings = TagLandingSenders()
 
 
 async def handle_tag_callback(update: Update, context: CallbackContext):
+    """Показывает товары тега из кнопки рассылки.
+
+    Страница тега подготовлена заранее (src/service/tag_landing.py),
+    поэтому нажатие не обращается к БД. Товары с медиа отправляются
+    одной медиагруппой с карточками в подписях, остальные - текстом.
+    """
     query = update.callback_query
     await query.answer()
-    tag_name = query.data.replace('newsletter_tag_', '')
-    params = {'offset': 0, 'limit': 10}
-    json_data = {'tags': [tag_name]}
-    try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                API_URL, params=params, json=json_data
+    match = TAG_CALLBACK_PATTERN.match(query.data)
+    tag_name = match['tag']
+    if match['newsletter_id']:
+        try:
+            await api_client.add_newsletter_click(
+                int(match['newsletter_id']), int(match['wave'])
             )
-            response.raise_for_status()
-            data = response.json()
-    except httpx.HTTPError as e:
+        except (aiohttp.ClientError, APIClientError) as error:
+            logger.warning('Нажатие не учтено: %s', error)
+    try:
+        landing, sender = await tag_landings.get(context.bot, tag_name)
+    except (aiohttp.ClientError, APIClientError) as e:
         await query.edit_message_text(f'Ошибка при запросе данных: {str(e)}')
         return
-    fireworks = data.get('fireworks', [])
-    if not fireworks:
+    if not landing.cards:
         await query.edit_message_text('По этому тегу ничего не найдено.')
         return
-    for firework in fireworks:
-        card_text = build_firework_card(firework, full_info=True)
-        media_urls = firework.get('media_urls', [])
-        if media_urls:
-            media_group = []
-            for idx, url in enumerate(media_urls[:TELEGRAM_MEDIA_LIMIT]):
-                if url.endswith(PHOTO_FORMATS):
-                    if idx == 0:
-                        media_group.append(
-                            InputMediaPhoto(
-                                media=url,
-                                caption=card_text,
-                                parse_mode='Markdown',
-                            )
-                        )
-                    else:
-                        media_group.append(InputMediaPhoto(media=url))
-                elif url.endswith(VIDEO_FORMATS):
-                    if idx == 0:
-                        media_group.append(
-                            InputMediaVideo(
-                                media=url,
-                                caption=card_text,
-                                parse_mode='Markdown',
-                            )
-                        )
-                    else:
-                        media_group.append(InputMediaVideo(media=url))
-            if media_group:
-                await context.bot.send_media_group(
-                    chat_id=query.message.chat_id, media=media_group
-                )
-            else:
-                await context.bot.send_message(
-                    chat_id=query.message.chat_id,
-                    text=card_text,
-                    parse_mode='Markdown',
-                )
-        else:
+    chat_id = query.message.chat_id
+    if sender:
+        await sender.send(chat_id)
+        await save_uploaded_media(sender)
+    # Медиа, которые не удалось скачать, отправитель пропускает.
+    sent = {media.firework_id for media in sender.media}
+    for card in landing.cards:
+        if card.firework_id not in sent:
             await context.bot.send_message(
-                chat_id=query.message.chat_id,
-                text=card_text,
+                chat_id=chat_id,
+                text=card.text,
                 parse_mode='Markdown',
             )
@@ -0,0 +1,56 @@
+"""Отдельный процесс рассылок.
+
+Запуск: python -m src.utils.scheduler.worker
+
+Процесс участвует в выборе ведущего (src/utils/scheduler/leader.py)
+и, став ведущим, планирует и отправляет рассылки. У него свой пул
+соединений с БД (размер задается DB_POOL_SIZE и DB_MAX_OVERFLOW) и свой
+Bot, поэтому крупная рассылка не замедляет ответы API и бота.
+Приложение только сохраняет рассылки и сообщает об их изменении через
+notify_newsletter_changed.
+"""
+
+import asyncio
+import logging
+import signal
+
+from sqlalchemy.orm import configure_mappers
+
+import src.models  # noqa: F401
+from src.database.db_dependencies import engine
+from src.utils.scheduler.delivery import close_bots
+from src.utils.scheduler.scheduler import setup_scheduler, shutdown_scheduler
+
+logger = logging.getLogger(__name__)
+
+
+async def run() -> None:
+    """Работает до SIGINT или SIGTERM, затем корректно завершается."""
+    stopped = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, stopped.set)
+    setup_scheduler()
+    logger.info('Процесс рассылок запущен')
+    try:
+        await stopped.wait()
+    finally:
+        # Начатая пачка доставок остается за процессом до истечения
+        # аренды и будет продолжена следующим ведущим процессом.
+        await shutdown_scheduler()
+        await close_bots()
+        await engine.dispose()
+        logger.info('Процесс рассылок остановлен')
+
+
+def main() -> None:
+    logging.basicConfig(
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        level=logging.INFO,
+    )
+    configure_mappers()
+    asyncio.run(run())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,42 @@
+"""Общие фикстуры тестов.
+
+Тестам с БД нужна база с примененными миграциями (настройки берутся
+из .env, как у приложения). Каждый тест работает в транзакции, которая
+откатывается после него; если БД недоступна, тест пропускается.
+"""
+
+from typing import AsyncIterator
+
+import pytest
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from src.database.db_dependencies import engine
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return 'asyncio'
+
+
+@pytest.fixture
+async def connection() -> AsyncIterator[AsyncConnection]:
+    try:
+        connection = await engine.connect()
+    except (OSError, SQLAlchemyError) as error:
+        pytest.skip(f'БД недоступна: {error}')
+    transaction = await connection.begin()
+    try:
+        yield connection
+    finally:
+        await transaction.rollback()
+        await connection.close()
+        await engine.dispose()
+
+
+@pytest.fixture
+async def session(connection: AsyncConnection) -> AsyncIterator[AsyncSession]:
+    async with AsyncSession(
+        bind=connection, expire_on_commit=False
+    ) as session:
+        yield session
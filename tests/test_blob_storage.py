@@ -0,0 +1,200 @@
+"""Список файлов хранилища и удаление лишних файлов вариантов.
+
+S3BlobStorage проверяется на локальной подделке ListObjectsV2 (aiohttp),
+LocalBlobStorage - во временном каталоге. Для удаления лишних файлов
+нужна БД: записи создаются в транзакции, которая откатывается после
+теста (tests/conftest.py).
+"""
+
+import os
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import AsyncIterator
+from xml.sax.saxutils import escape
+
+import pytest
+from aiohttp import web
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.crud import media as media_crud_module
+from src.crud.media import FORMATTED_MEDIA_PREFIX, formatted_media_crud
+from src.models.media import FormattedMedia, Media
+from src.service.blob_storage import LocalBlobStorage, S3BlobStorage
+
+BUCKET = 'test-bucket'
+PAGE_SIZE = 2
+MODIFIED = datetime(2026, 10, 18, 12, 0, tzinfo=timezone.utc)
+# Ключ и токен продолжения с символами, которые кодируются в запросе.
+S3_KEYS = [
+    f'{FORMATTED_MEDIA_PREFIX}/{number}/card/x y+{number}.jpeg'
+    for number in range(5)
+]
+TOKEN_PREFIX = 'a/='
+ORPHAN_MIN_AGE = timedelta(hours=1)
+CREDENTIALS = {
+    'bucket': BUCKET,
+    'access_key': 'access',
+    'secret_key': 'secret',
+    'region': 'us-east-1',
+}
+
+
+class FakeS3:
+    """Поддельный ListObjectsV2: ключи по PAGE_SIZE за ответ.
+
+    Подпись запроса проверяется по адресу, полученному сервером.
+    """
+
+    def __init__(self) -> None:
+        """Создает bucket с ключами S3_KEYS."""
+        self.queries: list[dict[str, str]] = []
+
+    async def list_objects(self, request: web.Request) -> web.Response:
+        self.queries.append(dict(request.query))
+        assert request.query['list-type'] == '2'
+        signer = S3BlobStorage(
+            endpoint_url=f'http://{request.host}', **CREDENTIALS
+        )
+        signed = signer.sign(
+            'GET',
+            request.rel_url.raw_path,
+            request.headers['x-amz-content-sha256'],
+            now=datetime.strptime(
+                request.headers['x-amz-date'], '%Y%m%dT%H%M%SZ'
+            ),
+            query=request.rel_url.raw_query_string,
+        )
+        assert request.headers['authorization'] == signed['authorization']
+        keys = [
+            key for key in S3_KEYS if key.startswith(request.query['prefix'])
+        ]
+        token = request.query.get('continuation-token')
+        start = int(token.removeprefix(TOKEN_PREFIX)) if token else 0
+        page = keys[start : start + PAGE_SIZE]
+        contents = ''.join(
+            f'<Contents><Key>{escape(key)}</Key><LastModified>'
+            f'{MODIFIED.strftime("%Y-%m-%dT%H:%M:%S.000Z")}'
+            '</LastModified></Contents>'
+            for key in page
+        )
+        next_token = ''
+        if start + PAGE_SIZE < len(keys):
+            next_token = (
+                '<NextContinuationToken>'
+                f'{TOKEN_PREFIX}{start + PAGE_SIZE}</NextContinuationToken>'
+            )
+        return web.Response(
+            text=(
+                '<?xml version="1.0" encoding="UTF-8"?>'
+                '<ListBucketResult '
+                'xmlns="http://s3.amazonaws.com/doc/2006-03-01/">'
+                f'{contents}{next_token}</ListBucketResult>'
+            ),
+            content_type='application/xml',
+        )
+
+
+@pytest.fixture
+def s3() -> FakeS3:
+    return FakeS3()
+
+
+@pytest.fixture
+async def s3_storage(s3: FakeS3) -> AsyncIterator[S3BlobStorage]:
+    app = web.Application()
+    app.router.add_get(f'/{BUCKET}', s3.list_objects)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    storage = S3BlobStorage(
+        endpoint_url=f'http://127.0.0.1:{port}', **CREDENTIALS
+    )
+    try:
+        yield storage
+    finally:
+        await storage.close()
+        await runner.cleanup()
+
+
+def set_age(storage: LocalBlobStorage, key: str, age: timedelta) -> None:
+    timestamp = (datetime.now(timezone.utc) - age).timestamp()
+    os.utime(storage.get_path(key), (timestamp, timestamp))
+
+
+@pytest.mark.anyio
+async def test_s3_list_keys_pages(
+    s3: FakeS3, s3_storage: S3BlobStorage
+) -> None:
+    keys = await s3_storage.list_keys(FORMATTED_MEDIA_PREFIX)
+    assert keys == dict.fromkeys(S3_KEYS, MODIFIED)
+    assert [query.get('continuation-token') for query in s3.queries] == [
+        None,
+        f'{TOKEN_PREFIX}2',
+        f'{TOKEN_PREFIX}4',
+    ]
+
+
+@pytest.mark.anyio
+async def test_local_list_keys(tmp_path: Path) -> None:
+    storage = LocalBlobStorage(str(tmp_path))
+    await storage.put(f'{FORMATTED_MEDIA_PREFIX}/1/card/a.jpeg', b'a')
+    await storage.put(f'{FORMATTED_MEDIA_PREFIX}/2/detail/b.webp', b'b')
+    await storage.put('other/c.jpeg', b'c')
+    set_age(storage, f'{FORMATTED_MEDIA_PREFIX}/1/card/a.jpeg', ORPHAN_MIN_AGE)
+
+    keys = await storage.list_keys(FORMATTED_MEDIA_PREFIX)
+    assert sorted(keys) == [
+        f'{FORMATTED_MEDIA_PREFIX}/1/card/a.jpeg',
+        f'{FORMATTED_MEDIA_PREFIX}/2/detail/b.webp',
+    ]
+    age = (
+        datetime.now(timezone.utc)
+        - keys[f'{FORMATTED_MEDIA_PREFIX}/1/card/a.jpeg']
+    )
+    assert ORPHAN_MIN_AGE <= age < ORPHAN_MIN_AGE + timedelta(minutes=1)
+    assert await storage.list_keys('missing') == {}
+
+
+@pytest.mark.anyio
+async def test_delete_orphaned_files(
+    tmp_path: Path, session: AsyncSession, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    storage = LocalBlobStorage(str(tmp_path))
+    monkeypatch.setattr(media_crud_module, 'blob_storage', storage)
+    media = Media(
+        media_url='https://example.com/test-orphans.jpg', media_type='image'
+    )
+    session.add(media)
+    await session.flush()
+    referenced = f'{FORMATTED_MEDIA_PREFIX}/{media.id}/card/a.jpeg'
+    old_orphan = f'{FORMATTED_MEDIA_PREFIX}/{media.id}/card/b.jpeg'
+    # Файл, записанный до фиксации еще не созданной записи.
+    new_orphan = f'{FORMATTED_MEDIA_PREFIX}/{media.id}/card/c.jpeg'
+    session.add(
+        FormattedMedia(
+            media_id=media.id,
+            variant='card',
+            format='jpeg',
+            path=referenced,
+            size=1,
+            sha256='a' * 64,
+        )
+    )
+    await session.flush()
+    for key in (referenced, old_orphan, new_orphan):
+        await storage.put(key, b'x')
+    for key in (referenced, old_orphan):
+        set_age(storage, key, 2 * ORPHAN_MIN_AGE)
+
+    assert (
+        await formatted_media_crud.delete_orphaned_files(
+            session, ORPHAN_MIN_AGE
+        )
+        == 1
+    )
+    assert sorted(await storage.list_keys(FORMATTED_MEDIA_PREFIX)) == [
+        referenced,
+        new_orphan,
+    ]
@@ -0,0 +1,176 @@
+"""Количество SQL-запросов эндпоинтов каталога.
+
+Связи каталога объявлены с lazy='raise', и каждый запрос CRUD явно
+подключает связи, нужные его схеме ответа (src/crud/load_options.py).
+Тест проверяет, что эндпоинты не обращаются к незагруженным связям
+(иначе ответ 500) и что число запросов не зависит от количества
+товаров: связи загружаются пачками, а не отдельным запросом на товар.
+
+Тестовые данные создаются в транзакции, которая откатывается после
+теста (tests/conftest.py); кеш каталога не используется.
+"""
+
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from src.api.v1.router import main_router
+from src.crud.media import PHOTO_MEDIA_TYPE
+from src.database.db_dependencies import get_async_session
+from src.models.discounts import Discount
+from src.models.favorite import FavoriteFirework
+from src.models.media import Media
+from src.models.product import Category, Firework, Tag
+from src.models.user import User
+from src.service.catalog_cache import catalog_cache, get_adapter
+
+TELEGRAM_ID = 9_000_000_001
+# Размеры каталога: число запросов не должно от них зависеть.
+CATALOG_SIZES = (1, 3)
+# Эндпоинт -> ожидаемое число SQL-запросов.
+EXPECTED_QUERIES = {
+    # Количество, страница, теги, акции, медиа, варианты фото.
+    'fireworks': 6,
+    # Проверка существования, товар, теги, акции, медиа, варианты фото.
+    'firework': 6,
+    # Страница категорий и их количество.
+    'categories': 2,
+    # Активные акции.
+    'discounts': 1,
+    # Пользователь, избранное с товарами, теги, акции, медиа, варианты.
+    'favorites': 6,
+}
+
+
+class QueryCounter:
+    """Считает SQL-запросы, выполненные на соединении."""
+
+    def __init__(self) -> None:
+        """Создает счетчик без запросов."""
+        self.statements: list[str] = []
+
+    def __call__(self, *args: Any) -> None:
+        # before_cursor_execute(conn, cursor, statement, ...)
+        self.statements.append(args[2])
+
+
+async def load_without_cache(
+    namespace: str,
+    params: dict,
+    loader: Callable[[], Awaitable[Any]],
+    schema: Any,
+    ttl: Optional[int] = None,
+) -> Any:
+    """Замена catalog_cache.get_or_load: всегда загружает из БД.
+
+    Результат проверяется схемой так же, как в кеше, поэтому обращение
+    к незагруженной связи при сериализации тоже приводит к ошибке.
+    """
+    return get_adapter(schema).validate_python(
+        await loader(), from_attributes=True
+    )
+
+
+@pytest.fixture
+async def client(
+    session: AsyncSession, monkeypatch: pytest.MonkeyPatch
+) -> AsyncIterator[AsyncClient]:
+    async def get_test_session() -> AsyncIterator[AsyncSession]:
+        yield session
+
+    app = FastAPI()
+    app.include_router(main_router)
+    app.dependency_overrides[get_async_session] = get_test_session
+    monkeypatch.setattr(catalog_cache, 'get_or_load', load_without_cache)
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url='http://test'
+    ) as client:
+        yield client
+
+
+async def create_catalog(session: AsyncSession, size: int) -> list[int]:
+    """Создает size товаров с тегами, акцией, фото и избранным.
+
+    Возвращает id созданных товаров.
+    """
+    now = datetime.utcnow()
+    category = Category(name='Тест: категория')
+    tags = [Tag(name=f'Тест: тег {number}') for number in range(2)]
+    discount = Discount(
+        type='Тест: акция',
+        value=10,
+        start_date=now - timedelta(days=1),
+        end_date=now + timedelta(days=1),
+    )
+    fireworks = [
+        Firework(
+            code=f'test-{number}',
+            article=f'test-{number}',
+            name=f'Тест: товар {number}',
+            measurement_unit='шт',
+            product_size='10x10',
+            price=100,
+            category=category,
+            tags=tags,
+            discounts=[discount],
+            media=[
+                Media(
+                    media_url=f'https://example.com/test-{number}.jpg',
+                    media_type=PHOTO_MEDIA_TYPE,
+                )
+            ],
+        )
+        for number in range(size)
+    ]
+    user = User(telegram_id=TELEGRAM_ID, name='Тест')
+    session.add_all([*fireworks, user])
+    await session.flush()
+    session.add_all(
+        FavoriteFirework(user_id=user.id, firework_id=firework.id)
+        for firework in fireworks
+    )
+    await session.flush()
+    return [firework.id for firework in fireworks]
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize('size', CATALOG_SIZES)
+async def test_catalog_query_counts(
+    connection: AsyncConnection,
+    session: AsyncSession,
+    client: AsyncClient,
+    size: int,
+) -> None:
+    firework_ids = await create_catalog(session, size)
+    session.expunge_all()
+    requests = {
+        'fireworks': ('POST', '/fireworks', None),
+        'firework': ('GET', f'/fireworks/{firework_ids[0]}', None),
+        'categories': ('GET', '/categories', None),
+        'discounts': ('GET', '/discounts', None),
+        'favorites': (
+            'POST',
+            '/favorites/me',
+            {'telegram_id': TELEGRAM_ID},
+        ),
+    }
+    query_counts = {}
+    for name, (method, url, body) in requests.items():
+        counter = QueryCounter()
+        event.listen(
+            connection.sync_connection, 'before_cursor_execute', counter
+        )
+        try:
+            response = await client.request(method, url, json=body)
+        finally:
+            event.remove(
+                connection.sync_connection, 'before_cursor_execute', counter
+            )
+        assert response.status_code == 200, (name, response.text)
+        query_counts[name] = len(counter.statements)
+    assert query_counts == EXPECTED_QUERIES
@@ -0,0 +1,124 @@
+"""Память потоковой загрузки прайс-листа.
+
+Синтетический прайс-лист на ROWS строк генерируется во временном файле
+и загружается частями через csv_loader.read_chunks: без БД - только
+подготовка частей (prepare_* функции), с БД - import_price_list
+в транзакции, которая откатывается после теста. Пик памяти, выделенной
+во время загрузки (tracemalloc), не должен зависеть от размера файла
+и превышать MAX_MEMORY_MB.
+"""
+
+import csv
+import tracemalloc
+from pathlib import Path
+from typing import Awaitable, Callable
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.service.csv_loader import (
+    CODE_COLUMN,
+    FIREWORK_COLUMNS,
+    GROUP_COLUMN,
+    PHOTO_COLUMN,
+    PRICE_COLUMN,
+    SUBGROUP_COLUMN,
+    VIDEO_COLUMN,
+    ImportReport,
+    import_price_list,
+    prepare_categories,
+    prepare_fireworks,
+    prepare_media,
+    prepare_properties,
+    read_chunks,
+)
+
+ROWS = 500_000
+CHUNK_SIZE = 2000
+MAX_MEMORY_MB = 64
+
+PROPERTY_COLUMNS = ('Цвет', 'Высота подъема, м', 'Время работы, с')
+HEADER = (
+    *FIREWORK_COLUMNS,
+    GROUP_COLUMN,
+    SUBGROUP_COLUMN,
+    PHOTO_COLUMN,
+    VIDEO_COLUMN,
+    *PROPERTY_COLUMNS,
+)
+
+
+def generate_row(number: int) -> dict:
+    row = dict.fromkeys(HEADER, '')
+    row.update({
+        CODE_COLUMN: f'test-{number}',
+        'Артикул': f'TEST-{number}',
+        'Наименование': f'Тест: батарея салютов {number}',
+        'Единица измерения': 'шт',
+        'Кол-во зарядов': str(10 + number % 90),
+        'Описание — как на Рутуб': (
+            'Яркие залпы с эффектом золотой ивы,\nвысота подъема '
+            f'{20 + number % 60} метров.'
+        ),
+        'Размер изделия, мм': '100x100x100',
+        PRICE_COLUMN: f'{1 + number % 9},{number % 1000:03d}',
+        GROUP_COLUMN: f'Тест: группа {number % 20}',
+        SUBGROUP_COLUMN: f'Тест: подгруппа {number % 200}',
+        PHOTO_COLUMN: f'https://example.com/test/{number}.jpg',
+        'Цвет': ('красный', 'зеленый', 'золотой')[number % 3],
+        'Высота подъема, м': str(20 + number % 60),
+    })
+    return row
+
+
+@pytest.fixture(scope='module')
+def price_list(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Прайс-лист на ROWS строк; пишется построчно, не держа его в памяти."""
+    path = tmp_path_factory.mktemp('price_list') / 'price.csv'
+    with open(path, 'w', newline='', encoding='utf-8') as file:
+        writer = csv.DictWriter(file, fieldnames=HEADER)
+        writer.writeheader()
+        for number in range(ROWS):
+            writer.writerow(generate_row(number))
+    return path
+
+
+async def measure_peak_mb(load: Callable[[], Awaitable[int]]) -> float:
+    """Пик памяти, выделенной во время load, в МБ."""
+    tracemalloc.start()
+    try:
+        assert await load() == ROWS
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 1024 / 1024
+
+
+@pytest.mark.anyio
+async def test_prepare_memory(price_list: Path) -> None:
+    async def prepare() -> int:
+        rows = 0
+        async for chunk in read_chunks(str(price_list), CHUNK_SIZE):
+            prepare_categories(chunk)
+            prepare_fireworks(chunk)
+            prepare_properties(chunk)
+            prepare_media(chunk)
+            rows += len(chunk)
+        return rows
+
+    assert await measure_peak_mb(prepare) < MAX_MEMORY_MB
+
+
+@pytest.mark.anyio
+async def test_import_memory(price_list: Path, session: AsyncSession) -> None:
+    report = ImportReport()
+
+    async def load() -> int:
+        rows = 0
+        async for chunk in read_chunks(str(price_list), CHUNK_SIZE):
+            await import_price_list(session, chunk, report)
+            rows += len(chunk)
+        return rows
+
+    assert await measure_peak_mb(load) < MAX_MEMORY_MB
+    assert report.as_dict()['changes']['added'] == ROWS
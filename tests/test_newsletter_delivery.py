@@ -0,0 +1,279 @@
+"""Доставка рассылки на локальной подделке Bot API.
+
+Поддельный сервер Bot API (aiohttp) запоминает время поступления
+каждого сообщения и по заданию отвечает ошибкой 429 с retry_after.
+DeliveryEngine доставляет рассылку через настоящий telegram.Bot,
+а тесты проверяют по времени на сервере общий лимит скорости
+(TokenBucket), интервал между сообщениями в один чат (ChatPacer)
+и ожидание при RetryAfter. БД и настоящий токен не нужны.
+"""
+
+import asyncio
+import json
+from collections import Counter
+from functools import partial
+from time import monotonic, time
+from types import SimpleNamespace
+from typing import AsyncIterator, Optional
+
+import pytest
+from aiohttp import web
+from telegram import Bot
+from telegram.request import HTTPXRequest
+
+from src.service.telegram_media import MediaGroupSender
+from src.utils.scheduler.delivery import DeliveryEngine
+
+BOT_TOKEN = '123456:test'
+LATENCY = 0.02
+RETRY_AFTER = 1
+# Допуск на время прохождения запроса до сервера.
+TOLERANCE = 0.05
+
+
+class FakeBotAPI:
+    """Поддельный сервер Bot API, запоминающий принятые сообщения.
+
+    floods: сколько следующих запросов в чат получат ответ 429.
+    """
+
+    def __init__(self) -> None:
+        """Создает сервер без сообщений."""
+        self.messages: list[tuple[float, int]] = []
+        self.floods: Counter = Counter()
+        self.flood_times: dict[int, float] = {}
+        self.media_sources = Counter()
+        self._message_id = 0
+
+    def get_times(self, chat_id: Optional[int] = None) -> list[float]:
+        """Время поступления сообщений (в чат chat_id или всех)."""
+        return sorted(
+            arrived
+            for arrived, chat in self.messages
+            if chat_id is None or chat == chat_id
+        )
+
+    def make_message(self, chat_id: int, file_id: str = None) -> dict:
+        self._message_id += 1
+        message = {
+            'message_id': self._message_id,
+            'date': int(time()),
+            'chat': {'id': chat_id, 'type': 'private'},
+        }
+        if file_id:
+            message['photo'] = [
+                {
+                    'file_id': file_id,
+                    'file_unique_id': file_id,
+                    'width': 100,
+                    'height': 100,
+                }
+            ]
+        return message
+
+    def make_media_message(self, chat_id: int, media: str) -> dict:
+        if media.startswith('file-'):
+            self.media_sources['file_id'] += 1
+            return self.make_message(chat_id, media)
+        self.media_sources['upload'] += 1
+        return self.make_message(chat_id, f'file-{media}')
+
+    async def handle(self, request: web.Request) -> web.Response:
+        arrived = monotonic()
+        method = request.match_info['method']
+        if method == 'getMe':
+            return web.json_response({
+                'ok': True,
+                'result': {
+                    'id': 123456,
+                    'is_bot': True,
+                    'first_name': 'test',
+                    'username': 'test_bot',
+                },
+            })
+        data = await request.post()
+        chat_id = int(data['chat_id'])
+        await asyncio.sleep(LATENCY)
+        if self.floods[chat_id]:
+            self.floods[chat_id] -= 1
+            self.flood_times[chat_id] = arrived
+            return web.json_response(
+                {
+                    'ok': False,
+                    'error_code': 429,
+                    'description': 'Too Many Requests',
+                    'parameters': {'retry_after': RETRY_AFTER},
+                },
+                status=429,
+            )
+        if method == 'sendMediaGroup':
+            media = json.loads(data['media'])
+            self.messages.extend((arrived, chat_id) for _ in media)
+            result = [
+                self.make_media_message(chat_id, item['media'])
+                for item in media
+            ]
+        else:
+            self.messages.append((arrived, chat_id))
+            result = self.make_message(chat_id)
+        return web.json_response({'ok': True, 'result': result})
+
+
+@pytest.fixture
+def api() -> FakeBotAPI:
+    return FakeBotAPI()
+
+
+@pytest.fixture
+async def bot(api: FakeBotAPI) -> AsyncIterator[Bot]:
+    app = web.Application()
+    app.router.add_post('/bot{token}/{method}', api.handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    bot = Bot(
+        token=BOT_TOKEN,
+        base_url=f'http://127.0.0.1:{port}/bot',
+        request=HTTPXRequest(connection_pool_size=20),
+    )
+    await bot.initialize()
+    try:
+        yield bot
+    finally:
+        await bot.shutdown()
+        await runner.cleanup()
+
+
+def get_max_per_second(times: list[float]) -> int:
+    """Наибольшее число сообщений за любую секунду."""
+    return max(
+        sum(1 for other in times[index:] if other < start + 1)
+        for index, start in enumerate(times)
+    )
+
+
+@pytest.mark.anyio
+async def test_rate_limit(api: FakeBotAPI, bot: Bot) -> None:
+    rate, recipients = 40, 80
+    engine = DeliveryEngine(concurrency=10, rate=rate, chat_interval=0)
+
+    async def deliver(chat_id: int) -> None:
+        await engine.send(chat_id, bot.send_message, text='Рассылка')
+
+    stats = await engine.run(range(1, recipients + 1), deliver)
+
+    assert (stats.delivered, stats.failed, stats.messages) == (
+        recipients,
+        0,
+        recipients,
+    )
+    # Бакет вмещает один токен: за секунду не больше rate + 1.
+    assert get_max_per_second(api.get_times()) <= rate + 1
+
+
+@pytest.mark.anyio
+async def test_chat_interval(api: FakeBotAPI, bot: Bot) -> None:
+    chat_interval, recipients, messages = 0.2, 10, 3
+    # Общий лимит не ограничивает: интервал задает только ChatPacer.
+    engine = DeliveryEngine(
+        concurrency=recipients, rate=1000, chat_interval=chat_interval
+    )
+
+    async def deliver(chat_id: int) -> None:
+        for _ in range(messages):
+            await engine.send(chat_id, bot.send_message, text='Рассылка')
+
+    stats = await engine.run(range(1, recipients + 1), deliver)
+
+    assert stats.messages == recipients * messages
+    for chat_id in range(1, recipients + 1):
+        times = api.get_times(chat_id)
+        assert len(times) == messages
+        for previous, current in zip(times, times[1:]):
+            assert current - previous >= chat_interval - TOLERANCE
+    # Интервал действует на чат, а не на всех: чаты обслуживаются
+    # одновременно.
+    assert stats.seconds < 2 * messages * chat_interval
+
+
+@pytest.mark.anyio
+async def test_retry_after_pauses_bot(api: FakeBotAPI, bot: Bot) -> None:
+    rate, recipients, flood_chat = 20, 30, 3
+    api.floods[flood_chat] = 1
+    engine = DeliveryEngine(concurrency=5, rate=rate, chat_interval=0)
+
+    async def deliver(chat_id: int) -> None:
+        await engine.send(chat_id, bot.send_message, text='Рассылка')
+
+    stats = await engine.run(range(1, recipients + 1), deliver)
+
+    assert (stats.delivered, stats.failed, stats.retries) == (
+        recipients,
+        0,
+        1,
+    )
+    flood_time = api.flood_times[flood_chat]
+    (retried,) = api.get_times(flood_chat)
+    assert retried - flood_time >= RETRY_AFTER - TOLERANCE
+    # Ограничение действует на весь бот: после сообщений, на которые
+    # токены уже были выданы (не больше числа обработчиков), бот ждет
+    # retry_after.
+    paused = [
+        arrived
+        for arrived in api.get_times()
+        if flood_time < arrived < flood_time + RETRY_AFTER - TOLERANCE
+    ]
+    assert len(paused) < engine.concurrency
+    assert all(
+        arrived < flood_time + engine.concurrency / rate for arrived in paused
+    )
+
+
+@pytest.mark.anyio
+async def test_retry_after_limit(api: FakeBotAPI, bot: Bot) -> None:
+    api.floods[1] = 2
+    engine = DeliveryEngine(concurrency=1, rate=100, max_retries=1)
+
+    async def deliver(chat_id: int) -> None:
+        await engine.send(chat_id, bot.send_message, text='Рассылка')
+
+    stats = await engine.run([1, 2], deliver)
+
+    assert (stats.delivered, stats.failed, stats.retries) == (1, 1, 1)
+    assert [chat for _, chat in api.messages] == [2]
+
+
+@pytest.mark.anyio
+async def test_media_uploaded_once(api: FakeBotAPI, bot: Bot) -> None:
+    recipients, photos = 10, 3
+    engine = DeliveryEngine(concurrency=5, rate=100, chat_interval=0)
+    media = [
+        SimpleNamespace(
+            media_url=f'https://example.com/{number}.jpg',
+            telegram_file_id=None,
+        )
+        for number in range(photos)
+    ]
+    sender = MediaGroupSender(bot, media)
+
+    async def deliver(chat_id: int) -> None:
+        await sender.send(chat_id, partial(engine.send, chat_id))
+
+    stats = await engine.run(range(1, recipients + 1), deliver)
+
+    assert (stats.delivered, stats.messages) == (
+        recipients,
+        recipients * photos,
+    )
+    # Файлы загружаются первым чатом, остальные получают их по file_id.
+    assert api.media_sources == Counter(
+        upload=photos, file_id=photos * (recipients - 1)
+    )
+    assert [item.telegram_file_id for item in media] == [
+        f'file-https://example.com/{number}.jpg' for number in range(photos)
+    ]
+    assert Counter(chat for _, chat in api.messages) == {
+        chat_id: photos for chat_id in range(1, recipients + 1)
+    }
@@ -0,0 +1,194 @@
+"""Кеш прямых ссылок Яндекс Диска на локальной подделке API.
+
+Поддельный сервер (aiohttp) отвечает на метод API
+/v1/disk/public/resources/download прямыми ссылками на себя же и отдает
+по ним файлы. Яндекс Диск, Redis и БД не нужны.
+"""
+
+import asyncio
+from collections import Counter
+from time import time
+from typing import AsyncIterator
+from urllib.parse import urlencode
+
+import aiohttp
+import pytest
+from aiohttp import web
+
+from src.service.yandex_disk import EXPIRY_MARGIN, YandexDiskResolver
+
+API_PATH = '/v1/disk/public/resources/download'
+PUBLIC_URL = 'https://disk.yandex.ru/i/test{number}'
+CONTENT = b'\xff\xd8test'
+# Задержка ответа API: одновременные запросы успевают встретиться.
+API_LATENCY = 0.05
+TTL = 1800
+
+
+class FakeYandexDisk:
+    """Поддельный API Яндекс Диска, считающий запросы.
+
+    Ссылка включает поколение файла: после revoke(public_key) прежние ссылки
+    на файл отвечают stale_status.
+    """
+
+    def __init__(self) -> None:
+        """Создает сервер без выданных ссылок."""
+        self.generations = Counter()
+        self.api_requests = Counter()
+        self.stale_status = 410
+
+    def revoke(self, public_key: str) -> None:
+        self.generations[public_key.rsplit('/', 1)[1]] += 1
+
+    async def resolve(self, request: web.Request) -> web.Response:
+        public_key = request.query['public_key']
+        self.api_requests[public_key] += 1
+        await asyncio.sleep(API_LATENCY)
+        name = public_key.rsplit('/', 1)[1]
+        href = request.url.with_path(
+            f'/file/{self.generations[name]}/{name}'
+        ).with_query(expires=int(time()) + 3600)
+        return web.json_response({'href': str(href)})
+
+    async def download(self, request: web.Request) -> web.Response:
+        name = request.match_info['name']
+        if int(request.match_info['generation']) != self.generations[name]:
+            return web.Response(status=self.stale_status)
+        return web.Response(body=CONTENT, content_type='image/jpeg')
+
+
+@pytest.fixture
+def disk() -> FakeYandexDisk:
+    return FakeYandexDisk()
+
+
+@pytest.fixture
+async def api_url(disk: FakeYandexDisk) -> AsyncIterator[str]:
+    app = web.Application()
+    app.router.add_get(API_PATH, disk.resolve)
+    app.router.add_get('/file/{generation}/{name}', disk.download)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    try:
+        yield f'http://127.0.0.1:{port}{API_PATH}'
+    finally:
+        await runner.cleanup()
+
+
+@pytest.fixture
+def resolver(api_url: str) -> YandexDiskResolver:
+    # Кеш без Redis, обращающийся к подделке API.
+    return YandexDiskResolver(ttl=TTL, max_entries=100, api_url=api_url)
+
+
+@pytest.fixture
+async def http_session() -> AsyncIterator[aiohttp.ClientSession]:
+    async with aiohttp.ClientSession() as http_session:
+        yield http_session
+
+
+async def download(
+    resolver: YandexDiskResolver, session: aiohttp.ClientSession, url: str
+) -> bytes:
+    async with resolver.open(session, url) as response:
+        response.raise_for_status()
+        return await response.read()
+
+
+async def download_all(
+    resolver: YandexDiskResolver,
+    session: aiohttp.ClientSession,
+    keys: int,
+    requests_per_key: int,
+) -> list[bytes]:
+    return await asyncio.gather(
+        *(
+            download(resolver, session, PUBLIC_URL.format(number=number))
+            for number in range(keys)
+            for _ in range(requests_per_key)
+        )
+    )
+
+
+@pytest.mark.anyio
+async def test_single_flight_and_warm_cache(
+    disk: FakeYandexDisk,
+    resolver: YandexDiskResolver,
+    http_session: aiohttp.ClientSession,
+) -> None:
+    keys = 5
+    results = await download_all(resolver, http_session, keys, 20)
+    assert results == [CONTENT] * keys * 20
+    # Одновременные запросы одной ссылки ждут один запрос к API.
+    assert disk.api_requests == Counter({
+        PUBLIC_URL.format(number=number): 1 for number in range(keys)
+    })
+    disk.api_requests.clear()
+    await download_all(resolver, http_session, keys, 20)
+    assert not disk.api_requests
+
+
+def test_get_ttl() -> None:
+    resolver = YandexDiskResolver(ttl=TTL)
+    now = int(time())
+    assert resolver.get_ttl('https://downloader.disk/file') == TTL
+    assert resolver.get_ttl('https://downloader.disk/file?expires=x') == TTL
+    assert (
+        resolver.get_ttl(f'https://downloader.disk/file?expires={now + 7200}')
+        == TTL
+    )
+    ttl = resolver.get_ttl(
+        'https://downloader.disk/file?'
+        + urlencode({'expires': now + 600, 'limit': 0})
+    )
+    assert 600 - EXPIRY_MARGIN - 2 <= ttl <= 600 - EXPIRY_MARGIN
+    assert resolver.get_ttl(f'https://downloader.disk/file?expires={now}') == 1
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize('stale_status', (403, 404, 410))
+async def test_stale_href_resolved_again_once(
+    disk: FakeYandexDisk,
+    resolver: YandexDiskResolver,
+    http_session: aiohttp.ClientSession,
+    stale_status: int,
+) -> None:
+    disk.stale_status = stale_status
+    stale_url, fresh_url = (
+        PUBLIC_URL.format(number=0),
+        PUBLIC_URL.format(number=1),
+    )
+    await download(resolver, http_session, stale_url)
+    await download(resolver, http_session, fresh_url)
+    fresh_href = await resolver.resolve(http_session, fresh_url)
+    disk.api_requests.clear()
+    disk.revoke(stale_url)
+
+    assert await download(resolver, http_session, stale_url) == CONTENT
+    assert disk.api_requests == Counter({stale_url: 1})
+    # Ссылка другого файла осталась в кеше.
+    assert await resolver.resolve(http_session, fresh_url) == fresh_href
+    assert disk.api_requests == Counter({stale_url: 1})
+
+
+@pytest.mark.anyio
+async def test_invalidate_keeps_newer_href(
+    disk: FakeYandexDisk,
+    resolver: YandexDiskResolver,
+    http_session: aiohttp.ClientSession,
+) -> None:
+    url = PUBLIC_URL.format(number=0)
+    old_href = await resolver.resolve(http_session, url)
+    disk.revoke(url)
+    await resolver.invalidate(url, old_href)
+    new_href = await resolver.resolve(http_session, url)
+    assert new_href != old_href
+    # Запрос, получивший старую ссылку, не сбрасывает новую.
+    await resolver.invalidate(url, old_href)
+    disk.api_requests.clear()
+    assert await resolver.resolve(http_session, url) == new_href
+    assert not disk.api_requests